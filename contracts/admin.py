@@ -7,7 +7,6 @@ from .models import (
     OrdemFornecimento,
     OrdemServico,
 )
-from babel.numbers import format_currency
 
 
 @admin.register(Cliente)
@@ -144,11 +143,15 @@ class OrdemFornecimentoAdmin(admin.ModelAdmin):
     ordering = ("-data_ativacao",)
 
     def valor_unitario_formatado(self, obj):
+        from babel.numbers import format_currency
+
         return format_currency(obj.valor_unitario, "BRL", locale="pt_BR")
 
     valor_unitario_formatado.short_description = "Valor Unitário"
 
     def valor_total_formatado(self, obj):
+        from babel.numbers import format_currency
+
         return format_currency(obj.valor_total, "BRL", locale="pt_BR")
 
     valor_total_formatado.short_description = "Valor Total"
@@ -189,6 +189,14 @@ class ClienteForm(forms.ModelForm):
                         }
                     )
 
+    def clean_cnpj_cpf(self):
+        """O mesmo CNPJ/CPF em outra formatação também é duplicidade"""
+        cnpj_cpf = self.cleaned_data.get("cnpj_cpf")
+        existente = Cliente.objects.por_documento(cnpj_cpf).exclude(pk=self.instance.pk).first()
+        if existente:
+            raise forms.ValidationError(f"Já existe um cliente com este CNPJ/CPF: {existente}.")
+        return cnpj_cpf
+
 
 # 🔗 Lista padrão de fornecedores
 FORNECEDORES_CHOICES = [(key, label) for key, label in FORNECEDORES_MAP.items()]
@@ -1346,6 +1354,13 @@ class TarefaForm(forms.ModelForm):
                     self.fields['projeto'].initial = projeto
             except Projeto.DoesNotExist:
                 pass
+        
+        # Papel é opcional no formulário: quando omitido vale o atual (ou o padrão "consultor")
+        if 'papel' in self.fields:
+            self.fields['papel'].required = False
+    
+    def clean_papel(self):
+        return self.cleaned_data.get('papel') or self.instance.papel or "consultor"
 
 
 class StakeholderContratoForm(forms.ModelForm):
@@ -1693,7 +1708,7 @@ class AnaliseContratoForm(forms.Form):
         })
     )
     
-    arquivos = forms.FileField(
+    arquivos = MultipleFileField(
         required=False,
         label="Arquivos",
         help_text="Selecione um ou mais arquivos (PDF ou Word). Máximo 50MB por arquivo.",
@@ -0,0 +1,25 @@
+"""
+Comando para recalcular a data de expiração das licenças das OFs
+Executar após a migração (backfill) ou quando a vigência de um item de contrato mudar
+"""
+from django.core.management.base import BaseCommand
+
+from contracts.models import OrdemFornecimento
+from contracts.services import ExpiracaoLicencaService
+
+
+class Command(BaseCommand):
+    help = 'Recalcula a data de expiração (ativação + vigência do produto) das Ordens de Fornecimento'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--contrato', type=int, help='Restringe ao contrato informado (id)')
+
+    def handle(self, *args, **options):
+        ordens = OrdemFornecimento.objects.all()
+        if options['contrato']:
+            ordens = ordens.filter(contrato_id=options['contrato'])
+
+        total = ExpiracaoLicencaService.recalcular(ordens)
+        self.stdout.write(self.style.SUCCESS(
+            f'{total} data(s) de expiração atualizada(s).'
+        ))
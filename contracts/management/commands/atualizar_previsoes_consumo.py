@@ -0,0 +1,30 @@
+"""
+Comando para recalcular a previsão de consumo dos itens de contrato
+Agendar diariamente (ex.: cron às 02:00) para alimentar a listagem e o dashboard
+"""
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from contracts.services import PrevisaoConsumoService
+
+
+class Command(BaseCommand):
+    help = 'Recalcula o ritmo de consumo e a data prevista de esgotamento do saldo de cada item de contrato'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--data', help='Data de referência (AAAA-MM-DD). Padrão: hoje')
+
+    def handle(self, *args, **options):
+        hoje = timezone.now().date()
+        if options['data']:
+            try:
+                hoje = datetime.strptime(options['data'], '%Y-%m-%d').date()
+            except ValueError:
+                raise CommandError(f"Data inválida: {options['data']}. Use o formato AAAA-MM-DD.")
+
+        total = PrevisaoConsumoService.materializar(hoje)
+        self.stdout.write(self.style.SUCCESS(
+            f'{total} previsão(ões) de consumo gravada(s) em {hoje:%d/%m/%Y}.'
+        ))
@@ -0,0 +1,22 @@
+"""
+Comando para calcular a conformidade dos SLAs importantes
+Agendar de hora em hora (ex.: cron); calcula os incidentes novos, alterados ou
+ainda em aberto e regrava ConformidadeSLA dos meses afetados
+"""
+from django.core.management.base import BaseCommand
+
+from contracts.services import ConformidadeSLAService
+
+
+class Command(BaseCommand):
+    help = 'Calcula tempos em horas úteis, violações e a conformidade mensal dos SLAs importantes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--completo', action='store_true', help='Recalcula todos os incidentes')
+
+    def handle(self, *args, **options):
+        resultado = ConformidadeSLAService.processar(completo=options['completo'])
+        self.stdout.write(self.style.SUCCESS(
+            f"{resultado['incidentes']} incidente(s) avaliado(s): {resultado['atualizados']} atualizado(s), "
+            f"{resultado['meses']} mês(es) de conformidade regravado(s)."
+        ))
@@ -0,0 +1,32 @@
+"""
+Comando para calcular as glosas previstas por violação de SLA
+Agendar após calcular_conformidade_sla (ex.: diariamente) e antes do faturamento;
+regrava GlosaPrevista da competência para todos os contratos
+"""
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from contracts.services import GlosaService
+from contracts.templatetags.math_extras import currency_br
+
+
+class Command(BaseCommand):
+    help = 'Aplica o quadro de penalizações às violações de SLA da competência e projeta as glosas nas OS/OF'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--competencia', help='Mês de referência (AAAA-MM). Padrão: mês atual')
+
+    def handle(self, *args, **options):
+        competencia = None
+        if options['competencia']:
+            try:
+                competencia = datetime.strptime(options['competencia'], '%Y-%m').date()
+            except ValueError:
+                raise CommandError(f"Competência inválida: {options['competencia']}. Use o formato AAAA-MM.")
+
+        resultado = GlosaService.processar(competencia)
+        self.stdout.write(self.style.SUCCESS(
+            f"Competência {resultado['competencia']:%m/%Y}: {resultado['glosas']} glosa(s) em "
+            f"{resultado['documentos']} documento(s), total {currency_br(resultado['valor_total'])}."
+        ))
@@ -0,0 +1,38 @@
+"""
+Comando para remover os blobs de documentos sem referências
+Agendar fora do horário de uso (ex.: diariamente de madrugada); a carência
+protege os uploads em andamento e os documentos recém-excluídos
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from contracts.services import ArquivoConteudoService
+
+
+class Command(BaseCommand):
+    help = 'Remove os ArquivoConteudo sem documentos e os arquivos da pasta de blobs sem registro'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--carencia', type=int, default=ArquivoConteudoService.CARENCIA_HORAS,
+            help=f'Idade mínima em horas (padrão: {ArquivoConteudoService.CARENCIA_HORAS})',
+        )
+        parser.add_argument('--dry-run', action='store_true', help='Apenas lista o que seria removido')
+        parser.add_argument(
+            '--recontar', action='store_true',
+            help='Recalcula as referências a partir dos documentos antes da coleta',
+        )
+
+    def handle(self, *args, **options):
+        if options['carencia'] < 0:
+            raise CommandError('A carência deve ser maior ou igual a zero.')
+
+        if options['recontar']:
+            corrigidos = ArquivoConteudoService.recontar()
+            self.stdout.write(f'{corrigidos} contagem(ns) de referências corrigida(s).')
+
+        resultado = ArquivoConteudoService.coletar_orfaos(options['carencia'], simular=options['dry_run'])
+        acao = 'seriam removidos' if options['dry_run'] else 'removidos'
+        self.stdout.write(self.style.SUCCESS(
+            f"{resultado['blobs']} blob(s) e {resultado['arquivos']} arquivo(s) sem registro {acao} "
+            f"({resultado['bytes'] / (1024 * 1024):.1f} MB)."
+        ))
@@ -0,0 +1,33 @@
+"""
+Comando para exibir a taxa de acerto do cache versionado (CacheVersaoService)
+Uma linha por fragmento de template ({% cache_versao %}) e por conteúdo guardado
+pelas views (abas e resumo do contrato, indicadores do dashboard). Os contadores
+ficam no cache compartilhado; cada processo soma os seus a cada LOTE_ESTATISTICAS leituras
+"""
+from django.core.management.base import BaseCommand
+
+from contracts.services import CacheVersaoService
+
+
+class Command(BaseCommand):
+    help = 'Exibe acertos, falhas e taxa de acerto do cache de fragmentos e abas por versão'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--zerar', action='store_true', help='Zera os contadores após exibir')
+
+    def handle(self, *args, **options):
+        estatisticas = CacheVersaoService.estatisticas()
+        if not estatisticas:
+            self.stdout.write("Nenhuma leitura registrada.")
+        acertos = falhas = 0
+        for linha in estatisticas:
+            acertos, falhas = acertos + linha["acertos"], falhas + linha["falhas"]
+            taxa = "-" if linha["taxa"] is None else f"{linha['taxa']}%"
+            self.stdout.write(f"{linha['grupo']:40} {linha['acertos']:>8} acertos {linha['falhas']:>8} falhas  {taxa:>6}")
+        if acertos + falhas:
+            self.stdout.write(self.style.SUCCESS(
+                f"Total: {acertos} acerto(s), {falhas} falha(s), taxa de {acertos * 100 / (acertos + falhas):.1f}%."
+            ))
+        if options['zerar']:
+            CacheVersaoService.zerar_estatisticas()
+            self.stdout.write("Contadores zerados.")
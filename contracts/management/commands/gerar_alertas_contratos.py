@@ -0,0 +1,34 @@
+"""
+Comando para gerar os alertas de contratos (AlertaContrato)
+Agendar diariamente (ex.: cron às 02:00); só reavalia os contratos cujos
+aditivos, datas ou faixa de vencimento mudaram desde a última execução
+"""
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from contracts.services import AlertaContratoService
+
+
+class Command(BaseCommand):
+    help = 'Gera os alertas de renovação, limite de vigência e limite de aditivos dos contratos alterados'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--data', help='Data de referência (AAAA-MM-DD). Padrão: hoje')
+        parser.add_argument('--completo', action='store_true', help='Reavalia todos os contratos')
+
+    def handle(self, *args, **options):
+        hoje = timezone.now().date()
+        if options['data']:
+            try:
+                hoje = datetime.strptime(options['data'], '%Y-%m-%d').date()
+            except ValueError:
+                raise CommandError(f"Data inválida: {options['data']}. Use o formato AAAA-MM-DD.")
+
+        resultado = AlertaContratoService.processar(hoje, completo=options['completo'])
+        self.stdout.write(self.style.SUCCESS(
+            f"{resultado['avaliados']} contrato(s) reavaliado(s): {resultado['criados']} alerta(s) criado(s), "
+            f"{resultado['reativados']} reativado(s), {resultado['atualizados']} atualizado(s), "
+            f"{resultado['resolvidos']} resolvido(s)."
+        ))
@@ -0,0 +1,39 @@
+"""
+Comando para gerar os snapshots diários de horas de projetos e sprints
+Agendar diariamente (ex.: cron às 23:30) para alimentar os gráficos de burn-down
+"""
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from contracts.services import BurndownService
+
+
+class Command(BaseCommand):
+    help = 'Gera os snapshots diários de horas (planejadas, consumidas, restantes e faturáveis) por projeto e sprint'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--data', help='Data do snapshot (AAAA-MM-DD). Padrão: hoje')
+        parser.add_argument('--desde', help='Gera snapshots de --desde até --data (backfill)')
+        parser.add_argument('--projeto', type=int, action='append', help='ID do projeto (pode repetir)')
+
+    def _parse_data(self, valor):
+        try:
+            return datetime.strptime(valor, '%Y-%m-%d').date()
+        except ValueError:
+            raise CommandError(f'Data inválida: {valor}. Use o formato AAAA-MM-DD.')
+
+    def handle(self, *args, **options):
+        fim = self._parse_data(options['data']) if options['data'] else timezone.now().date()
+        inicio = self._parse_data(options['desde']) if options['desde'] else fim
+        if inicio > fim:
+            raise CommandError('--desde deve ser anterior ou igual a --data.')
+
+        total = 0
+        for dia in BurndownService.dias_periodo(inicio, fim):
+            total += BurndownService.gerar_snapshots(dia, options['projeto'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f'{total} snapshot(s) gerado(s) entre {inicio:%d/%m/%Y} e {fim:%d/%m/%Y}.'
+        ))
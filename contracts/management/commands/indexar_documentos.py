@@ -0,0 +1,24 @@
+"""
+Comando para indexar os trechos dos documentos de contrato na busca textual
+Os documentos são indexados ao salvar o texto extraído; executar uma vez após
+a implantação (documentos existentes) e com --reindexar ao mudar a segmentação
+"""
+from django.core.management.base import BaseCommand
+
+from contracts.services import BuscaDocumentoService
+
+
+class Command(BaseCommand):
+    help = 'Divide o texto extraído dos documentos em trechos e indexa para a busca textual'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--reindexar', action='store_true',
+            help='Regrava também os documentos que já possuem trechos',
+        )
+
+    def handle(self, *args, **options):
+        resultado = BuscaDocumentoService.indexar_todos(reindexar=options['reindexar'])
+        self.stdout.write(self.style.SUCCESS(
+            f"{resultado['documentos']} documento(s) indexado(s) em {resultado['trechos']} trecho(s)."
+        ))
@@ -0,0 +1,31 @@
+"""
+Comando para listar os clientes que coincidem pelo CNPJ/CPF normalizado
+Executar após a migração da chave cnpj_normalizado e depois de importações;
+os duplicados devem ter os contratos transferidos ao principal e ser excluídos
+"""
+from django.core.management.base import BaseCommand
+
+from contracts.services import ClienteService
+
+
+class Command(BaseCommand):
+    help = 'Lista os clientes com o mesmo CNPJ/CPF em formatações diferentes'
+
+    def handle(self, *args, **options):
+        grupos = ClienteService.duplicados()
+        for grupo in grupos:
+            principal = grupo['principal']
+            self.stdout.write(
+                f"{grupo['documento']}: principal "
+                + (f"#{principal.pk} {principal.nome_razao_social} ({principal.num_contratos} contrato(s))"
+                   if principal else "nenhum")
+            )
+            for cliente in grupo['duplicados']:
+                self.stdout.write(
+                    f"    duplicado #{cliente.pk} {cliente.nome_razao_social} "
+                    f"[{cliente.cnpj_cpf}] ({cliente.num_contratos} contrato(s))"
+                )
+        self.stdout.write(self.style.SUCCESS(
+            f"{len(grupos)} CNPJ/CPF com cadastros duplicados "
+            f"({sum(len(grupo['duplicados']) for grupo in grupos)} duplicado(s))."
+        ))
@@ -0,0 +1,75 @@
+"""
+Comando para medir o tempo de importação na inicialização (python -X importtime)
+Mede django.setup() mais a resolução das URLs em um processo novo, como no boot
+de um worker; executar após adicionar dependências ou imports de módulo.
+tests_inicializacao verifica as bibliotecas pesadas e uma margem folgada do
+orçamento (FOLGA_TESTES), pulável com SEM_ORCAMENTO_IMPORTACAO=1 em máquinas lentas
+"""
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+SCRIPT = "import django; django.setup(); from django.urls import resolve; resolve('/')"
+
+
+class Command(BaseCommand):
+    help = 'Resume o python -X importtime de django.setup() + URLs e falha acima do orçamento'
+
+    # Soma dos tempos acumulados dos imports de primeiro nível, em ms
+    ORCAMENTO_MS = 1000
+    # Multiplicador do orçamento no teste automatizado (tolera runners compartilhados)
+    FOLGA_TESTES = 3
+    # Bibliotecas que só podem ser importadas dentro das views/serviços que as usam
+    PESADOS = ("numpy", "pandas", "openpyxl", "xlsxwriter", "reportlab", "openai", "babel")
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--orcamento', type=int, default=self.ORCAMENTO_MS,
+            help=f'Tempo máximo em ms (padrão: {self.ORCAMENTO_MS})',
+        )
+        parser.add_argument('--top', type=int, default=15, help='Quantidade de imports listados (padrão: 15)')
+
+    def medir(self):
+        """Lista de (módulo, acumulado em µs, primeiro nível) na ordem do importtime"""
+        env = {**os.environ, "DJANGO_SETTINGS_MODULE": settings.SETTINGS_MODULE}
+        processo = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", SCRIPT],
+            cwd=settings.BASE_DIR, env=env, capture_output=True, text=True,
+        )
+        if processo.returncode:
+            raise CommandError(f"Falha ao inicializar o Django:\n{processo.stderr[-2000:]}")
+
+        registros = []
+        for linha in processo.stderr.splitlines():
+            if not linha.startswith("import time:"):
+                continue
+            _, acumulado, nome = linha.split("|", 2)
+            if not acumulado.strip().isdigit():
+                continue  # cabeçalho
+            registros.append((nome.strip(), int(acumulado), not nome[1:].startswith(" ")))
+        return registros
+
+    @staticmethod
+    def total_ms(registros):
+        """Soma dos acumulados dos imports de primeiro nível, em ms"""
+        return sum(acumulado for _, acumulado, topo in registros if topo) / 1000
+
+    def handle(self, *args, **options):
+        registros = self.medir()
+        primeiro_nivel = [(nome, acumulado) for nome, acumulado, topo in registros if topo]
+        total_ms = self.total_ms(registros)
+
+        for nome, acumulado in sorted(primeiro_nivel, key=lambda r: -r[1])[:options['top']]:
+            self.stdout.write(f"{acumulado / 1000:9.1f} ms  {nome}")
+
+        pesados = sorted({nome.split(".")[0] for nome, _, _ in registros} & set(self.PESADOS))
+        if pesados:
+            raise CommandError(f"Importados na inicialização: {', '.join(pesados)} (importar dentro das funções).")
+        if total_ms > options['orcamento']:
+            raise CommandError(f"Importação em {total_ms:.0f} ms, acima do orçamento de {options['orcamento']} ms.")
+        self.stdout.write(self.style.SUCCESS(
+            f"Importação em {total_ms:.0f} ms (orçamento: {options['orcamento']} ms)."
+        ))
@@ -0,0 +1,35 @@
+"""
+Comando para aplicar as transições de status dependentes de data
+Agendar diariamente (ex.: cron às 00:05) ou executar sob demanda
+"""
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from contracts.services import TransicaoStatusService
+
+
+class Command(BaseCommand):
+    help = 'Atualiza a situação dos contratos e o status de sprints/OS conforme as datas, com trilha de auditoria'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--data', help='Data de referência (AAAA-MM-DD). Padrão: hoje')
+        parser.add_argument('--dry-run', action='store_true', help='Apenas lista as quantidades, sem gravar')
+
+    def handle(self, *args, **options):
+        hoje = timezone.now().date()
+        if options['data']:
+            try:
+                hoje = datetime.strptime(options['data'], '%Y-%m-%d').date()
+            except ValueError:
+                raise CommandError(f"Data inválida: {options['data']}. Use o formato AAAA-MM-DD.")
+
+        resumo = TransicaoStatusService.executar(hoje, dry_run=options['dry_run'])
+
+        prefixo = '[dry-run] ' if options['dry_run'] else ''
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefixo}Transições em {hoje:%d/%m/%Y}: "
+            f"{resumo['contrato']} contrato(s), {resumo['sprint']} sprint(s), "
+            f"{resumo['ordem_servico']} OS."
+        ))
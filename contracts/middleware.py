@@ -0,0 +1,21 @@
+"""
+Middlewares do app contracts
+"""
+from .services import EventoService
+
+
+class EventoMiddleware:
+    """
+    Acumula os eventos registrados durante a requisição (EventoService.registrar)
+    e os grava com um único bulk_create ao fim da resposta
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        tokens = EventoService.iniciar(getattr(request, "user", None))
+        try:
+            return self.get_response(request)
+        finally:
+            EventoService.descarregar(tokens)
@@ -0,0 +1,42 @@
+# Snapshots diários de horas por projeto/sprint (burn-down/burn-up)
+
+from decimal import Decimal
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contracts", "0074_corrigir_constraint_projeto_tarefa"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SnapshotHorasProjeto",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("data", models.DateField(verbose_name="Data")),
+                ("horas_planejadas", models.DecimalField(decimal_places=2, default=Decimal("0.00"), max_digits=10, verbose_name="Horas Planejadas")),
+                ("horas_consumidas", models.DecimalField(decimal_places=2, default=Decimal("0.00"), max_digits=10, verbose_name="Horas Consumidas")),
+                ("horas_restantes", models.DecimalField(decimal_places=2, default=Decimal("0.00"), max_digits=10, verbose_name="Horas Restantes")),
+                ("horas_faturaveis", models.DecimalField(decimal_places=2, default=Decimal("0.00"), help_text="Horas faturáveis lançadas em tarefas concluídas e bilhetáveis na OS", max_digits=10, verbose_name="Horas Faturáveis")),
+                ("total_tarefas", models.PositiveIntegerField(default=0, verbose_name="Total de Tarefas")),
+                ("tarefas_concluidas", models.PositiveIntegerField(default=0, verbose_name="Tarefas Concluídas")),
+                ("criado_em", models.DateTimeField(auto_now_add=True)),
+                ("projeto", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="snapshots_horas", to="contracts.projeto", verbose_name="Projeto")),
+                ("sprint", models.ForeignKey(blank=True, help_text="Vazio para o consolidado do projeto", null=True, on_delete=django.db.models.deletion.CASCADE, related_name="snapshots_horas", to="contracts.sprint", verbose_name="Sprint")),
+            ],
+            options={
+                "verbose_name": "Snapshot de Horas do Projeto",
+                "verbose_name_plural": "Snapshots de Horas dos Projetos",
+                "ordering": ["projeto", "sprint", "data"],
+                "indexes": [
+                    models.Index(fields=["projeto", "data"], name="snapshot_projeto_data_idx"),
+                    models.Index(fields=["sprint", "data"], name="snapshot_sprint_data_idx"),
+                ],
+                "unique_together": {("projeto", "sprint", "data")},
+            },
+        ),
+    ]
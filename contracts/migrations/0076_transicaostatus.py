@@ -0,0 +1,35 @@
+# Trilha de auditoria das transições automáticas de status
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contracts", "0075_snapshothorasprojeto"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TransicaoStatus",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("entidade", models.CharField(choices=[("contrato", "Contrato"), ("sprint", "Sprint"), ("ordem_servico", "Ordem de Serviço")], max_length=20, verbose_name="Entidade")),
+                ("objeto_id", models.PositiveIntegerField(verbose_name="ID do Objeto")),
+                ("status_anterior", models.CharField(blank=True, max_length=20, verbose_name="Status Anterior")),
+                ("status_novo", models.CharField(max_length=20, verbose_name="Status Novo")),
+                ("origem", models.CharField(default="transicionar_status", help_text="Rotina que executou a transição", max_length=50, verbose_name="Origem")),
+                ("data_referencia", models.DateField(verbose_name="Data de Referência")),
+                ("criado_em", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "verbose_name": "Transição de Status",
+                "verbose_name_plural": "Transições de Status",
+                "ordering": ["-criado_em"],
+                "indexes": [
+                    models.Index(fields=["entidade", "objeto_id"], name="transicao_entidade_obj_idx"),
+                    models.Index(fields=["data_referencia"], name="transicao_data_ref_idx"),
+                ],
+            },
+        ),
+    ]
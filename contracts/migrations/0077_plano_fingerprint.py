@@ -0,0 +1,23 @@
+# Fingerprint da última sincronização com o Plano de Trabalho
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contracts", "0076_transicaostatus"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="sprint",
+            name="plano_fingerprint",
+            field=models.CharField(blank=True, default="", editable=False, help_text="Hash dos valores gravados na última sincronização com o Plano de Trabalho", max_length=40, verbose_name="Fingerprint do Plano"),
+        ),
+        migrations.AddField(
+            model_name="tarefa",
+            name="plano_fingerprint",
+            field=models.CharField(blank=True, default="", editable=False, help_text="Hash dos valores gravados na última sincronização com o Plano de Trabalho", max_length=40, verbose_name="Fingerprint do Plano"),
+        ),
+    ]
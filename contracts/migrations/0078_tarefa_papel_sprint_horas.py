@@ -0,0 +1,61 @@
+# Papel da tarefa (consultor/gestão) e totais de horas armazenados na sprint
+
+from decimal import Decimal
+
+from django.db import migrations, models
+from django.db.models import DecimalField, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+
+def preencher_papel_e_totais(apps, schema_editor):
+    Tarefa = apps.get_model("contracts", "Tarefa")
+    Sprint = apps.get_model("contracts", "Sprint")
+
+    # Mesmo critério usado até aqui para identificar tarefas de gestão (pelo título)
+    Tarefa.objects.filter(
+        Q(titulo__icontains="gestão") | Q(titulo__icontains="gerente")
+    ).update(papel="gestao")
+
+    decimal_zero = Value(Decimal("0.00"), output_field=DecimalField())
+    tarefas = Tarefa.objects.filter(sprint=OuterRef("pk")).order_by().values("sprint")
+
+    def soma(papel):
+        return Coalesce(
+            Subquery(
+                tarefas.filter(papel=papel).annotate(total=Sum("horas_planejadas")).values("total")[:1],
+                output_field=DecimalField(),
+            ),
+            decimal_zero,
+        )
+
+    Sprint.objects.update(horas_consultor_planejadas=soma("consultor"), horas_gestao_planejadas=soma("gestao"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contracts", "0077_plano_fingerprint"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="tarefa",
+            name="papel",
+            field=models.CharField(choices=[("consultor", "Consultor"), ("gestao", "Gestão de Projetos")], default="consultor", help_text="Tarefas de gestão recebem 25% das horas de consultor da sprint", max_length=10, verbose_name="Papel"),
+        ),
+        migrations.AddField(
+            model_name="sprint",
+            name="horas_consultor_planejadas",
+            field=models.DecimalField(decimal_places=2, default=Decimal("0.00"), editable=False, help_text="Soma das horas planejadas das tarefas de consultor, mantida pelo Tarefa.save", max_digits=10, verbose_name="Horas Planejadas (Consultor)"),
+        ),
+        migrations.AddField(
+            model_name="sprint",
+            name="horas_gestao_planejadas",
+            field=models.DecimalField(decimal_places=2, default=Decimal("0.00"), editable=False, help_text="Soma das horas planejadas das tarefas de gestão, mantida pelo Tarefa.save", max_digits=10, verbose_name="Horas Planejadas (Gestão)"),
+        ),
+        migrations.AddIndex(
+            model_name="tarefa",
+            index=models.Index(fields=["sprint", "papel"], name="tarefa_sprint_papel_idx"),
+        ),
+        migrations.RunPython(preencher_papel_e_totais, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,38 @@
+# Previsão de consumo e esgotamento do saldo dos itens de contrato
+
+from decimal import Decimal
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contracts", "0078_tarefa_papel_sprint_horas"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PrevisaoConsumoItem",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("quantidade_consumida", models.DecimalField(decimal_places=2, default=Decimal("0.00"), max_digits=12, verbose_name="Quantidade Consumida")),
+                ("saldo_quantidade", models.DecimalField(decimal_places=2, default=Decimal("0.00"), max_digits=12, verbose_name="Saldo de Quantidade")),
+                ("consumo_diario", models.DecimalField(decimal_places=4, default=Decimal("0.0000"), help_text="Inclinação da reta de mínimos quadrados do consumo acumulado", max_digits=12, verbose_name="Consumo Diário")),
+                ("data_esgotamento_prevista", models.DateField(blank=True, null=True, verbose_name="Esgotamento Previsto")),
+                ("data_fim_contrato", models.DateField(blank=True, null=True, verbose_name="Fim do Contrato")),
+                ("saldo_previsto_fim", models.DecimalField(decimal_places=2, default=Decimal("0.00"), help_text="Quantidade que sobrará no fim do contrato mantido o ritmo atual", max_digits=12, verbose_name="Saldo Previsto no Fim")),
+                ("percentual_ocioso", models.DecimalField(decimal_places=2, default=Decimal("0.00"), max_digits=6, verbose_name="% Ocioso Previsto")),
+                ("situacao", models.CharField(choices=[("esgota_antes", "Esgota antes do fim do contrato"), ("subutilizado", "Subutilização prevista"), ("adequado", "Consumo adequado"), ("sem_historico", "Sem histórico de consumo"), ("esgotado", "Saldo esgotado")], max_length=20, verbose_name="Situação")),
+                ("calculado_em", models.DateField(verbose_name="Calculado em")),
+                ("item", models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name="previsao_consumo", to="contracts.itemcontrato", verbose_name="Item de Contrato")),
+            ],
+            options={
+                "verbose_name": "Previsão de Consumo do Item",
+                "verbose_name_plural": "Previsões de Consumo dos Itens",
+                "ordering": ["data_esgotamento_prevista"],
+                "indexes": [models.Index(fields=["situacao", "data_esgotamento_prevista"], name="previsao_situacao_idx")],
+            },
+        ),
+    ]
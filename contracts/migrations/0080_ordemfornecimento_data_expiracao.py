@@ -0,0 +1,36 @@
+# Data de expiração da licença armazenada e indexada na Ordem de Fornecimento
+
+from dateutil.relativedelta import relativedelta
+from django.db import migrations, models
+
+
+def preencher_data_expiracao(apps, schema_editor):
+    OrdemFornecimento = apps.get_model("contracts", "OrdemFornecimento")
+
+    ordens = list(
+        OrdemFornecimento.objects.filter(data_ativacao__isnull=False, vigencia_produto__isnull=False)
+        .only("id", "data_ativacao", "vigencia_produto")
+    )
+    for ordem in ordens:
+        ordem.data_expiracao = ordem.data_ativacao + relativedelta(months=ordem.vigencia_produto)
+    OrdemFornecimento.objects.bulk_update(ordens, ["data_expiracao"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contracts", "0079_previsaoconsumoitem"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="ordemfornecimento",
+            name="data_expiracao",
+            field=models.DateField(blank=True, editable=False, help_text="Ativação + vigência do produto (meses), calculada no save", null=True, verbose_name="Data de Expiração"),
+        ),
+        migrations.AddIndex(
+            model_name="ordemfornecimento",
+            index=models.Index(fields=["data_expiracao"], name="of_data_expiracao_idx"),
+        ),
+        migrations.RunPython(preencher_data_expiracao, migrations.RunPython.noop),
+    ]
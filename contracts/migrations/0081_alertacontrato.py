@@ -0,0 +1,43 @@
+# Alertas de contratos materializados (renovação, limite de vigência e de aditivos)
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contracts", "0080_ordemfornecimento_data_expiracao"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="contrato",
+            name="assinatura_alertas",
+            field=models.CharField(blank=True, default="", editable=False, help_text="Resumo dos dados avaliados na última geração de alertas (AlertaContrato)", max_length=40),
+        ),
+        migrations.CreateModel(
+            name="AlertaContrato",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("tipo", models.CharField(choices=[("renovacao_90", "Vencimento em até 90 dias"), ("renovacao_60", "Vencimento em até 60 dias"), ("renovacao_30", "Vencimento em até 30 dias"), ("limite_vigencia", "Limite legal de vigência atingido"), ("limite_aditivo", "Limite de 25% de aditivos próximo do esgotamento")], max_length=20, verbose_name="Tipo")),
+                ("mensagem", models.CharField(max_length=255, verbose_name="Mensagem")),
+                ("data_referencia", models.DateField(blank=True, help_text="Data de fim atual do contrato quando o alerta foi gerado", null=True, verbose_name="Data de Referência")),
+                ("ativo", models.BooleanField(default=True, verbose_name="Ativo")),
+                ("reconhecido_em", models.DateTimeField(blank=True, null=True, verbose_name="Reconhecido em")),
+                ("criado_em", models.DateTimeField(auto_now_add=True)),
+                ("resolvido_em", models.DateTimeField(blank=True, null=True, verbose_name="Resolvido em")),
+                ("contrato", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="alertas", to="contracts.contrato", verbose_name="Contrato")),
+                ("reconhecido_por", models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name="alertas_contrato_reconhecidos", to=settings.AUTH_USER_MODEL, verbose_name="Reconhecido por")),
+            ],
+            options={
+                "verbose_name": "Alerta de Contrato",
+                "verbose_name_plural": "Alertas de Contratos",
+                "ordering": ["data_referencia", "contrato_id"],
+                "indexes": [models.Index(fields=["ativo", "tipo", "data_referencia"], name="alerta_ativo_tipo_idx")],
+                "constraints": [models.UniqueConstraint(fields=("contrato", "tipo"), name="alerta_contrato_tipo_unico")],
+            },
+        ),
+    ]
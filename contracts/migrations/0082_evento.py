@@ -0,0 +1,41 @@
+# Fluxo de atividades (append-only) para o dashboard e a linha do tempo dos contratos
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contracts", "0081_alertacontrato"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Evento",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("entidade", models.CharField(choices=[("contrato", "Contrato"), ("termo_aditivo", "Termo Aditivo"), ("ordem_servico", "Ordem de Serviço"), ("ordem_fornecimento", "Ordem de Fornecimento"), ("sprint", "Sprint"), ("analise_contrato", "Análise de Contrato")], max_length=20, verbose_name="Entidade")),
+                ("objeto_id", models.PositiveIntegerField(verbose_name="ID do Objeto")),
+                ("acao", models.CharField(help_text="criado ou o novo status", max_length=20, verbose_name="Ação")),
+                ("descricao", models.CharField(max_length=255, verbose_name="Descrição")),
+                ("criado_em", models.DateTimeField(default=django.utils.timezone.now, editable=False, verbose_name="Criado em")),
+                ("contrato", models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name="eventos", to="contracts.contrato", verbose_name="Contrato")),
+                ("usuario", models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name="eventos", to=settings.AUTH_USER_MODEL, verbose_name="Usuário")),
+            ],
+            options={
+                "verbose_name": "Evento",
+                "verbose_name_plural": "Eventos",
+                "ordering": ["-criado_em", "-id"],
+                "indexes": [
+                    models.Index(fields=["entidade", "criado_em"], name="evento_entidade_idx"),
+                    models.Index(fields=["usuario", "criado_em"], name="evento_usuario_idx"),
+                    models.Index(fields=["contrato", "criado_em", "id"], name="evento_contrato_idx"),
+                    models.Index(fields=["criado_em", "id"], name="evento_criado_idx"),
+                ],
+            },
+        ),
+    ]
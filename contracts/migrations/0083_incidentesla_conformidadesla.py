@@ -0,0 +1,74 @@
+# Medições de SLA (incidentes) e conformidade mensal materializada
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contracts", "0082_evento"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="IncidenteSLA",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("identificador", models.CharField(help_text="Número do chamado na ferramenta de origem", max_length=100, verbose_name="Identificador")),
+                ("descricao", models.CharField(blank=True, max_length=255, verbose_name="Descrição")),
+                ("aberto_em", models.DateTimeField(verbose_name="Aberto em")),
+                ("respondido_em", models.DateTimeField(blank=True, null=True, verbose_name="Respondido em")),
+                ("resolvido_em", models.DateTimeField(blank=True, null=True, verbose_name="Resolvido em")),
+                ("horas_resposta", models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True, verbose_name="Horas Úteis até a Resposta")),
+                ("horas_solucao", models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True, verbose_name="Horas Úteis até a Solução")),
+                ("violou_resposta", models.BooleanField(default=False, verbose_name="Violou Tempo de Resposta")),
+                ("violou_solucao", models.BooleanField(default=False, verbose_name="Violou Tempo de Solução")),
+                ("calculado_em", models.DateTimeField(blank=True, help_text="Vazio: aguardando o cálculo de conformidade", null=True, verbose_name="Calculado em")),
+                ("criado_em", models.DateTimeField(auto_now_add=True)),
+                ("contrato", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="incidentes_sla", to="contracts.contrato", verbose_name="Contrato")),
+                ("sla", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="incidentes", to="contracts.slaimportante", verbose_name="SLA Importante")),
+            ],
+            options={
+                "verbose_name": "Incidente de SLA",
+                "verbose_name_plural": "Incidentes de SLA",
+                "ordering": ["-aberto_em"],
+                "indexes": [
+                    models.Index(fields=["contrato", "aberto_em"], name="incidente_contrato_aberto_idx"),
+                    models.Index(fields=["sla", "aberto_em"], name="incidente_sla_aberto_idx"),
+                ],
+                "constraints": [
+                    models.UniqueConstraint(fields=("sla", "identificador"), name="incidente_sla_identificador_unico"),
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="ConformidadeSLA",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("mes", models.DateField(help_text="Primeiro dia do mês de abertura dos incidentes", verbose_name="Mês")),
+                ("total_incidentes", models.PositiveIntegerField(default=0, verbose_name="Incidentes")),
+                ("incidentes_avaliados", models.PositiveIntegerField(default=0, help_text="Resolvidos ou já violados", verbose_name="Incidentes Avaliados")),
+                ("incidentes_conformes", models.PositiveIntegerField(default=0, verbose_name="Incidentes Conformes")),
+                ("violacoes_resposta", models.PositiveIntegerField(default=0, verbose_name="Violações de Resposta")),
+                ("violacoes_solucao", models.PositiveIntegerField(default=0, verbose_name="Violações de Solução")),
+                ("percentual_conformidade", models.DecimalField(blank=True, decimal_places=2, max_digits=5, null=True, verbose_name="Conformidade (%)")),
+                ("horas_resposta_media", models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True, verbose_name="Resposta Média (h úteis)")),
+                ("horas_solucao_media", models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True, verbose_name="Solução Média (h úteis)")),
+                ("calculado_em", models.DateTimeField(verbose_name="Calculado em")),
+                ("contrato", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="conformidades_sla", to="contracts.contrato", verbose_name="Contrato")),
+                ("sla", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="conformidades", to="contracts.slaimportante", verbose_name="SLA Importante")),
+            ],
+            options={
+                "verbose_name": "Conformidade de SLA",
+                "verbose_name_plural": "Conformidades de SLA",
+                "ordering": ["-mes", "sla_id"],
+                "indexes": [
+                    models.Index(fields=["contrato", "mes"], name="conformidade_contrato_mes_idx"),
+                ],
+                "constraints": [
+                    models.UniqueConstraint(fields=("sla", "mes"), name="conformidade_sla_mes_unica"),
+                ],
+            },
+        ),
+    ]
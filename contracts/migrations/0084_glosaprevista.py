@@ -0,0 +1,39 @@
+# Glosas previstas por violação de SLA (deduções projetadas na fila de faturamento)
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contracts", "0083_incidentesla_conformidadesla"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="GlosaPrevista",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("competencia", models.DateField(help_text="Primeiro dia do mês das violações", verbose_name="Competência")),
+                ("violacoes", models.PositiveIntegerField(verbose_name="Violações no Mês")),
+                ("valor_base", models.DecimalField(decimal_places=2, max_digits=12, verbose_name="Valor do Documento (R$)")),
+                ("percentual", models.DecimalField(blank=True, decimal_places=2, max_digits=5, null=True, verbose_name="Percentual (%)")),
+                ("valor_fixo_rateado", models.DecimalField(decimal_places=2, default=0, help_text="Parcela do valor fixo × violações proporcional ao valor do documento no contrato", max_digits=12, verbose_name="Valor Fixo Rateado (R$)")),
+                ("valor", models.DecimalField(decimal_places=2, help_text="Limitada ao valor do documento", max_digits=12, verbose_name="Glosa (R$)")),
+                ("calculado_em", models.DateTimeField(verbose_name="Calculado em")),
+                ("contrato", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="glosas_previstas", to="contracts.contrato", verbose_name="Contrato")),
+                ("ordem_fornecimento", models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name="glosas_previstas", to="contracts.ordemfornecimento", verbose_name="Ordem de Fornecimento")),
+                ("ordem_servico", models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name="glosas_previstas", to="contracts.ordemservico", verbose_name="Ordem de Serviço")),
+                ("penalizacao", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="glosas_previstas", to="contracts.quadropenalizacao", verbose_name="Penalização/Glosa")),
+            ],
+            options={
+                "verbose_name": "Glosa Prevista",
+                "verbose_name_plural": "Glosas Previstas",
+                "ordering": ["-competencia", "contrato_id", "id"],
+                "indexes": [
+                    models.Index(fields=["competencia", "contrato"], name="glosa_competencia_contrato_idx"),
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Armazenamento por conteúdo (SHA-256) dos arquivos de DocumentoContrato
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contracts", "0084_glosaprevista"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArquivoConteudo",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("sha256", models.CharField(max_length=64, unique=True, verbose_name="SHA-256")),
+                ("arquivo", models.FileField(max_length=500, upload_to="documentos_contratos/blobs/", verbose_name="Arquivo")),
+                ("tamanho", models.BigIntegerField(verbose_name="Tamanho (bytes)")),
+                ("texto_extraido", models.TextField(blank=True, null=True, verbose_name="Texto Extraído")),
+                ("referencias", models.PositiveIntegerField(default=0, help_text="Quantidade de DocumentoContrato que apontam para o conteúdo", verbose_name="Referências")),
+                ("criado_em", models.DateTimeField(auto_now_add=True)),
+                ("atualizado_em", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "Conteúdo de Arquivo",
+                "verbose_name_plural": "Conteúdos de Arquivos",
+                "indexes": [
+                    models.Index(fields=["referencias", "atualizado_em"], name="arquivo_conteudo_refs_idx"),
+                ],
+            },
+        ),
+        migrations.AddField(
+            model_name="documentocontrato",
+            name="conteudo",
+            field=models.ForeignKey(blank=True, help_text="Conteúdo deduplicado (SHA-256); vazio para documentos anteriores ao armazenamento por conteúdo", null=True, on_delete=django.db.models.deletion.PROTECT, related_name="documentos", to="contracts.arquivoconteudo", verbose_name="Conteúdo"),
+        ),
+    ]
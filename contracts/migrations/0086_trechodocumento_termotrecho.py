@@ -0,0 +1,63 @@
+# Trechos dos documentos de contrato para a busca textual (FTS no PostgreSQL,
+# índice invertido TermoTrecho nos demais bancos)
+
+import django.contrib.postgres.search
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def criar_indice_gin(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(
+            "CREATE INDEX IF NOT EXISTS trecho_vetor_gin_idx ON contracts_trechodocumento USING gin (vetor)"
+        )
+
+
+def remover_indice_gin(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute("DROP INDEX IF EXISTS trecho_vetor_gin_idx")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contracts", "0085_arquivoconteudo"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TrechoDocumento",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("ordem", models.PositiveIntegerField(verbose_name="Ordem")),
+                ("titulo", models.CharField(blank=True, max_length=255, verbose_name="Cláusula")),
+                ("texto", models.TextField(verbose_name="Texto")),
+                ("quantidade_termos", models.PositiveIntegerField(default=0, verbose_name="Quantidade de Termos")),
+                ("vetor", django.contrib.postgres.search.SearchVectorField(editable=False, null=True)),
+                ("documento", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="trechos", to="contracts.documentocontrato", verbose_name="Documento")),
+            ],
+            options={
+                "verbose_name": "Trecho de Documento",
+                "verbose_name_plural": "Trechos de Documentos",
+                "ordering": ["documento", "ordem"],
+                "constraints": [
+                    models.UniqueConstraint(fields=("documento", "ordem"), name="trecho_documento_ordem_unico"),
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="TermoTrecho",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("termo", models.CharField(max_length=60)),
+                ("frequencia", models.PositiveIntegerField(default=1)),
+                ("trecho", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="termos", to="contracts.trechodocumento")),
+            ],
+            options={
+                "indexes": [
+                    models.Index(fields=["termo", "trecho"], name="termo_trecho_idx"),
+                ],
+            },
+        ),
+        migrations.RunPython(criar_indice_gin, remover_indice_gin),
+    ]
@@ -0,0 +1,40 @@
+# Chave normalizada (somente dígitos) do CNPJ/CPF do cliente, com índice único.
+# No preenchimento, o cliente mais antigo de cada CNPJ/CPF recebe a chave e os
+# demais ficam sem ela (listados por relatorio_clientes_duplicados)
+
+from django.db import migrations, models
+
+
+def preencher_cnpj_normalizado(apps, schema_editor):
+    Cliente = apps.get_model("contracts", "Cliente")
+    vistos = set()
+    alterados = []
+    for cliente in Cliente.objects.order_by("pk").only("pk", "cnpj_cpf").iterator(chunk_size=2000):
+        digitos = "".join(c for c in (cliente.cnpj_cpf or "") if c.isdigit())
+        if not digitos or digitos in vistos:
+            continue
+        vistos.add(digitos)
+        cliente.cnpj_normalizado = digitos
+        alterados.append(cliente)
+    Cliente.objects.bulk_update(alterados, ["cnpj_normalizado"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contracts", "0086_trechodocumento_termotrecho"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="cliente",
+            name="cnpj_normalizado",
+            field=models.CharField(blank=True, editable=False, help_text="Preenchido no save a partir de cnpj_cpf; chave das buscas e da deduplicação", max_length=18, null=True, verbose_name="CNPJ/CPF (somente dígitos)"),
+        ),
+        migrations.RunPython(preencher_cnpj_normalizado, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="cliente",
+            name="cnpj_normalizado",
+            field=models.CharField(blank=True, editable=False, help_text="Preenchido no save a partir de cnpj_cpf; chave das buscas e da deduplicação", max_length=18, null=True, unique=True, verbose_name="CNPJ/CPF (somente dígitos)"),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Tabela do cache compartilhado (settings.CACHES com DatabaseCache), criada junto
+# com o migrate para que o deploy não dependa de "manage.py createcachetable".
+# Sem efeito quando o cache é Redis/memória ou a tabela já existe
+
+from django.core.management import call_command
+from django.db import migrations
+
+
+def criar_tabela_cache(apps, schema_editor):
+    call_command("createcachetable", database=schema_editor.connection.alias, verbosity=0)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contracts", "0087_cliente_cnpj_normalizado"),
+    ]
+
+    operations = [
+        migrations.RunPython(criar_tabela_cache, migrations.RunPython.noop),
+    ]
@@ -3,10 +3,11 @@ from django.core.exceptions import ValidationError
 from django.utils import timezone
 from datetime import timedelta, datetime, time, date
 from dateutil.relativedelta import relativedelta
-from django.db.models import Sum, F, FloatField, ExpressionWrapper, Value, DecimalField
-from django.db.models.functions import Coalesce
+from django.db.models import Sum, F, FloatField, ExpressionWrapper, Value, DecimalField, Count, Q, OuterRef, Subquery
+from django.db.models.functions import Coalesce, NullIf
 from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
+from django.contrib.postgres.search import SearchVectorField
 from decimal import Decimal
 from django.contrib.auth.models import User
 import os
@@ -15,6 +16,19 @@ import uuid
 from .constants import FORNECEDORES_MAP, TIPOS_ITEM_FORNECEDOR_CHOICES
 
 
+def normalizar_documento(valor):
+    """CNPJ/CPF apenas com dígitos; None quando não há dígitos (ex.: "A_DEFINIR")"""
+    digitos = "".join(c for c in str(valor or "") if c.isdigit())
+    return digitos or None
+
+
+class ClienteQuerySet(models.QuerySet):
+    def por_documento(self, valor):
+        """Clientes pelo CNPJ/CPF em qualquer formatação (chave normalizada indexada)"""
+        normalizado = normalizar_documento(valor)
+        return self.filter(cnpj_normalizado=normalizado) if normalizado else self.none()
+
+
 class Cliente(models.Model):
     TIPO_CLIENTE = [("publico", "Público"), ("privado", "Privado")]
     TIPO_PESSOA = [("fisica", "Física"), ("juridica", "Jurídica")]
@@ -24,6 +38,11 @@ class Cliente(models.Model):
     tipo_cliente = models.CharField(max_length=10, choices=TIPO_CLIENTE)
     tipo_pessoa = models.CharField(max_length=10, choices=TIPO_PESSOA)
     cnpj_cpf = models.CharField(max_length=18, unique=True)
+    cnpj_normalizado = models.CharField(
+        max_length=18, unique=True, null=True, blank=True, editable=False,
+        verbose_name="CNPJ/CPF (somente dígitos)",
+        help_text="Preenchido no save a partir de cnpj_cpf; chave das buscas e da deduplicação"
+    )
     natureza_juridica = models.CharField(max_length=100, blank=True, null=True)
     inscricao_estadual = models.CharField(max_length=50, blank=True, null=True)
     inscricao_municipal = models.CharField(max_length=50, blank=True, null=True)
@@ -62,9 +81,25 @@ class Cliente(models.Model):
         limit_choices_to={"cargo__icontains": "sucessos"}
     )
 
+    objects = ClienteQuerySet.as_manager()
+
     def __str__(self):
         return self.nome_fantasia or self.nome_razao_social
 
+    def save(self, *args, **kwargs):
+        normalizado = normalizar_documento(self.cnpj_cpf)
+        # Duplicado anterior à chave (ver relatorio_clientes_duplicados): continua sem ela
+        if (
+            normalizado and self.pk and self.cnpj_normalizado is None
+            and Cliente.objects.por_documento(normalizado).exclude(pk=self.pk).exists()
+        ):
+            normalizado = None
+        self.cnpj_normalizado = normalizado
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "cnpj_cpf" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "cnpj_normalizado"}
+        super().save(*args, **kwargs)
+
 
 class ContatoCliente(models.Model):
     """Contatos do cliente - permite múltiplos contatos por cliente"""
@@ -336,6 +371,13 @@ class Contrato(models.Model):
     valor_global = models.DecimalField(
         max_digits=14, decimal_places=2, editable=False, default=0
     )
+    assinatura_alertas = models.CharField(
+        max_length=40,
+        blank=True,
+        default="",
+        editable=False,
+        help_text="Resumo dos dados avaliados na última geração de alertas (AlertaContrato)"
+    )
 
     class Meta:
         verbose_name = "Contrato"
@@ -760,33 +802,18 @@ class ItemContrato(models.Model):
     valor_saldo_original_prop.fget.short_description = "Valor Saldo Qtd. (Prop.)"
     
     def vigencia_restante(self):
-        from .models import OrdemFornecimento # Movido para dentro para evitar importação circular se necessário
         if self.tipo in self.TIPOS_PRODUTO and self.vigencia_produto:
-            if not hasattr(self, 'ordemfornecimento'):
-                 return self.vigencia_produto # Ou None, dependendo da lógica desejada
-
-            ativacoes = self.ordemfornecimento.filter(
+            # A ativação que expira primeiro define a vigência restante (data_expiracao indexada)
+            expiracao = self.ordemfornecimento_set.filter(
                 status="faturada", data_ativacao__isnull=False
-            ).values_list("data_ativacao", flat=True)
+            ).aggregate(primeira=models.Min("data_expiracao"))["primeira"]
             
-            if not ativacoes:
+            if not expiracao:
                 return self.vigencia_produto
 
             hoje = date.today()
-            restantes = []
-
-            for data_ativacao_item in ativacoes:
-                if data_ativacao_item:
-                    meses_utilizados = (
-                        (hoje.year - data_ativacao_item.year) * 12 + hoje.month - data_ativacao_item.month
-                    )
-                    if hoje.day < data_ativacao_item.day and hoje.year == data_ativacao_item.year and hoje.month == data_ativacao_item.month:
-                         meses_utilizados -=1
-                    
-                    restante = self.vigencia_produto - meses_utilizados # Não arredondar aqui para manter precisão decimal
-                    restantes.append(max(restante, 0))
-
-            return min(restantes) if restantes else self.vigencia_produto
+            restante = (expiracao.year - hoje.year) * 12 + expiracao.month - hoje.month
+            return max(restante, 0)
         return None
     vigencia_restante.short_description = "Vigência Restante (meses)"
 
@@ -917,6 +944,13 @@ class OrdemFornecimento(models.Model):
     )
     data_ativacao = models.DateField(blank=True, null=True)
     data_faturamento = models.DateField(blank=True, null=True)
+    data_expiracao = models.DateField(
+        blank=True,
+        null=True,
+        editable=False,
+        verbose_name="Data de Expiração",
+        help_text="Ativação + vigência do produto (meses), calculada no save"
+    )
 
     observacoes = models.TextField(blank=True, null=True)
 
@@ -927,6 +961,9 @@ class OrdemFornecimento(models.Model):
         verbose_name = "Ordem de Fornecimento"
         verbose_name_plural = "Ordens de Fornecimento"
         ordering = ["-criado_em"]
+        indexes = [
+            models.Index(fields=["data_expiracao"], name="of_data_expiracao_idx"),
+        ]
 
     def __str__(self):
         return self.numero_of
@@ -1027,7 +1064,16 @@ class OrdemFornecimento(models.Model):
         if self.status == self.STATUS_FATURADA and not self.data_faturamento:
             self.data_faturamento = timezone.now().date()
 
+        self.data_expiracao = self.calcular_data_expiracao(self.data_ativacao, self.vigencia_produto)
+
         super().save(*args, **kwargs)
+
+    @staticmethod
+    def calcular_data_expiracao(data_ativacao, vigencia_produto):
+        """Data de expiração da licença: ativação + vigência do produto em meses"""
+        if not data_ativacao or not vigencia_produto:
+            return None
+        return data_ativacao + relativedelta(months=vigencia_produto)
     
     @property
     def tipo_documento_fiscal(self):
@@ -1591,19 +1637,8 @@ class OrdemServico(models.Model):
             # Não há sprint vinculada, não fazer nada
             pass
 
-        if self.status == "faturada":
-            if not is_update or (old_instance and old_instance.status != "faturada"):
-                # Cria feedback automaticamente para Customer Success
-                from .models import FeedbackSprintOS
-                if not FeedbackSprintOS.objects.filter(sprint=self).exists():
-                    FeedbackSprintOS.objects.create(
-                        sprint=self,
-                        cliente=self.projeto.contrato.cliente if self.projeto and self.projeto.contrato else None,
-                        contrato=self.projeto.contrato if self.projeto and self.projeto.contrato else None,
-                        projeto=self.projeto,
-                        status='pendente'
-                    )
-                item = self.item_contrato
+        # O ticket de Customer Success da OS faturada é criado pelo signal
+        # criar_ticket_contato_os_faturada (e em lote por FaturamentoService)
 
     def calcula_termino(self):
         """
@@ -2154,6 +2189,28 @@ class CentroCusto(models.Model):
 
 # ========== GESTÃO ÁGIL DE PROJETOS ==========
 
+class ProjetoQuerySet(models.QuerySet):
+    def com_resumo_sprints(self):
+        """
+        Anota contagem de sprints (total e ativas) e de tarefas no backlog do contrato,
+        evitando uma consulta por projeto nas listagens
+        """
+        backlog_contrato = (
+            Tarefa.objects.filter(sprint__isnull=True, backlog__contrato=OuterRef("contrato"))
+            .order_by()
+            .values("backlog__contrato")
+            .annotate(total=Count("id"))
+            .values("total")
+        )
+        return self.annotate(
+            num_sprints=Count("sprints", distinct=True),
+            num_sprints_ativas=Count(
+                "sprints", filter=Q(sprints__status__in=Sprint.STATUS_ATIVOS), distinct=True
+            ),
+            num_tarefas_backlog=Coalesce(Subquery(backlog_contrato), 0),
+        )
+
+
 class Projeto(models.Model):
     """Projetos vinculados a contratos - Um contrato pode ter vários projetos"""
     STATUS_CHOICES = [
@@ -2212,6 +2269,8 @@ class Projeto(models.Model):
     data_fim_prevista = models.DateField(verbose_name="Data de Fim Prevista", editable=False)
     criado_em = models.DateTimeField(auto_now_add=True)
     atualizado_em = models.DateTimeField(auto_now=True)
+
+    objects = ProjetoQuerySet.as_manager()
     
     class Meta:
         verbose_name = "Projeto"
@@ -2235,6 +2294,9 @@ class Projeto(models.Model):
     def total_tarefas_backlog(self):
         """Total de tarefas no backlog do projeto (tarefas sem sprint atribuída que pertencem ao projeto)"""
         from .models import Tarefa
+        # Valor anotado por Projeto.objects.com_resumo_sprints()
+        if hasattr(self, "num_tarefas_backlog"):
+            return self.num_tarefas_backlog
         # Tarefas sem sprint que foram criadas no contexto do projeto
         # Busca tarefas que estão em sprints do projeto mas sem sprint atribuída (não deveria acontecer)
         # Ou tarefas que estão no backlog do contrato mas podem ser atribuídas ao projeto
@@ -2267,38 +2329,30 @@ class Projeto(models.Model):
     @property
     def horas_executadas_projeto(self):
         """Total de horas executadas no projeto (horas lançadas em tarefas concluídas e bilhetáveis)"""
-        from .models import Tarefa, LancamentoHora
+        from .models import LancamentoHora
         from decimal import Decimal
-        
-        # Buscar todas as tarefas concluídas do projeto que são bilhetáveis
-        tarefas_concluidas = Tarefa.objects.filter(
-            sprint__projeto=self,
-            status_sprint='concluida',
-            bilhetar_na_os=True
-        )
-        
-        # Somar horas lançadas para essas tarefas
-        total_horas = Decimal('0.00')
-        for tarefa in tarefas_concluidas:
-            lancamentos = LancamentoHora.objects.filter(
-                tarefa=tarefa,
-                faturavel=True
-            )
-            for lancamento in lancamentos:
-                if lancamento.tempo_gasto:
-                    total_horas += Decimal(str(lancamento.tempo_gasto))
-        
-        return total_horas
+
+        # Uma única agregação sobre os lançamentos faturáveis das tarefas concluídas
+        return LancamentoHora.objects.filter(
+            tarefa__sprint__projeto=self,
+            tarefa__status_sprint='finalizada',
+            tarefa__bilhetar_na_os=True,
+            faturavel=True
+        ).aggregate(total=Sum('horas_trabalhadas'))['total'] or Decimal('0.00')
     
     @property
     def total_sprints(self):
         """Total de sprints do projeto"""
+        if hasattr(self, "num_sprints"):
+            return self.num_sprints
         return self.sprints.count()
     
     @property
     def sprints_ativas(self):
-        """Sprints ativas do projeto"""
-        return self.sprints.filter(status="ativa").count()
+        """Sprints ativas do projeto (abertas ou em execução)"""
+        if hasattr(self, "num_sprints_ativas"):
+            return self.num_sprints_ativas
+        return self.sprints.filter(status__in=Sprint.STATUS_ATIVOS).count()
 
 
 class Backlog(models.Model):
@@ -2398,6 +2452,60 @@ class Backlog(models.Model):
         return projeto
 
 
+class SprintQuerySet(models.QuerySet):
+    # Tarefas de gestão identificadas pelo papel (índice tarefa_sprint_papel_idx)
+    FILTRO_GESTAO = Q(tarefas__papel="gestao")
+
+    def com_progresso(self):
+        """
+        Anota em uma única consulta as contagens de tarefas por status, o percentual
+        de conclusão e as horas planejadas/consumidas (total, consultor e gestão)
+        """
+        decimal_zero = Value(Decimal("0.00"), output_field=DecimalField())
+        return self.annotate(
+            num_tarefas=Count("tarefas"),
+            num_tarefas_concluidas=Count("tarefas", filter=Q(tarefas__status_sprint="finalizada")),
+            num_tarefas_em_execucao=Count("tarefas", filter=Q(tarefas__status_sprint="em_execucao")),
+            num_tarefas_nao_iniciadas=Count("tarefas", filter=Q(tarefas__status_sprint="nao_iniciada")),
+            soma_horas_planejadas=Coalesce(Sum("tarefas__horas_planejadas"), decimal_zero),
+            soma_horas_consumidas=Coalesce(Sum("tarefas__horas_consumidas"), decimal_zero),
+            soma_horas_gestao=Coalesce(
+                Sum("tarefas__horas_planejadas", filter=self.FILTRO_GESTAO), decimal_zero
+            ),
+        ).annotate(
+            soma_horas_consultor=ExpressionWrapper(
+                F("soma_horas_planejadas") - F("soma_horas_gestao"), output_field=DecimalField()
+            ),
+            percentual_concluido=Coalesce(
+                ExpressionWrapper(
+                    F("num_tarefas_concluidas") * Value(100.0) / NullIf(F("num_tarefas"), 0),
+                    output_field=FloatField(),
+                ),
+                Value(0.0),
+                output_field=FloatField(),
+            ),
+        )
+
+    def recalcular_horas(self):
+        """
+        Recalcula, em um único UPDATE, os totais armazenados de horas planejadas
+        de consultor e de gestão a partir das tarefas (usado após gravações em lote)
+        """
+        decimal_zero = Value(Decimal("0.00"), output_field=DecimalField())
+        tarefas = Tarefa.objects.filter(sprint=OuterRef("pk")).order_by().values("sprint")
+
+        def soma(papel):
+            return Coalesce(
+                Subquery(
+                    tarefas.filter(papel=papel).annotate(total=Sum("horas_planejadas")).values("total")[:1],
+                    output_field=DecimalField(),
+                ),
+                decimal_zero,
+            )
+
+        return self.update(horas_consultor_planejadas=soma("consultor"), horas_gestao_planejadas=soma("gestao"))
+
+
 class Sprint(models.Model):
     """Sprints do projeto - Ciclos de desenvolvimento"""
     STATUS_CHOICES = [
@@ -2406,6 +2514,7 @@ class Sprint(models.Model):
         ("finalizada", "Finalizada"),
         ("faturada", "Faturada"),
     ]
+    STATUS_ATIVOS = ["aberta", "execucao"]
     
     projeto = models.ForeignKey(
         "Projeto",
@@ -2432,8 +2541,34 @@ class Sprint(models.Model):
         verbose_name="Ordem de Serviço",
         help_text="OS vinculada à sprint (criada automaticamente se não existir)"
     )
+    plano_fingerprint = models.CharField(
+        max_length=40,
+        blank=True,
+        default="",
+        editable=False,
+        verbose_name="Fingerprint do Plano",
+        help_text="Hash dos valores gravados na última sincronização com o Plano de Trabalho"
+    )
+    horas_consultor_planejadas = models.DecimalField(
+        max_digits=10,
+        decimal_places=2,
+        default=Decimal("0.00"),
+        editable=False,
+        verbose_name="Horas Planejadas (Consultor)",
+        help_text="Soma das horas planejadas das tarefas de consultor, mantida pelo Tarefa.save"
+    )
+    horas_gestao_planejadas = models.DecimalField(
+        max_digits=10,
+        decimal_places=2,
+        default=Decimal("0.00"),
+        editable=False,
+        verbose_name="Horas Planejadas (Gestão)",
+        help_text="Soma das horas planejadas das tarefas de gestão, mantida pelo Tarefa.save"
+    )
     criado_em = models.DateTimeField(auto_now_add=True)
     atualizado_em = models.DateTimeField(auto_now=True)
+
+    objects = SprintQuerySet.as_manager()
     
     class Meta:
         verbose_name = "Sprint"
@@ -2560,19 +2695,46 @@ class Sprint(models.Model):
             if os_updated and update_fields:
                 self.ordem_servico.save(update_fields=update_fields)
     
+    def atualizar_horas_gestao(self):
+        """
+        Aplica às tarefas de gestão da sprint 25% das horas de consultor armazenadas
+        (número fixo de consultas, independente da quantidade de tarefas)
+        
+        Returns:
+            Horas planejadas de cada tarefa de gestão
+        """
+        horas_consultor = Sprint.objects.filter(pk=self.pk).values_list(
+            "horas_consultor_planejadas", flat=True
+        ).first() or Decimal("0.00")
+        horas_gestao = (horas_consultor * Tarefa.PERCENTUAL_GESTAO).quantize(Decimal("0.01"))
+        quantidade = self.tarefas.filter(papel="gestao").update(
+            horas_planejadas=horas_gestao, atualizado_em=timezone.now()
+        )
+        Sprint.objects.filter(pk=self.pk).update(horas_gestao_planejadas=horas_gestao * quantidade)
+        self.horas_consultor_planejadas = horas_consultor
+        self.horas_gestao_planejadas = horas_gestao * quantidade
+        return horas_gestao
+    
     @property
     def total_tarefas(self):
         """Total de tarefas na sprint"""
+        # Valores anotados por Sprint.objects.com_progresso() evitam novas consultas
+        if hasattr(self, "num_tarefas"):
+            return self.num_tarefas
         return self.tarefas.count()
     
     @property
     def tarefas_concluidas(self):
         """Tarefas concluídas na sprint"""
+        if hasattr(self, "num_tarefas_concluidas"):
+            return self.num_tarefas_concluidas
         return self.tarefas.filter(status_sprint="finalizada").count()
     
     @property
     def percentual_conclusao(self):
         """Percentual de conclusão da sprint"""
+        if hasattr(self, "percentual_concluido"):
+            return self.percentual_concluido
         if self.total_tarefas > 0:
             return (self.tarefas_concluidas / self.total_tarefas) * 100
         return Decimal('0.00')
@@ -2602,6 +2764,13 @@ class Tarefa(models.Model):
         ("alta", "Alta"),
     ]
     
+    PAPEL_CHOICES = [
+        ("consultor", "Consultor"),
+        ("gestao", "Gestão de Projetos"),
+    ]
+    # Tarefas de gestão recebem este percentual das horas de consultor da sprint
+    PERCENTUAL_GESTAO = Decimal("0.25")
+    
     titulo = models.CharField(max_length=255, verbose_name="Nome da Tarefa")
     descricao = models.TextField(verbose_name="Descrição")
     projeto = models.ForeignKey(
@@ -2668,6 +2837,13 @@ class Tarefa(models.Model):
         default="pendente",
         verbose_name="Status"
     )
+    papel = models.CharField(
+        max_length=10,
+        choices=PAPEL_CHOICES,
+        default="consultor",
+        verbose_name="Papel",
+        help_text="Tarefas de gestão recebem 25% das horas de consultor da sprint"
+    )
     prioridade = models.CharField(
         max_length=20,
         choices=PRIORIDADE_CHOICES,
@@ -2698,6 +2874,14 @@ class Tarefa(models.Model):
         verbose_name="Ordem na Sprint",
         help_text="Ordem de exibição da tarefa dentro da sprint (0 = primeiro)"
     )
+    plano_fingerprint = models.CharField(
+        max_length=40,
+        blank=True,
+        default="",
+        editable=False,
+        verbose_name="Fingerprint do Plano",
+        help_text="Hash dos valores gravados na última sincronização com o Plano de Trabalho"
+    )
     criado_em = models.DateTimeField(auto_now_add=True)
     atualizado_em = models.DateTimeField(auto_now=True)
     
@@ -2705,11 +2889,57 @@ class Tarefa(models.Model):
         verbose_name = "Tarefa"
         verbose_name_plural = "Tarefas"
         ordering = ["-criado_em"]
+        indexes = [
+            models.Index(fields=["sprint", "papel"], name="tarefa_sprint_papel_idx"),
+        ]
     
     def __str__(self):
         return f"{self.titulo} - {self.responsavel.nome_completo if self.responsavel else 'Sem responsável'}"
     
-    def calcular_horas_dias_uteis(self, datetime_inicio, datetime_termino):
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Contribuição gravada nos totais da sprint (para aplicar apenas a diferença no save)
+        if {"sprint_id", "papel", "horas_planejadas"} <= set(field_names):
+            instance._contribuicao_gravada = instance.contribuicao_sprint()
+        return instance
+    
+    def refresh_from_db(self, *args, **kwargs):
+        super().refresh_from_db(*args, **kwargs)
+        # Valores recarregados: o próximo save consulta a contribuição gravada
+        self.__dict__.pop("_contribuicao_gravada", None)
+    
+    def contribuicao_sprint(self):
+        """(sprint_id, papel, horas planejadas) desta tarefa nos totais armazenados da sprint"""
+        horas = Decimal(str(self.horas_planejadas or 0)).quantize(Decimal("0.01"))
+        return (self.sprint_id, self.papel, horas)
+    
+    @staticmethod
+    def somar_horas_sprint(contribuicao, sinal=1):
+        """Soma (ou subtrai, com sinal=-1) a contribuição no total da sprint com um UPDATE"""
+        sprint_id, papel, horas = contribuicao
+        if not sprint_id or not horas:
+            return
+        campo = "horas_gestao_planejadas" if papel == "gestao" else "horas_consultor_planejadas"
+        Sprint.objects.filter(pk=sprint_id).update(**{campo: F(campo) + horas * sinal})
+    
+    def atualizar_totais_sprint(self, anterior):
+        """
+        Aplica nos totais armazenados das sprints a diferença entre a contribuição
+        anterior (None para tarefa nova) e a atual
+        """
+        atual = self.contribuicao_sprint()
+        if anterior == atual:
+            return
+        if anterior and anterior[:2] == atual[:2]:
+            Tarefa.somar_horas_sprint((atual[0], atual[1], atual[2] - anterior[2]))
+        else:
+            if anterior:
+                Tarefa.somar_horas_sprint(anterior, sinal=-1)
+            Tarefa.somar_horas_sprint(atual)
+    
+    @staticmethod
+    def calcular_horas_dias_uteis(datetime_inicio, datetime_termino):
         """
         Calcula horas baseado em dias úteis (segunda a sexta)
         Horário: 09:00 às 12:00 e 14:00 às 19:00
@@ -2806,14 +3036,8 @@ class Tarefa(models.Model):
         return total_horas
     
     def is_tarefa_gestao_projetos(self):
-        """Verifica se a tarefa é de gestão de projetos (responsável é o gerente do projeto)"""
-        if not self.sprint or not self.responsavel:
-            return False
-        
-        # Verificar se o responsável é o gerente do projeto
-        if self.sprint.projeto.gerente_projeto:
-            return self.responsavel == self.sprint.projeto.gerente_projeto
-        return False
+        """Verifica se a tarefa é de gestão de projetos (papel gestão em uma sprint)"""
+        return bool(self.sprint_id) and self.papel == "gestao"
     
     def clean(self):
         """Validações de datas e horas"""
@@ -2863,47 +3087,15 @@ class Tarefa(models.Model):
                     'data_termino_prevista': f'A data/hora de término deve ser menor ou igual à data de fim da sprint ({self.sprint.data_fim.strftime("%d/%m/%Y")}).'
                 })
         
-        # Validação de horas planejadas para tarefas do consultor
-        if self.sprint and self.sprint.ordem_servico and not self.is_tarefa_gestao_projetos():
-            os = self.sprint.ordem_servico
-            horas_consultor_os = os.horas_consultor or Decimal('0.00')
+        # Validação do orçamento de horas do consultor na OS da sprint (uma consulta agregada)
+        if self.sprint_id and not self.is_tarefa_gestao_projetos():
+            from .services.orcamento_horas_service import OrcamentoHorasService
             
-            # Calcular horas planejadas baseado nas datas/horas
-            if self.data_inicio_prevista and self.data_termino_prevista:
-                horas_calculadas = self.calcular_horas_dias_uteis(
-                    self.data_inicio_prevista,
-                    self.data_termino_prevista
-                )
-                
-                # Verificar se as horas calculadas não excedem o total da OS
-                if horas_calculadas > horas_consultor_os:
-                    raise ValidationError({
-                        'data_termino_prevista': f'As horas planejadas ({horas_calculadas}h) excedem o total de horas do consultor na OS ({horas_consultor_os}h).'
-                    })
-                
-                # Verificar soma de todas as tarefas do consultor (exceto esta)
-                # Usar self.__class__ para evitar referência circular
-                outras_tarefas_consultor = self.__class__.objects.filter(
-                    sprint=self.sprint,
-                    ordem_servico=os
-                ).exclude(pk=self.pk if self.pk else None)
-                
-                # Filtrar apenas tarefas que não são de gestão de projetos
-                outras_tarefas_consultor = [
-                    t for t in outras_tarefas_consultor 
-                    if not t.is_tarefa_gestao_projetos()
-                ]
-                
-                total_horas_outras = sum(
-                    t.horas_planejadas for t in outras_tarefas_consultor
-                )
-                
-                total_horas_todas = total_horas_outras + horas_calculadas
-                
-                if total_horas_todas > horas_consultor_os:
-                    raise ValidationError({
-                        'data_termino_prevista': f'A soma das horas planejadas de todas as tarefas do consultor ({total_horas_todas}h) excede o total de horas do consultor na OS ({horas_consultor_os}h).'
-                    })
+            violacoes = OrcamentoHorasService.validar([self])
+            if violacoes:
+                raise ValidationError({
+                    'data_termino_prevista': [violacao["mensagem"] for violacao in violacoes]
+                })
     
     def save(self, *args, **kwargs):
         """Alocação automática no backlog e cálculo de horas planejadas"""
@@ -2916,14 +3108,25 @@ class Tarefa(models.Model):
         else:
             self.status_sprint = None
         
+        # Contribuição anterior nos totais da sprint (None para tarefa nova)
+        if self._state.adding:
+            anterior = None
+        elif hasattr(self, "_contribuicao_gravada"):
+            anterior = self._contribuicao_gravada
+        else:
+            anterior = Tarefa.objects.filter(pk=self.pk).values_list("sprint_id", "papel", "horas_planejadas").first()
+        
         # Calcular horas planejadas
         if self.is_tarefa_gestao_projetos():
-            # Tarefa de gestão de projetos: 25% da soma de todas as horas das tarefas de consultor na sprint
+            # Tarefa de gestão de projetos: 25% das horas de consultor armazenadas na sprint
             if self.sprint:
-                # Calcular total de horas de todas as tarefas de consultor na sprint (excluindo a própria tarefa de gestão)
-                tarefas_consultor = self.sprint.tarefas.exclude(titulo__icontains="gestão").exclude(titulo__icontains="gerente").exclude(pk=self.pk if self.pk else None)
-                total_horas_consultor = sum(t.horas_planejadas for t in tarefas_consultor if t.horas_planejadas) or Decimal('0.00')
-                self.horas_planejadas = total_horas_consultor * Decimal('0.25')
+                total_horas_consultor = Sprint.objects.filter(pk=self.sprint_id).values_list(
+                    "horas_consultor_planejadas", flat=True
+                ).first() or Decimal('0.00')
+                # Tarefa que deixou de ser de consultor: suas horas ainda constam no total
+                if anterior and anterior[0] == self.sprint_id and anterior[1] == "consultor":
+                    total_horas_consultor -= anterior[2]
+                self.horas_planejadas = (total_horas_consultor * self.PERCENTUAL_GESTAO).quantize(Decimal('0.01'))
                 # Data de início e término igual à da sprint
                 if self.sprint:
                     from datetime import datetime, time
@@ -2976,6 +3179,10 @@ class Tarefa(models.Model):
                 # Se horas_planejadas já tem valor, manter (editável pelo usuário)
         
         super().save(*args, **kwargs)
+        
+        # Totais de horas da sprint mantidos de forma incremental (sem somar as tarefas)
+        self.atualizar_totais_sprint(anterior)
+        self._contribuicao_gravada = self.contribuicao_sprint()
     
     @property
     def horas_restantes(self):
@@ -3068,6 +3275,265 @@ class LancamentoHora(models.Model):
         return f"{self.colaborador.nome_completo} - {self.data} - {self.horas_trabalhadas}h"
 
 
+class SnapshotHorasProjeto(models.Model):
+    """
+    Fotografia diária das horas de um projeto (sprint=None) ou de uma sprint.
+    Gerada pelo comando gerar_snapshots_projetos e usada nos gráficos de
+    burn-down/burn-up e nas métricas de velocidade.
+    """
+    projeto = models.ForeignKey(
+        "Projeto",
+        on_delete=models.CASCADE,
+        related_name="snapshots_horas",
+        verbose_name="Projeto"
+    )
+    sprint = models.ForeignKey(
+        "Sprint",
+        on_delete=models.CASCADE,
+        related_name="snapshots_horas",
+        blank=True,
+        null=True,
+        verbose_name="Sprint",
+        help_text="Vazio para o consolidado do projeto"
+    )
+    data = models.DateField(verbose_name="Data")
+    horas_planejadas = models.DecimalField(
+        max_digits=10, decimal_places=2, default=Decimal("0.00"), verbose_name="Horas Planejadas"
+    )
+    horas_consumidas = models.DecimalField(
+        max_digits=10, decimal_places=2, default=Decimal("0.00"), verbose_name="Horas Consumidas"
+    )
+    horas_restantes = models.DecimalField(
+        max_digits=10, decimal_places=2, default=Decimal("0.00"), verbose_name="Horas Restantes"
+    )
+    horas_faturaveis = models.DecimalField(
+        max_digits=10,
+        decimal_places=2,
+        default=Decimal("0.00"),
+        verbose_name="Horas Faturáveis",
+        help_text="Horas faturáveis lançadas em tarefas concluídas e bilhetáveis na OS"
+    )
+    total_tarefas = models.PositiveIntegerField(default=0, verbose_name="Total de Tarefas")
+    tarefas_concluidas = models.PositiveIntegerField(default=0, verbose_name="Tarefas Concluídas")
+    criado_em = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Snapshot de Horas do Projeto"
+        verbose_name_plural = "Snapshots de Horas dos Projetos"
+        ordering = ["projeto", "sprint", "data"]
+        unique_together = ("projeto", "sprint", "data")
+        indexes = [
+            models.Index(fields=["projeto", "data"], name="snapshot_projeto_data_idx"),
+            models.Index(fields=["sprint", "data"], name="snapshot_sprint_data_idx"),
+        ]
+
+    def __str__(self):
+        alvo = self.sprint.nome if self.sprint_id else self.projeto.nome
+        return f"{alvo} - {self.data}"
+
+
+class PrevisaoConsumoItem(models.Model):
+    """
+    Previsão de consumo e de esgotamento do saldo de um item de contrato
+    Regravada pelo comando atualizar_previsoes_consumo (agendar diariamente)
+    """
+    SITUACAO_CHOICES = [
+        ("esgota_antes", "Esgota antes do fim do contrato"),
+        ("subutilizado", "Subutilização prevista"),
+        ("adequado", "Consumo adequado"),
+        ("sem_historico", "Sem histórico de consumo"),
+        ("esgotado", "Saldo esgotado"),
+    ]
+
+    item = models.OneToOneField(
+        "ItemContrato",
+        on_delete=models.CASCADE,
+        related_name="previsao_consumo",
+        verbose_name="Item de Contrato"
+    )
+    quantidade_consumida = models.DecimalField(
+        max_digits=12, decimal_places=2, default=Decimal("0.00"), verbose_name="Quantidade Consumida"
+    )
+    saldo_quantidade = models.DecimalField(
+        max_digits=12, decimal_places=2, default=Decimal("0.00"), verbose_name="Saldo de Quantidade"
+    )
+    consumo_diario = models.DecimalField(
+        max_digits=12, decimal_places=4, default=Decimal("0.0000"), verbose_name="Consumo Diário",
+        help_text="Inclinação da reta de mínimos quadrados do consumo acumulado"
+    )
+    data_esgotamento_prevista = models.DateField(blank=True, null=True, verbose_name="Esgotamento Previsto")
+    data_fim_contrato = models.DateField(blank=True, null=True, verbose_name="Fim do Contrato")
+    saldo_previsto_fim = models.DecimalField(
+        max_digits=12, decimal_places=2, default=Decimal("0.00"), verbose_name="Saldo Previsto no Fim",
+        help_text="Quantidade que sobrará no fim do contrato mantido o ritmo atual"
+    )
+    percentual_ocioso = models.DecimalField(
+        max_digits=6, decimal_places=2, default=Decimal("0.00"), verbose_name="% Ocioso Previsto"
+    )
+    situacao = models.CharField(max_length=20, choices=SITUACAO_CHOICES, verbose_name="Situação")
+    calculado_em = models.DateField(verbose_name="Calculado em")
+
+    class Meta:
+        verbose_name = "Previsão de Consumo do Item"
+        verbose_name_plural = "Previsões de Consumo dos Itens"
+        ordering = ["data_esgotamento_prevista"]
+        indexes = [
+            models.Index(fields=["situacao", "data_esgotamento_prevista"], name="previsao_situacao_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.item} - {self.get_situacao_display()}"
+
+
+class AlertaContrato(models.Model):
+    """
+    Alerta de gestão de um contrato (renovação, limite de vigência, limite de aditivos)
+    Gerado incrementalmente pelo comando gerar_alertas_contratos (agendar diariamente);
+    um registro por contrato e tipo, desativado quando a condição deixa de existir
+    """
+    TIPO_CHOICES = [
+        ("renovacao_90", "Vencimento em até 90 dias"),
+        ("renovacao_60", "Vencimento em até 60 dias"),
+        ("renovacao_30", "Vencimento em até 30 dias"),
+        ("limite_vigencia", "Limite legal de vigência atingido"),
+        ("limite_aditivo", "Limite de 25% de aditivos próximo do esgotamento"),
+    ]
+    TIPOS_RENOVACAO = ("renovacao_90", "renovacao_60", "renovacao_30")
+
+    contrato = models.ForeignKey(
+        "Contrato",
+        on_delete=models.CASCADE,
+        related_name="alertas",
+        verbose_name="Contrato"
+    )
+    tipo = models.CharField(max_length=20, choices=TIPO_CHOICES, verbose_name="Tipo")
+    mensagem = models.CharField(max_length=255, verbose_name="Mensagem")
+    data_referencia = models.DateField(
+        blank=True, null=True, verbose_name="Data de Referência",
+        help_text="Data de fim atual do contrato quando o alerta foi gerado"
+    )
+    ativo = models.BooleanField(default=True, verbose_name="Ativo")
+    reconhecido_em = models.DateTimeField(blank=True, null=True, verbose_name="Reconhecido em")
+    reconhecido_por = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        blank=True,
+        null=True,
+        related_name="alertas_contrato_reconhecidos",
+        verbose_name="Reconhecido por"
+    )
+    criado_em = models.DateTimeField(auto_now_add=True)
+    resolvido_em = models.DateTimeField(blank=True, null=True, verbose_name="Resolvido em")
+
+    class Meta:
+        verbose_name = "Alerta de Contrato"
+        verbose_name_plural = "Alertas de Contratos"
+        ordering = ["data_referencia", "contrato_id"]
+        constraints = [
+            models.UniqueConstraint(fields=["contrato", "tipo"], name="alerta_contrato_tipo_unico"),
+        ]
+        indexes = [
+            models.Index(fields=["ativo", "tipo", "data_referencia"], name="alerta_ativo_tipo_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.contrato.numero_contrato} - {self.get_tipo_display()}"
+
+
+class Evento(models.Model):
+    """
+    Fluxo de atividades (append-only) alimentado pelos signals de contracts.signals
+    Os eventos de uma requisição são gravados de uma vez pelo EventoMiddleware
+    """
+    ENTIDADE_CHOICES = [
+        ("contrato", "Contrato"),
+        ("termo_aditivo", "Termo Aditivo"),
+        ("ordem_servico", "Ordem de Serviço"),
+        ("ordem_fornecimento", "Ordem de Fornecimento"),
+        ("sprint", "Sprint"),
+        ("analise_contrato", "Análise de Contrato"),
+    ]
+
+    entidade = models.CharField(max_length=20, choices=ENTIDADE_CHOICES, verbose_name="Entidade")
+    objeto_id = models.PositiveIntegerField(verbose_name="ID do Objeto")
+    acao = models.CharField(max_length=20, verbose_name="Ação", help_text="criado ou o novo status")
+    descricao = models.CharField(max_length=255, verbose_name="Descrição")
+    contrato = models.ForeignKey(
+        "Contrato",
+        on_delete=models.SET_NULL,
+        blank=True,
+        null=True,
+        related_name="eventos",
+        verbose_name="Contrato"
+    )
+    usuario = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        blank=True,
+        null=True,
+        related_name="eventos",
+        verbose_name="Usuário"
+    )
+    criado_em = models.DateTimeField(default=timezone.now, editable=False, verbose_name="Criado em")
+
+    class Meta:
+        verbose_name = "Evento"
+        verbose_name_plural = "Eventos"
+        ordering = ["-criado_em", "-id"]
+        indexes = [
+            models.Index(fields=["entidade", "criado_em"], name="evento_entidade_idx"),
+            models.Index(fields=["usuario", "criado_em"], name="evento_usuario_idx"),
+            models.Index(fields=["contrato", "criado_em", "id"], name="evento_contrato_idx"),
+            models.Index(fields=["criado_em", "id"], name="evento_criado_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.get_entidade_display()} #{self.objeto_id}: {self.descricao}"
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise ValidationError("Eventos não podem ser alterados.")
+        super().save(*args, **kwargs)
+
+
+class TransicaoStatus(models.Model):
+    """
+    Trilha de auditoria das transições automáticas de status
+    Gravada em lote pelo comando transicionar_status (contratos, sprints e OS)
+    """
+    ENTIDADE_CHOICES = [
+        ("contrato", "Contrato"),
+        ("sprint", "Sprint"),
+        ("ordem_servico", "Ordem de Serviço"),
+    ]
+
+    entidade = models.CharField(max_length=20, choices=ENTIDADE_CHOICES, verbose_name="Entidade")
+    objeto_id = models.PositiveIntegerField(verbose_name="ID do Objeto")
+    status_anterior = models.CharField(max_length=20, blank=True, verbose_name="Status Anterior")
+    status_novo = models.CharField(max_length=20, verbose_name="Status Novo")
+    origem = models.CharField(
+        max_length=50, default="transicionar_status", verbose_name="Origem",
+        help_text="Rotina que executou a transição"
+    )
+    data_referencia = models.DateField(verbose_name="Data de Referência")
+    criado_em = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Transição de Status"
+        verbose_name_plural = "Transições de Status"
+        ordering = ["-criado_em"]
+        indexes = [
+            models.Index(fields=["entidade", "objeto_id"], name="transicao_entidade_obj_idx"),
+            models.Index(fields=["data_referencia"], name="transicao_data_ref_idx"),
+        ]
+
+    def __str__(self):
+        return (
+            f"{self.get_entidade_display()} #{self.objeto_id}: "
+            f"{self.status_anterior or '-'} → {self.status_novo}"
+        )
+
+
 class AnaliseContrato(models.Model):
     """
     Modelo para agrupar múltiplos documentos em uma única análise
@@ -3175,6 +3641,34 @@ def documento_contrato_upload_to(instance, filename):
     return f"documentos_contratos/{timezone.now().year}/{timezone.now().month:02d}/{nome_final}"
 
 
+class ArquivoConteudo(models.Model):
+    """
+    Conteúdo de arquivo endereçado pelo SHA-256 (armazenado uma única vez)
+    Compartilhado pelos DocumentoContrato com o mesmo conteúdo; o texto extraído
+    é reaproveitado e blobs sem referências são removidos por coletar_blobs_orfaos
+    """
+    sha256 = models.CharField(max_length=64, unique=True, verbose_name="SHA-256")
+    arquivo = models.FileField(upload_to="documentos_contratos/blobs/", max_length=500, verbose_name="Arquivo")
+    tamanho = models.BigIntegerField(verbose_name="Tamanho (bytes)")
+    texto_extraido = models.TextField(blank=True, null=True, verbose_name="Texto Extraído")
+    referencias = models.PositiveIntegerField(
+        default=0, verbose_name="Referências",
+        help_text="Quantidade de DocumentoContrato que apontam para o conteúdo"
+    )
+    criado_em = models.DateTimeField(auto_now_add=True)
+    atualizado_em = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Conteúdo de Arquivo"
+        verbose_name_plural = "Conteúdos de Arquivos"
+        indexes = [
+            models.Index(fields=["referencias", "atualizado_em"], name="arquivo_conteudo_refs_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.sha256[:12]} ({self.referencias} ref.)"
+
+
 class DocumentoContrato(models.Model):
     """
     Modelo para armazenar documentos individuais de contrato para análise por IA.
@@ -3219,6 +3713,15 @@ class DocumentoContrato(models.Model):
         max_length=500,
         verbose_name="Arquivo"
     )
+    conteudo = models.ForeignKey(
+        ArquivoConteudo,
+        on_delete=models.PROTECT,
+        blank=True,
+        null=True,
+        related_name="documentos",
+        verbose_name="Conteúdo",
+        help_text="Conteúdo deduplicado (SHA-256); vazio para documentos anteriores ao armazenamento por conteúdo"
+    )
     texto_extraido = models.TextField(
         blank=True, 
         null=True, 
@@ -3254,6 +3757,45 @@ class DocumentoContrato(models.Model):
         return None
 
 
+class TrechoDocumento(models.Model):
+    """
+    Trecho (cláusula/parágrafo) do texto extraído de um DocumentoContrato
+    Unidade da busca textual: no PostgreSQL pelo vetor (FTS em português, índice
+    GIN criado na migração); nos demais bancos pelo índice invertido TermoTrecho
+    """
+    documento = models.ForeignKey(
+        DocumentoContrato, on_delete=models.CASCADE, related_name="trechos", verbose_name="Documento"
+    )
+    ordem = models.PositiveIntegerField(verbose_name="Ordem")
+    titulo = models.CharField(max_length=255, blank=True, verbose_name="Cláusula")
+    texto = models.TextField(verbose_name="Texto")
+    quantidade_termos = models.PositiveIntegerField(default=0, verbose_name="Quantidade de Termos")
+    vetor = SearchVectorField(null=True, editable=False)
+
+    class Meta:
+        verbose_name = "Trecho de Documento"
+        verbose_name_plural = "Trechos de Documentos"
+        ordering = ["documento", "ordem"]
+        constraints = [
+            models.UniqueConstraint(fields=["documento", "ordem"], name="trecho_documento_ordem_unico"),
+        ]
+
+    def __str__(self):
+        return f"{self.documento.nome} #{self.ordem}"
+
+
+class TermoTrecho(models.Model):
+    """Entrada do índice invertido (radical -> trecho) usado fora do PostgreSQL"""
+    trecho = models.ForeignKey(TrechoDocumento, on_delete=models.CASCADE, related_name="termos")
+    termo = models.CharField(max_length=60)
+    frequencia = models.PositiveIntegerField(default=1)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["termo", "trecho"], name="termo_trecho_idx"),
+        ]
+
+
 class PlanoTrabalho(models.Model):
     """
     Plano de trabalho completo gerado pela IA para um projeto
@@ -3509,6 +4051,182 @@ class QuadroPenalizacao(models.Model):
         return f"{self.get_tipo_display()} - {self.descricao}"
 
 
+class IncidenteSLA(models.Model):
+    """
+    Incidente/medição de um SLA importante (importado de planilha ou ferramenta de chamados)
+    Tempos em horas úteis e violações calculados pelo comando calcular_conformidade_sla
+    """
+    sla = models.ForeignKey(
+        SLAImportante,
+        on_delete=models.CASCADE,
+        related_name="incidentes",
+        verbose_name="SLA Importante"
+    )
+    contrato = models.ForeignKey(
+        "Contrato",
+        on_delete=models.CASCADE,
+        related_name="incidentes_sla",
+        verbose_name="Contrato"
+    )
+    identificador = models.CharField(
+        max_length=100, verbose_name="Identificador",
+        help_text="Número do chamado na ferramenta de origem"
+    )
+    descricao = models.CharField(max_length=255, blank=True, verbose_name="Descrição")
+    aberto_em = models.DateTimeField(verbose_name="Aberto em")
+    respondido_em = models.DateTimeField(blank=True, null=True, verbose_name="Respondido em")
+    resolvido_em = models.DateTimeField(blank=True, null=True, verbose_name="Resolvido em")
+
+    # Calculados (ConformidadeSLAService)
+    horas_resposta = models.DecimalField(
+        max_digits=10, decimal_places=2, blank=True, null=True, verbose_name="Horas Úteis até a Resposta"
+    )
+    horas_solucao = models.DecimalField(
+        max_digits=10, decimal_places=2, blank=True, null=True, verbose_name="Horas Úteis até a Solução"
+    )
+    violou_resposta = models.BooleanField(default=False, verbose_name="Violou Tempo de Resposta")
+    violou_solucao = models.BooleanField(default=False, verbose_name="Violou Tempo de Solução")
+    calculado_em = models.DateTimeField(
+        blank=True, null=True, verbose_name="Calculado em",
+        help_text="Vazio: aguardando o cálculo de conformidade"
+    )
+    criado_em = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Incidente de SLA"
+        verbose_name_plural = "Incidentes de SLA"
+        ordering = ["-aberto_em"]
+        constraints = [
+            models.UniqueConstraint(fields=["sla", "identificador"], name="incidente_sla_identificador_unico"),
+        ]
+        indexes = [
+            models.Index(fields=["contrato", "aberto_em"], name="incidente_contrato_aberto_idx"),
+            models.Index(fields=["sla", "aberto_em"], name="incidente_sla_aberto_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.identificador} - {self.sla.nome}"
+
+    @property
+    def avaliado(self):
+        """Resolvido ou já violado: entra no percentual de conformidade"""
+        return self.resolvido_em is not None or self.violou_resposta or self.violou_solucao
+
+
+class ConformidadeSLA(models.Model):
+    """
+    Conformidade mensal de um SLA importante (materializada a partir de IncidenteSLA)
+    Regravada pelo comando calcular_conformidade_sla para os meses com incidentes alterados
+    """
+    sla = models.ForeignKey(
+        SLAImportante,
+        on_delete=models.CASCADE,
+        related_name="conformidades",
+        verbose_name="SLA Importante"
+    )
+    contrato = models.ForeignKey(
+        "Contrato",
+        on_delete=models.CASCADE,
+        related_name="conformidades_sla",
+        verbose_name="Contrato"
+    )
+    mes = models.DateField(verbose_name="Mês", help_text="Primeiro dia do mês de abertura dos incidentes")
+    total_incidentes = models.PositiveIntegerField(default=0, verbose_name="Incidentes")
+    incidentes_avaliados = models.PositiveIntegerField(
+        default=0, verbose_name="Incidentes Avaliados", help_text="Resolvidos ou já violados"
+    )
+    incidentes_conformes = models.PositiveIntegerField(default=0, verbose_name="Incidentes Conformes")
+    violacoes_resposta = models.PositiveIntegerField(default=0, verbose_name="Violações de Resposta")
+    violacoes_solucao = models.PositiveIntegerField(default=0, verbose_name="Violações de Solução")
+    percentual_conformidade = models.DecimalField(
+        max_digits=5, decimal_places=2, blank=True, null=True, verbose_name="Conformidade (%)"
+    )
+    horas_resposta_media = models.DecimalField(
+        max_digits=10, decimal_places=2, blank=True, null=True, verbose_name="Resposta Média (h úteis)"
+    )
+    horas_solucao_media = models.DecimalField(
+        max_digits=10, decimal_places=2, blank=True, null=True, verbose_name="Solução Média (h úteis)"
+    )
+    calculado_em = models.DateTimeField(verbose_name="Calculado em")
+
+    class Meta:
+        verbose_name = "Conformidade de SLA"
+        verbose_name_plural = "Conformidades de SLA"
+        ordering = ["-mes", "sla_id"]
+        constraints = [
+            models.UniqueConstraint(fields=["sla", "mes"], name="conformidade_sla_mes_unica"),
+        ]
+        indexes = [
+            models.Index(fields=["contrato", "mes"], name="conformidade_contrato_mes_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.sla.nome} - {self.mes:%m/%Y}"
+
+
+class GlosaPrevista(models.Model):
+    """
+    Glosa prevista de uma OS/OF por violação de SLA (dedução projetada na fila de faturamento)
+    Uma linha por competência, documento e linha do QuadroPenalizacao, regravada pelo
+    comando calcular_glosas; guarda a memória de cálculo para auditoria
+    """
+    competencia = models.DateField(verbose_name="Competência", help_text="Primeiro dia do mês das violações")
+    contrato = models.ForeignKey(
+        "Contrato",
+        on_delete=models.CASCADE,
+        related_name="glosas_previstas",
+        verbose_name="Contrato"
+    )
+    penalizacao = models.ForeignKey(
+        QuadroPenalizacao,
+        on_delete=models.CASCADE,
+        related_name="glosas_previstas",
+        verbose_name="Penalização/Glosa"
+    )
+    ordem_servico = models.ForeignKey(
+        "OrdemServico",
+        on_delete=models.CASCADE,
+        blank=True,
+        null=True,
+        related_name="glosas_previstas",
+        verbose_name="Ordem de Serviço"
+    )
+    ordem_fornecimento = models.ForeignKey(
+        "OrdemFornecimento",
+        on_delete=models.CASCADE,
+        blank=True,
+        null=True,
+        related_name="glosas_previstas",
+        verbose_name="Ordem de Fornecimento"
+    )
+    violacoes = models.PositiveIntegerField(verbose_name="Violações no Mês")
+    valor_base = models.DecimalField(max_digits=12, decimal_places=2, verbose_name="Valor do Documento (R$)")
+    percentual = models.DecimalField(
+        max_digits=5, decimal_places=2, blank=True, null=True, verbose_name="Percentual (%)"
+    )
+    valor_fixo_rateado = models.DecimalField(
+        max_digits=12, decimal_places=2, default=0, verbose_name="Valor Fixo Rateado (R$)",
+        help_text="Parcela do valor fixo × violações proporcional ao valor do documento no contrato"
+    )
+    valor = models.DecimalField(
+        max_digits=12, decimal_places=2, verbose_name="Glosa (R$)",
+        help_text="Limitada ao valor do documento"
+    )
+    calculado_em = models.DateTimeField(verbose_name="Calculado em")
+
+    class Meta:
+        verbose_name = "Glosa Prevista"
+        verbose_name_plural = "Glosas Previstas"
+        ordering = ["-competencia", "contrato_id", "id"]
+        indexes = [
+            models.Index(fields=["competencia", "contrato"], name="glosa_competencia_contrato_idx"),
+        ]
+
+    def __str__(self):
+        documento = self.ordem_servico or self.ordem_fornecimento
+        return f"{documento} - {self.penalizacao.descricao} ({self.competencia:%m/%Y})"
+
+
 class MatrizRACI(models.Model):
     """
     Matriz RACI para o projeto/contrato
@@ -1,4 +1,25 @@
 from .contrato_service import ContratoService
+from .relatorio_rentabilidade_service import RelatorioRentabilidadeService
+from .burndown_service import BurndownService
+from .faturamento_service import FaturamentoService
+from .transicao_status_service import TransicaoStatusService
+from .materializacao_projeto_service import MaterializacaoProjetoService
+from .sincronizacao_plano_service import SincronizacaoPlanoService
+from .orcamento_horas_service import OrcamentoHorasService
+from .capacidade_service import CapacidadeService
+from .auditoria_timesheet_service import AuditoriaTimesheetService
+from .previsao_consumo_service import PrevisaoConsumoService
+from .expiracao_licenca_service import ExpiracaoLicencaService
+from .alerta_contrato_service import AlertaContratoService
+from .evento_service import EventoService
+from .conformidade_sla_service import ConformidadeSLAService
+from .glosa_service import GlosaService
+from .entrega_arquivo_service import EntregaArquivoService
+from .arquivo_conteudo_service import ArquivoConteudoService
+from .busca_documento_service import BuscaDocumentoService
+from .similaridade_service import SimilaridadeService
+from .cliente_service import ClienteService
+from .cache_versao_service import CacheVersaoService
 from .contract_ai_service import (
     DocumentExtractor,
     ContractAIAnalyzer,
@@ -7,6 +28,27 @@ from .contract_ai_service import (
 
 __all__ = [
     'ContratoService',
+    'RelatorioRentabilidadeService',
+    'BurndownService',
+    'FaturamentoService',
+    'TransicaoStatusService',
+    'MaterializacaoProjetoService',
+    'SincronizacaoPlanoService',
+    'OrcamentoHorasService',
+    'CapacidadeService',
+    'AuditoriaTimesheetService',
+    'PrevisaoConsumoService',
+    'ExpiracaoLicencaService',
+    'AlertaContratoService',
+    'EventoService',
+    'ConformidadeSLAService',
+    'GlosaService',
+    'EntregaArquivoService',
+    'ArquivoConteudoService',
+    'BuscaDocumentoService',
+    'SimilaridadeService',
+    'ClienteService',
+    'CacheVersaoService',
     'DocumentExtractor',
     'ContractAIAnalyzer', 
     'ContractAIService',
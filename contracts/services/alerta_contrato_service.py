@@ -0,0 +1,239 @@
+"""
+Service Layer para os alertas de contratos
+Gera incrementalmente os registros de AlertaContrato (renovação 90/60/30 dias,
+limite legal de vigência e limite de 25% de aditivos de valor)
+"""
+import hashlib
+from typing import Dict, Iterable, List, Optional
+from datetime import date
+from decimal import Decimal
+
+from dateutil.relativedelta import relativedelta
+from django.db import transaction
+from django.db.models import Q, QuerySet, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from ..models import AlertaContrato, Contrato, RegimeLegal, TipoTermoAditivo
+from .contrato_service import ContratoService
+
+
+class AlertaContratoService:
+    """
+    Pipeline incremental de alertas de contratos
+
+    Os dados que determinam os alertas (fim atual, vigência total, valor
+    inicial e aditivos, regime e faixa de vencimento na data de referência)
+    são lidos de todos os contratos em uma consulta agregada. Apenas os
+    contratos cujo resumo difere de Contrato.assinatura_alertas são
+    reavaliados e têm seus alertas gravados; as listagens e o dashboard
+    leem AlertaContrato pelo índice (ativo, tipo).
+    """
+
+    # Faixas de vencimento (dias), da maior para a menor
+    FAIXAS_RENOVACAO = (90, 60, 30)
+    # Percentual do limite de 25% já consumido por aditivos que dispara o alerta
+    PERCENTUAL_ALERTA_ADITIVO = Decimal("80")
+
+    CAMPOS = (
+        "id", "numero_contrato", "data_assinatura", "vigencia", "data_fim", "situacao",
+        "regime_legal", "valor_inicial", "assinatura_alertas", "meses_prorrogacao", "valor_aditivos",
+    )
+
+    @staticmethod
+    def estados(contrato_ids: Optional[Iterable[int]] = None) -> List[Dict]:
+        """Dados de alerta de cada contrato (uma consulta com as somas dos aditivos)"""
+        contratos = Contrato.objects.all()
+        if contrato_ids is not None:
+            contratos = contratos.filter(pk__in=list(contrato_ids))
+        return list(
+            contratos.annotate(
+                meses_prorrogacao=Coalesce(
+                    Sum("termos_aditivos__meses_acrescimo",
+                        filter=Q(termos_aditivos__tipo=TipoTermoAditivo.PRORROGACAO)),
+                    Value(0),
+                ),
+                valor_aditivos=Coalesce(
+                    Sum("termos_aditivos__valor_acrescimo",
+                        filter=Q(termos_aditivos__tipo__in=[TipoTermoAditivo.VALOR, TipoTermoAditivo.REEQUILIBRIO])),
+                    Value(Decimal("0.00")),
+                ),
+            ).values(*AlertaContratoService.CAMPOS)
+        )
+
+    @staticmethod
+    def data_fim(estado: Dict) -> Optional[date]:
+        """Fim atual: data_fim gravada ou assinatura + vigência + prorrogações"""
+        if estado["data_fim"]:
+            return estado["data_fim"]
+        if not estado["data_assinatura"]:
+            return None
+        meses = (estado["vigencia"] or 0) + estado["meses_prorrogacao"]
+        return estado["data_assinatura"] + relativedelta(months=meses)
+
+    @staticmethod
+    def faixa_renovacao(data_fim: Optional[date], hoje: date) -> Optional[int]:
+        """Menor faixa (90/60/30) que contém o vencimento, como em verificar_renovacao_pendente"""
+        if not data_fim:
+            return None
+        dias_restantes = (data_fim - hoje).days
+        faixa = None
+        for limite in AlertaContratoService.FAIXAS_RENOVACAO:
+            if 0 < dias_restantes <= limite:
+                faixa = limite
+        return faixa
+
+    @staticmethod
+    def assinatura(estado: Dict, hoje: date) -> str:
+        """Resumo dos dados que determinam os alertas; muda quando um alerta pode mudar"""
+        data_fim = AlertaContratoService.data_fim(estado)
+        partes = (
+            data_fim, estado["vigencia"], estado["meses_prorrogacao"], estado["regime_legal"],
+            estado["situacao"], estado["valor_inicial"], estado["valor_aditivos"],
+            AlertaContratoService.faixa_renovacao(data_fim, hoje),
+        )
+        return hashlib.sha1("|".join(str(parte) for parte in partes).encode()).hexdigest()
+
+    @staticmethod
+    def avaliar(estado: Dict, hoje: date) -> Dict[str, Dict]:
+        """
+        Alertas devidos para o contrato
+
+        Returns:
+            Dict {tipo: {"mensagem", "data_referencia"}}
+        """
+        alertas = {}
+        data_fim = AlertaContratoService.data_fim(estado)
+
+        faixa = AlertaContratoService.faixa_renovacao(data_fim, hoje)
+        if faixa and estado["situacao"] == "Ativo":
+            alertas[f"renovacao_{faixa}"] = {
+                "mensagem": f"Vigência atual termina em {data_fim:%d/%m/%Y}; avaliar prorrogação ou nova contratação.",
+                "data_referencia": data_fim,
+            }
+
+        # Mesmo critério de validar_limite_vigencia: nenhuma prorrogação adicional é possível
+        limite_meses = ContratoService.get_limite_vigencia(estado["regime_legal"])
+        vigencia_total = (estado["vigencia"] or 0) + estado["meses_prorrogacao"]
+        if vigencia_total >= limite_meses:
+            regime_nome = dict(RegimeLegal.choices).get(estado["regime_legal"], "Contrato Privado")
+            alertas["limite_vigencia"] = {
+                "mensagem": f"Vigência total ({vigencia_total} meses) atingiu o limite legal "
+                            f"de {limite_meses} meses conforme {regime_nome}.",
+                "data_referencia": data_fim,
+            }
+
+        # Limite de 25% do valor inicial em aditivos (Art. 125 da Lei 14.133/2021)
+        if estado["regime_legal"] == RegimeLegal.LEI_14133 and estado["valor_inicial"]:
+            limite_valor = estado["valor_inicial"] * Decimal(ContratoService.LIMITE_ADITIVO_VALOR_PERCENTUAL) / 100
+            consumido = estado["valor_aditivos"] * 100 / limite_valor
+            if consumido >= AlertaContratoService.PERCENTUAL_ALERTA_ADITIVO:
+                alertas["limite_aditivo"] = {
+                    "mensagem": f"Aditivos de valor consomem {consumido:.1f}% do limite de 25% "
+                                f"(R$ {estado['valor_aditivos']:,.2f} de R$ {limite_valor:,.2f}).",
+                    "data_referencia": data_fim,
+                }
+        return alertas
+
+    @staticmethod
+    def processar(hoje: Optional[date] = None, contrato_ids: Optional[Iterable[int]] = None,
+                  completo: bool = False) -> Dict[str, int]:
+        """
+        Gera os alertas dos contratos alterados desde a última execução
+
+        Args:
+            hoje: Data de referência (padrão: hoje)
+            contrato_ids: Restringe aos contratos informados
+            completo: Reavalia todos os contratos, ignorando a assinatura gravada
+
+        Returns:
+            Dict com avaliados, criados, reativados, atualizados e resolvidos
+        """
+        hoje = hoje or timezone.now().date()
+        resultado = {"avaliados": 0, "criados": 0, "reativados": 0, "atualizados": 0, "resolvidos": 0}
+
+        alterados = {}
+        for estado in AlertaContratoService.estados(contrato_ids):
+            assinatura = AlertaContratoService.assinatura(estado, hoje)
+            if completo or assinatura != estado["assinatura_alertas"]:
+                alterados[estado["id"]] = (estado, assinatura)
+        if not alterados:
+            return resultado
+        resultado["avaliados"] = len(alterados)
+
+        existentes = {}
+        for alerta in AlertaContrato.objects.filter(contrato_id__in=list(alterados)):
+            existentes.setdefault(alerta.contrato_id, {})[alerta.tipo] = alerta
+        agora = timezone.now()
+        novos, modificados = [], []
+        for contrato_id, (estado, _) in alterados.items():
+            devidos = AlertaContratoService.avaliar(estado, hoje)
+            do_contrato = existentes.get(contrato_id, {})
+            for tipo, dados in devidos.items():
+                alerta = do_contrato.get(tipo)
+                if alerta is None:
+                    novos.append(AlertaContrato(contrato_id=contrato_id, tipo=tipo, **dados))
+                    resultado["criados"] += 1
+                elif not alerta.ativo:
+                    alerta.ativo, alerta.resolvido_em = True, None
+                    alerta.reconhecido_em, alerta.reconhecido_por = None, None
+                    alerta.mensagem, alerta.data_referencia = dados["mensagem"], dados["data_referencia"]
+                    modificados.append(alerta)
+                    resultado["reativados"] += 1
+                elif (alerta.mensagem, alerta.data_referencia) != (dados["mensagem"], dados["data_referencia"]):
+                    alerta.mensagem, alerta.data_referencia = dados["mensagem"], dados["data_referencia"]
+                    modificados.append(alerta)
+                    resultado["atualizados"] += 1
+            for tipo, alerta in do_contrato.items():
+                if alerta.ativo and tipo not in devidos:
+                    alerta.ativo, alerta.resolvido_em = False, agora
+                    modificados.append(alerta)
+                    resultado["resolvidos"] += 1
+
+        with transaction.atomic():
+            AlertaContrato.objects.bulk_create(novos, batch_size=1000)
+            AlertaContrato.objects.bulk_update(
+                modificados,
+                ["ativo", "mensagem", "data_referencia", "reconhecido_em", "reconhecido_por", "resolvido_em"],
+                batch_size=1000,
+            )
+            Contrato.objects.bulk_update(
+                [Contrato(pk=contrato_id, assinatura_alertas=assinatura)
+                 for contrato_id, (_, assinatura) in alterados.items()],
+                ["assinatura_alertas"],
+                batch_size=1000,
+            )
+        return resultado
+
+    @staticmethod
+    def ativos(tipos: Optional[Iterable[str]] = None, pendentes: bool = False) -> QuerySet:
+        """
+        Alertas ativos, pelo vencimento mais próximo
+
+        Args:
+            tipos: Restringe aos tipos informados
+            pendentes: Apenas os ainda não reconhecidos
+        """
+        alertas = AlertaContrato.objects.filter(ativo=True)
+        if tipos is not None:
+            alertas = alertas.filter(tipo__in=list(tipos))
+        if pendentes:
+            alertas = alertas.filter(reconhecido_em__isnull=True)
+        return alertas.select_related("contrato__cliente", "reconhecido_por").order_by(
+            "data_referencia", "contrato_id", "tipo"
+        )
+
+    @staticmethod
+    def contratos_com_renovacao_pendente() -> QuerySet:
+        """Ids dos contratos com alerta de renovação ativo (subconsulta)"""
+        return AlertaContrato.objects.filter(
+            ativo=True, tipo__in=AlertaContrato.TIPOS_RENOVACAO
+        ).values("contrato_id")
+
+    @staticmethod
+    def reconhecer(alerta: AlertaContrato, usuario) -> AlertaContrato:
+        """Registra a ciência do alerta; ele permanece ativo até a condição deixar de existir"""
+        alerta.reconhecido_em = timezone.now()
+        alerta.reconhecido_por = usuario
+        alerta.save(update_fields=["reconhecido_em", "reconhecido_por"])
+        return alerta
@@ -0,0 +1,178 @@
+"""
+Service Layer para o armazenamento por conteúdo dos documentos de contrato
+Deduplica os uploads pelo SHA-256 (ArquivoConteudo), mantém a contagem de
+referências dos DocumentoContrato e remove os blobs órfãos
+"""
+import hashlib
+import os
+from typing import Dict, Optional
+from datetime import timedelta
+
+from django.core.files.storage import default_storage
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+from django.db.models.deletion import ProtectedError
+from django.utils import timezone
+
+from ..models import ArquivoConteudo, DocumentoContrato
+
+
+class ArquivoConteudoService:
+    """
+    Armazenamento endereçado por conteúdo
+
+    O hash chega pronto do SHA256UploadHandler (calculado enquanto o upload é
+    gravado no arquivo temporário); o arquivo temporário é movido para
+    PASTA/<2 primeiros dígitos>/<sha256><extensão> apenas se o conteúdo ainda
+    não existir. Documentos com o mesmo conteúdo compartilham o blob e o
+    texto extraído.
+    """
+
+    PASTA = "documentos_contratos/blobs"
+    # Blobs e arquivos sem referência mais novos que isto não são coletados (uploads em andamento)
+    CARENCIA_HORAS = 24
+
+    @staticmethod
+    def sha256(arquivo) -> str:
+        """SHA-256 do upload (do handler, se disponível; senão lido em blocos)"""
+        calculado = getattr(arquivo, "sha256", None)
+        if calculado:
+            return calculado
+        resumo = hashlib.sha256()
+        for bloco in arquivo.chunks():
+            resumo.update(bloco)
+        arquivo.seek(0)
+        return resumo.hexdigest()
+
+    @staticmethod
+    def caminho(sha256: str, extensao: str) -> str:
+        return f"{ArquivoConteudoService.PASTA}/{sha256[:2]}/{sha256}{extensao}"
+
+    @staticmethod
+    def armazenar(arquivo) -> ArquivoConteudo:
+        """
+        Conteúdo do upload, gravando o blob apenas se ainda não existir
+
+        Args:
+            arquivo: UploadedFile (TemporaryUploadedFile é movido, sem cópia em memória)
+        """
+        sha256 = ArquivoConteudoService.sha256(arquivo)
+        conteudo = ArquivoConteudo.objects.filter(sha256=sha256).first()
+        if conteudo is not None and default_storage.exists(conteudo.arquivo.name):
+            return conteudo
+
+        nome = ArquivoConteudoService.caminho(sha256, os.path.splitext(arquivo.name)[1].lower())
+        if not default_storage.exists(nome):
+            nome = default_storage.save(nome, arquivo)
+        if conteudo is not None:
+            # Registro sem o blob em disco (removido manualmente): restaura
+            conteudo.arquivo.name = nome
+            conteudo.save(update_fields=["arquivo", "atualizado_em"])
+            return conteudo
+        try:
+            with transaction.atomic():
+                return ArquivoConteudo.objects.create(sha256=sha256, arquivo=nome, tamanho=arquivo.size)
+        except IntegrityError:
+            # Upload simultâneo do mesmo conteúdo; o arquivo excedente fica para a coleta
+            return ArquivoConteudo.objects.get(sha256=sha256)
+
+    @staticmethod
+    def criar_documento(arquivo, **campos) -> DocumentoContrato:
+        """
+        Cria o DocumentoContrato apontando para o conteúdo deduplicado
+
+        O texto já extraído de um conteúdo idêntico é copiado para o documento.
+        """
+        conteudo = ArquivoConteudoService.armazenar(arquivo)
+        with transaction.atomic():
+            documento = DocumentoContrato.objects.create(
+                conteudo=conteudo,
+                arquivo=conteudo.arquivo.name,
+                texto_extraido=conteudo.texto_extraido,
+                **campos,
+            )
+            ArquivoConteudo.objects.filter(pk=conteudo.pk).update(
+                referencias=F("referencias") + 1, atualizado_em=timezone.now()
+            )
+        return documento
+
+    @staticmethod
+    def liberar(conteudo_id: int) -> None:
+        """Decrementa as referências (exclusão de um DocumentoContrato)"""
+        ArquivoConteudo.objects.filter(pk=conteudo_id, referencias__gt=0).update(
+            referencias=F("referencias") - 1, atualizado_em=timezone.now()
+        )
+
+    @staticmethod
+    def guardar_texto(conteudo_id: int, texto: str) -> None:
+        """Guarda o texto extraído no conteúdo para os próximos documentos idênticos"""
+        ArquivoConteudo.objects.filter(pk=conteudo_id).update(texto_extraido=texto)
+
+    @staticmethod
+    def recontar() -> int:
+        """
+        Recalcula referencias a partir dos DocumentoContrato
+
+        Returns:
+            Quantidade de conteúdos corrigidos
+        """
+        divergentes = list(
+            ArquivoConteudo.objects.annotate(total=Count("documentos"))
+            .exclude(referencias=F("total"))
+            .values_list("pk", "total")
+        )
+        ArquivoConteudo.objects.bulk_update(
+            [ArquivoConteudo(pk=pk, referencias=total) for pk, total in divergentes], ["referencias"], batch_size=1000
+        )
+        return len(divergentes)
+
+    @staticmethod
+    def _arquivos(pasta: str):
+        """Nomes de todos os arquivos sob a pasta do armazenamento"""
+        if not default_storage.exists(pasta):
+            return
+        subpastas, arquivos = default_storage.listdir(pasta)
+        for nome in arquivos:
+            yield f"{pasta}/{nome}"
+        for subpasta in subpastas:
+            yield from ArquivoConteudoService._arquivos(f"{pasta}/{subpasta}")
+
+    @staticmethod
+    def coletar_orfaos(carencia_horas: Optional[int] = None, simular: bool = False) -> Dict[str, int]:
+        """
+        Remove os blobs sem referências e os arquivos da pasta sem registro
+
+        Args:
+            carencia_horas: Idade mínima para a remoção (padrão: CARENCIA_HORAS)
+            simular: Apenas conta, sem remover
+
+        Returns:
+            Dict com blobs (registros), arquivos (sem registro) e bytes liberados
+        """
+        carencia = ArquivoConteudoService.CARENCIA_HORAS if carencia_horas is None else carencia_horas
+        limite = timezone.now() - timedelta(hours=carencia)
+        resultado = {"blobs": 0, "arquivos": 0, "bytes": 0}
+
+        orfaos = ArquivoConteudo.objects.filter(referencias=0, atualizado_em__lt=limite).annotate(
+            total=Count("documentos")
+        ).filter(total=0)
+        for conteudo in orfaos:
+            if not simular:
+                try:
+                    conteudo.delete()  # PROTECT: falha se um documento acabou de referenciá-lo
+                except ProtectedError:
+                    continue
+                default_storage.delete(conteudo.arquivo.name)
+            resultado["blobs"] += 1
+            resultado["bytes"] += conteudo.tamanho
+
+        # Uploads interrompidos e colisões de uploads simultâneos
+        registrados = set(ArquivoConteudo.objects.values_list("arquivo", flat=True))
+        for nome in ArquivoConteudoService._arquivos(ArquivoConteudoService.PASTA):
+            if nome in registrados or default_storage.get_modified_time(nome) >= limite:
+                continue
+            resultado["arquivos"] += 1
+            resultado["bytes"] += default_storage.size(nome)
+            if not simular:
+                default_storage.delete(nome)
+        return resultado
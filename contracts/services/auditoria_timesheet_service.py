@@ -0,0 +1,223 @@
+"""
+Service Layer para a auditoria do timesheet
+Verifica os lançamentos de horas de um período de forma vetorizada (NumPy)
+"""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional
+from datetime import date, timedelta
+
+from django.db.models.functions import Coalesce
+
+from ..models import LancamentoHora, Tarefa
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+class AuditoriaTimesheetService:
+    """
+    Auditoria vetorizada dos lançamentos de horas (LancamentoHora)
+
+    Os lançamentos do período são lidos com uma única consulta (values_list)
+    e convertidos em arrays; todas as verificações são feitas em uma passada
+    sobre os arrays:
+    - sobreposição de lançamentos do mesmo colaborador;
+    - lançamentos que viram o dia (término anterior ao início);
+    - total diário acima do limite (e acima de 24h) e total semanal acima do limite;
+    - horas faturáveis em fim de semana ou fora do horário comercial;
+    - horas em tarefas de OS finalizada/faturada.
+
+    A mesma rotina serve ao relatório e à checagem prévia das importações em lote.
+    """
+
+    LIMITE_DIARIO = 10.0
+    LIMITE_SEMANAL = 44.0
+    INICIO_EXPEDIENTE = 9 * 60  # minutos desde 00:00, como em Tarefa.calcular_horas_dias_uteis
+    FIM_EXPEDIENTE = 19 * 60
+    STATUS_OS_ENCERRADA = ("finalizada", "faturada")
+
+    TIPOS = {
+        "sobreposicao": "Sobreposição com outro lançamento",
+        "virada_dia": "Término anterior ao início (passa da meia-noite)",
+        "dia_24h": "Dia com mais de 24h lançadas",
+        "limite_diario": "Dia acima do limite de horas",
+        "limite_semanal": "Semana acima do limite de horas",
+        "fim_semana": "Hora faturável em fim de semana",
+        "fora_expediente": "Hora faturável fora do horário comercial",
+        "os_encerrada": "Lançamento em OS finalizada/faturada",
+    }
+    # Ocorrências que impedem a gravação de uma importação
+    BLOQUEANTES = ("sobreposicao", "dia_24h", "os_encerrada")
+
+    CAMPOS = ("id", "colaborador_id", "data", "hora_inicio", "hora_termino", "faturavel", "status_os")
+
+    @staticmethod
+    def registros(inicio: date, fim: date, colaboradores: Optional[Iterable[int]] = None) -> List[tuple]:
+        """Lançamentos do período [inicio, fim] como tuplas na ordem de CAMPOS"""
+        lancamentos = LancamentoHora.objects.filter(data__range=(inicio, fim))
+        if colaboradores is not None:
+            lancamentos = lancamentos.filter(colaborador_id__in=list(colaboradores))
+        return list(
+            lancamentos.annotate(
+                status_os=Coalesce("tarefa__ordem_servico__status", "tarefa__sprint__ordem_servico__status")
+            ).values_list(*AuditoriaTimesheetService.CAMPOS)
+        )
+
+    @staticmethod
+    def _minutos(hora) -> int:
+        return hora.hour * 60 + hora.minute
+
+    @staticmethod
+    def auditar(registros: List[tuple]) -> Dict[str, np.ndarray]:
+        """
+        Aplica todas as verificações aos registros
+
+        Args:
+            registros: Tuplas (id, colaborador_id, data, hora_inicio,
+                hora_termino, faturavel, status_os)
+
+        Returns:
+            Dict {tipo: array booleano por registro} e "horas" (float por registro)
+        """
+        import numpy as np
+        n = len(registros)
+        if not n:
+            vazio = np.zeros(0, dtype=bool)
+            return {**{tipo: vazio for tipo in AuditoriaTimesheetService.TIPOS}, "horas": np.zeros(0)}
+
+        minutos = AuditoriaTimesheetService._minutos
+        colaborador = np.fromiter((r[1] for r in registros), dtype=np.int64, count=n)
+        dia = np.array([r[2] for r in registros], dtype="datetime64[D]").astype(np.int64)
+        ini = np.fromiter((minutos(r[3]) for r in registros), dtype=np.int64, count=n)
+        fim = np.fromiter((minutos(r[4]) for r in registros), dtype=np.int64, count=n)
+        faturavel = np.fromiter((bool(r[5]) for r in registros), dtype=bool, count=n)
+        encerrada = np.fromiter(
+            (r[6] in AuditoriaTimesheetService.STATUS_OS_ENCERRADA for r in registros), dtype=bool, count=n
+        )
+
+        # Como LancamentoHora.save, término anterior ao início passa para o dia seguinte
+        virada = fim < ini
+        fim = np.where(virada, fim + 1440, fim)
+        horas = (fim - ini) / 60.0
+        inicio_abs, fim_abs = dia * 1440 + ini, dia * 1440 + fim
+
+        # Sobreposição: ordenar por (colaborador, início); um lançamento sobrepõe o
+        # anterior se começa antes do maior término já visto no mesmo colaborador,
+        # e o seguinte se ele começa antes do seu término
+        ordem = np.lexsort((inicio_abs, colaborador))
+        col_o, ini_o, fim_o = colaborador[ordem], inicio_abs[ordem], fim_abs[ordem]
+        _, grupo = np.unique(col_o, return_inverse=True)
+        deslocamento = grupo * (fim_o.max() - ini_o.min() + 2880)  # isola os colaboradores no acumulado
+        maior_fim = np.maximum.accumulate(fim_o - ini_o.min() + deslocamento)
+        mesmo_anterior = np.r_[False, col_o[1:] == col_o[:-1]]
+        mesmo_seguinte = np.r_[col_o[1:] == col_o[:-1], False]
+        sobrepoe_anterior = mesmo_anterior & (ini_o - ini_o.min() + deslocamento < np.r_[0, maior_fim[:-1]])
+        sobrepoe_seguinte = mesmo_seguinte & (np.r_[ini_o[1:], 0] < fim_o)
+        sobreposicao = np.zeros(n, dtype=bool)
+        sobreposicao[ordem] = sobrepoe_anterior | sobrepoe_seguinte
+
+        # Totais por (colaborador, dia) e (colaborador, semana iniciada na segunda)
+        def total_por(chave):
+            _, indice = np.unique(np.stack([colaborador, chave]), axis=1, return_inverse=True)
+            indice = indice.ravel()
+            return np.bincount(indice, weights=horas)[indice]
+
+        total_dia = total_por(dia)
+        semana = (dia + 3) // 7  # 01/01/1970 foi quinta-feira
+        total_semana = total_por(semana)
+        dia_semana = (dia + 3) % 7  # 0 = segunda
+
+        return {
+            "sobreposicao": sobreposicao,
+            "virada_dia": virada,
+            "dia_24h": total_dia > 24,
+            "limite_diario": (total_dia > AuditoriaTimesheetService.LIMITE_DIARIO) & (total_dia <= 24),
+            "limite_semanal": total_semana > AuditoriaTimesheetService.LIMITE_SEMANAL,
+            "fim_semana": faturavel & (dia_semana >= 5),
+            "fora_expediente": faturavel & (dia_semana < 5) & (
+                (ini < AuditoriaTimesheetService.INICIO_EXPEDIENTE) | (fim > AuditoriaTimesheetService.FIM_EXPEDIENTE)
+            ),
+            "os_encerrada": encerrada,
+            "horas": horas,
+        }
+
+    @staticmethod
+    def ocorrencias(registros: List[tuple], flags: Dict[str, np.ndarray], indices=None) -> List[Dict]:
+        """Lista de ocorrências (uma por registro e tipo) a partir dos arrays de auditar"""
+        import numpy as np
+        selecionados = np.zeros(len(registros), dtype=bool)
+        if indices is None:
+            selecionados[:] = True
+        else:
+            selecionados[list(indices)] = True
+        resultado = []
+        for tipo, descricao in AuditoriaTimesheetService.TIPOS.items():
+            for i in np.flatnonzero(flags[tipo] & selecionados):
+                registro = registros[i]
+                resultado.append({
+                    "indice": int(i),
+                    "lancamento_id": registro[0],
+                    "colaborador_id": registro[1],
+                    "data": registro[2],
+                    "hora_inicio": registro[3],
+                    "hora_termino": registro[4],
+                    "horas": round(float(flags["horas"][i]), 2),
+                    "tipo": tipo,
+                    "descricao": descricao,
+                    "bloqueante": tipo in AuditoriaTimesheetService.BLOQUEANTES,
+                })
+        resultado.sort(key=lambda o: (o["colaborador_id"], o["data"], o["hora_inicio"]))
+        return resultado
+
+    @staticmethod
+    def relatorio(inicio: date, fim: date, colaboradores: Optional[Iterable[int]] = None) -> Dict:
+        """
+        Auditoria do período para o relatório
+
+        Returns:
+            Dict com ocorrencias, resumo {tipo: quantidade} e total_lancamentos
+        """
+        # Semanas completas, para que o limite semanal considere os dias fora do período
+        registros = AuditoriaTimesheetService.registros(
+            inicio - timedelta(days=inicio.weekday()), fim + timedelta(days=6 - fim.weekday()), colaboradores
+        )
+        flags = AuditoriaTimesheetService.auditar(registros)
+        no_periodo = [i for i, registro in enumerate(registros) if inicio <= registro[2] <= fim]
+        ocorrencias = AuditoriaTimesheetService.ocorrencias(registros, flags, no_periodo)
+        resumo = {tipo: 0 for tipo in AuditoriaTimesheetService.TIPOS}
+        for ocorrencia in ocorrencias:
+            resumo[ocorrencia["tipo"]] += 1
+        return {"ocorrencias": ocorrencias, "resumo": resumo, "total_lancamentos": len(no_periodo)}
+
+    @staticmethod
+    def verificar_lote(lancamentos: List[LancamentoHora]) -> List[Dict]:
+        """
+        Checagem prévia de lançamentos ainda não gravados (importações)
+
+        Os novos lançamentos são auditados junto com os já gravados dos mesmos
+        colaboradores nas semanas envolvidas.
+
+        Returns:
+            Ocorrências dos novos lançamentos; "indice" é a posição na lista recebida
+        """
+        if not lancamentos:
+            return []
+        datas = [lancamento.data for lancamento in lancamentos]
+        existentes = AuditoriaTimesheetService.registros(
+            min(datas) - timedelta(days=min(datas).weekday()),
+            max(datas) + timedelta(days=6 - max(datas).weekday()),
+            {lancamento.colaborador_id for lancamento in lancamentos},
+        )
+        status_os = dict(
+            Tarefa.objects.filter(pk__in={l.tarefa_id for l in lancamentos if l.tarefa_id})
+            .annotate(status_os=Coalesce("ordem_servico__status", "sprint__ordem_servico__status"))
+            .values_list("pk", "status_os")
+        )
+        novos = [
+            (None, l.colaborador_id, l.data, l.hora_inicio, l.hora_termino, l.faturavel, status_os.get(l.tarefa_id))
+            for l in lancamentos
+        ]
+        flags = AuditoriaTimesheetService.auditar(novos + existentes)
+        ocorrencias = AuditoriaTimesheetService.ocorrencias(novos + existentes, flags, range(len(novos)))
+        return ocorrencias
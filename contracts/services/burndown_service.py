@@ -0,0 +1,302 @@
+"""
+Service Layer para Burn-down/Burn-up de Projetos
+Gera os snapshots diários de horas por projeto e sprint e calcula as séries
+dos gráficos e as métricas de velocidade a partir deles
+"""
+from typing import Dict, Iterable, List, Optional
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, DecimalField, Q, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from ..models import LancamentoHora, Projeto, SnapshotHorasProjeto, Sprint, Tarefa
+
+
+ZERO = Decimal("0.00")
+
+
+class BurndownService:
+    """
+    Snapshots diários de horas (planejadas, consumidas, restantes e faturáveis)
+
+    Os totais são obtidos com duas agregações agrupadas (tarefas e lançamentos)
+    por (projeto, sprint), independentemente do número de tarefas, e gravados
+    com bulk_create.
+    """
+
+    STATUS_SPRINT_ENCERRADA = ["finalizada", "faturada"]
+
+    # ==================== GERAÇÃO ====================
+
+    @staticmethod
+    def calcular_totais(dia: Optional[date] = None,
+                        projeto_ids: Optional[Iterable[int]] = None) -> Dict[tuple, Dict]:
+        """
+        Calcula os totais de horas por (projeto, sprint) na data informada
+
+        Args:
+            dia: Data de referência (padrão: hoje). Considera lançamentos até esta data
+            projeto_ids: Restringe o cálculo a estes projetos
+
+        Returns:
+            Dicionário {(projeto_id, sprint_id): totais}. A chave (projeto_id, None)
+            traz o consolidado do projeto (inclui tarefas sem sprint)
+        """
+        dia = dia or timezone.now().date()
+        decimal_zero = Value(ZERO, output_field=DecimalField())
+
+        tarefas = Tarefa.objects.filter(criado_em__date__lte=dia)
+        lancamentos = LancamentoHora.objects.filter(data__lte=dia, tarefa__isnull=False)
+        if projeto_ids is not None:
+            projeto_ids = list(projeto_ids)
+            tarefas = tarefas.filter(projeto_id__in=projeto_ids)
+            lancamentos = lancamentos.filter(tarefa__projeto_id__in=projeto_ids)
+
+        agregado_tarefas = tarefas.values("projeto_id", "sprint_id").annotate(
+            planejadas=Coalesce(Sum("horas_planejadas"), decimal_zero),
+            total=Count("id"),
+            concluidas=Count("id", filter=Q(status_sprint="finalizada")),
+        ).order_by()
+
+        agregado_lancamentos = lancamentos.values("tarefa__projeto_id", "tarefa__sprint_id").annotate(
+            consumidas=Coalesce(Sum("horas_trabalhadas"), decimal_zero),
+            faturaveis=Coalesce(
+                Sum(
+                    "horas_trabalhadas",
+                    filter=Q(
+                        faturavel=True,
+                        tarefa__bilhetar_na_os=True,
+                        tarefa__status_sprint="finalizada",
+                        tarefa__sprint__isnull=False,
+                    ),
+                ),
+                decimal_zero,
+            ),
+        ).order_by()
+
+        def vazio() -> Dict:
+            return {
+                "horas_planejadas": ZERO,
+                "horas_consumidas": ZERO,
+                "horas_faturaveis": ZERO,
+                "total_tarefas": 0,
+                "tarefas_concluidas": 0,
+            }
+
+        totais: Dict[tuple, Dict] = {}
+
+        def acumular(projeto_id, sprint_id, **valores):
+            # Toda linha alimenta o consolidado do projeto; apenas as de sprint geram linha própria
+            chaves = [(projeto_id, None)]
+            if sprint_id is not None:
+                chaves.append((projeto_id, sprint_id))
+            for chave in chaves:
+                registro = totais.setdefault(chave, vazio())
+                for campo, valor in valores.items():
+                    registro[campo] += valor
+
+        for linha in agregado_tarefas:
+            acumular(
+                linha["projeto_id"], linha["sprint_id"],
+                horas_planejadas=linha["planejadas"],
+                total_tarefas=linha["total"],
+                tarefas_concluidas=linha["concluidas"],
+            )
+        for linha in agregado_lancamentos:
+            acumular(
+                linha["tarefa__projeto_id"], linha["tarefa__sprint_id"],
+                horas_consumidas=linha["consumidas"],
+                horas_faturaveis=linha["faturaveis"],
+            )
+
+        for registro in totais.values():
+            registro["horas_restantes"] = max(
+                registro["horas_planejadas"] - registro["horas_consumidas"], ZERO
+            )
+        return totais
+
+    @staticmethod
+    def gerar_snapshots(dia: Optional[date] = None,
+                        projeto_ids: Optional[Iterable[int]] = None) -> int:
+        """
+        Grava (ou regrava) os snapshots do dia para projetos e sprints
+
+        Args:
+            dia: Data do snapshot (padrão: hoje)
+            projeto_ids: Restringe a geração a estes projetos
+
+        Returns:
+            Quantidade de snapshots gravados
+        """
+        dia = dia or timezone.now().date()
+        if projeto_ids is not None:
+            projeto_ids = list(projeto_ids)
+        totais = BurndownService.calcular_totais(dia, projeto_ids)
+
+        snapshots = [
+            SnapshotHorasProjeto(projeto_id=projeto_id, sprint_id=sprint_id, data=dia, **valores)
+            for (projeto_id, sprint_id), valores in totais.items()
+        ]
+
+        with transaction.atomic():
+            existentes = SnapshotHorasProjeto.objects.filter(data=dia)
+            if projeto_ids is not None:
+                existentes = existentes.filter(projeto_id__in=projeto_ids)
+            existentes.delete()
+            SnapshotHorasProjeto.objects.bulk_create(snapshots, batch_size=1000)
+
+        return len(snapshots)
+
+    # ==================== CONSULTAS ====================
+
+    @staticmethod
+    def resumo_projeto(projeto: Projeto) -> Dict:
+        """
+        Totais mais recentes do projeto
+
+        Lê o último snapshot consolidado; se o projeto ainda não tiver snapshot,
+        calcula os totais na hora (mesmas agregações, sem gravar).
+
+        Args:
+            projeto: Projeto
+
+        Returns:
+            Dicionário com horas planejadas/consumidas/restantes/faturáveis,
+            tarefas e a data de referência
+        """
+        snapshot = (
+            SnapshotHorasProjeto.objects.filter(projeto=projeto, sprint__isnull=True)
+            .order_by("-data")
+            .first()
+        )
+        if snapshot:
+            return {
+                "data": snapshot.data,
+                "horas_planejadas": snapshot.horas_planejadas,
+                "horas_consumidas": snapshot.horas_consumidas,
+                "horas_restantes": snapshot.horas_restantes,
+                "horas_faturaveis": snapshot.horas_faturaveis,
+                "total_tarefas": snapshot.total_tarefas,
+                "tarefas_concluidas": snapshot.tarefas_concluidas,
+            }
+
+        hoje = timezone.now().date()
+        totais = BurndownService.calcular_totais(hoje, [projeto.pk]).get((projeto.pk, None))
+        if not totais:
+            totais = {
+                "horas_planejadas": ZERO,
+                "horas_consumidas": ZERO,
+                "horas_restantes": ZERO,
+                "horas_faturaveis": ZERO,
+                "total_tarefas": 0,
+                "tarefas_concluidas": 0,
+            }
+        return {"data": hoje, **totais}
+
+    @staticmethod
+    def serie_burndown(projeto: Projeto, sprint: Optional[Sprint] = None) -> Dict[str, List]:
+        """
+        Séries para os gráficos de burn-down (restantes) e burn-up (consumidas x escopo)
+
+        Args:
+            projeto: Projeto
+            sprint: Sprint específica ou None para o consolidado do projeto
+
+        Returns:
+            Dicionário com listas alinhadas: datas, planejadas, consumidas,
+            restantes e ideal (queda linear do escopo inicial até zero)
+        """
+        snapshots = SnapshotHorasProjeto.objects.filter(projeto=projeto)
+        if sprint:
+            snapshots = snapshots.filter(sprint=sprint)
+        else:
+            snapshots = snapshots.filter(sprint__isnull=True)
+
+        linhas = list(
+            snapshots.order_by("data").values_list(
+                "data", "horas_planejadas", "horas_consumidas", "horas_restantes"
+            )
+        )
+        serie = {"datas": [], "planejadas": [], "consumidas": [], "restantes": [], "ideal": []}
+        if not linhas:
+            return serie
+
+        for dia, planejadas, consumidas, restantes in linhas:
+            serie["datas"].append(dia.strftime("%d/%m"))
+            serie["planejadas"].append(float(planejadas))
+            serie["consumidas"].append(float(consumidas))
+            serie["restantes"].append(float(restantes))
+
+        # Linha ideal: do escopo do primeiro dia até zero no fim da sprint/projeto
+        inicio = linhas[0][0]
+        fim = (sprint.data_fim if sprint else projeto.data_fim_prevista) or linhas[-1][0]
+        duracao = max((fim - inicio).days, 1)
+        escopo_inicial = float(linhas[0][1])
+        for dia, *_ in linhas:
+            decorrido = min(max((dia - inicio).days, 0), duracao)
+            serie["ideal"].append(round(escopo_inicial * (1 - decorrido / duracao), 2))
+
+        return serie
+
+    @staticmethod
+    def velocidade(projeto: Projeto) -> Dict:
+        """
+        Velocidade do projeto a partir do último snapshot de cada sprint encerrada
+
+        Args:
+            projeto: Projeto
+
+        Returns:
+            Dicionário com a lista por sprint (horas e tarefas concluídas) e as médias
+        """
+        snapshots = (
+            SnapshotHorasProjeto.objects.filter(
+                projeto=projeto,
+                sprint__isnull=False,
+                sprint__status__in=BurndownService.STATUS_SPRINT_ENCERRADA,
+            )
+            .select_related("sprint")
+            .order_by("sprint__data_inicio", "sprint_id", "-data")
+        )
+
+        sprints = []
+        vistos = set()
+        for snapshot in snapshots:
+            if snapshot.sprint_id in vistos:
+                continue
+            vistos.add(snapshot.sprint_id)
+            sprints.append({
+                "sprint": snapshot.sprint.nome,
+                "horas_consumidas": snapshot.horas_consumidas,
+                "tarefas_concluidas": snapshot.tarefas_concluidas,
+            })
+
+        quantidade = len(sprints)
+        return {
+            "sprints": sprints,
+            "media_horas": (
+                sum((s["horas_consumidas"] for s in sprints), ZERO) / quantidade
+                if quantidade else ZERO
+            ),
+            "media_tarefas": (
+                sum(s["tarefas_concluidas"] for s in sprints) / quantidade
+                if quantidade else 0
+            ),
+        }
+
+    @staticmethod
+    def dias_periodo(inicio: date, fim: date) -> List[date]:
+        """
+        Lista de dias entre duas datas (inclusive), usada no backfill
+
+        Args:
+            inicio: Primeiro dia
+            fim: Último dia
+
+        Returns:
+            Lista de datas
+        """
+        return [inicio + timedelta(days=i) for i in range((fim - inicio).days + 1)]
@@ -0,0 +1,343 @@
+"""
+Service Layer para a busca textual nos documentos de contrato
+Divide o texto extraído em trechos (cláusulas/parágrafos), indexa e consulta
+com ranking e trechos destacados
+"""
+import math
+import re
+import unicodedata
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank, SearchVector
+from django.db import connection, transaction
+from django.db.models import Avg, Count, F
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+from ..models import DocumentoContrato, TermoTrecho, TrechoDocumento
+
+
+class BuscaDocumentoService:
+    """
+    Busca por trechos dos DocumentoContrato
+
+    No PostgreSQL cada trecho tem um tsvector (configuração "portuguese", com
+    radicais; título com peso A e texto com peso B) em índice GIN; a consulta
+    aceita a sintaxe do websearch_to_tsquery (aspas, OR, -termo) e é ordenada
+    por ts_rank com ts_headline para o destaque.
+
+    Nos demais bancos (SQLite dos testes) o índice é TermoTrecho (radical ->
+    trecho, frequência) com um radicalizador simplificado, todos os termos
+    obrigatórios, -termo para excluir e ranking BM25.
+    """
+
+    # Trechos de ~1.200 caracteres: uma cláusula curta ou parte de uma longa
+    TAMANHO_ALVO = 1200
+    TAMANHO_MAXIMO = 3000
+    CONFIGURACAO = "portuguese"
+    K1 = 1.2
+    B = 0.75
+
+    _INICIO_BLOCO = re.compile(
+        r"^(CL[ÁA]USULA|SUBCL[ÁA]USULA|PAR[ÁA]GRAFO|SE[ÇC][ÃA]O|CAP[ÍI]TULO|ANEXO|\d{1,2}(\.\d{1,3})*[.)\-–]?\s)",
+        re.IGNORECASE,
+    )
+    _CLAUSULA = re.compile(r"^(CL[ÁA]USULA|CAP[ÍI]TULO|SE[ÇC][ÃA]O|ANEXO)\b", re.IGNORECASE)
+    _FRASE = re.compile(r"(?<=[.;:])\s+")
+    _PALAVRA = re.compile(r"\w+")
+    _CONSULTA = re.compile(r"(-?)(\w+)")
+
+    STOPWORDS = frozenset(
+        "a ao aos as com da das de do dos e em na nas no nos o os ou para pela pelas pelo pelos "
+        "por que se sem sob sobre um uma umas uns como mais ser sera sao foi ao seu sua seus suas "
+        "este esta estes estas esse essa isso qual quando entre ate".split()
+    )
+    # Do mais longo para o mais curto; o radical mantém ao menos 3 letras
+    SUFIXOS = (
+        "amentos", "imentos", "amento", "imento", "idades", "idade", "mente", "acoes", "icoes",
+        "acao", "icao", "ores", "oras", "ais", "eis", "ora", "or", "es", "as", "os", "is", "a", "o", "e", "s",
+    )
+
+    @staticmethod
+    def usa_postgres() -> bool:
+        return connection.vendor == "postgresql"
+
+    # ------------------------------------------------------------------
+    # Segmentação e termos
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _dividir(paragrafo: str) -> List[str]:
+        """Parágrafos acima de TAMANHO_MAXIMO divididos em frases"""
+        if len(paragrafo) <= BuscaDocumentoService.TAMANHO_MAXIMO:
+            return [paragrafo]
+        partes, atual = [], ""
+        for frase in BuscaDocumentoService._FRASE.split(paragrafo):
+            if atual and len(atual) + len(frase) > BuscaDocumentoService.TAMANHO_ALVO:
+                partes.append(atual)
+                atual = ""
+            atual = f"{atual} {frase}".strip()
+        if atual:
+            partes.append(atual)
+        return partes
+
+    @staticmethod
+    def segmentar(texto: str) -> List[Tuple[str, str]]:
+        """
+        Divide o texto extraído em trechos
+
+        Um parágrafo termina em linha em branco ou no início de uma cláusula,
+        parágrafo ou item numerado; parágrafos são agrupados até TAMANHO_ALVO
+        sem atravessar o início de uma cláusula.
+
+        Returns:
+            Lista de (título da cláusula corrente, texto do trecho)
+        """
+        paragrafos, linhas = [], []
+        for linha in (texto or "").splitlines():
+            linha = linha.strip()
+            if linhas and (not linha or BuscaDocumentoService._INICIO_BLOCO.match(linha)):
+                paragrafos.append(" ".join(linhas))
+                linhas = []
+            if linha:
+                linhas.append(linha)
+        if linhas:
+            paragrafos.append(" ".join(linhas))
+
+        trechos, titulo, atual = [], "", []
+
+        def fechar():
+            if atual:
+                trechos.append((titulo, "\n".join(atual)))
+                atual.clear()
+
+        for paragrafo in paragrafos:
+            if BuscaDocumentoService._CLAUSULA.match(paragrafo):
+                fechar()
+                titulo = paragrafo[:255]
+            for parte in BuscaDocumentoService._dividir(paragrafo):
+                if atual and sum(len(p) for p in atual) + len(parte) > BuscaDocumentoService.TAMANHO_ALVO:
+                    fechar()
+                atual.append(parte)
+        fechar()
+        return trechos
+
+    @staticmethod
+    def normalizar(palavra: str) -> str:
+        """Minúsculas e sem acentos"""
+        decomposta = unicodedata.normalize("NFKD", palavra.lower())
+        return "".join(c for c in decomposta if not unicodedata.combining(c))
+
+    @staticmethod
+    def radical(palavra: str) -> str:
+        """Radical aproximado (plural, gênero e sufixos nominais comuns)"""
+        for sufixo in BuscaDocumentoService.SUFIXOS:
+            if palavra.endswith(sufixo) and len(palavra) - len(sufixo) >= 3:
+                return palavra[:-len(sufixo)]
+        return palavra
+
+    @staticmethod
+    def termos(texto: str) -> List[str]:
+        """Radicais das palavras do texto, sem stopwords"""
+        resultado = []
+        for palavra in BuscaDocumentoService._PALAVRA.findall(texto or ""):
+            palavra = BuscaDocumentoService.normalizar(palavra)
+            if palavra not in BuscaDocumentoService.STOPWORDS:
+                resultado.append(BuscaDocumentoService.radical(palavra)[:60])
+        return resultado
+
+    # ------------------------------------------------------------------
+    # Indexação
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def indexar(documento: DocumentoContrato) -> int:
+        """
+        Regrava os trechos do documento a partir do texto_extraido
+
+        Returns:
+            Quantidade de trechos
+        """
+        segmentos = BuscaDocumentoService.segmentar(documento.texto_extraido or "")
+        postgres = BuscaDocumentoService.usa_postgres()
+        contagens = [Counter(BuscaDocumentoService.termos(f"{titulo} {texto}")) for titulo, texto in segmentos]
+        with transaction.atomic():
+            TrechoDocumento.objects.filter(documento=documento).delete()
+            trechos = TrechoDocumento.objects.bulk_create([
+                TrechoDocumento(
+                    documento=documento, ordem=ordem, titulo=titulo, texto=texto,
+                    quantidade_termos=sum(contagem.values()),
+                )
+                for ordem, ((titulo, texto), contagem) in enumerate(zip(segmentos, contagens))
+            ], batch_size=500)
+            if postgres:
+                TrechoDocumento.objects.filter(documento=documento).update(
+                    vetor=SearchVector("titulo", weight="A", config=BuscaDocumentoService.CONFIGURACAO)
+                    + SearchVector("texto", weight="B", config=BuscaDocumentoService.CONFIGURACAO)
+                )
+            else:
+                TermoTrecho.objects.bulk_create([
+                    TermoTrecho(trecho=trecho, termo=termo, frequencia=frequencia)
+                    for trecho, contagem in zip(trechos, contagens)
+                    for termo, frequencia in contagem.items()
+                ], batch_size=2000)
+        return len(trechos)
+
+    @staticmethod
+    def indexar_todos(reindexar: bool = False) -> Dict[str, int]:
+        """
+        Indexa os documentos com texto extraído
+
+        Args:
+            reindexar: Regrava também os documentos que já têm trechos
+
+        Returns:
+            Dict com documentos e trechos
+        """
+        documentos = DocumentoContrato.objects.exclude(texto_extraido__isnull=True).exclude(texto_extraido="")
+        if not reindexar:
+            documentos = documentos.filter(trechos__isnull=True)
+        resultado = {"documentos": 0, "trechos": 0}
+        for documento in documentos.distinct().iterator(chunk_size=50):
+            resultado["documentos"] += 1
+            resultado["trechos"] += BuscaDocumentoService.indexar(documento)
+        return resultado
+
+    # ------------------------------------------------------------------
+    # Consulta
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _trechos(contrato_id: Optional[int] = None, tipo_documento: Optional[str] = None):
+        trechos = TrechoDocumento.objects.all()
+        if contrato_id:
+            trechos = trechos.filter(documento__analise__contrato_gerado_id=contrato_id)
+        if tipo_documento:
+            trechos = trechos.filter(documento__tipo_documento=tipo_documento)
+        return trechos
+
+    @staticmethod
+    def _destacar(texto: str, radicais: set, tamanho: int = 300) -> str:
+        """Janela do texto em torno da primeira ocorrência, com <mark> nas palavras buscadas"""
+        ocorrencias = [
+            m for m in BuscaDocumentoService._PALAVRA.finditer(texto)
+            if BuscaDocumentoService.radical(BuscaDocumentoService.normalizar(m.group())) in radicais
+        ]
+        inicio = max((ocorrencias[0].start() if ocorrencias else 0) - tamanho // 3, 0)
+        fim = min(inicio + tamanho, len(texto))
+        partes, posicao = [], inicio
+        for ocorrencia in ocorrencias:
+            if ocorrencia.start() < inicio or ocorrencia.end() > fim:
+                continue
+            partes.append(escape(texto[posicao:ocorrencia.start()]))
+            partes.append(f"<mark>{escape(ocorrencia.group())}</mark>")
+            posicao = ocorrencia.end()
+        partes.append(escape(texto[posicao:fim]))
+        return mark_safe(("… " if inicio else "") + "".join(partes) + (" …" if fim < len(texto) else ""))
+
+    @staticmethod
+    def _buscar_postgres(consulta: str, trechos, limite: int) -> List[Tuple[TrechoDocumento, float, str]]:
+        busca = SearchQuery(consulta, config=BuscaDocumentoService.CONFIGURACAO, search_type="websearch")
+        ranking = list(
+            trechos.filter(vetor=busca).annotate(rank=SearchRank(F("vetor"), busca))
+            .order_by("-rank", "pk").values_list("pk", "rank")[:limite]
+        )
+        # ts_headline apenas para as linhas da página; marcadores de controle para escapar o texto
+        destaques = dict(
+            TrechoDocumento.objects.filter(pk__in=[pk for pk, _ in ranking]).annotate(
+                destaque=SearchHeadline(
+                    "texto", busca, config=BuscaDocumentoService.CONFIGURACAO,
+                    start_sel="\x02", stop_sel="\x03", max_words=45, min_words=20,
+                    max_fragments=2, fragment_delimiter=" … ",
+                )
+            ).values_list("pk", "destaque")
+        )
+        objetos = TrechoDocumento.objects.select_related(
+            "documento__analise__contrato_gerado"
+        ).in_bulk([pk for pk, _ in ranking])
+        return [
+            (
+                objetos[pk], float(rank),
+                mark_safe(escape(destaques[pk]).replace("\x02", "<mark>").replace("\x03", "</mark>")),
+            )
+            for pk, rank in ranking
+        ]
+
+    @staticmethod
+    def _buscar_indice(consulta: str, trechos, limite: int) -> List[Tuple[TrechoDocumento, float, str]]:
+        incluir, excluir = set(), set()
+        for sinal, palavra in BuscaDocumentoService._CONSULTA.findall(consulta):
+            termos = BuscaDocumentoService.termos(palavra)
+            (excluir if sinal else incluir).update(termos)
+        incluir -= excluir
+        if not incluir:
+            return []
+
+        frequencias = defaultdict(dict)
+        for trecho_id, termo, frequencia, tamanho in TermoTrecho.objects.filter(
+            termo__in=incluir | excluir, trecho__in=trechos
+        ).values_list("trecho_id", "termo", "frequencia", "trecho__quantidade_termos"):
+            frequencias[trecho_id][termo] = (frequencia, tamanho)
+        candidatos = {
+            trecho_id: termos for trecho_id, termos in frequencias.items()
+            if incluir <= termos.keys() and not excluir & termos.keys()
+        }
+        if not candidatos:
+            return []
+
+        # BM25 sobre o conjunto filtrado
+        estatisticas = trechos.aggregate(total=Count("id"), media=Avg("quantidade_termos"))
+        total, media = estatisticas["total"], max(estatisticas["media"] or 0, 1)
+        documentos_com = Counter(termo for termos in frequencias.values() for termo in termos)
+        k1, b = BuscaDocumentoService.K1, BuscaDocumentoService.B
+        pontuacao = {}
+        for trecho_id, termos in candidatos.items():
+            score = 0.0
+            for termo in incluir:
+                frequencia, tamanho = termos[termo]
+                idf = math.log(1 + (total - documentos_com[termo] + 0.5) / (documentos_com[termo] + 0.5))
+                score += idf * frequencia * (k1 + 1) / (frequencia + k1 * (1 - b + b * tamanho / media))
+            pontuacao[trecho_id] = score
+        melhores = sorted(pontuacao, key=lambda pk: (-pontuacao[pk], pk))[:limite]
+        objetos = TrechoDocumento.objects.select_related("documento__analise__contrato_gerado").in_bulk(melhores)
+        return [
+            (objetos[pk], pontuacao[pk], BuscaDocumentoService._destacar(objetos[pk].texto, incluir))
+            for pk in melhores
+        ]
+
+    @staticmethod
+    def buscar(consulta: str, contrato_id: Optional[int] = None, tipo_documento: Optional[str] = None,
+               limite: int = 50) -> List[Dict]:
+        """
+        Trechos que atendem à consulta, do mais relevante para o menos
+
+        Args:
+            consulta: Texto da busca (todas as palavras; "-palavra" exclui)
+            contrato_id: Restringe aos documentos das análises do contrato
+            tipo_documento: Restringe ao tipo de documento
+            limite: Quantidade máxima de trechos
+
+        Returns:
+            Lista de dicts com trecho, documento, analise, contrato, relevancia e
+            destaque (HTML seguro com <mark>)
+        """
+        consulta = (consulta or "").strip()
+        if not consulta:
+            return []
+        trechos = BuscaDocumentoService._trechos(contrato_id, tipo_documento)
+        if BuscaDocumentoService.usa_postgres():
+            encontrados = BuscaDocumentoService._buscar_postgres(consulta, trechos, limite)
+        else:
+            encontrados = BuscaDocumentoService._buscar_indice(consulta, trechos, limite)
+        return [
+            {
+                "trecho": trecho,
+                "documento": trecho.documento,
+                "analise": trecho.documento.analise,
+                "contrato": trecho.documento.analise.contrato_gerado if trecho.documento.analise else None,
+                "relevancia": relevancia,
+                "destaque": destaque,
+            }
+            for trecho, relevancia, destaque in encontrados
+        ]
@@ -0,0 +1,188 @@
+"""
+Service Layer para o cache versionado por entidade
+Cada entidade (ex.: contrato) tem um contador de versão no cache, incrementado
+quando ela ou seus filhos são gravados; o conteúdo fica sob chaves com a versão
+"""
+import hashlib
+import time
+from collections import Counter
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, TypeVar
+
+from django.core.cache import cache
+from django.db import transaction
+
+T = TypeVar("T")
+
+
+class CacheVersaoService:
+    """
+    Cache de conteúdo derivado (HTML de abas e fragmentos, indicadores) por versão da entidade
+
+    Incrementar a versão torna inalcançável todo o conteúdo anterior, que expira
+    pelo TIMEOUT; nada precisa ser apagado. A versão inicial é o instante em
+    nanossegundos: se o contador for removido do cache, a nova versão nunca
+    coincide com uma anterior.
+
+    Entidades versionadas (incrementadas pelos signals e pelas gravações em lote):
+    - contrato: o contrato, itens, OF/OS, aditivos, SLAs, backlogs, projetos e stakeholders
+    - projeto: o projeto, sprints, tarefas, OS e plano de trabalho
+    - painel ("geral"): clientes, contratos, itens, OF/OS (e seus itens de fornecedor),
+      catálogo de itens de fornecedor e previsões de consumo
+    - cadastro ("geral"): colaboradores e catálogo de itens de fornecedor, exibidos nas
+      abas de projetos e OF/OS de todos os contratos (entra na chave dessas abas)
+    """
+
+    # Conteúdo com datas relativas (dias restantes, conformidade) é refeito ao menos a cada hora
+    TIMEOUT = 60 * 60
+    ENTIDADES = ("contrato", "projeto", "painel")
+    # Valor do {% csrf_token %} no HTML guardado, trocado pelo token de quem recebe a página
+    MARCADOR_CSRF = "__csrf_cache_versao__"
+    # Acertos/falhas acumulados no processo antes de somar nos contadores compartilhados
+    LOTE_ESTATISTICAS = 50
+
+    _estatisticas = Counter()
+
+    @staticmethod
+    def _chave_versao(entidade: str, pk) -> str:
+        return f"versao:{entidade}:{pk}"
+
+    @staticmethod
+    def versoes(pares: Iterable[Tuple[str, object]]) -> List[int]:
+        """Versões atuais de vários (entidade, pk) com uma leitura do cache"""
+        chaves = [CacheVersaoService._chave_versao(entidade, pk) for entidade, pk in pares]
+        atuais = cache.get_many(chaves)
+        for chave in chaves:
+            if chave not in atuais:
+                atuais[chave] = cache.get_or_set(chave, time.time_ns, None)
+        return [atuais[chave] for chave in chaves]
+
+    @staticmethod
+    def versao(entidade: str, pk) -> int:
+        return CacheVersaoService.versoes([(entidade, pk)])[0]
+
+    @staticmethod
+    def incrementar(entidade: str, *pks) -> None:
+        """
+        Invalida o conteúdo das entidades após o commit da transação atual
+
+        Após o commit, e não antes, para que uma leitura concorrente não guarde
+        o estado anterior sob a nova versão.
+        """
+        pks = {pk for pk in pks if pk is not None}
+        if not pks:
+            return
+
+        def incrementar():
+            for pk in pks:
+                chave = CacheVersaoService._chave_versao(entidade, pk)
+                try:
+                    cache.incr(chave)
+                except ValueError:
+                    cache.set(chave, time.time_ns(), None)
+
+        transaction.on_commit(incrementar)
+
+    @staticmethod
+    def obter(entidade: str, pk, parte: str, gerar: Callable[[], T], timeout: Optional[int] = None) -> T:
+        """
+        Conteúdo da versão atual da entidade, gerado apenas na falta
+
+        Args:
+            entidade: Nome da entidade (ex.: "contrato")
+            pk: Chave da entidade
+            parte: Identificação do conteúdo (ex.: "aba:itens:gestor"); o trecho
+                antes do primeiro ":" agrupa as estatísticas
+            gerar: Função que produz o conteúdo (qualquer valor serializável, exceto None)
+            timeout: Validade em segundos (padrão: TIMEOUT)
+        """
+        chave = f"{entidade}:{pk}:v{CacheVersaoService.versao(entidade, pk)}:{parte}"
+        return CacheVersaoService._ler(chave, f"{entidade}:{parte.split(':', 1)[0]}", gerar, timeout)
+
+    @staticmethod
+    def fragmento(nome: str, entidades: List[Tuple[str, object]], variacoes: List[str],
+                  gerar: Callable[[], str], timeout: Optional[int] = None) -> str:
+        """
+        HTML de um fragmento de template ({% cache_versao %}) na versão atual das entidades
+
+        Args:
+            nome: Nome do fragmento (agrupa as estatísticas)
+            entidades: Pares (entidade, pk) de que o fragmento depende
+            variacoes: Demais valores que mudam o HTML (ex.: permissão de edição)
+            gerar: Renderização do fragmento
+        """
+        desconhecidas = {entidade for entidade, _ in entidades} - set(CacheVersaoService.ENTIDADES)
+        if not entidades or desconhecidas:
+            raise ValueError(f"Entidades sem versão: {', '.join(sorted(desconhecidas))}")
+        versoes = CacheVersaoService.versoes(entidades)
+        dependencias = ":".join(f"{entidade}{pk}v{versao}" for (entidade, pk), versao in zip(entidades, versoes))
+        variacao = hashlib.md5("\x00".join(variacoes).encode()).hexdigest()
+        chave = f"fragmento:{nome}:{dependencias}:{variacao}"
+        return CacheVersaoService._ler(chave, f"fragmento:{nome}", gerar, timeout)
+
+    @staticmethod
+    def _ler(chave: str, grupo: str, gerar: Callable[[], T], timeout: Optional[int]) -> T:
+        valor = cache.get(chave)
+        acerto = valor is not None
+        if not acerto:
+            valor = gerar()
+            cache.set(chave, valor, timeout or CacheVersaoService.TIMEOUT)
+        CacheVersaoService._registrar(grupo, acerto)
+        return valor
+
+    @staticmethod
+    def _registrar(grupo: str, acerto: bool) -> None:
+        estatisticas = CacheVersaoService._estatisticas
+        estatisticas[(grupo, "acertos" if acerto else "falhas")] += 1
+        if sum(estatisticas.values()) >= CacheVersaoService.LOTE_ESTATISTICAS:
+            CacheVersaoService.gravar_estatisticas()
+
+    @staticmethod
+    def gravar_estatisticas() -> None:
+        """Soma os acertos/falhas acumulados no processo aos contadores compartilhados"""
+        pendentes = dict(CacheVersaoService._estatisticas)
+        CacheVersaoService._estatisticas.clear()
+        if not pendentes:
+            return
+        grupos = cache.get("estatisticas:grupos", set())
+        novos = {grupo for grupo, _ in pendentes} - grupos
+        if novos:
+            cache.set("estatisticas:grupos", grupos | novos, None)
+        for (grupo, tipo), quantidade in pendentes.items():
+            chave = f"estatisticas:{grupo}:{tipo}"
+            cache.add(chave, 0, None)
+            try:
+                cache.incr(chave, quantidade)
+            except ValueError:
+                cache.set(chave, quantidade, None)
+
+    @staticmethod
+    def _chaves_estatisticas(grupos: Iterable[str]) -> List[str]:
+        return [f"estatisticas:{grupo}:{tipo}" for grupo in grupos for tipo in ("acertos", "falhas")]
+
+    @staticmethod
+    def estatisticas() -> List[Dict]:
+        """
+        Taxa de acerto por grupo (fragmento ou parte), nos contadores compartilhados
+
+        Returns:
+            Lista de dicts com grupo, acertos, falhas e taxa (%, None sem leituras)
+        """
+        CacheVersaoService.gravar_estatisticas()
+        grupos = sorted(cache.get("estatisticas:grupos", set()))
+        contadores = cache.get_many(CacheVersaoService._chaves_estatisticas(grupos))
+        resultado = []
+        for grupo in grupos:
+            acertos = contadores.get(f"estatisticas:{grupo}:acertos", 0)
+            falhas = contadores.get(f"estatisticas:{grupo}:falhas", 0)
+            total = acertos + falhas
+            resultado.append({
+                "grupo": grupo, "acertos": acertos, "falhas": falhas,
+                "taxa": round(acertos * 100 / total, 1) if total else None,
+            })
+        return resultado
+
+    @staticmethod
+    def zerar_estatisticas() -> None:
+        CacheVersaoService._estatisticas.clear()
+        grupos = cache.get("estatisticas:grupos", set())
+        cache.delete_many(["estatisticas:grupos"] + CacheVersaoService._chaves_estatisticas(grupos))
@@ -0,0 +1,264 @@
+"""
+Service Layer para o planejamento de capacidade dos colaboradores
+Detecta sobreposição de tarefas e sobrealocação semanal (40h úteis) com
+uma varredura ordenada por colaborador
+"""
+import heapq
+from typing import Dict, Iterable, List, Optional
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+
+from django.utils import timezone
+
+from ..models import Colaborador, Tarefa
+
+
+class CapacidadeService:
+    """
+    Capacidade e sobrealocação dos colaboradores
+
+    As tarefas abertas do período são carregadas em uma única consulta e
+    ordenadas por (responsável, início). Uma varredura com heap dos términos
+    ativos encontra as sobreposições em O(n log n) por colaborador; as horas
+    planejadas são distribuídas pelas semanas proporcionalmente às horas úteis
+    de cada semana e comparadas com a capacidade semanal.
+    """
+
+    HORAS_SEMANA = Decimal("40.00")
+    STATUS_FECHADOS = ("concluida", "cancelada")
+    CAMPOS = (
+        "id", "titulo", "responsavel_id", "projeto_id", "projeto__nome",
+        "data_inicio_prevista", "data_termino_prevista", "horas_planejadas",
+    )
+
+    @staticmethod
+    def inicio_semana(valor) -> date:
+        """Segunda-feira da semana do valor (data ou datetime, no fuso local)"""
+        if isinstance(valor, datetime):
+            valor = timezone.localtime(valor).date() if timezone.is_aware(valor) else valor.date()
+        return valor - timedelta(days=valor.weekday())
+
+    @staticmethod
+    def _limite_semana(semana: date) -> datetime:
+        return timezone.make_aware(datetime.combine(semana, time.min))
+
+    @staticmethod
+    def tarefas_abertas(inicio: datetime, fim: datetime, colaboradores: Optional[Iterable[int]] = None,
+                        excluir: Optional[int] = None) -> List[Dict]:
+        """
+        Tarefas abertas com responsável que se sobrepõem a [inicio, fim)
+
+        Args:
+            inicio: Início do período
+            fim: Fim do período (exclusivo)
+            colaboradores: Restringe aos ids informados
+            excluir: Id de tarefa ignorada (a que está sendo editada)
+
+        Returns:
+            Lista de dicts (CAMPOS) ordenada por responsável e início
+        """
+        tarefas = (
+            Tarefa.objects.filter(
+                responsavel__isnull=False,
+                data_inicio_prevista__lt=fim,
+                data_termino_prevista__gt=inicio,
+            )
+            .exclude(status__in=CapacidadeService.STATUS_FECHADOS)
+            .exclude(status_sprint="finalizada")
+        )
+        if colaboradores is not None:
+            tarefas = tarefas.filter(responsavel_id__in=list(colaboradores))
+        if excluir:
+            tarefas = tarefas.exclude(pk=excluir)
+        return list(tarefas.order_by("responsavel_id", "data_inicio_prevista", "id").values(*CapacidadeService.CAMPOS))
+
+    @staticmethod
+    def sobreposicoes(tarefas: List[Dict]) -> List[Dict]:
+        """
+        Pares de tarefas do mesmo responsável com períodos sobrepostos
+
+        Args:
+            tarefas: Dicts de tarefas_abertas (responsavel_id, data_inicio_prevista,
+                data_termino_prevista); não precisam estar ordenados
+
+        Returns:
+            Lista de dicts com colaborador_id, tarefa (a que começou antes),
+            conflito, inicio e fim do trecho sobreposto
+        """
+        ordenadas = sorted(tarefas, key=lambda t: (t["responsavel_id"], t["data_inicio_prevista"], t["id"]))
+        resultado = []
+        ativas = []  # heap (término, id, tarefa) das tarefas em aberto do colaborador atual
+        colaborador_atual = None
+        for tarefa in ordenadas:
+            if tarefa["responsavel_id"] != colaborador_atual:
+                colaborador_atual, ativas = tarefa["responsavel_id"], []
+            inicio = tarefa["data_inicio_prevista"]
+            while ativas and ativas[0][0] <= inicio:
+                heapq.heappop(ativas)
+            for termino, _, anterior in ativas:
+                resultado.append({
+                    "colaborador_id": colaborador_atual,
+                    "tarefa": anterior,
+                    "conflito": tarefa,
+                    "inicio": inicio,
+                    "fim": min(termino, tarefa["data_termino_prevista"]),
+                })
+            heapq.heappush(ativas, (tarefa["data_termino_prevista"], tarefa["id"], tarefa))
+        return resultado
+
+    @staticmethod
+    def horas_por_semana(tarefa: Dict, semanas: List[date]) -> Dict[date, Decimal]:
+        """
+        Distribui as horas planejadas da tarefa pelas semanas informadas
+
+        A distribuição é proporcional às horas úteis (Tarefa.calcular_horas_dias_uteis)
+        de cada semana; tarefas sem horas úteis ficam inteiras na semana do início.
+        """
+        inicio, termino = tarefa["data_inicio_prevista"], tarefa["data_termino_prevista"]
+        calcular = Tarefa.calcular_horas_dias_uteis
+        local = timezone.localtime
+        horas_uteis = calcular(local(inicio), local(termino))
+        horas = tarefa["horas_planejadas"] if tarefa["horas_planejadas"] else horas_uteis
+
+        distribuicao = {}
+        if not horas_uteis:
+            semana = CapacidadeService.inicio_semana(inicio)
+            if semana in semanas:
+                distribuicao[semana] = Decimal(horas)
+            return distribuicao
+
+        primeira, ultima = CapacidadeService.inicio_semana(inicio), CapacidadeService.inicio_semana(termino)
+        for semana in semanas:
+            if semana < primeira or semana > ultima:
+                continue
+            de = max(inicio, CapacidadeService._limite_semana(semana))
+            ate = min(termino, CapacidadeService._limite_semana(semana + timedelta(days=7)))
+            uteis_semana = calcular(local(de), local(ate))
+            if uteis_semana:
+                distribuicao[semana] = (Decimal(horas) * uteis_semana / horas_uteis).quantize(Decimal("0.01"))
+        return distribuicao
+
+    @staticmethod
+    def nivel(utilizacao: Decimal) -> str:
+        """Faixa de utilização usada nas cores do mapa de calor"""
+        if utilizacao <= 0:
+            return "livre"
+        if utilizacao < 70:
+            return "baixa"
+        if utilizacao <= 100:
+            return "adequada"
+        return "sobrecarga"
+
+    @staticmethod
+    def _celula(semana: date, horas: Decimal) -> Dict:
+        utilizacao = (horas * 100 / CapacidadeService.HORAS_SEMANA).quantize(Decimal("0.1"))
+        return {
+            "semana": semana,
+            "horas": horas,
+            "capacidade": CapacidadeService.HORAS_SEMANA,
+            "excedente": max(horas - CapacidadeService.HORAS_SEMANA, Decimal("0.00")),
+            "utilizacao": utilizacao,
+            "nivel": CapacidadeService.nivel(utilizacao),
+        }
+
+    @staticmethod
+    def mapa_calor(inicio: date, quantidade_semanas: int = 8) -> Dict:
+        """
+        Utilização semanal de cada colaborador ativo (colaborador x semana)
+
+        Args:
+            inicio: Qualquer data da primeira semana
+            quantidade_semanas: Número de semanas exibidas
+
+        Returns:
+            Dict com semanas, linhas (colaborador, celulas, sobreposicoes,
+            total_horas) e totais de sobreposições e semanas sobrecarregadas
+        """
+        primeira = CapacidadeService.inicio_semana(inicio)
+        semanas = [primeira + timedelta(weeks=i) for i in range(quantidade_semanas)]
+        tarefas = CapacidadeService.tarefas_abertas(
+            CapacidadeService._limite_semana(semanas[0]),
+            CapacidadeService._limite_semana(semanas[-1] + timedelta(days=7)),
+        )
+        conflitos = CapacidadeService.sobreposicoes(tarefas)
+
+        horas = {}
+        for tarefa in tarefas:
+            por_semana = horas.setdefault(tarefa["responsavel_id"], {})
+            for semana, valor in CapacidadeService.horas_por_semana(tarefa, semanas).items():
+                por_semana[semana] = por_semana.get(semana, Decimal("0.00")) + valor
+        conflitos_por_colaborador = {}
+        for conflito in conflitos:
+            conflitos_por_colaborador.setdefault(conflito["colaborador_id"], []).append(conflito)
+
+        linhas = []
+        for colaborador in Colaborador.objects.filter(ativo=True).only("id", "nome_completo", "cargo"):
+            por_semana = horas.get(colaborador.pk, {})
+            celulas = [CapacidadeService._celula(semana, por_semana.get(semana, Decimal("0.00"))) for semana in semanas]
+            linhas.append({
+                "colaborador": colaborador,
+                "celulas": celulas,
+                "sobreposicoes": conflitos_por_colaborador.get(colaborador.pk, []),
+                "total_horas": sum((c["horas"] for c in celulas), Decimal("0.00")),
+            })
+        return {
+            "semanas": semanas,
+            "linhas": linhas,
+            "total_sobreposicoes": len(conflitos),
+            "semanas_sobrecarregadas": sum(
+                1 for linha in linhas for celula in linha["celulas"] if celula["nivel"] == "sobrecarga"
+            ),
+        }
+
+    @staticmethod
+    def verificar_alocacao(responsavel_id: int, data_inicio: datetime, data_termino: datetime,
+                           horas: Optional[Decimal] = None, tarefa_id: Optional[int] = None) -> Dict:
+        """
+        Avalia a atribuição de uma tarefa a um colaborador antes de gravá-la
+
+        Args:
+            responsavel_id: Colaborador que receberá a tarefa
+            data_inicio, data_termino: Período previsto da tarefa
+            horas: Horas planejadas (padrão: horas úteis do período)
+            tarefa_id: Tarefa em edição, desconsiderada na carga atual
+
+        Returns:
+            Dict com sobreposicoes (tarefas conflitantes), semanas (apenas as
+            sobrecarregadas, já com a nova tarefa) e alerta
+        """
+        candidata = {
+            "id": tarefa_id or 0,
+            "titulo": "",
+            "responsavel_id": responsavel_id,
+            "projeto_id": None,
+            "projeto__nome": "",
+            "data_inicio_prevista": data_inicio,
+            "data_termino_prevista": data_termino,
+            "horas_planejadas": horas,
+        }
+        primeira, ultima = CapacidadeService.inicio_semana(data_inicio), CapacidadeService.inicio_semana(data_termino)
+        semanas = [primeira + timedelta(weeks=i) for i in range((ultima - primeira).days // 7 + 1)]
+        tarefas = CapacidadeService.tarefas_abertas(
+            CapacidadeService._limite_semana(primeira),
+            CapacidadeService._limite_semana(ultima + timedelta(days=7)),
+            colaboradores=[responsavel_id],
+            excluir=tarefa_id,
+        )
+
+        conflitos = [
+            tarefa for tarefa in tarefas
+            if tarefa["data_inicio_prevista"] < data_termino and tarefa["data_termino_prevista"] > data_inicio
+        ]
+        carga = {}
+        for tarefa in tarefas + [candidata]:
+            for semana, valor in CapacidadeService.horas_por_semana(tarefa, semanas).items():
+                carga[semana] = carga.get(semana, Decimal("0.00")) + valor
+        sobrecarregadas = [
+            celula for celula in (CapacidadeService._celula(semana, valor) for semana, valor in sorted(carga.items()))
+            if celula["nivel"] == "sobrecarga"
+        ]
+        return {
+            "sobreposicoes": conflitos,
+            "semanas": sobrecarregadas,
+            "alerta": bool(conflitos or sobrecarregadas),
+        }
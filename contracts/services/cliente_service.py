@@ -0,0 +1,50 @@
+"""
+Service Layer para clientes
+Relatório dos cadastros que coincidem pelo CNPJ/CPF normalizado (somente dígitos)
+"""
+from collections import defaultdict
+from typing import Dict, List
+
+from django.db.models import Count
+
+from ..models import Cliente, normalizar_documento
+
+
+class ClienteService:
+    """
+    Deduplicação de clientes pela chave cnpj_normalizado
+
+    A chave é única: ao criá-la, o cliente mais antigo de cada CNPJ/CPF ficou
+    com ela e os demais cadastros do mesmo documento (formatação diferente,
+    ex.: "11.111.111/0001-11" e "11111111000111") ficaram sem chave. Estes
+    são os duplicados a revisar e mesclar.
+    """
+
+    @staticmethod
+    def duplicados() -> List[Dict]:
+        """
+        Grupos de clientes com o mesmo CNPJ/CPF normalizado
+
+        Returns:
+            Lista de dicts com documento, principal (Cliente com a chave) e
+            duplicados (Clientes sem a chave), anotados com num_contratos
+        """
+        por_documento = defaultdict(list)
+        sem_chave = Cliente.objects.filter(cnpj_normalizado__isnull=True).annotate(num_contratos=Count("contratos"))
+        for cliente in sem_chave.order_by("pk"):
+            documento = normalizar_documento(cliente.cnpj_cpf)
+            if documento:
+                por_documento[documento].append(cliente)
+        if not por_documento:
+            return []
+
+        principais = {
+            cliente.cnpj_normalizado: cliente
+            for cliente in Cliente.objects.filter(cnpj_normalizado__in=list(por_documento)).annotate(
+                num_contratos=Count("contratos")
+            )
+        }
+        return [
+            {"documento": documento, "principal": principais.get(documento), "duplicados": clientes}
+            for documento, clientes in sorted(por_documento.items())
+        ]
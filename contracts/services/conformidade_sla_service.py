@@ -0,0 +1,425 @@
+"""
+Service Layer para a conformidade dos SLAs importantes
+Importa incidentes (IncidenteSLA), calcula tempos em horas úteis e violações de
+forma vetorizada (NumPy) e materializa a conformidade mensal (ConformidadeSLA)
+"""
+from __future__ import annotations
+
+import csv
+import io
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+from dateutil.relativedelta import relativedelta
+from django.db import transaction
+from django.db.models import Avg, Count, DateField, Q
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from ..models import ConformidadeSLA, Contrato, IncidenteSLA, SLAImportante
+from .cache_versao_service import CacheVersaoService
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+class ConformidadeSLAService:
+    """
+    Motor de conformidade dos SLAs importantes
+
+    Os incidentes pendentes de cálculo (novos, alterados ou ainda em aberto)
+    são lidos em uma consulta e convertidos em arrays; as horas úteis até a
+    resposta e até a solução saem da diferença entre os minutos úteis
+    acumulados (np.busday_count) de cada instante. Os meses afetados são
+    reagregados em ConformidadeSLA, que as páginas de contrato leem prontas.
+    """
+
+    # Expediente de Tarefa.calcular_horas_dias_uteis (minutos desde 00:00)
+    INICIO_MANHA, FIM_MANHA = 9 * 60, 12 * 60
+    INICIO_TARDE, FIM_TARDE = 14 * 60, 19 * 60
+    MINUTOS_DIA = (FIM_MANHA - INICIO_MANHA) + (FIM_TARDE - INICIO_TARDE)
+    FERIADOS: Tuple[str, ...] = ()
+    JANELAS = (30, 90)
+    # Segunda-feira de referência para a contagem de dias úteis
+    _BASE = "2000-01-03"
+
+    FORMATOS_DATA = ("%d/%m/%Y %H:%M:%S", "%d/%m/%Y %H:%M", "%d/%m/%Y")
+
+    @staticmethod
+    def _instantes(valores: Iterable[Optional[datetime]]) -> np.ndarray:
+        """Datetimes (aware) no horário local como datetime64[m]; None vira NaT"""
+        import numpy as np
+        return np.array(
+            [timezone.localtime(v).replace(tzinfo=None) if v else None for v in valores],
+            dtype="datetime64[m]",
+        )
+
+    @staticmethod
+    def minutos_uteis(instantes: np.ndarray) -> np.ndarray:
+        """Minutos de expediente decorridos desde _BASE até cada instante (sem NaT)"""
+        import numpy as np
+        dia = instantes.astype("datetime64[D]")
+        minuto = (instantes - dia).astype(np.int64)
+        feriados = list(ConformidadeSLAService.FERIADOS)
+        dias_uteis = np.busday_count(ConformidadeSLAService._BASE, dia, holidays=feriados)
+        no_dia = (
+            np.clip(minuto, ConformidadeSLAService.INICIO_MANHA, ConformidadeSLAService.FIM_MANHA)
+            - ConformidadeSLAService.INICIO_MANHA
+            + np.clip(minuto, ConformidadeSLAService.INICIO_TARDE, ConformidadeSLAService.FIM_TARDE)
+            - ConformidadeSLAService.INICIO_TARDE
+        )
+        return dias_uteis * ConformidadeSLAService.MINUTOS_DIA + np.where(
+            np.is_busday(dia, holidays=feriados), no_dia, 0
+        )
+
+    @staticmethod
+    def horas_uteis(inicio: np.ndarray, fim: np.ndarray) -> np.ndarray:
+        """Horas úteis entre os instantes; NaN onde fim é NaT"""
+        import numpy as np
+        horas = np.full(len(inicio), np.nan)
+        validos = ~np.isnat(fim) & ~np.isnat(inicio)
+        if validos.any():
+            minutos = ConformidadeSLAService.minutos_uteis
+            horas[validos] = np.maximum(minutos(fim[validos]) - minutos(inicio[validos]), 0) / 60.0
+        return horas
+
+    @staticmethod
+    def calcular(registros: List[tuple], agora: datetime) -> Dict[str, np.ndarray]:
+        """
+        Tempos e violações dos incidentes
+
+        Args:
+            registros: Tuplas (aberto_em, respondido_em, resolvido_em,
+                meta_resposta_horas, meta_solucao_horas)
+            agora: Instante de referência para os incidentes em aberto
+
+        Returns:
+            Dict com horas_resposta e horas_solucao (NaN se ainda não ocorreram),
+            violou_resposta e violou_solucao (booleanos)
+        """
+        import numpy as np
+        n = len(registros)
+        aberto = ConformidadeSLAService._instantes(r[0] for r in registros)
+        # Sem resposta registrada, a solução conta como resposta
+        respondido = ConformidadeSLAService._instantes(r[1] or r[2] for r in registros)
+        resolvido = ConformidadeSLAService._instantes(r[2] for r in registros)
+        meta_resposta = np.fromiter((r[3] or 0 for r in registros), dtype=float, count=n)
+        meta_solucao = np.fromiter((r[4] or 0 for r in registros), dtype=float, count=n)
+        referencia = ConformidadeSLAService._instantes([agora])[0]
+
+        horas_resposta = ConformidadeSLAService.horas_uteis(aberto, respondido)
+        horas_solucao = ConformidadeSLAService.horas_uteis(aberto, resolvido)
+        # Em aberto: o tempo decorrido até agora já pode ter estourado a meta
+        decorrido = ConformidadeSLAService.horas_uteis(aberto, np.full(n, referencia))
+        return {
+            "horas_resposta": horas_resposta,
+            "horas_solucao": horas_solucao,
+            "violou_resposta": (meta_resposta > 0) & (np.where(np.isnan(horas_resposta), decorrido, horas_resposta) > meta_resposta),
+            "violou_solucao": (meta_solucao > 0) & (np.where(np.isnan(horas_solucao), decorrido, horas_solucao) > meta_solucao),
+        }
+
+    @staticmethod
+    def processar(agora: Optional[datetime] = None, sla_ids: Optional[Iterable[int]] = None,
+                  completo: bool = False) -> Dict[str, int]:
+        """
+        Calcula os incidentes pendentes e regrava a conformidade dos meses afetados
+
+        Args:
+            agora: Instante de referência (padrão: agora)
+            sla_ids: Restringe aos SLAs importantes informados
+            completo: Recalcula todos os incidentes, não só os pendentes e em aberto
+
+        Returns:
+            Dict com incidentes (avaliados), atualizados e meses (regravados)
+        """
+        import numpy as np
+        agora = agora or timezone.now()
+        incidentes = IncidenteSLA.objects.all()
+        if sla_ids is not None:
+            incidentes = incidentes.filter(sla_id__in=list(sla_ids))
+        if not completo:
+            incidentes = incidentes.filter(Q(calculado_em__isnull=True) | Q(resolvido_em__isnull=True))
+        registros = list(incidentes.values_list(
+            "id", "sla_id", "aberto_em", "respondido_em", "resolvido_em",
+            "sla__tempo_resposta_horas", "sla__tempo_solucao_horas",
+            "horas_resposta", "horas_solucao", "violou_resposta", "violou_solucao", "calculado_em",
+        ))
+        resultado = {"incidentes": len(registros), "atualizados": 0, "meses": 0}
+        if not registros:
+            return resultado
+
+        calculo = ConformidadeSLAService.calcular([r[2:7] for r in registros], agora)
+
+        def decimal(valor):
+            return None if np.isnan(valor) else Decimal(str(round(float(valor), 2)))
+
+        alterados, pares = [], set()
+        for i, registro in enumerate(registros):
+            valores = (
+                decimal(calculo["horas_resposta"][i]), decimal(calculo["horas_solucao"][i]),
+                bool(calculo["violou_resposta"][i]), bool(calculo["violou_solucao"][i]),
+            )
+            if registro[11] is not None and valores == tuple(registro[7:11]):
+                continue
+            alterados.append(IncidenteSLA(
+                pk=registro[0], horas_resposta=valores[0], horas_solucao=valores[1],
+                violou_resposta=valores[2], violou_solucao=valores[3], calculado_em=agora,
+            ))
+            pares.add((registro[1], timezone.localtime(registro[2]).date().replace(day=1)))
+
+        with transaction.atomic():
+            IncidenteSLA.objects.bulk_update(
+                alterados,
+                ["horas_resposta", "horas_solucao", "violou_resposta", "violou_solucao", "calculado_em"],
+                batch_size=1000,
+            )
+            resultado["atualizados"] = len(alterados)
+            resultado["meses"] = ConformidadeSLAService.materializar(pares, agora)
+        return resultado
+
+    @staticmethod
+    def materializar(pares: Iterable[Tuple[int, date]], agora: Optional[datetime] = None) -> int:
+        """
+        Regrava ConformidadeSLA dos pares (sla_id, mês) informados
+
+        Returns:
+            Quantidade de registros mensais gravados
+        """
+        pares = set(pares)
+        if not pares:
+            return 0
+        agora = agora or timezone.now()
+        sla_ids = {sla_id for sla_id, _ in pares}
+        meses = {mes for _, mes in pares}
+        inicio = timezone.make_aware(datetime.combine(min(meses), datetime.min.time()))
+        fim = timezone.make_aware(datetime.combine(max(meses) + timedelta(days=32), datetime.min.time()))
+
+        avaliado = Q(resolvido_em__isnull=False) | Q(violou_resposta=True) | Q(violou_solucao=True)
+        agregados = (
+            IncidenteSLA.objects.filter(sla_id__in=sla_ids, aberto_em__gte=inicio, aberto_em__lt=fim)
+            .annotate(mes=TruncMonth("aberto_em", output_field=DateField()))
+            .values("sla_id", "contrato_id", "mes")
+            .annotate(
+                total=Count("id"),
+                avaliados=Count("id", filter=avaliado),
+                conformes=Count("id", filter=avaliado & Q(violou_resposta=False, violou_solucao=False)),
+                com_violacao_resposta=Count("id", filter=Q(violou_resposta=True)),
+                com_violacao_solucao=Count("id", filter=Q(violou_solucao=True)),
+                resposta_media=Avg("horas_resposta"),
+                solucao_media=Avg("horas_solucao"),
+            )
+            .order_by()
+        )
+
+        def arredondar(valor):
+            return None if valor is None else Decimal(str(valor)).quantize(Decimal("0.01"))
+
+        novos = [
+            ConformidadeSLA(
+                sla_id=linha["sla_id"],
+                contrato_id=linha["contrato_id"],
+                mes=linha["mes"],
+                total_incidentes=linha["total"],
+                incidentes_avaliados=linha["avaliados"],
+                incidentes_conformes=linha["conformes"],
+                violacoes_resposta=linha["com_violacao_resposta"],
+                violacoes_solucao=linha["com_violacao_solucao"],
+                percentual_conformidade=(
+                    arredondar(linha["conformes"] * 100 / linha["avaliados"]) if linha["avaliados"] else None
+                ),
+                horas_resposta_media=arredondar(linha["resposta_media"]),
+                horas_solucao_media=arredondar(linha["solucao_media"]),
+                calculado_em=agora,
+            )
+            for linha in agregados
+            if (linha["sla_id"], linha["mes"]) in pares
+        ]
+        with transaction.atomic():
+            # Meses sem incidentes restantes simplesmente deixam de existir
+            ConformidadeSLA.objects.filter(
+                Q(*[Q(sla_id=sla_id, mes=mes) for sla_id, mes in pares], _connector=Q.OR)
+            ).delete()
+            ConformidadeSLA.objects.bulk_create(novos, batch_size=1000)
+            CacheVersaoService.incrementar(
+                "contrato", *SLAImportante.objects.filter(pk__in=sla_ids).values_list("contrato_id", flat=True)
+            )
+        return len(novos)
+
+    @staticmethod
+    def conformidade_movel(hoje: Optional[date] = None,
+                           contrato_ids: Optional[Iterable[int]] = None) -> Dict[int, List[Dict]]:
+        """
+        Conformidade nas janelas móveis (JANELAS, em dias) de cada contrato
+
+        Lê os campos já calculados dos incidentes abertos na maior janela e
+        soma por contrato e janela com np.bincount.
+
+        Returns:
+            Dict {contrato_id: [{janela, incidentes, avaliados, conformes, violacoes, percentual}]}
+        """
+        import numpy as np
+        hoje = hoje or timezone.localdate()
+        maior = max(ConformidadeSLAService.JANELAS)
+        desde = timezone.make_aware(datetime.combine(hoje - timedelta(days=maior - 1), datetime.min.time()))
+        incidentes = IncidenteSLA.objects.filter(aberto_em__gte=desde)
+        if contrato_ids is not None:
+            incidentes = incidentes.filter(contrato_id__in=list(contrato_ids))
+        registros = list(incidentes.values_list(
+            "contrato_id", "aberto_em", "resolvido_em", "violou_resposta", "violou_solucao"
+        ))
+        if not registros:
+            return {}
+
+        n = len(registros)
+        contratos, grupo = np.unique(np.fromiter((r[0] for r in registros), dtype=np.int64, count=n),
+                                     return_inverse=True)
+        dia = ConformidadeSLAService._instantes(r[1] for r in registros).astype("datetime64[D]")
+        idade = (np.datetime64(hoje, "D") - dia).astype(np.int64)
+        violou = np.fromiter((r[3] or r[4] for r in registros), dtype=bool, count=n)
+        avaliado = violou | np.fromiter((r[2] is not None for r in registros), dtype=bool, count=n)
+
+        resultado = {int(contrato_id): [] for contrato_id in contratos}
+        for janela in ConformidadeSLAService.JANELAS:
+            na_janela = idade < janela
+
+            def somar(flags):
+                return np.bincount(grupo, weights=flags & na_janela, minlength=len(contratos))
+
+            total, avaliados = somar(np.ones(n, dtype=bool)), somar(avaliado)
+            conformes, violacoes = somar(avaliado & ~violou), somar(violou)
+            for i, contrato_id in enumerate(contratos):
+                resultado[int(contrato_id)].append({
+                    "janela": janela,
+                    "incidentes": int(total[i]),
+                    "avaliados": int(avaliados[i]),
+                    "conformes": int(conformes[i]),
+                    "violacoes": int(violacoes[i]),
+                    "percentual": round(conformes[i] * 100 / avaliados[i], 2) if avaliados[i] else None,
+                })
+        return resultado
+
+    @staticmethod
+    def resumo_contrato(contrato: Contrato, hoje: Optional[date] = None, meses: int = 12) -> Dict:
+        """Janelas móveis e conformidade mensal materializada de um contrato (página do contrato)"""
+        hoje = hoje or timezone.localdate()
+        janelas = ConformidadeSLAService.conformidade_movel(hoje, [contrato.pk]).get(contrato.pk)
+        return {
+            "janelas": janelas or [],
+            "mensal": list(
+                ConformidadeSLA.objects.filter(
+                    contrato=contrato, mes__gte=hoje.replace(day=1) - relativedelta(months=meses - 1)
+                ).select_related("sla").order_by("-mes", "sla__nome")
+            ),
+        }
+
+    @staticmethod
+    def _data_hora(valor) -> Optional[datetime]:
+        """Aceita datetime, ISO 8601 ou dd/mm/aaaa [hh:mm[:ss]]; sem fuso assume o horário local"""
+        if valor in (None, ""):
+            return None
+        if isinstance(valor, datetime):
+            resultado = valor
+        else:
+            texto = str(valor).strip()
+            try:
+                resultado = datetime.fromisoformat(texto.replace("Z", "+00:00"))
+            except ValueError:
+                for formato in ConformidadeSLAService.FORMATOS_DATA:
+                    try:
+                        resultado = datetime.strptime(texto, formato)
+                        break
+                    except ValueError:
+                        continue
+                else:
+                    raise ValueError(f"data/hora inválida: {texto}")
+        if timezone.is_naive(resultado):
+            resultado = timezone.make_aware(resultado)
+        return resultado
+
+    @staticmethod
+    def ler_csv(conteudo: str) -> List[Dict]:
+        """Linhas do CSV (separador ; ou ,) como dicts com cabeçalhos em minúsculas"""
+        conteudo = conteudo.lstrip("\ufeff")
+        primeira = conteudo.split("\n", 1)[0]
+        delimitador = ";" if primeira.count(";") > primeira.count(",") else ","
+        leitor = csv.DictReader(io.StringIO(conteudo), delimiter=delimitador)
+        return [
+            {(chave or "").strip().lower(): (valor or "").strip() for chave, valor in linha.items()}
+            for linha in leitor
+        ]
+
+    @staticmethod
+    def importar(contrato: Contrato, registros: List[Dict]) -> Dict:
+        """
+        Importa incidentes do contrato (inclusão ou atualização por SLA + identificador)
+
+        Args:
+            contrato: Contrato dos SLAs importantes
+            registros: Dicts com sla (id ou nome), identificador, aberto_em,
+                respondido_em, resolvido_em e descricao (opcional)
+
+        Returns:
+            Dict com criados, atualizados, erros (lista de mensagens) e o
+            resultado do processamento de conformidade
+        """
+        slas = {}
+        for sla in contrato.slas_importantes.all():
+            slas[str(sla.pk)] = sla
+            slas[sla.nome.strip().lower()] = sla
+
+        lidos, erros = {}, []
+        for linha, registro in enumerate(registros, start=1):
+            try:
+                if not isinstance(registro, dict):
+                    raise ValueError("registro deve ser um objeto JSON")
+                sla = slas.get(str(registro.get("sla", "")).strip().lower())
+                if sla is None:
+                    raise ValueError(f"SLA '{registro.get('sla', '')}' não pertence ao contrato")
+                identificador = str(registro.get("identificador") or "").strip()
+                if not identificador:
+                    raise ValueError("identificador não informado")
+                aberto_em = ConformidadeSLAService._data_hora(registro.get("aberto_em"))
+                if aberto_em is None:
+                    raise ValueError("aberto_em não informado")
+                respondido_em = ConformidadeSLAService._data_hora(registro.get("respondido_em"))
+                resolvido_em = ConformidadeSLAService._data_hora(registro.get("resolvido_em"))
+                if any(instante and instante < aberto_em for instante in (respondido_em, resolvido_em)):
+                    raise ValueError("resposta/solução anterior à abertura")
+            except ValueError as e:
+                erros.append(f"Registro {linha}: {e}")
+                continue
+            lidos[(sla.pk, identificador[:100])] = {
+                "descricao": str(registro.get("descricao") or "")[:255],
+                "aberto_em": aberto_em,
+                "respondido_em": respondido_em,
+                "resolvido_em": resolvido_em,
+            }
+
+        existentes = {
+            (incidente.sla_id, incidente.identificador): incidente
+            for incidente in IncidenteSLA.objects.filter(
+                contrato=contrato, identificador__in={identificador for _, identificador in lidos}
+            )
+        }
+        novos, alterados, meses_anteriores = [], [], set()
+        for (sla_id, identificador), valores in lidos.items():
+            incidente = existentes.get((sla_id, identificador))
+            if incidente is None:
+                novos.append(IncidenteSLA(contrato=contrato, sla_id=sla_id, identificador=identificador, **valores))
+                continue
+            # O mês de abertura anterior também precisa ser reagregado
+            meses_anteriores.add((sla_id, timezone.localtime(incidente.aberto_em).date().replace(day=1)))
+            for campo, valor in valores.items():
+                setattr(incidente, campo, valor)
+            incidente.calculado_em = None
+            alterados.append(incidente)
+
+        with transaction.atomic():
+            IncidenteSLA.objects.bulk_create(novos, batch_size=1000)
+            IncidenteSLA.objects.bulk_update(
+                alterados, ["descricao", "aberto_em", "respondido_em", "resolvido_em", "calculado_em"], batch_size=1000
+            )
+        conformidade = ConformidadeSLAService.processar(sla_ids={sla_id for sla_id, _ in lidos})
+        ConformidadeSLAService.materializar(meses_anteriores)
+        return {"criados": len(novos), "atualizados": len(alterados), "erros": erros, "conformidade": conformidade}
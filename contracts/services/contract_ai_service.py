@@ -415,7 +415,10 @@ REGRAS IMPORTANTES:
         if registros.get('clientes'):
             texto += "CLIENTES CADASTRADOS:\n"
             for cliente in registros['clientes']:
-                texto += f"- ID: {cliente['id']}, Nome: {cliente['nome_razao_social']}, CNPJ/CPF: {cliente['cnpj_cpf']}, Tipo: {cliente['tipo_cliente']}\n"
+                texto += f"- ID: {cliente['id']}, Nome: {cliente['nome_razao_social']}, CNPJ/CPF: {cliente['cnpj_cpf']}, Tipo: {cliente['tipo_cliente']}"
+                if 'similaridade' in cliente:
+                    texto += f" (candidato, similaridade {cliente['similaridade']:.2f})"
+                texto += "\n"
                 if cliente.get('contatos'):
                     texto += "  Contatos:\n"
                     for contato in cliente['contatos']:
@@ -424,7 +427,10 @@ REGRAS IMPORTANTES:
         if registros.get('contratos'):
             texto += "\nCONTRATOS CADASTRADOS:\n"
             for contrato in registros['contratos']:
-                texto += f"- ID: {contrato['id']}, Número: {contrato['numero_contrato']}, Cliente: {contrato['cliente']}\n"
+                texto += f"- ID: {contrato['id']}, Número: {contrato['numero_contrato']}, Cliente: {contrato['cliente']}"
+                if 'similaridade' in contrato:
+                    texto += f" (candidato, similaridade {contrato['similaridade']:.2f})"
+                texto += "\n"
                 texto += f"  Objeto: {contrato['objeto']}\n"
                 if contrato.get('itens'):
                     texto += "  Itens:\n"
@@ -474,15 +480,22 @@ class ContractAIService:
             textos_por_tipo = {}
             textos_consolidados = []
             
-            for documento in analise.documentos.all():
+            for documento in analise.documentos.select_related('conteudo'):
                 try:
                     documento.status = 'processando'
                     documento.save(update_fields=['status'])
                     
-                    file_path = documento.arquivo.path
-                    texto = self.extractor.extract_text(file_path)
-                    # Sanitiza novamente antes de salvar (garantia extra)
-                    texto = DocumentExtractor.sanitize_text(texto)
+                    if documento.conteudo_id and documento.conteudo.texto_extraido:
+                        # Conteúdo idêntico já extraído em outra análise
+                        texto = documento.conteudo.texto_extraido
+                    else:
+                        file_path = documento.arquivo.path
+                        texto = self.extractor.extract_text(file_path)
+                        # Sanitiza novamente antes de salvar (garantia extra)
+                        texto = DocumentExtractor.sanitize_text(texto)
+                        if documento.conteudo_id:
+                            from contracts.services.arquivo_conteudo_service import ArquivoConteudoService
+                            ArquivoConteudoService.guardar_texto(documento.conteudo_id, texto)
                     documento.texto_extraido = texto
                     documento.status = 'analisado'
                     documento.save(update_fields=['texto_extraido', 'status'])
@@ -593,8 +606,33 @@ class ContractAIService:
                 ]
             })
         
-        # Busca clientes similares por CNPJ parcial (se houver número de contrato na análise)
-        # Isso ajuda a identificar possíveis matches mesmo sem CNPJ completo
+        # Candidatos por similaridade (TF-IDF sobre nome/CNPJ, número, objeto e itens)
+        from contracts.services.similaridade_service import SimilaridadeService
+        candidatos = SimilaridadeService.candidatos(analise.texto_consolidado or '')
+        vinculados = {
+            'clientes': {c['id'] for c in registros['clientes']},
+            'contratos': {c['id'] for c in registros['contratos']},
+        }
+        similaridade = {
+            tipo: {c['id']: c for c in lista if c['id'] not in vinculados[tipo]}
+            for tipo, lista in candidatos.items()
+        }
+        for cliente in Cliente.objects.filter(pk__in=similaridade['clientes']):
+            registros['clientes'].append({
+                'id': cliente.id,
+                'nome_razao_social': cliente.nome_razao_social,
+                'cnpj_cpf': cliente.cnpj_cpf,
+                'tipo_cliente': cliente.tipo_cliente,
+                'similaridade': similaridade['clientes'][cliente.id]['similaridade'],
+            })
+        for contrato in Contrato.objects.filter(pk__in=similaridade['contratos']).select_related('cliente'):
+            registros['contratos'].append({
+                'id': contrato.id,
+                'numero_contrato': contrato.numero_contrato,
+                'cliente': contrato.cliente.nome_razao_social,
+                'objeto': contrato.objeto[:200] if contrato.objeto else '',
+                'similaridade': similaridade['contratos'][contrato.id]['similaridade'],
+            })
         
         return registros
     
@@ -623,8 +661,7 @@ class ContractAIService:
         
         # Se não encontrou, busca por CNPJ do cliente
         if not contrato and cnpj_cliente:
-            cnpj_limpo = cnpj_cliente.replace('.', '').replace('/', '').replace('-', '')
-            cliente = Cliente.objects.filter(cnpj_cpf=cnpj_limpo).first()
+            cliente = Cliente.objects.por_documento(cnpj_cliente).first()
             if cliente:
                 # Busca o contrato mais recente do cliente
                 contrato = cliente.contratos.order_by('-data_assinatura').first()
@@ -634,7 +671,7 @@ class ContractAIService:
     @staticmethod
     def create_cliente_from_data(dados: Dict[str, Any], user=None, cliente_existente=None):
         """Cria ou retorna um Cliente a partir dos dados extraídos"""
-        from contracts.models import Cliente
+        from contracts.models import Cliente, normalizar_documento
         
         # Se já existe um cliente, retorna ele
         if cliente_existente:
@@ -645,9 +682,9 @@ class ContractAIService:
             return None
         
         # Verifica se já existe pelo CNPJ
-        cnpj = cliente_data.get('cnpj_cpf', '').replace('.', '').replace('/', '').replace('-', '')
+        cnpj = normalizar_documento(cliente_data.get('cnpj_cpf'))
         if cnpj:
-            existing = Cliente.objects.filter(cnpj_cpf=cnpj).first()
+            existing = Cliente.objects.por_documento(cnpj).first()
             if existing:
                 return existing
         
@@ -1685,331 +1722,201 @@ Documento do Contrato:
         return sprints_data
     
     @staticmethod
-    def criar_projeto_sprints_tarefas(plano, usuario):
+    def sprints_do_processo_execucao(plano):
         """
-        Cria projeto, sprints e tarefas automaticamente após aprovação do plano
-        REGRA IMPORTANTE: Cada item de software, hardware ou solução deve ter sprints para:
-        - Planejamento
-        - Implantação
-        - Execução
-        - Suporte
+        Sprints (com tarefas) descritas nas etapas do processo_execucao do plano
         
-        O objetivo é que todos os itens cheguem à fase de Suporte (implantados e em uso)
+        Etapas sem data recebem início após a etapa anterior e duração de
+        duracao_dias/duracao_semanas (padrão: 2 semanas).
         
         Args:
             plano: Instância de PlanoTrabalho
-            usuario: Usuário que aprovou
+            
+        Returns:
+            Lista de dicionários com nome, objetivo, data_inicio, data_fim e tarefas
         """
-        from contracts.models import Projeto, Sprint, Tarefa
-        from datetime import datetime, timedelta
-        from decimal import Decimal
-        
-        logger.info(f"Iniciando criação de projeto/sprints/tarefas para plano {plano.pk}")
+        from datetime import timedelta
+        from .materializacao_projeto_service import MaterializacaoProjetoService
         
-        # Busca sprints do plano aprovado
+        parse_data = MaterializacaoProjetoService.parse_data
         sprints_data = []
+        processo_execucao = plano.processo_execucao or []
+        logger.info(f"Processo execução tem {len(processo_execucao)} etapas")
         
-        # NOVA LÓGICA: Gera sprints baseadas nos itens do contrato
-        itens_produto = plano.contrato.itens.filter(tipo__in=['software', 'hardware', 'solucao'])
-        
-        if itens_produto.exists():
-            logger.info(f"Gerando sprints baseadas em {itens_produto.count()} itens do contrato")
-            sprints_data = ContractAIService.gerar_sprints_por_item_contrato(
-                plano.contrato,
-                plano.data_inicio_prevista
-            )
-        
-        # Fallback: Verifica se processo_execucao existe e não está vazio
-        if not sprints_data:
-            processo_execucao = plano.processo_execucao
-            if not processo_execucao:
-                processo_execucao = []
+        dias_acumulados = 0
+        for idx, etapa in enumerate(processo_execucao):
+            logger.info(f"Processando etapa {idx + 1}: {etapa.get('nome', etapa.get('etapa', 'Sem nome'))}")
+            data_inicio_sprint = parse_data(etapa.get('data_inicio'))
+            data_fim_sprint = parse_data(etapa.get('data_fim'))
             
-            logger.info(f"Processo execução tem {len(processo_execucao)} etapas (usando fallback)")
+            # Se as datas não puderem ser parseadas, calcula baseado na duração
+            if not data_inicio_sprint and plano.data_inicio_prevista:
+                data_inicio_sprint = plano.data_inicio_prevista + timedelta(days=dias_acumulados)
             
-            # Prioriza fluxo_trabalho_fases (formato melhorado com melhores práticas)
-            if processo_execucao and len(processo_execucao) > 0:
-                # Processa processo_execucao que já contém as sprints estruturadas
-                dias_acumulados = 0
-                for idx, etapa in enumerate(processo_execucao):
-                    logger.info(f"Processando etapa {idx + 1}: {etapa.get('nome', etapa.get('etapa', 'Sem nome'))}")
-                # Garante que 'tarefas' é uma lista, mesmo que vazia
-                tarefas_etapa = etapa.get('tarefas', []) or []
-                
-                # Converte as datas para objetos date
-                data_inicio_str = etapa.get('data_inicio')
-                data_fim_str = etapa.get('data_fim')
-                
-                data_inicio_sprint = None
-                data_fim_sprint = None
-                
-                if data_inicio_str:
-                    try:
-                        if isinstance(data_inicio_str, str):
-                            data_inicio_sprint = datetime.strptime(data_inicio_str, '%Y-%m-%d').date()
-                        else:
-                            data_inicio_sprint = data_inicio_str
-                    except (ValueError, TypeError):
-                        logger.warning(f"Data de início inválida para sprint: {data_inicio_str}")
-                
-                if data_fim_str:
-                    try:
-                        if isinstance(data_fim_str, str):
-                            data_fim_sprint = datetime.strptime(data_fim_str, '%Y-%m-%d').date()
-                        else:
-                            data_fim_sprint = data_fim_str
-                    except (ValueError, TypeError):
-                        logger.warning(f"Data de fim inválida para sprint: {data_fim_str}")
-
-                # Se as datas não puderem ser parseadas, calcula baseado na duração
-                if not data_inicio_sprint and plano.data_inicio_prevista:
-                    data_inicio_sprint = plano.data_inicio_prevista + timedelta(days=dias_acumulados)
-                
-                if not data_fim_sprint and data_inicio_sprint:
-                    duracao = etapa.get('duracao_dias', 14)  # Padrão de 2 semanas
-                    # Se tiver duracao_semanas, converte para dias
-                    if 'duracao_semanas' in etapa:
-                        duracao = etapa.get('duracao_semanas', 2) * 7
-                    data_fim_sprint = data_inicio_sprint + timedelta(days=duracao)
-                
-                if data_inicio_sprint and data_fim_sprint:
-                    sprints_data.append({
-                        'nome': etapa.get('nome', etapa.get('etapa', 'Sprint')),
-                        'objetivo': etapa.get('objetivo', etapa.get('descricao', '')),
-                        'data_inicio': data_inicio_sprint.isoformat(),
-                        'data_fim': data_fim_sprint.isoformat(),
-                        'tarefas': tarefas_etapa
-                    })
-                    # Atualiza dias acumulados para próxima sprint
-                    dias_acumulados = (data_fim_sprint - plano.data_inicio_prevista).days
-                else:
-                    logger.warning(f"Não foi possível determinar datas para a sprint: {etapa.get('nome')}")
-            
-            # Fallback: busca da análise original se processo_execucao estiver vazio
-            if not sprints_data:
-                analise = plano.contrato.analises_origem.first()
-                if analise and analise.dados_extraidos:
-                    fluxo_fases = analise.dados_extraidos.get('fluxo_trabalho_fases', [])
-                    if fluxo_fases:
-                        dias_acumulados = 0
-                        for fase_data in fluxo_fases:
-                            sprints_fase = fase_data.get('sprints', [])
-                            
-                            for sprint in sprints_fase:
-                                # Calcula datas se não estiverem definidas
-                                if not sprint.get('data_inicio') or not sprint.get('data_fim'):
-                                    data_inicio = plano.data_inicio_prevista + timedelta(days=dias_acumulados)
-                                # Usa duracao_semanas se disponível, senão duracao_dias, senão padrão 14 dias
-                                duracao_semanas = sprint.get('duracao_semanas', 2)
-                                duracao = sprint.get('duracao_dias', duracao_semanas * 7)
-                                data_fim = data_inicio + timedelta(days=duracao)
-                                sprint['data_inicio'] = data_inicio.isoformat()
-                                sprint['data_fim'] = data_fim.isoformat()
-                                dias_acumulados += duracao
-                            else:
-                                # Se já tem datas, calcula dias acumulados para próxima sprint
-                                try:
-                                    data_inicio = datetime.strptime(sprint['data_inicio'], '%Y-%m-%d').date()
-                                    data_fim = datetime.strptime(sprint['data_fim'], '%Y-%m-%d').date()
-                                    dias_acumulados = (data_fim - plano.data_inicio_prevista).days
-                                except (ValueError, TypeError) as e:
-                                    logger.warning(f"Erro ao parsear datas da sprint: {e}")
-                                    data_inicio = plano.data_inicio_prevista + timedelta(days=dias_acumulados)
-                                    data_fim = data_inicio + timedelta(days=14)
-                                    sprint['data_inicio'] = data_inicio.isoformat()
-                                    sprint['data_fim'] = data_fim.isoformat()
-                                    dias_acumulados += 14
-                            
-                            sprints_data.append({
-                                'nome': sprint.get('nome', 'Sprint'),
-                                'objetivo': sprint.get('objetivo', ''),
-                                'data_inicio': sprint.get('data_inicio'),
-                                'data_fim': sprint.get('data_fim'),
-                                'tarefas': sprint.get('tarefas', [])
-                            })
-                            dias_acumulados += 1  # 1 dia de buffer entre sprints
+            if not data_fim_sprint and data_inicio_sprint:
+                duracao = etapa.get('duracao_dias', 14)  # Padrão de 2 semanas
+                if 'duracao_semanas' in etapa:
+                    duracao = etapa.get('duracao_semanas', 2) * 7
+                data_fim_sprint = data_inicio_sprint + timedelta(days=duracao)
             
-            # Se ainda não tiver dados, cria sprints básicas
-            if not sprints_data:
-                logger.warning("Nenhuma sprint encontrada, criando sprint básica")
-            # Cria uma sprint básica
-            sprints_data.append({
-                'nome': 'Sprint Inicial',
-                'objetivo': 'Início do projeto',
-                'descricao': 'Início do projeto',
-                'data_inicio': plano.data_inicio_prevista.isoformat(),
-                'data_fim': (plano.data_inicio_prevista + timedelta(days=14)).isoformat(),
-                'tarefas': [{
-                    'titulo': 'Kick-off do Projeto',
-                    'descricao': 'Reunião inicial de alinhamento',
-                    'tipo': 'planejamento',
-                    'prioridade': 'alta',
-                    'horas_planejadas': 8
-                }]
-            })
+            if data_inicio_sprint and data_fim_sprint:
+                sprints_data.append({
+                    'nome': etapa.get('nome', etapa.get('etapa', 'Sprint')),
+                    'objetivo': etapa.get('objetivo', etapa.get('descricao', '')),
+                    'data_inicio': data_inicio_sprint.isoformat(),
+                    'data_fim': data_fim_sprint.isoformat(),
+                    'tarefas': etapa.get('tarefas', []) or [],
+                })
+                # Atualiza dias acumulados para próxima sprint
+                dias_acumulados = (data_fim_sprint - plano.data_inicio_prevista).days
+            else:
+                logger.warning(f"Não foi possível determinar datas para a sprint: {etapa.get('nome')}")
+        return sprints_data
+    
+    @staticmethod
+    def montar_sprints_plano(plano, contrato):
+        """
+        Monta a lista de sprints (com tarefas) a partir do plano de trabalho
         
-        logger.info(f"Total de sprints a criar: {len(sprints_data)}")
+        Ordem de prioridade:
+        1. Itens de produto do contrato (4 fases por item)
+        2. processo_execucao do plano
+        3. fluxo_trabalho_fases da análise de origem do contrato
+        4. Sprint inicial básica
         
-        # Verifica se já existe projeto vinculado
-        if plano.projeto:
-            logger.info(f"Projeto já existe: {plano.projeto.pk}")
-            projeto = plano.projeto
-            # Se o projeto já existe, verifica se já tem sprints
-            sprints_existentes = projeto.sprints.count()
-            if sprints_existentes > 0:
-                logger.warning(f"Projeto já tem {sprints_existentes} sprint(s). Pulando criação de novas sprints.")
-                return projeto
-        else:
-            # Criar Projeto
-            logger.info("Criando novo projeto")
-            projeto = Projeto(
-                nome=f"Projeto - {plano.contrato.numero_contrato}",
-                descricao=plano.resumo_contrato[:500] if plano.resumo_contrato else '',
-                contrato=plano.contrato,
-                data_inicio=plano.data_inicio_prevista,
-                data_fim_prevista=plano.data_fim_prevista,
-                gerente_projeto=plano.contrato.gerente_contrato,
-            )
-            projeto.save()
-            logger.info(f"Projeto criado: {projeto.pk}")
+        Args:
+            plano: Instância de PlanoTrabalho
+            contrato: Contrato do projeto vinculado ao plano
             
-            plano.projeto = projeto
-            plano.save()
+        Returns:
+            Lista de dicionários com nome, objetivo, data_inicio, data_fim e tarefas
+        """
+        from datetime import timedelta
+        from .materializacao_projeto_service import MaterializacaoProjetoService
         
-        # Criar Sprints e Tarefas
-        sprints_criadas = 0
-        tarefas_criadas = 0
+        parse_data = MaterializacaoProjetoService.parse_data
         
-        for idx, sprint_data in enumerate(sprints_data):
-            logger.info(f"Criando sprint {idx + 1}/{len(sprints_data)}: {sprint_data.get('nome')}")
-            try:
-                data_inicio_sprint = datetime.strptime(sprint_data['data_inicio'], '%Y-%m-%d').date()
-                data_fim_sprint = datetime.strptime(sprint_data['data_fim'], '%Y-%m-%d').date()
-            except (ValueError, KeyError) as e:
-                # Se não conseguir parsear, usa datas padrão
-                logger.warning(f"Erro ao parsear datas da sprint {sprint_data.get('nome')}: {e}")
-                data_inicio_sprint = plano.data_inicio_prevista
-                data_fim_sprint = plano.data_inicio_prevista + timedelta(days=14)
-            
-            try:
-                # Define data_fim como a data de término do contrato por padrão
-                # Será ajustada futuramente pelo gerente do projeto
-                data_fim_contrato = plano.contrato.data_fim_atual or plano.data_fim_prevista
-                
-                sprint = Sprint(
-                    projeto=projeto,
-                    nome=sprint_data.get('nome', 'Sprint'),
-                    descricao=sprint_data.get('descricao', sprint_data.get('objetivo', '')),
-                    data_inicio=data_inicio_sprint,
-                    data_fim=data_fim_contrato,  # Usa data de término do contrato por padrão
-                )
-                sprint.save()
-                logger.info(f"Sprint criada: {sprint.pk} - {sprint.nome}")
-                sprints_criadas += 1
-            except Exception as e:
-                logger.error(f"Erro ao criar sprint {sprint_data.get('nome')}: {e}")
-                import traceback
-                logger.error(traceback.format_exc())
-                continue
-            
-            # Criar Tarefas com melhorias baseadas em melhores práticas
-            tarefas_sprint = sprint_data.get('tarefas', [])
-            logger.info(f"Sprint {sprint.nome} tem {len(tarefas_sprint)} tarefas")
-            
-            for tarefa_idx, tarefa_data in enumerate(tarefas_sprint):
-                logger.debug(f"Criando tarefa {tarefa_idx + 1}/{len(tarefas_sprint)}: {tarefa_data.get('titulo')}")
-                tipo_map = {
-                    'desenvolvimento': 'desenvolvimento',
-                    'teste': 'teste',
-                    'documentacao': 'documentacao',
-                    'treinamento': 'treinamento',
-                    'implantacao': 'implantacao',
-                    'planejamento': 'planejamento',
-                    'execucao': 'execucao',
-                    'suporte': 'suporte',
-                }
-                
-                prioridade_map = {
-                    'critica': 'critica',
-                    'alta': 'alta',
-                    'media': 'media',
-                    'baixa': 'baixa',
-                }
-                
-                # Monta descrição completa incluindo critérios de aceitação e entregáveis
-                descricao_completa = tarefa_data.get('descricao', '')
-                
-                # Adiciona entregável se disponível
-                entregavel = tarefa_data.get('entregavel', '')
-                if entregavel:
-                    descricao_completa += f"\n\nEntregável: {entregavel}"
-                
-                # Adiciona critérios de aceitação se disponível
-                criterios = tarefa_data.get('criterios_aceitacao', '')
-                if criterios:
-                    descricao_completa += f"\n\nCritérios de Aceitação: {criterios}"
-                
-                # Adiciona dependências se disponível
-                dependencias = tarefa_data.get('dependencias', [])
-                if dependencias:
-                    descricao_completa += f"\n\nDependências: {', '.join(dependencias)}"
-                
-                # Determina responsável (pode vir da tarefa ou usar gerente do contrato)
-                responsavel_tarefa = plano.contrato.gerente_contrato
-                if tarefa_data.get('responsavel'):
-                    # Tenta encontrar colaborador pelo nome/função
-                    from contracts.models import Colaborador
-                    responsavel_nome = tarefa_data.get('responsavel', '').lower()
-                    # Busca por nome ou cargo
-                    colaborador = Colaborador.objects.filter(
-                        Q(nome_completo__icontains=responsavel_nome) |
-                        Q(cargo__icontains=responsavel_nome)
-                    ).first()
-                    if colaborador:
-                        responsavel_tarefa = colaborador
-                
-                horas_planejadas = Decimal(str(tarefa_data.get('horas_planejadas', 40)))
-                # Garante mínimo de 8 horas
-                if horas_planejadas < 8:
-                    horas_planejadas = Decimal('8.00')
+        # NOVA LÓGICA: Gera sprints baseadas nos itens do contrato
+        sprints_data = ContractAIService.gerar_sprints_por_item_contrato(
+            contrato,
+            plano.data_inicio_prevista
+        )
+        if sprints_data:
+            return sprints_data
+        
+        # Fallback: etapas do processo_execucao do plano
+        sprints_data = ContractAIService.sprints_do_processo_execucao(plano)
+        if sprints_data:
+            return sprints_data
+        
+        # Fallback: busca da análise original se processo_execucao estiver vazio
+        analise = contrato.analises_origem.first()
+        fluxo_fases = (analise.dados_extraidos or {}).get('fluxo_trabalho_fases', []) if analise else []
+        dias_acumulados = 0
+        for fase_data in fluxo_fases:
+            for sprint in fase_data.get('sprints', []):
+                data_inicio = parse_data(sprint.get('data_inicio'))
+                data_fim = parse_data(sprint.get('data_fim'))
+                if not data_inicio or not data_fim:
+                    # Usa duracao_semanas se disponível, senão duracao_dias, senão padrão 14 dias
+                    duracao = sprint.get('duracao_dias', sprint.get('duracao_semanas', 2) * 7)
+                    data_inicio = plano.data_inicio_prevista + timedelta(days=dias_acumulados)
+                    data_fim = data_inicio + timedelta(days=duracao)
+                dias_acumulados = (data_fim - plano.data_inicio_prevista).days + 1  # 1 dia de buffer
                 
-                try:
-                    tarefa = Tarefa(
-                        sprint=sprint,
-                        titulo=tarefa_data.get('titulo', 'Tarefa'),
-                        descricao=descricao_completa.strip(),
-                        tipo=tipo_map.get(tarefa_data.get('tipo', '').lower(), 'desenvolvimento'),
-                        prioridade=prioridade_map.get(tarefa_data.get('prioridade', '').lower(), 'media'),
-                        horas_planejadas=horas_planejadas,
-                        responsavel=responsavel_tarefa,
-                    )
-                    tarefa.save()
-                    tarefas_criadas += 1
-                except Exception as e:
-                    logger.error(f"Erro ao criar tarefa {tarefa_data.get('titulo')}: {e}")
-                    import traceback
-                    logger.error(traceback.format_exc())
-                    continue
+                sprints_data.append({
+                    'nome': sprint.get('nome', 'Sprint'),
+                    'objetivo': sprint.get('objetivo', ''),
+                    'data_inicio': data_inicio.isoformat(),
+                    'data_fim': data_fim.isoformat(),
+                    'tarefas': sprint.get('tarefas', []),
+                })
+        if sprints_data:
+            return sprints_data
+        
+        # Se ainda não tiver dados, cria uma sprint básica
+        logger.warning("Nenhuma sprint encontrada, criando sprint básica")
+        return [{
+            'nome': 'Sprint Inicial',
+            'objetivo': 'Início do projeto',
+            'descricao': 'Início do projeto',
+            'data_inicio': plano.data_inicio_prevista.isoformat(),
+            'data_fim': (plano.data_inicio_prevista + timedelta(days=14)).isoformat(),
+            'tarefas': [{
+                'titulo': 'Kick-off do Projeto',
+                'descricao': 'Reunião inicial de alinhamento',
+                'tipo': 'planejamento',
+                'prioridade': 'alta',
+                'horas_planejadas': 8
+            }]
+        }]
+    
+    @staticmethod
+    def criar_projeto_sprints_tarefas(plano, usuario):
+        """
+        Cria sprints e tarefas do projeto automaticamente após aprovação do plano
+        REGRA IMPORTANTE: Cada item de software, hardware ou solução deve ter sprints para:
+        - Planejamento
+        - Implantação
+        - Execução
+        - Suporte
+        
+        O objetivo é que todos os itens cheguem à fase de Suporte (implantados e em uso).
+        A gravação é feita em lote por MaterializacaoProjetoService.
+        
+        Args:
+            plano: Instância de PlanoTrabalho (vinculada a um projeto)
+            usuario: Usuário que aprovou
             
-            sprints_criadas += 1
+        Returns:
+            Projeto do plano
+        """
+        from .materializacao_projeto_service import MaterializacaoProjetoService
+        
+        logger.info(f"Iniciando criação de projeto/sprints/tarefas para plano {plano.pk}")
+        
+        projeto = plano.projeto
+        if not projeto:
+            raise ValueError("O plano de trabalho deve estar vinculado a um projeto.")
         
-        logger.info(f"Projeto {projeto.nome} criado com {sprints_criadas} sprints e {tarefas_criadas} tarefas")
+        # Se o projeto já tem sprints, não materializa novamente
+        if projeto.sprints.exists():
+            logger.warning(f"Projeto {projeto.pk} já tem sprints. Pulando criação de novas sprints.")
+            return projeto
+        
+        contrato = projeto.contrato
+        sprints_data = ContractAIService.montar_sprints_plano(plano, contrato)
+        logger.info(f"Total de sprints a criar: {len(sprints_data)}")
+        
+        # Define data_fim como a data de término do contrato por padrão
+        # Será ajustada futuramente pelo gerente do projeto
+        data_fim_contrato = contrato.data_fim_atual or plano.data_fim_prevista
+        
+        resultado = MaterializacaoProjetoService.materializar(
+            projeto,
+            sprints_data,
+            data_inicio_padrao=plano.data_inicio_prevista,
+            data_fim_sprint=data_fim_contrato,
+        )
+        logger.info(
+            f"Projeto {projeto.nome} criado com {resultado['sprints']} sprints e {resultado['tarefas']} tarefas"
+        )
         return projeto
     
     @staticmethod
-    def sincronizar_projeto_com_plano(plano, usuario, forcar_sincronizacao=False):
+    def sincronizar_projeto_com_plano(plano, usuario, forcar_sincronizacao=False, sobrescrever_conflitos=False):
         """
         Sincroniza sprints e tarefas do projeto com as mudanças no plano de trabalho
-        Cria novas sprints/tarefas, atualiza existentes e remove as que foram deletadas do plano
+        Cria novas sprints/tarefas, atualiza existentes e remove as que foram deletadas do plano,
+        gravando apenas as diferenças (ver SincronizacaoPlanoService)
         
         Args:
             plano: Instância de PlanoTrabalho
             usuario: Usuário que fez a edição
             forcar_sincronizacao: Se True, sincroniza mesmo se o plano não estiver aprovado
+            sobrescrever_conflitos: Se True, aplica o plano também nos registros editados no projeto
         """
-        from contracts.models import Projeto, Sprint, Tarefa
-        from datetime import datetime, timedelta
-        from decimal import Decimal
+        from .sincronizacao_plano_service import SincronizacaoPlanoService
         
         # Verifica se tem projeto vinculado
         if not plano.projeto:
@@ -2033,205 +1940,13 @@ Documento do Contrato:
         projeto = plano.projeto
         logger.info(f"Sincronizando projeto {projeto.pk} com plano {plano.pk}")
         
-        # Processa processo_execucao do plano
-        processo_execucao = plano.processo_execucao or []
-        
-        if not processo_execucao:
-            logger.warning(f"Plano {plano.pk} não tem processo_execucao. Nada para sincronizar.")
-            return projeto
-        
-        # Mapeia sprints existentes por nome (usando nome como identificador)
-        sprints_existentes = {sprint.nome: sprint for sprint in projeto.sprints.all()}
-        
-        # Processa cada etapa do processo_execucao
-        sprints_criadas = 0
-        sprints_atualizadas = 0
-        tarefas_criadas = 0
-        tarefas_atualizadas = 0
-        
-        for etapa in processo_execucao:
-            nome_sprint = etapa.get('nome', etapa.get('etapa', 'Sprint'))
-            tarefas_etapa = etapa.get('tarefas', []) or []
-            
-            # Parse de datas
-            data_inicio_str = etapa.get('data_inicio')
-            data_fim_str = etapa.get('data_fim')
-            
-            data_inicio_sprint = None
-            data_fim_sprint = None
-            
-            if data_inicio_str:
-                try:
-                    if isinstance(data_inicio_str, str):
-                        data_inicio_sprint = datetime.strptime(data_inicio_str, '%Y-%m-%d').date()
-                    else:
-                        data_inicio_sprint = data_inicio_str
-                except (ValueError, TypeError):
-                    logger.warning(f"Data de início inválida para sprint: {data_inicio_str}")
-            
-            if data_fim_str:
-                try:
-                    if isinstance(data_fim_str, str):
-                        data_fim_sprint = datetime.strptime(data_fim_str, '%Y-%m-%d').date()
-                    else:
-                        data_fim_sprint = data_fim_str
-                except (ValueError, TypeError):
-                    logger.warning(f"Data de fim inválida para sprint: {data_fim_str}")
-            
-            # Se não tiver datas, calcula baseado na duração
-            if not data_inicio_sprint:
-                data_inicio_sprint = plano.data_inicio_prevista
-            
-            if not data_fim_sprint:
-                duracao = etapa.get('duracao_dias', 14)
-                if 'duracao_semanas' in etapa:
-                    duracao = etapa.get('duracao_semanas', 2) * 7
-                data_fim_sprint = data_inicio_sprint + timedelta(days=duracao)
-            
-            # Verifica se sprint já existe
-            if nome_sprint in sprints_existentes:
-                # Atualiza sprint existente
-                sprint = sprints_existentes[nome_sprint]
-                # Define data_fim como a data de término do contrato por padrão
-                data_fim_contrato = plano.contrato.data_fim_atual or plano.data_fim_prevista
-                
-                sprint.descricao = etapa.get('objetivo', etapa.get('descricao', sprint.descricao))
-                sprint.data_inicio = data_inicio_sprint
-                sprint.data_fim = data_fim_contrato  # Usa data de término do contrato por padrão
-                sprint.save()
-                sprints_atualizadas += 1
-                logger.info(f"Sprint atualizada: {sprint.nome}")
-            else:
-                # Define data_fim como a data de término do contrato por padrão
-                data_fim_contrato = plano.contrato.data_fim_atual or plano.data_fim_prevista
-                
-                # Cria nova sprint
-                sprint = Sprint(
-                    projeto=projeto,
-                    nome=nome_sprint,
-                    descricao=etapa.get('objetivo', etapa.get('descricao', '')),
-                    data_inicio=data_inicio_sprint,
-                    data_fim=data_fim_contrato,  # Usa data de término do contrato por padrão
-                )
-                sprint.save()
-                sprints_criadas += 1
-                logger.info(f"Sprint criada: {sprint.nome}")
-            
-            # Sincroniza tarefas da sprint
-            tarefas_existentes = {tarefa.titulo: tarefa for tarefa in sprint.tarefas.all()}
-            
-            for tarefa_data in tarefas_etapa:
-                titulo_tarefa = tarefa_data.get('titulo', 'Tarefa')
-                
-                # Mapeamentos
-                tipo_map = {
-                    'desenvolvimento': 'desenvolvimento',
-                    'teste': 'teste',
-                    'documentacao': 'documentacao',
-                    'treinamento': 'treinamento',
-                    'implantacao': 'implantacao',
-                    'planejamento': 'planejamento',
-                    'execucao': 'execucao',
-                    'suporte': 'suporte',
-                }
-                
-                prioridade_map = {
-                    'critica': 'critica',
-                    'alta': 'alta',
-                    'media': 'media',
-                    'baixa': 'baixa',
-                }
-                
-                # Monta descrição completa
-                descricao_completa = tarefa_data.get('descricao', '')
-                
-                entregavel = tarefa_data.get('entregavel', '')
-                if entregavel:
-                    descricao_completa += f"\n\nEntregável: {entregavel}"
-                
-                criterios = tarefa_data.get('criterios_aceitacao', '')
-                if criterios:
-                    descricao_completa += f"\n\nCritérios de Aceitação: {criterios}"
-                
-                dependencias = tarefa_data.get('dependencias', [])
-                if dependencias:
-                    descricao_completa += f"\n\nDependências: {', '.join(dependencias)}"
-                
-                # Determina responsável
-                responsavel_tarefa = plano.contrato.gerente_contrato
-                if tarefa_data.get('responsavel'):
-                    from contracts.models import Colaborador
-                    responsavel_nome = tarefa_data.get('responsavel', '').lower()
-                    colaborador = Colaborador.objects.filter(
-                        Q(nome_completo__icontains=responsavel_nome) |
-                        Q(cargo__icontains=responsavel_nome)
-                    ).first()
-                    if colaborador:
-                        responsavel_tarefa = colaborador
-                
-                horas_planejadas = Decimal(str(tarefa_data.get('horas_planejadas', 40)))
-                if horas_planejadas < 8:
-                    horas_planejadas = Decimal('8.00')
-                
-                # Verifica se tarefa já existe
-                if titulo_tarefa in tarefas_existentes:
-                    # Atualiza tarefa existente
-                    tarefa = tarefas_existentes[titulo_tarefa]
-                    tarefa.descricao = descricao_completa.strip()
-                    tarefa.tipo = tipo_map.get(tarefa_data.get('tipo', '').lower(), tarefa.tipo)
-                    tarefa.prioridade = prioridade_map.get(tarefa_data.get('prioridade', '').lower(), tarefa.prioridade)
-                    tarefa.horas_planejadas = horas_planejadas
-                    tarefa.responsavel = responsavel_tarefa
-                    tarefa.save()
-                    tarefas_atualizadas += 1
-                    logger.info(f"Tarefa atualizada: {tarefa.titulo}")
-                else:
-                    # Cria nova tarefa
-                    try:
-                        bilhetar_na_os = tarefa_data.get('bilhetar_na_os', True)
-                        
-                        tarefa = Tarefa(
-                            projeto=projeto,  # Projeto obrigatório
-                            sprint=sprint,  # Sprint pode ser None (fica no backlog)
-                            titulo=titulo_tarefa,
-                            descricao=descricao_completa.strip(),
-                            prioridade=prioridade_map.get(tarefa_data.get('prioridade', '').lower(), 'media'),
-                            horas_planejadas=horas_planejadas,
-                            responsavel=responsavel_tarefa,
-                            bilhetar_na_os=bilhetar_na_os,
-                            status='pendente',
-                        )
-                        tarefa.save()
-                        tarefas_criadas += 1
-                        logger.info(f"Tarefa criada: {tarefa.titulo}")
-                    except Exception as e:
-                        logger.error(f"Erro ao criar tarefa {titulo_tarefa}: {e}")
-                        continue
-            
-            # Remove tarefas que não estão mais no plano
-            tarefas_planos_titulos = {t.get('titulo', 'Tarefa') for t in tarefas_etapa}
-            tarefas_para_remover = [
-                t for t in sprint.tarefas.all() 
-                if t.titulo not in tarefas_planos_titulos and t.status not in ['finalizada', 'concluida']
-            ]
-            for tarefa in tarefas_para_remover:
-                logger.info(f"Removendo tarefa {tarefa.titulo} que não está mais no plano")
-                tarefa.delete()
-        
-        # Remove sprints que não estão mais no plano
-        sprints_planos_nomes = {e.get('nome', e.get('etapa', 'Sprint')) for e in processo_execucao}
-        sprints_para_remover = [
-            s for s in projeto.sprints.all() 
-            if s.nome not in sprints_planos_nomes and s.status not in ['finalizada', 'faturada']
-        ]
-        for sprint in sprints_para_remover:
-            logger.info(f"Removendo sprint {sprint.nome} que não está mais no plano")
-            sprint.delete()
+        diff = SincronizacaoPlanoService.calcular_diff(plano)
+        resultado = SincronizacaoPlanoService.aplicar_diff(diff, sobrescrever_conflitos=sobrescrever_conflitos)
         
         logger.info(
-            f"Sincronização concluída: {sprints_criadas} sprints criadas, "
-            f"{sprints_atualizadas} atualizadas, {tarefas_criadas} tarefas criadas, "
-            f"{tarefas_atualizadas} tarefas atualizadas"
+            f"Sincronização concluída: {resultado['sprints_criadas']} sprints criadas, "
+            f"{resultado['sprints_atualizadas']} atualizadas, {resultado['tarefas_criadas']} tarefas criadas, "
+            f"{resultado['tarefas_atualizadas']} tarefas atualizadas"
         )
         
         return projeto
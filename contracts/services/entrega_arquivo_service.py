@@ -0,0 +1,158 @@
+"""
+Service Layer para a entrega de arquivos protegidos (MEDIA_ROOT)
+Após a checagem de permissão da view, delega a transferência ao servidor web
+(X-Accel-Redirect / X-Sendfile) ou transmite em blocos com suporte a Range e ETag
+"""
+import os
+import re
+from typing import Optional, Tuple
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified, StreamingHttpResponse
+from django.utils.http import content_disposition_header, http_date, parse_http_date_safe
+
+
+class EntregaArquivoService:
+    """
+    Entrega de arquivos em disco
+
+    Com settings.ARQUIVOS_ENTREGA = "nginx" a resposta leva apenas o cabeçalho
+    X-Accel-Redirect (ARQUIVOS_ACCEL_PREFIXO + caminho relativo ao MEDIA_ROOT,
+    mapeado para uma location internal do nginx); com "apache" (mod_xsendfile)
+    leva X-Sendfile com o caminho absoluto. O servidor web transfere os bytes e
+    trata Range/ETag, liberando o worker do Django.
+
+    Sem configuração, o arquivo é transmitido em blocos (StreamingHttpResponse)
+    com ETag, Last-Modified, If-None-Match/If-Modified-Since (304), Range de um
+    intervalo com If-Range (206) e 416 para intervalos fora do arquivo.
+    """
+
+    TAMANHO_BLOCO = 64 * 1024
+    MODOS_SERVIDOR = ("nginx", "apache")
+    _RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+    @staticmethod
+    def etag(stat: os.stat_result) -> str:
+        """ETag forte a partir do tamanho e da data de modificação"""
+        return f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"'
+
+    @staticmethod
+    def intervalo(cabecalho: str, tamanho: int) -> Optional[Tuple[int, int]]:
+        """
+        Interpreta o cabeçalho Range (um único intervalo em bytes)
+
+        Returns:
+            (início, fim) inclusivos; None para ignorar o cabeçalho (ausente, inválido
+            ou com vários intervalos: responde 200 com o arquivo inteiro)
+
+        Raises:
+            ValueError: Intervalo fora do arquivo ou arquivo vazio (416)
+        """
+        encontrado = EntregaArquivoService._RANGE.match((cabecalho or "").strip())
+        if not encontrado or encontrado.groups() == ("", ""):
+            return None
+        inicio, fim = encontrado.groups()
+        if inicio == "":
+            # Sufixo: os últimos N bytes
+            sufixo = int(fim)
+            if sufixo == 0 or tamanho == 0:
+                raise ValueError("intervalo vazio")
+            return max(tamanho - sufixo, 0), tamanho - 1
+        inicio = int(inicio)
+        fim = min(int(fim), tamanho - 1) if fim else tamanho - 1
+        if inicio >= tamanho or fim < inicio:
+            raise ValueError("intervalo fora do arquivo")
+        return inicio, fim
+
+    @staticmethod
+    def _blocos(caminho: str, inicio: int, quantidade: int):
+        """Lê quantidade bytes a partir de inicio, em blocos de TAMANHO_BLOCO"""
+        with open(caminho, "rb") as arquivo:
+            arquivo.seek(inicio)
+            while quantidade > 0:
+                bloco = arquivo.read(min(EntregaArquivoService.TAMANHO_BLOCO, quantidade))
+                if not bloco:
+                    break
+                quantidade -= len(bloco)
+                yield bloco
+
+    @staticmethod
+    def _nao_modificado(request, etag: str, modificado_em: float) -> bool:
+        """If-None-Match tem precedência sobre If-Modified-Since (RFC 9110)"""
+        if_none_match = request.headers.get("If-None-Match")
+        if if_none_match is not None:
+            return if_none_match.strip() == "*" or etag in [valor.strip() for valor in if_none_match.split(",")]
+        if_modified_since = parse_http_date_safe(request.headers.get("If-Modified-Since") or "")
+        return if_modified_since is not None and int(modificado_em) <= if_modified_since
+
+    @staticmethod
+    def responder(request, caminho: str, nome: str, content_type: str,
+                  inline: bool = False) -> HttpResponse:
+        """
+        Resposta de download do arquivo (a permissão já deve ter sido verificada)
+
+        Args:
+            request: Requisição (cabeçalhos Range e condicionais)
+            caminho: Caminho absoluto do arquivo
+            nome: Nome exibido ao usuário (Content-Disposition)
+            content_type: Tipo MIME
+            inline: Exibir no navegador em vez de baixar
+        """
+        disposicao = content_disposition_header(not inline, nome)
+        modo = getattr(settings, "ARQUIVOS_ENTREGA", "")
+
+        if modo in EntregaArquivoService.MODOS_SERVIDOR:
+            response = HttpResponse(content_type=content_type)
+            if modo == "nginx":
+                relativo = os.path.relpath(caminho, settings.MEDIA_ROOT).replace(os.sep, "/")
+                if relativo.startswith("../"):
+                    raise ValueError("arquivo fora do MEDIA_ROOT")
+                prefixo = getattr(settings, "ARQUIVOS_ACCEL_PREFIXO", "/protegido/").rstrip("/")
+                response["X-Accel-Redirect"] = f"{prefixo}/{quote(relativo)}"
+            else:
+                response["X-Sendfile"] = caminho
+            response["Content-Disposition"] = disposicao
+            return response
+
+        stat = os.stat(caminho)
+        etag = EntregaArquivoService.etag(stat)
+        cabecalhos = {
+            "ETag": etag,
+            "Last-Modified": http_date(stat.st_mtime),
+            "Accept-Ranges": "bytes",
+        }
+        if EntregaArquivoService._nao_modificado(request, etag, stat.st_mtime):
+            response = HttpResponseNotModified()
+            for chave, valor in cabecalhos.items():
+                response[chave] = valor
+            return response
+
+        tamanho = stat.st_size
+        # If-Range: só atende o intervalo se o arquivo não mudou desde a primeira parte;
+        # caso contrário o Range é ignorado, mesmo fora do arquivo (RFC 9110)
+        if_range = request.headers.get("If-Range")
+        intervalo = None
+        if not if_range or if_range.strip() in (etag, cabecalhos["Last-Modified"]):
+            try:
+                intervalo = EntregaArquivoService.intervalo(request.headers.get("Range"), tamanho)
+            except ValueError:
+                response = HttpResponse(status=416)
+                response["Content-Range"] = f"bytes */{tamanho}"
+                response["Accept-Ranges"] = "bytes"
+                return response
+
+        inicio, fim = intervalo or (0, tamanho - 1)
+        quantidade = max(fim - inicio + 1, 0)
+        response = StreamingHttpResponse(
+            EntregaArquivoService._blocos(caminho, inicio, quantidade),
+            status=206 if intervalo else 200,
+            content_type=content_type,
+        )
+        for chave, valor in cabecalhos.items():
+            response[chave] = valor
+        response["Content-Length"] = str(quantidade)
+        if intervalo:
+            response["Content-Range"] = f"bytes {inicio}-{fim}/{tamanho}"
+        response["Content-Disposition"] = disposicao
+        return response
@@ -0,0 +1,131 @@
+"""
+Service Layer para o fluxo de atividades (Evento)
+Registro com buffer por requisição e leitura paginada por chave (keyset)
+"""
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+from datetime import datetime
+
+from django.db import transaction
+from django.db.models import Q, QuerySet
+
+from ..models import Evento
+
+# Eventos pendentes e usuário da requisição corrente (EventoMiddleware)
+_buffer: ContextVar[Optional[List[Evento]]] = ContextVar("eventos_buffer", default=None)
+_usuario: ContextVar = ContextVar("eventos_usuario", default=None)
+
+
+class EventoService:
+    """
+    Fluxo de atividades append-only
+
+    Dentro de uma requisição os eventos confirmados (on_commit) são acumulados
+    e gravados com um único bulk_create ao fim da resposta; fora dela
+    (comandos, shell) são gravados logo após o commit. A leitura usa paginação
+    por chave (criado_em, id) sobre os índices da tabela, sem OFFSET.
+    """
+
+    LIMITE_PAGINA = 20
+
+    @staticmethod
+    def iniciar(usuario=None) -> Tuple:
+        """Abre o buffer da requisição; retorna os tokens para descarregar()"""
+        return _buffer.set([]), _usuario.set(usuario)
+
+    @staticmethod
+    def descarregar(tokens: Tuple) -> int:
+        """
+        Grava os eventos acumulados (um bulk_create) e fecha o buffer
+
+        Returns:
+            Quantidade de eventos gravados
+        """
+        eventos = _buffer.get() or []
+        token_buffer, token_usuario = tokens
+        _buffer.reset(token_buffer)
+        _usuario.reset(token_usuario)
+        if eventos:
+            Evento.objects.bulk_create(eventos, batch_size=500)
+        return len(eventos)
+
+    @staticmethod
+    def registrar(entidade: str, objeto_id: int, acao: str, descricao: str,
+                  contrato_id: Optional[int] = None, usuario=None) -> Evento:
+        """
+        Registra um evento (no buffer da requisição, se houver)
+
+        Args:
+            entidade: Valor de Evento.ENTIDADE_CHOICES
+            objeto_id: Id do objeto
+            acao: "criado" ou o novo status
+            descricao: Texto exibido no feed
+            contrato_id: Contrato da linha do tempo
+            usuario: Autor (padrão: usuário da requisição)
+        """
+        usuario = usuario or _usuario.get()
+        if usuario is not None and not usuario.is_authenticated:
+            usuario = None
+        evento = Evento(
+            entidade=entidade,
+            objeto_id=objeto_id,
+            acao=acao,
+            descricao=descricao[:255],
+            contrato_id=contrato_id,
+            usuario=usuario,
+        )
+        # Só após o commit: eventos de transações desfeitas são descartados
+        buffer = _buffer.get()
+        transaction.on_commit(lambda: EventoService._confirmar(evento, buffer))
+        return evento
+
+    @staticmethod
+    def _confirmar(evento: Evento, buffer: Optional[List[Evento]]) -> None:
+        """Acumula no buffer ainda aberto ou grava imediatamente"""
+        if buffer is not None and buffer is _buffer.get():
+            buffer.append(evento)
+        else:
+            evento.save()
+
+    @staticmethod
+    def cursor(evento: Evento) -> str:
+        """Chave do evento para a próxima página"""
+        return f"{evento.criado_em.isoformat()}_{evento.pk}"
+
+    @staticmethod
+    def paginar(eventos: QuerySet, cursor: Optional[str] = None,
+                limite: Optional[int] = None) -> Dict:
+        """
+        Página de eventos anteriores ao cursor, do mais recente para o mais antigo
+
+        Args:
+            eventos: QuerySet de Evento (já filtrado)
+            cursor: Valor de "proximo" da página anterior
+            limite: Eventos por página
+
+        Returns:
+            Dict com eventos e proximo (cursor ou None na última página)
+        """
+        limite = limite or EventoService.LIMITE_PAGINA
+        if cursor:
+            try:
+                criado_em, pk = cursor.rsplit("_", 1)
+                criado_em, pk = datetime.fromisoformat(criado_em), int(pk)
+            except ValueError:
+                criado_em = pk = None
+            if pk is not None:
+                eventos = eventos.filter(Q(criado_em__lt=criado_em) | Q(criado_em=criado_em, pk__lt=pk))
+        pagina = list(eventos.select_related("usuario").order_by("-criado_em", "-pk")[:limite + 1])
+        proximo = EventoService.cursor(pagina[limite - 1]) if len(pagina) > limite else None
+        return {"eventos": pagina[:limite], "proximo": proximo}
+
+    @staticmethod
+    def recentes(limite: int = 10) -> List[Evento]:
+        """Feed do dashboard"""
+        return EventoService.paginar(Evento.objects.all(), limite=limite)["eventos"]
+
+    @staticmethod
+    def linha_do_tempo(contrato_id: int, cursor: Optional[str] = None,
+                       limite: Optional[int] = None) -> Dict:
+        """Eventos de um contrato, paginados por chave"""
+        return EventoService.paginar(Evento.objects.filter(contrato_id=contrato_id), cursor, limite)
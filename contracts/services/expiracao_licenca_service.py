@@ -0,0 +1,125 @@
+"""
+Service Layer para a expiração das licenças das Ordens de Fornecimento
+Consultas por período sobre a data de expiração armazenada e indexada
+"""
+import calendar
+from typing import Dict, List, Optional
+from datetime import date, timedelta
+
+from django.db import transaction
+from django.db.models import QuerySet
+from django.utils import timezone
+
+from ..models import OrdemFornecimento
+from .cache_versao_service import CacheVersaoService
+
+
+class ExpiracaoLicencaService:
+    """
+    Expiração das licenças (OrdemFornecimento.data_expiracao)
+
+    A data de expiração (ativação + vigência do produto) é gravada no save da
+    OF e indexada; consultas por período, calendário e alertas de renovação
+    são uma única varredura do índice.
+    """
+
+    # Faixas dos alertas de renovação (dias até a expiração)
+    FAIXAS_ALERTA = (30, 60, 90)
+
+    @staticmethod
+    def expirando(inicio: date, fim: date, contrato_id: Optional[int] = None,
+                  cliente_id: Optional[int] = None) -> QuerySet:
+        """
+        OFs cuja licença expira em [inicio, fim], pela data de expiração
+
+        Args:
+            inicio, fim: Período (inclusivo)
+            contrato_id, cliente_id: Filtros opcionais
+        """
+        ordens = (
+            OrdemFornecimento.objects.filter(data_expiracao__range=(inicio, fim))
+            .select_related("cliente", "contrato", "item_contrato")
+            .order_by("data_expiracao", "pk")
+        )
+        if contrato_id:
+            ordens = ordens.filter(contrato_id=contrato_id)
+        if cliente_id:
+            ordens = ordens.filter(cliente_id=cliente_id)
+        return ordens
+
+    @staticmethod
+    def faixa(dias_restantes: int) -> str:
+        """Faixa do alerta: vencida, 30, 60 ou 90 dias"""
+        if dias_restantes < 0:
+            return "vencida"
+        for limite in ExpiracaoLicencaService.FAIXAS_ALERTA:
+            if dias_restantes <= limite:
+                return str(limite)
+        return ""
+
+    @staticmethod
+    def alertas(hoje: Optional[date] = None, dias_vencidas: int = 30) -> List[Dict]:
+        """
+        Alertas de renovação: licenças vencidas há até dias_vencidas dias ou
+        que expiram dentro da maior faixa
+
+        Returns:
+            Lista de dicts com ordem, dias_restantes e faixa, pela expiração
+        """
+        hoje = hoje or timezone.now().date()
+        ordens = ExpiracaoLicencaService.expirando(
+            hoje - timedelta(days=dias_vencidas),
+            hoje + timedelta(days=max(ExpiracaoLicencaService.FAIXAS_ALERTA)),
+        )
+        alertas = []
+        for ordem in ordens:
+            dias_restantes = (ordem.data_expiracao - hoje).days
+            alertas.append({
+                "ordem": ordem,
+                "dias_restantes": dias_restantes,
+                "faixa": ExpiracaoLicencaService.faixa(dias_restantes),
+            })
+        return alertas
+
+    @staticmethod
+    def calendario(ano: int, mes: int, contrato_id: Optional[int] = None,
+                   cliente_id: Optional[int] = None) -> List[List[Dict]]:
+        """
+        Semanas do mês (segunda a domingo) com as OFs que expiram em cada dia
+
+        Returns:
+            Lista de semanas; cada dia é um dict com data, no_mes e ordens
+        """
+        semanas = calendar.Calendar().monthdatescalendar(ano, mes)
+        por_dia = {}
+        for ordem in ExpiracaoLicencaService.expirando(semanas[0][0], semanas[-1][-1], contrato_id, cliente_id):
+            por_dia.setdefault(ordem.data_expiracao, []).append(ordem)
+        return [
+            [{"data": dia, "no_mes": dia.month == mes, "ordens": por_dia.get(dia, [])} for dia in semana]
+            for semana in semanas
+        ]
+
+    @staticmethod
+    def recalcular(ordens: Optional[QuerySet] = None) -> int:
+        """
+        Regrava data_expiracao (backfill ou após mudança da vigência do item)
+
+        A vigência é lida do item do contrato, como no save da OF.
+
+        Returns:
+            Quantidade de OFs cuja data de expiração mudou
+        """
+        ordens = OrdemFornecimento.objects.all() if ordens is None else ordens
+        alteradas = []
+        for ordem in ordens.select_related("item_contrato").only(
+            "id", "contrato_id", "data_ativacao", "vigencia_produto", "data_expiracao", "item_contrato__vigencia_produto"
+        ).iterator(chunk_size=2000):
+            vigencia = ordem.item_contrato.vigencia_produto
+            expiracao = OrdemFornecimento.calcular_data_expiracao(ordem.data_ativacao, vigencia)
+            if expiracao != ordem.data_expiracao or vigencia != ordem.vigencia_produto:
+                ordem.data_expiracao, ordem.vigencia_produto = expiracao, vigencia
+                alteradas.append(ordem)
+        with transaction.atomic():
+            OrdemFornecimento.objects.bulk_update(alteradas, ["data_expiracao", "vigencia_produto"], batch_size=1000)
+            CacheVersaoService.incrementar("contrato", *(ordem.contrato_id for ordem in alteradas))
+        return len(alteradas)
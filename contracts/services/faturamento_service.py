@@ -0,0 +1,226 @@
+"""
+Service Layer para a Fila de Faturamento
+Transição em lote de OS/OF finalizadas para faturadas, com criação dos
+tickets de contato de Customer Success em massa
+"""
+from typing import Dict, Iterable, List, Optional
+from datetime import date
+from decimal import Decimal
+
+from django.db import transaction
+from django.utils import timezone
+
+from ..models import FeedbackSprintOS, OrdemFornecimento, OrdemServico, Sprint
+from .cache_versao_service import CacheVersaoService
+from .evento_service import EventoService
+
+
+ZERO = Decimal("0.00")
+
+
+class FaturamentoService:
+    """
+    Faturamento em lote da fila de faturamento
+
+    Em vez de executar OrdemServico.save (sincronização com a Sprint, checagens
+    de ticket e signals) documento a documento, o lote é processado em uma
+    transação: as transições são gravadas com bulk_update, as Sprints vinculadas
+    são sincronizadas com um único UPDATE e os tickets de contato são criados
+    com bulk_create(ignore_conflicts=True) sobre o número determinístico do ticket.
+    Como nenhum desses caminhos dispara post_save, os eventos do fluxo de
+    atividades (OS, OF e Sprints faturadas) são registrados aqui.
+    """
+
+    STATUS_ORIGEM = "finalizada"
+    STATUS_DESTINO = "faturada"
+    MOTIVADOR_TICKET = "feedback_servico"
+
+    @staticmethod
+    def _resultado(tipo: str, pk: int, numero: Optional[str], ok: bool, mensagem: str) -> Dict:
+        return {"tipo": tipo, "id": pk, "numero": numero, "ok": ok, "mensagem": mensagem}
+
+    @staticmethod
+    def _validar(tipo: str, ids: List[int], documentos: Dict[int, object], campo_numero: str) -> tuple:
+        """
+        Separa os documentos aptos ao faturamento e registra os recusados
+
+        Returns:
+            Tupla (documentos aptos, resultados de erro)
+        """
+        aptos, erros = [], []
+        for pk in ids:
+            documento = documentos.get(pk)
+            if documento is None:
+                erros.append(FaturamentoService._resultado(tipo, pk, None, False, "não encontrada"))
+            elif documento.status != FaturamentoService.STATUS_ORIGEM:
+                erros.append(FaturamentoService._resultado(
+                    tipo, pk, getattr(documento, campo_numero), False,
+                    f"status '{documento.get_status_display()}' (apenas finalizadas podem ser faturadas)",
+                ))
+            else:
+                aptos.append(documento)
+        return aptos, erros
+
+    @staticmethod
+    def numero_ticket_os(numero_os: str) -> str:
+        """Número do ticket automático da OS (mesmo formato de FeedbackSprintOS.gerar_numero_ticket)"""
+        return f"TKT-OS-{numero_os.replace('/', '-').replace(' ', '')}"
+
+    @staticmethod
+    def _criar_tickets(ordens: List[OrdemServico], sprints: List[Sprint]) -> int:
+        """
+        Cria em massa os tickets de contato das OS e Sprints faturadas
+
+        Documentos que já possuem ticket de feedback são ignorados (uma consulta
+        por tipo) e colisões de numero_ticket são descartadas pelo banco.
+
+        Returns:
+            Quantidade de tickets enviados para criação
+        """
+        motivador = FaturamentoService.MOTIVADOR_TICKET
+        os_com_ticket = set(
+            FeedbackSprintOS.objects.filter(
+                ordem_servico__in=ordens, motivador_contato=motivador
+            ).values_list("ordem_servico_id", flat=True)
+        )
+        sprints_com_ticket = set(
+            FeedbackSprintOS.objects.filter(
+                sprint__in=sprints, motivador_contato=motivador
+            ).values_list("sprint_id", flat=True)
+        )
+
+        tickets = [
+            FeedbackSprintOS(
+                numero_ticket=FaturamentoService.numero_ticket_os(os_item.numero_os),
+                ordem_servico=os_item,
+                cliente_id=os_item.cliente_id,
+                contrato_id=os_item.contrato_id,
+                projeto_id=os_item.projeto_id,
+                motivador_contato=motivador,
+                status="pendente",
+            )
+            for os_item in ordens
+            if os_item.pk not in os_com_ticket
+        ]
+        tickets += [
+            FeedbackSprintOS(
+                numero_ticket=f"TKT-SPRINT-{sprint.pk}",
+                sprint=sprint,
+                cliente_id=sprint.projeto.contrato.cliente_id,
+                contrato_id=sprint.projeto.contrato_id,
+                projeto_id=sprint.projeto_id,
+                motivador_contato=motivador,
+                status="pendente",
+            )
+            for sprint in sprints
+            if sprint.pk not in sprints_com_ticket
+        ]
+        FeedbackSprintOS.objects.bulk_create(tickets, batch_size=500, ignore_conflicts=True)
+        return len(tickets)
+
+    @staticmethod
+    def faturar_em_lote(os_ids: Iterable[int] = (), of_ids: Iterable[int] = (),
+                        data: Optional[date] = None) -> Dict:
+        """
+        Marca como faturadas as OS e OF informadas em uma única transação
+
+        Args:
+            os_ids: IDs das Ordens de Serviço
+            of_ids: IDs das Ordens de Fornecimento
+            data: Data de faturamento (padrão: hoje). Documentos que já têm
+                data_faturamento a mantêm
+
+        Returns:
+            Dicionário com os resultados por documento, as quantidades faturadas,
+            os valores faturados (total e por contrato) e os tickets criados
+        """
+        data = data or timezone.now().date()
+        os_ids = list(dict.fromkeys(int(pk) for pk in os_ids))
+        of_ids = list(dict.fromkeys(int(pk) for pk in of_ids))
+
+        with transaction.atomic():
+            ordens_servico = {
+                os_item.pk: os_item
+                for os_item in OrdemServico.objects.select_for_update(of=("self",))
+                .select_related("item_contrato")
+                .filter(pk__in=os_ids)
+            }
+            ordens_fornecimento = {
+                of_item.pk: of_item
+                for of_item in OrdemFornecimento.objects.select_for_update().filter(pk__in=of_ids)
+            }
+
+            os_aptas, erros_os = FaturamentoService._validar("OS", os_ids, ordens_servico, "numero_os")
+            of_aptas, erros_of = FaturamentoService._validar("OF", of_ids, ordens_fornecimento, "numero_of")
+
+            for documento in os_aptas + of_aptas:
+                documento.status = FaturamentoService.STATUS_DESTINO
+                if not documento.data_faturamento:
+                    documento.data_faturamento = data
+
+            OrdemServico.objects.bulk_update(os_aptas, ["status", "data_faturamento"], batch_size=500)
+            OrdemFornecimento.objects.bulk_update(of_aptas, ["status", "data_faturamento"], batch_size=500)
+            CacheVersaoService.incrementar("contrato", *(documento.contrato_id for documento in os_aptas + of_aptas))
+            CacheVersaoService.incrementar("painel", "geral")
+
+            # Sincronização OS -> Sprint (mesma regra de OrdemServico.save) em um único UPDATE
+            sprints = list(
+                Sprint.objects.filter(ordem_servico__in=os_aptas)
+                .exclude(status=FaturamentoService.STATUS_DESTINO)
+                .select_related("projeto__contrato")
+            )
+            Sprint.objects.filter(pk__in=[sprint.pk for sprint in sprints]).update(
+                status=FaturamentoService.STATUS_DESTINO
+            )
+            CacheVersaoService.incrementar(
+                "projeto", *(sprint.projeto_id for sprint in sprints), *(ordem.projeto_id for ordem in os_aptas)
+            )
+
+            for os_item in os_aptas:
+                EventoService.registrar(
+                    "ordem_servico", os_item.pk, os_item.status,
+                    f"OS {os_item.numero_os}: {os_item.get_status_display()}", os_item.contrato_id,
+                )
+            for of_item in of_aptas:
+                EventoService.registrar(
+                    "ordem_fornecimento", of_item.pk, of_item.status,
+                    f"OF {of_item.numero_of}: {of_item.get_status_display()}", of_item.contrato_id,
+                )
+            for sprint in sprints:
+                sprint.status = FaturamentoService.STATUS_DESTINO
+                EventoService.registrar(
+                    "sprint", sprint.pk, sprint.status,
+                    f"Sprint {sprint.nome}: {sprint.get_status_display()}", sprint.projeto.contrato_id,
+                )
+
+            tickets = FaturamentoService._criar_tickets(os_aptas, sprints)
+
+        # Totais faturados no lote, consolidados uma única vez por contrato
+        por_contrato: Dict[int, Decimal] = {}
+        valor_os = ZERO
+        for os_item in os_aptas:
+            valor_os += os_item.receita_prevista
+            por_contrato[os_item.contrato_id] = por_contrato.get(os_item.contrato_id, ZERO) + os_item.receita_prevista
+        valor_of = ZERO
+        for of_item in of_aptas:
+            valor_of += of_item.valor_total or ZERO
+            por_contrato[of_item.contrato_id] = por_contrato.get(of_item.contrato_id, ZERO) + (of_item.valor_total or ZERO)
+
+        resultados = (
+            [FaturamentoService._resultado("OS", o.pk, o.numero_os, True, "faturada") for o in os_aptas]
+            + [FaturamentoService._resultado("OF", o.pk, o.numero_of, True, "faturada") for o in of_aptas]
+            + erros_os
+            + erros_of
+        )
+        return {
+            "resultados": resultados,
+            "faturadas_os": len(os_aptas),
+            "faturadas_of": len(of_aptas),
+            "erros": len(erros_os) + len(erros_of),
+            "valor_os": valor_os,
+            "valor_of": valor_of,
+            "valor_total": valor_os + valor_of,
+            "valor_por_contrato": por_contrato,
+            "sprints_sincronizadas": len(sprints),
+            "tickets_criados": tickets,
+        }
@@ -0,0 +1,206 @@
+"""
+Service Layer para as glosas por violação de SLA
+Aplica o QuadroPenalizacao às violações medidas (IncidenteSLA) de uma competência
+e projeta as deduções sobre as OS/OF da fila de faturamento (GlosaPrevista)
+"""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Dict, Iterable, Optional
+from datetime import date, datetime
+from decimal import Decimal
+
+from dateutil.relativedelta import relativedelta
+from django.db import transaction
+from django.db.models import Count, Max, Q, Sum
+from django.utils import timezone
+
+from ..models import GlosaPrevista, IncidenteSLA, OrdemFornecimento, OrdemServico, QuadroPenalizacao
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+class GlosaService:
+    """
+    Motor de glosas da competência (mês)
+
+    Em uma passada por competência: as violações por SLA importante vêm de uma
+    consulta agregada, as linhas do QuadroPenalizacao e os documentos (OS/OF na
+    fila ou faturados no mês) de uma consulta cada. O cruzamento documento x
+    penalização do mesmo contrato é feito com DataFrames:
+    - percentual: percentual × violações sobre o valor do documento;
+    - valor fixo: valor × violações rateado pelo valor dos documentos do contrato;
+    - a soma das glosas de um documento é limitada ao seu valor (na competência
+      e no total de por_documento).
+    """
+
+    STATUS_FILA = "finalizada"
+    STATUS_FATURADA = "faturada"
+
+    @staticmethod
+    def periodo(competencia: date) -> tuple:
+        """Início (inclusive) e fim (exclusive) do mês, com fuso, para filtrar aberto_em"""
+        inicio = competencia.replace(day=1)
+        fim = inicio + relativedelta(months=1)
+        return (
+            timezone.make_aware(datetime.combine(inicio, datetime.min.time())),
+            timezone.make_aware(datetime.combine(fim, datetime.min.time())),
+        )
+
+    @staticmethod
+    def violacoes(competencia: date, contrato_ids: Optional[Iterable[int]] = None) -> Dict[int, int]:
+        """Incidentes violados (resposta ou solução) abertos na competência, por SLA importante"""
+        inicio, fim = GlosaService.periodo(competencia)
+        incidentes = IncidenteSLA.objects.filter(aberto_em__gte=inicio, aberto_em__lt=fim).filter(
+            Q(violou_resposta=True) | Q(violou_solucao=True)
+        )
+        if contrato_ids is not None:
+            incidentes = incidentes.filter(contrato_id__in=list(contrato_ids))
+        return dict(incidentes.values("sla_id").annotate(total=Count("id")).values_list("sla_id", "total"))
+
+    @staticmethod
+    def documentos(competencia: date, contrato_ids: Iterable[int]) -> pd.DataFrame:
+        """
+        OS/OF da competência nos contratos: na fila (finalizadas) ou faturadas no mês
+
+        Returns:
+            DataFrame com tipo ("OS"/"OF"), documento_id, contrato_id e valor_base
+        """
+        import pandas as pd
+        inicio = competencia.replace(day=1)
+        fim = inicio + relativedelta(months=1)
+        contrato_ids = [int(pk) for pk in contrato_ids]
+        na_competencia = Q(status=GlosaService.STATUS_FILA) | Q(
+            status=GlosaService.STATUS_FATURADA, data_faturamento__gte=inicio, data_faturamento__lt=fim
+        )
+        ordens_servico = OrdemServico.objects.filter(na_competencia, contrato_id__in=contrato_ids).values_list(
+            "id", "contrato_id", "item_contrato__valor_unitario", "quantidade"
+        )
+        ordens_fornecimento = OrdemFornecimento.objects.filter(
+            na_competencia, contrato_id__in=contrato_ids
+        ).values_list("id", "contrato_id", "valor_total")
+        # Valor da OS como OrdemServico.receita_prevista (valor do item × quantidade)
+        linhas = [
+            ("OS", pk, contrato_id, float(valor or 0) * float(quantidade or 0))
+            for pk, contrato_id, valor, quantidade in ordens_servico
+        ] + [
+            ("OF", pk, contrato_id, float(valor or 0))
+            for pk, contrato_id, valor in ordens_fornecimento
+        ]
+        return pd.DataFrame(linhas, columns=["tipo", "documento_id", "contrato_id", "valor_base"])
+
+    @staticmethod
+    def calcular(competencia: date, contrato_ids: Optional[Iterable[int]] = None) -> pd.DataFrame:
+        """
+        Memória de cálculo das glosas da competência
+
+        Returns:
+            DataFrame com uma linha por documento e penalização: tipo,
+            documento_id, contrato_id, penalizacao_id, violacoes, valor_base,
+            percentual, valor_fixo_rateado e valor
+        """
+        import numpy as np
+        import pandas as pd
+        colunas = [
+            "tipo", "documento_id", "contrato_id", "penalizacao_id", "violacoes",
+            "valor_base", "percentual", "valor_fixo_rateado", "valor",
+        ]
+        violacoes = GlosaService.violacoes(competencia, contrato_ids)
+        penalizacoes = pd.DataFrame(
+            list(QuadroPenalizacao.objects.filter(sla_importante_id__in=list(violacoes)).values_list(
+                "id", "sla_importante_id", "sla_importante__contrato_id", "percentual", "valor_fixo"
+            )),
+            columns=["penalizacao_id", "sla_id", "contrato_id", "percentual", "valor_fixo"],
+        )
+        if penalizacoes.empty:
+            return pd.DataFrame(columns=colunas)
+        penalizacoes["violacoes"] = penalizacoes["sla_id"].map(violacoes).astype(int)
+        penalizacoes["percentual"] = penalizacoes["percentual"].astype(float)
+        penalizacoes["valor_fixo"] = penalizacoes["valor_fixo"].astype(float).fillna(0.0)
+
+        documentos = GlosaService.documentos(competencia, penalizacoes["contrato_id"].unique())
+        if documentos.empty:
+            return pd.DataFrame(columns=colunas)
+        documentos["participacao"] = documentos["valor_base"] / documentos.groupby("contrato_id")[
+            "valor_base"
+        ].transform("sum").replace(0.0, np.nan)
+
+        df = documentos.merge(penalizacoes, on="contrato_id")
+        df["valor_fixo_rateado"] = (df["valor_fixo"] * df["violacoes"] * df["participacao"]).fillna(0.0)
+        df["valor"] = (
+            df["valor_base"] * df["percentual"].fillna(0.0) / 100 * df["violacoes"] + df["valor_fixo_rateado"]
+        )
+        # A glosa de um documento não ultrapassa o seu valor: reduz proporcionalmente
+        total = df.groupby(["tipo", "documento_id"])["valor"].transform("sum")
+        fator = np.where(total > df["valor_base"], df["valor_base"] / total.replace(0.0, np.nan), 1.0)
+        df["valor"] = df["valor"] * np.nan_to_num(fator, nan=0.0)
+        df = df[df["valor"] > 0]
+        return df[colunas].reset_index(drop=True)
+
+    @staticmethod
+    def processar(competencia: Optional[date] = None, contrato_ids: Optional[Iterable[int]] = None) -> Dict:
+        """
+        Regrava GlosaPrevista da competência
+
+        Args:
+            competencia: Qualquer dia do mês (padrão: mês atual)
+            contrato_ids: Restringe aos contratos informados
+
+        Returns:
+            Dict com competencia, glosas (linhas gravadas), documentos e valor_total
+        """
+        import pandas as pd
+        competencia = (competencia or timezone.localdate()).replace(day=1)
+        contrato_ids = list(contrato_ids) if contrato_ids is not None else None
+        df = GlosaService.calcular(competencia, contrato_ids)
+        agora = timezone.now()
+
+        def decimal(valor):
+            return Decimal(str(round(float(valor), 2)))
+
+        glosas = [
+            GlosaPrevista(
+                competencia=competencia,
+                contrato_id=int(linha.contrato_id),
+                penalizacao_id=int(linha.penalizacao_id),
+                ordem_servico_id=int(linha.documento_id) if linha.tipo == "OS" else None,
+                ordem_fornecimento_id=int(linha.documento_id) if linha.tipo == "OF" else None,
+                violacoes=int(linha.violacoes),
+                valor_base=decimal(linha.valor_base),
+                percentual=None if pd.isna(linha.percentual) else decimal(linha.percentual),
+                valor_fixo_rateado=decimal(linha.valor_fixo_rateado),
+                valor=decimal(linha.valor),
+                calculado_em=agora,
+            )
+            for linha in df.itertuples(index=False)
+        ]
+        anteriores = GlosaPrevista.objects.filter(competencia=competencia)
+        if contrato_ids is not None:
+            anteriores = anteriores.filter(contrato_id__in=contrato_ids)
+        with transaction.atomic():
+            anteriores.delete()
+            GlosaPrevista.objects.bulk_create(glosas, batch_size=1000)
+        return {
+            "competencia": competencia,
+            "glosas": len(glosas),
+            "documentos": df[["tipo", "documento_id"]].drop_duplicates().shape[0],
+            "valor_total": sum((glosa.valor for glosa in glosas), Decimal("0.00")),
+        }
+
+    @staticmethod
+    def por_documento(os_ids: Iterable[int] = (), of_ids: Iterable[int] = ()) -> Dict[str, Dict[int, Decimal]]:
+        """
+        Glosa prevista total de cada OS/OF (todas as competências), para a fila de faturamento
+
+        Um documento que permanece na fila recebe glosas em cada competência
+        processada; o total também é limitado ao valor do documento.
+        """
+        def somar(campo, ids):
+            totais = (
+                GlosaPrevista.objects.filter(**{f"{campo}__in": list(ids)})
+                .values(campo).annotate(total=Sum("valor"), base=Max("valor_base"))
+                .values_list(campo, "total", "base")
+            )
+            return {pk: min(total, base) for pk, total, base in totais}
+
+        return {"os": somar("ordem_servico_id", os_ids), "of": somar("ordem_fornecimento_id", of_ids)}
@@ -0,0 +1,391 @@
+"""
+Service Layer para a materialização de projetos a partir do Plano de Trabalho
+Monta em memória as OS, Sprints e Tarefas de um plano aprovado e grava tudo
+com bulk_create em uma única transação
+"""
+import hashlib
+import json
+import logging
+from typing import Dict, Iterable, List, Optional
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from ..models import Colaborador, ItemContrato, ItemFornecedor, OrdemServico, Sprint, Tarefa
+from .cache_versao_service import CacheVersaoService
+
+logger = logging.getLogger(__name__)
+
+
+class MaterializacaoProjetoService:
+    """
+    Criação em lote do grafo Projeto > OS > Sprint > Tarefa
+
+    Substitui o save() individual de cada Sprint (que cria a OS e varre as OS do
+    ano para numerá-la) e de cada Tarefa (que recalcula horas e, nas tarefas de
+    gestão, soma novamente as tarefas da sprint). Os números de OS são alocados
+    em bloco, as horas derivadas são calculadas uma única vez e a quantidade de
+    consultas não depende do tamanho do plano.
+    """
+
+    TIPOS_ITEM_OS = ["servico", "treinamento", "consultoria"]
+    PERIODOS_TRABALHO = [(time(9, 0), time(12, 0)), (time(14, 0), time(19, 0))]
+    PERCENTUAL_GESTAO = Tarefa.PERCENTUAL_GESTAO
+    HORAS_MINIMAS = Decimal("8.00")
+    HORAS_PADRAO = 40
+    TERMOS_GESTAO = ("gestão", "gerente")
+    PRIORIDADES = {"critica": "critica", "alta": "alta", "media": "media", "baixa": "baixa"}
+    BATCH_SIZE = 500
+    # Campos gerados a partir do plano; o fingerprint registra seus valores na última sincronização
+    CAMPOS_SPRINT_PLANO = ["descricao", "data_inicio", "data_fim"]
+    CAMPOS_TAREFA_PLANO = ["descricao", "prioridade", "horas_planejadas", "responsavel_id", "bilhetar_na_os"]
+
+    # ==================== REGRAS DE DOMÍNIO ====================
+
+    @staticmethod
+    def parse_data(valor) -> Optional[date]:
+        """Converte 'AAAA-MM-DD' (ou date) em date; None se inválido"""
+        if not valor:
+            return None
+        if isinstance(valor, date):
+            return valor
+        try:
+            return datetime.strptime(str(valor), "%Y-%m-%d").date()
+        except (ValueError, TypeError):
+            return None
+
+    @staticmethod
+    def descricao_tarefa(tarefa_data: Dict) -> str:
+        """Descrição completa da tarefa com entregável, critérios de aceitação e dependências"""
+        descricao = tarefa_data.get("descricao", "") or ""
+        if tarefa_data.get("entregavel"):
+            descricao += f"\n\nEntregável: {tarefa_data['entregavel']}"
+        if tarefa_data.get("criterios_aceitacao"):
+            descricao += f"\n\nCritérios de Aceitação: {tarefa_data['criterios_aceitacao']}"
+        if tarefa_data.get("dependencias"):
+            descricao += f"\n\nDependências: {', '.join(tarefa_data['dependencias'])}"
+        return descricao.strip()
+
+    @staticmethod
+    def horas_tarefa(tarefa_data: Dict) -> Decimal:
+        """Horas planejadas informadas no plano (mínimo de 8 horas)"""
+        horas = Decimal(str(tarefa_data.get("horas_planejadas", MaterializacaoProjetoService.HORAS_PADRAO)))
+        return max(horas, MaterializacaoProjetoService.HORAS_MINIMAS)
+
+    @staticmethod
+    def prioridade_tarefa(tarefa_data: Dict, padrao: str = "media") -> str:
+        return MaterializacaoProjetoService.PRIORIDADES.get(
+            (tarefa_data.get("prioridade") or "").lower(), padrao
+        )
+
+    @staticmethod
+    def is_titulo_gestao(titulo: str) -> bool:
+        """Tarefa de gestão pelo título (mesmo critério de SprintQuerySet.FILTRO_GESTAO)"""
+        titulo = (titulo or "").lower()
+        return any(termo in titulo for termo in MaterializacaoProjetoService.TERMOS_GESTAO)
+
+    @staticmethod
+    def _aware(valor: datetime) -> datetime:
+        if settings.USE_TZ and timezone.is_naive(valor):
+            return timezone.make_aware(valor)
+        return valor
+
+    @staticmethod
+    def avancar_horas_uteis(inicio: datetime, horas: Decimal) -> datetime:
+        """
+        Data/hora em que terminam `horas` de trabalho iniciadas em `inicio`
+
+        Considera dias úteis (segunda a sexta) das 09h-12h e 14h-19h.
+
+        Args:
+            inicio: Data/hora de início (naive)
+            horas: Horas de trabalho
+
+        Returns:
+            Data/hora de término (naive)
+        """
+        restante = timedelta(hours=float(horas))
+        atual = inicio
+        while True:
+            if atual.weekday() < 5:
+                for abertura, fechamento in MaterializacaoProjetoService.PERIODOS_TRABALHO:
+                    fim_periodo = datetime.combine(atual.date(), fechamento)
+                    if atual >= fim_periodo:
+                        continue
+                    atual = max(atual, datetime.combine(atual.date(), abertura))
+                    disponivel = fim_periodo - atual
+                    if restante <= disponivel:
+                        return atual + restante
+                    restante -= disponivel
+                    atual = fim_periodo
+            atual = datetime.combine(atual.date() + timedelta(days=1), time(9, 0))
+
+    @staticmethod
+    def buscar_responsavel(nome: Optional[str], colaboradores: List[Colaborador], padrao):
+        """
+        Colaborador cujo nome ou cargo contém `nome` (em memória, mesma regra do
+        filtro icontains usado anteriormente); `padrao` quando não encontrado
+        """
+        if not nome:
+            return padrao
+        nome = nome.lower()
+        for colaborador in colaboradores:
+            if nome in (colaborador.nome_completo or "").lower() or nome in (colaborador.cargo or "").lower():
+                return colaborador
+        return padrao
+
+    @staticmethod
+    def fingerprint(objeto, campos: List[str]) -> str:
+        """
+        Hash (sha1) dos valores de `campos` no objeto, estável entre memória e banco
+
+        Decimais são normalizados com duas casas e datas em ISO, de modo que a
+        instância montada a partir do plano e a lida do banco geram o mesmo hash.
+        """
+        valores = {}
+        for campo in campos:
+            valor = getattr(objeto, campo)
+            if isinstance(valor, Decimal):
+                valor = f"{valor:.2f}"
+            elif isinstance(valor, date):
+                valor = valor.isoformat()
+            valores[campo] = valor
+        conteudo = json.dumps(valores, sort_keys=True, default=str)
+        return hashlib.sha1(conteudo.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def periodo_sprint(sprint_data: Dict, data_inicio_padrao: date,
+                       data_fim_sprint: Optional[date] = None) -> tuple:
+        """Início e fim da sprint do plano (ver `materializar`)"""
+        inicio = MaterializacaoProjetoService.parse_data(sprint_data.get("data_inicio")) or data_inicio_padrao
+        fim = (
+            (data_fim_sprint if data_fim_sprint and data_fim_sprint >= inicio else None)
+            or MaterializacaoProjetoService.parse_data(sprint_data.get("data_fim"))
+            or inicio + timedelta(days=14)
+        )
+        return inicio, fim
+
+    @staticmethod
+    def montar_sprint(projeto, sprint_data: Dict, inicio: date, fim: date, ordem=None) -> Sprint:
+        return Sprint(
+            projeto=projeto,
+            nome=sprint_data.get("nome", "Sprint"),
+            descricao=sprint_data.get("descricao", sprint_data.get("objetivo", "")),
+            status="aberta",
+            data_inicio=inicio,
+            data_fim=fim,
+            ordem_servico=ordem,
+        )
+
+    @staticmethod
+    def colaboradores_para(sprints_data: List[Dict]) -> List[Colaborador]:
+        """Colaboradores candidatos a responsável (consulta só quando o plano indica nomes)"""
+        nomes_responsaveis = [
+            tarefa.get("responsavel") for sprint in sprints_data for tarefa in sprint.get("tarefas") or []
+            if tarefa.get("responsavel")
+        ]
+        return list(Colaborador.objects.all()) if nomes_responsaveis else []
+
+    # ==================== ALOCAÇÕES EM BLOCO ====================
+
+    @staticmethod
+    def alocar_numeros_os(anos: Iterable[int]) -> Dict[int, int]:
+        """
+        Próximo sequencial de OS por ano, obtido com uma única consulta
+
+        Args:
+            anos: Anos para os quais haverá numeração
+
+        Returns:
+            Dicionário {ano: próximo sequencial}
+        """
+        anos = sorted(set(anos))
+        if not anos:
+            return {}
+        filtro = Q()
+        for ano in anos:
+            filtro |= Q(numero_os__endswith=f"/{ano}")
+
+        proximos = {ano: 1 for ano in anos}
+        for numero in OrdemServico.objects.filter(filtro).values_list("numero_os", flat=True):
+            try:
+                sequencial, ano = numero.split("/")
+                proximos[int(ano)] = max(proximos[int(ano)], int(sequencial) + 1)
+            except (ValueError, KeyError):
+                continue
+        return proximos
+
+    @staticmethod
+    def itens_para_os(contrato):
+        """
+        Item de contrato e item de fornecedor usados nas OS das sprints
+        (mesma escolha feita por Sprint.save)
+        """
+        item_contrato = (
+            ItemContrato.objects.filter(contrato=contrato, tipo__in=MaterializacaoProjetoService.TIPOS_ITEM_OS).first()
+            or ItemContrato.objects.filter(contrato=contrato).first()
+        )
+        item_fornecedor = (
+            ItemFornecedor.objects.filter(tipo="servico").first()
+            or ItemFornecedor.objects.first()
+        )
+        if not item_contrato or not item_fornecedor:
+            raise ValueError(
+                "Não é possível criar a OS automaticamente: "
+                "é necessário ter pelo menos um Item de Contrato e um Item de Fornecedor cadastrados."
+            )
+        return item_contrato, item_fornecedor
+
+    @staticmethod
+    def nova_os(projeto, contrato, item_contrato, item_fornecedor, numero_os: str,
+                data_inicio: date, data_termino: date) -> OrdemServico:
+        """OS da sprint com os campos que OrdemServico.save derivaria"""
+        gerente = projeto.gerente_projeto
+        return OrdemServico(
+            numero_os=numero_os,
+            cliente_id=contrato.cliente_id,
+            contrato=contrato,
+            projeto=projeto,
+            item_contrato=item_contrato,
+            item_fornecedor_consultor=item_fornecedor,
+            unidade=item_contrato.unidade,
+            valor_unitario=item_contrato.valor_unitario,
+            valor_total=Decimal("0.00"),
+            quantidade=Decimal("0.00"),  # Será atualizada quando as horas forem aprovadas
+            tipo_os=item_contrato.tipo,
+            data_inicio=data_inicio,
+            data_termino=data_termino,
+            status="aberta",
+            gerente_projetos=str(gerente) if gerente else None,
+        )
+
+    @staticmethod
+    def montar_tarefas(projeto, sprint: Sprint, tarefas_data: List[Dict],
+                       colaboradores: List[Colaborador], responsavel_padrao) -> List[Tarefa]:
+        """
+        Tarefas da sprint com datas e horas derivadas calculadas uma única vez
+
+        As tarefas do consultor são agendadas em sequência a partir do início da
+        sprint, em horário útil. As de gestão ocupam todo o período da sprint com
+        25% das horas do consultor (regra de Tarefa.save). Os totais de horas
+        armazenados na sprint são preenchidos na própria instância.
+        """
+        inicio_sprint = datetime.combine(sprint.data_inicio, time(9, 0))
+        fim_sprint = datetime.combine(sprint.data_fim, time(23, 59, 59))
+        cursor = inicio_sprint
+
+        tarefas, gestao = [], []
+        horas_consultor = Decimal("0.00")
+        for ordem, tarefa_data in enumerate(tarefas_data):
+            titulo = tarefa_data.get("titulo", "Tarefa")
+            tarefa = Tarefa(
+                projeto=projeto,
+                sprint=sprint,
+                titulo=titulo,
+                descricao=MaterializacaoProjetoService.descricao_tarefa(tarefa_data),
+                prioridade=MaterializacaoProjetoService.prioridade_tarefa(tarefa_data),
+                responsavel=MaterializacaoProjetoService.buscar_responsavel(
+                    tarefa_data.get("responsavel"), colaboradores, responsavel_padrao
+                ),
+                bilhetar_na_os=tarefa_data.get("bilhetar_na_os", True),
+                status="pendente",
+                status_sprint="nao_iniciada",
+                ordem_sprint=ordem,
+            )
+            if MaterializacaoProjetoService.is_titulo_gestao(titulo):
+                tarefa.papel = "gestao"
+                gestao.append(tarefa)
+            else:
+                horas = MaterializacaoProjetoService.horas_tarefa(tarefa_data)
+                termino = min(MaterializacaoProjetoService.avancar_horas_uteis(cursor, horas), fim_sprint)
+                tarefa.horas_planejadas = horas
+                tarefa.data_inicio_prevista = MaterializacaoProjetoService._aware(cursor)
+                tarefa.data_termino_prevista = MaterializacaoProjetoService._aware(termino)
+                tarefa.plano_fingerprint = MaterializacaoProjetoService.fingerprint(
+                    tarefa, MaterializacaoProjetoService.CAMPOS_TAREFA_PLANO
+                )
+                horas_consultor += horas
+                cursor = termino
+            tarefas.append(tarefa)
+
+        horas_gestao = (horas_consultor * MaterializacaoProjetoService.PERCENTUAL_GESTAO).quantize(Decimal("0.01"))
+        for tarefa in gestao:
+            tarefa.horas_planejadas = horas_gestao
+            tarefa.data_inicio_prevista = MaterializacaoProjetoService._aware(
+                datetime.combine(sprint.data_inicio, time.min)
+            )
+            tarefa.data_termino_prevista = MaterializacaoProjetoService._aware(fim_sprint)
+            tarefa.plano_fingerprint = MaterializacaoProjetoService.fingerprint(
+                tarefa, MaterializacaoProjetoService.CAMPOS_TAREFA_PLANO
+            )
+        sprint.horas_consultor_planejadas = horas_consultor
+        sprint.horas_gestao_planejadas = horas_gestao * len(gestao)
+        return tarefas
+
+    # ==================== MATERIALIZAÇÃO ====================
+
+    @staticmethod
+    def materializar(projeto, sprints_data: List[Dict], data_inicio_padrao: date,
+                     data_fim_sprint: Optional[date] = None) -> Dict[str, int]:
+        """
+        Cria OS, Sprints e Tarefas do plano em uma transação com bulk_create
+
+        Args:
+            projeto: Projeto que receberá as sprints
+            sprints_data: Sprints do plano (nome, objetivo/descricao, data_inicio,
+                data_fim e lista de tarefas)
+            data_inicio_padrao: Início usado quando a sprint não tem data válida
+            data_fim_sprint: Data de fim aplicada às sprints que começam até ela
+                (padrão: a data_fim informada em cada sprint)
+
+        Returns:
+            Quantidades de OS, sprints e tarefas criadas
+        """
+        contrato = projeto.contrato
+        responsavel_padrao = contrato.gerente_contrato
+        item_contrato, item_fornecedor = MaterializacaoProjetoService.itens_para_os(contrato)
+
+        colaboradores = MaterializacaoProjetoService.colaboradores_para(sprints_data)
+        periodos = [
+            MaterializacaoProjetoService.periodo_sprint(sprint_data, data_inicio_padrao, data_fim_sprint)
+            for sprint_data in sprints_data
+        ]
+
+        with transaction.atomic():
+            proximos = MaterializacaoProjetoService.alocar_numeros_os(inicio.year for inicio, _ in periodos)
+            ordens = []
+            for inicio, fim in periodos:
+                numero = f"{proximos[inicio.year]:04d}/{inicio.year}"
+                proximos[inicio.year] += 1
+                ordens.append(MaterializacaoProjetoService.nova_os(
+                    projeto, contrato, item_contrato, item_fornecedor, numero, inicio, fim
+                ))
+            OrdemServico.objects.bulk_create(ordens, batch_size=MaterializacaoProjetoService.BATCH_SIZE)
+
+            sprints = [
+                MaterializacaoProjetoService.montar_sprint(projeto, sprint_data, inicio, fim, ordem)
+                for sprint_data, (inicio, fim), ordem in zip(sprints_data, periodos, ordens)
+            ]
+            tarefas = []
+            for sprint, sprint_data in zip(sprints, sprints_data):
+                sprint.plano_fingerprint = MaterializacaoProjetoService.fingerprint(
+                    sprint, MaterializacaoProjetoService.CAMPOS_SPRINT_PLANO
+                )
+                # Montadas antes da gravação para que a sprint já seja criada com os totais de horas
+                tarefas += MaterializacaoProjetoService.montar_tarefas(
+                    projeto, sprint, sprint_data.get("tarefas") or [], colaboradores, responsavel_padrao
+                )
+            Sprint.objects.bulk_create(sprints, batch_size=MaterializacaoProjetoService.BATCH_SIZE)
+            Tarefa.objects.bulk_create(tarefas, batch_size=MaterializacaoProjetoService.BATCH_SIZE)
+            CacheVersaoService.incrementar("contrato", contrato.pk)
+            CacheVersaoService.incrementar("projeto", projeto.pk)
+            CacheVersaoService.incrementar("painel", "geral")
+
+        logger.info(
+            f"Projeto {projeto.pk} materializado: {len(ordens)} OS, {len(sprints)} sprints, {len(tarefas)} tarefas"
+        )
+        return {"ordens_servico": len(ordens), "sprints": len(sprints), "tarefas": len(tarefas)}
@@ -0,0 +1,116 @@
+"""
+Service Layer para o orçamento de horas do consultor nas OS das sprints
+Verifica, com uma consulta agregada, se tarefas novas ou alteradas excedem
+as horas de consultor contratadas na OS vinculada à sprint
+"""
+from typing import Dict, Iterable, List
+from decimal import Decimal
+
+from django.db.models import DecimalField, Q, Sum, Value
+from django.db.models.functions import Coalesce
+
+from ..models import OrdemServico, Sprint, Tarefa
+
+
+class OrcamentoHorasService:
+    """
+    Validação do orçamento de horas de consultor (OrdemServico.horas_consultor)
+
+    O orçamento de uma OS é consumido pelas tarefas de consultor da sprint
+    vinculada a ela. A validação recebe as tarefas como ficarão após a
+    alteração (em memória) e compara, por OS, a soma das demais tarefas gravadas
+    com as novas horas. Serve ao Tarefa.clean (formulários), aos endpoints AJAX
+    e às operações em lote. OS sem horas de consultor definidas não têm limite.
+    """
+
+    @staticmethod
+    def horas_efetivas(tarefa: Tarefa) -> Decimal:
+        """
+        Horas planejadas que a tarefa terá após o save
+
+        Tarefas novas (ou sem horas) usam as horas úteis entre início e término,
+        como em Tarefa.save; nas demais vale o valor informado.
+        """
+        horas = tarefa.horas_planejadas or Decimal("0.00")
+        if (tarefa._state.adding or not horas) and tarefa.data_inicio_prevista and tarefa.data_termino_prevista:
+            horas = tarefa.calcular_horas_dias_uteis(tarefa.data_inicio_prevista, tarefa.data_termino_prevista)
+        return Decimal(str(horas)).quantize(Decimal("0.01"))
+
+    @staticmethod
+    def _ordens_das_sprints(tarefas: List[Tarefa]) -> Dict[int, int]:
+        """{sprint_id: ordem_servico_id}, sem consulta quando a sprint já está carregada"""
+        ordens, pendentes = {}, set()
+        for tarefa in tarefas:
+            if Tarefa.sprint.is_cached(tarefa) and tarefa.sprint is not None:
+                ordens[tarefa.sprint_id] = tarefa.sprint.ordem_servico_id
+            else:
+                pendentes.add(tarefa.sprint_id)
+        if pendentes:
+            ordens.update(Sprint.objects.filter(pk__in=pendentes).values_list("pk", "ordem_servico_id"))
+        return ordens
+
+    @staticmethod
+    def validar(tarefas: Iterable[Tarefa]) -> List[Dict]:
+        """
+        Violações do orçamento de horas de consultor causadas pelas tarefas
+
+        Args:
+            tarefas: Tarefas novas ou alteradas, com os valores que serão gravados
+
+        Returns:
+            Lista de violações (uma por OS) com ordem_servico_id, numero_os,
+            limite, horas_outras, horas_alteradas, total, excedente, tarefas
+            (títulos das tarefas alteradas) e mensagem. Lista vazia se o
+            orçamento comporta as alterações.
+        """
+        tarefas = [tarefa for tarefa in tarefas if tarefa.sprint_id and tarefa.papel == "consultor"]
+        if not tarefas:
+            return []
+
+        ordens = OrcamentoHorasService._ordens_das_sprints(tarefas)
+        por_ordem = {}
+        for tarefa in tarefas:
+            ordem_id = ordens.get(tarefa.sprint_id)
+            if ordem_id:
+                por_ordem.setdefault(ordem_id, []).append(tarefa)
+        if not por_ordem:
+            return []
+
+        # Uma consulta: limite da OS e horas das demais tarefas de consultor da sprint vinculada
+        alteradas = [tarefa.pk for tarefa in tarefas if tarefa.pk]
+        filtro = Q(sprint__tarefas__papel="consultor")
+        if alteradas:
+            filtro &= ~Q(sprint__tarefas__pk__in=alteradas)
+        orcamentos = (
+            OrdemServico.objects.filter(pk__in=por_ordem, horas_consultor__isnull=False)
+            .annotate(horas_outras=Coalesce(
+                Sum("sprint__tarefas__horas_planejadas", filter=filtro),
+                Value(Decimal("0.00"), output_field=DecimalField()),
+            ))
+            .values_list("pk", "numero_os", "horas_consultor", "horas_outras")
+        )
+
+        violacoes = []
+        for ordem_id, numero_os, limite, horas_outras in orcamentos:
+            horas_alteradas = sum(
+                (OrcamentoHorasService.horas_efetivas(tarefa) for tarefa in por_ordem[ordem_id]),
+                Decimal("0.00"),
+            )
+            total = horas_outras + horas_alteradas
+            if total <= limite:
+                continue
+            violacoes.append({
+                "ordem_servico_id": ordem_id,
+                "numero_os": numero_os,
+                "limite": limite,
+                "horas_outras": horas_outras,
+                "horas_alteradas": horas_alteradas,
+                "total": total,
+                "excedente": total - limite,
+                "tarefas": [tarefa.titulo for tarefa in por_ordem[ordem_id]],
+                "mensagem": (
+                    f"A soma das horas planejadas das tarefas do consultor ({total}h) excede o total "
+                    f"de horas do consultor na OS {numero_os} ({limite}h)."
+                ),
+            })
+        return violacoes
@@ -0,0 +1,184 @@
+"""
+Service Layer para a previsão de consumo dos itens de contrato
+Ajusta o ritmo de consumo de cada item pelo histórico de OS/OF faturadas e
+prevê a data de esgotamento do saldo frente ao fim do contrato
+"""
+from typing import Dict, List, Optional
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import F, Q
+from django.db.models.functions import Coalesce, TruncDate
+from django.utils import timezone
+
+from ..constants import TIPOS_PRODUTO_CONST, TIPOS_SERVICO_TREINAMENTO_CONST
+from ..models import ItemContrato, OrdemFornecimento, OrdemServico, PrevisaoConsumoItem
+from .cache_versao_service import CacheVersaoService
+
+
+class PrevisaoConsumoService:
+    """
+    Previsão de esgotamento do saldo dos itens de contrato
+
+    O consumo acumulado de cada item (OS faturadas para serviços/treinamentos,
+    OF faturadas para produtos, como em ItemContrato.quantidade_consumida) é
+    ajustado por uma reta de mínimos quadrados, com o ponto (assinatura, 0)
+    como origem. Todos os itens são ajustados de uma vez com somas agrupadas
+    (np.bincount). A inclinação é o consumo diário usado na projeção.
+    """
+
+    # Saldo previsto no fim do contrato acima deste percentual da quantidade = subutilização
+    PERCENTUAL_OCIOSO_ALERTA = 30.0
+    # Esgotamento além deste horizonte não é projetado (ritmo desprezível)
+    HORIZONTE_DIAS = 365 * 20
+
+    @staticmethod
+    def historico(item_ids: Optional[List[int]] = None) -> List[tuple]:
+        """(item_id, data, quantidade) das OS e OF faturadas que consomem os itens"""
+        ordens_servico = OrdemServico.objects.filter(
+            status="faturada", item_contrato__tipo__in=TIPOS_SERVICO_TREINAMENTO_CONST
+        )
+        ordens_fornecimento = OrdemFornecimento.objects.filter(
+            status="faturada", item_contrato__tipo__in=TIPOS_PRODUTO_CONST
+        )
+        if item_ids is not None:
+            ordens_servico = ordens_servico.filter(item_contrato_id__in=item_ids)
+            ordens_fornecimento = ordens_fornecimento.filter(item_contrato_id__in=item_ids)
+        return list(
+            ordens_servico.annotate(dia=Coalesce("data_faturamento", "data_inicio"))
+            .values_list("item_contrato_id", "dia", "quantidade")
+        ) + list(
+            ordens_fornecimento.annotate(dia=Coalesce("data_faturamento", "data_ativacao", TruncDate("criado_em")))
+            .values_list("item_contrato_id", "dia", "quantidade")
+        )
+
+    @staticmethod
+    def calcular(hoje: Optional[date] = None) -> List[Dict]:
+        """
+        Previsão de todos os itens de contratos vigentes
+
+        Args:
+            hoje: Data de referência (padrão: hoje)
+
+        Returns:
+            Lista de dicts com os campos de PrevisaoConsumoItem (item_id, ...)
+        """
+        import numpy as np
+        hoje = hoje or timezone.now().date()
+        itens = list(
+            ItemContrato.objects.filter(Q(contrato__data_fim__gte=hoje) | Q(contrato__data_fim__isnull=True))
+            .values_list("id", "quantidade", "contrato__data_assinatura", "contrato__data_fim")
+        )
+        if not itens:
+            return []
+
+        n = len(itens)
+        posicao = {item[0]: i for i, item in enumerate(itens)}
+        quantidade = np.array([float(item[1] or 0) for item in itens])
+        assinatura = np.array([(item[2] - hoje).days if item[2] else 0 for item in itens], dtype=float)
+        dias_restantes = np.array([(item[3] - hoje).days if item[3] else np.nan for item in itens])
+
+        eventos = [e for e in PrevisaoConsumoService.historico(list(posicao)) if e[1]]
+        grupo = np.array([posicao[e[0]] for e in eventos], dtype=np.int64)
+        dia = np.array([(e[1] - hoje).days for e in eventos], dtype=float)
+        consumo = np.array([float(e[2] or 0) for e in eventos])
+
+        # Origem (assinatura, 0) de cada item + eventos, ordenados por (item, dia)
+        grupo = np.r_[np.arange(n), grupo]
+        dia = np.r_[assinatura, dia]
+        consumo = np.r_[np.zeros(n), consumo]
+        ordem = np.lexsort((dia, grupo))
+        grupo, dia, consumo = grupo[ordem], dia[ordem], consumo[ordem]
+
+        # Consumo acumulado dentro de cada item
+        acumulado = np.cumsum(consumo)
+        inicio_grupo = np.r_[0, np.flatnonzero(grupo[1:] != grupo[:-1]) + 1]
+        acumulado -= np.repeat(acumulado[inicio_grupo] - consumo[inicio_grupo], np.diff(np.r_[inicio_grupo, len(grupo)]))
+
+        # Mínimos quadrados (acumulado = a + b * dia) com somas por item
+        pontos = np.bincount(grupo, minlength=n).astype(float)
+        soma_t = np.bincount(grupo, weights=dia, minlength=n)
+        soma_c = np.bincount(grupo, weights=acumulado, minlength=n)
+        soma_tt = np.bincount(grupo, weights=dia * dia, minlength=n)
+        soma_tc = np.bincount(grupo, weights=dia * acumulado, minlength=n)
+        denominador = pontos * soma_tt - soma_t ** 2
+        consumido = np.bincount(grupo, weights=consumo, minlength=n)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ritmo = np.where(denominador > 0, (pontos * soma_tc - soma_t * soma_c) / denominador, 0.0)
+            # Todo o consumo no dia da assinatura: ritmo médio desde então
+            ritmo = np.where(
+                (denominador <= 0) & (consumido > 0), consumido / np.maximum(-assinatura, 1.0), ritmo
+            )
+        ritmo = np.maximum(ritmo, 0.0)
+
+        saldo = quantidade - consumido
+        with np.errstate(divide="ignore", invalid="ignore"):
+            dias_esgotamento = np.where((ritmo > 0) & (saldo > 0), np.ceil(saldo / ritmo), np.inf)
+            saldo_fim = np.where(np.isnan(dias_restantes), saldo, saldo - ritmo * np.maximum(dias_restantes, 0))
+            saldo_fim = np.maximum(saldo_fim, 0.0)
+            ocioso = np.where(quantidade > 0, saldo_fim * 100 / quantidade, 0.0)
+
+        situacao = np.select(
+            [
+                saldo <= 0,
+                ritmo <= 0,
+                dias_esgotamento < np.nan_to_num(dias_restantes, nan=np.inf),
+                ocioso > PrevisaoConsumoService.PERCENTUAL_OCIOSO_ALERTA,
+            ],
+            ["esgotado", "sem_historico", "esgota_antes", "subutilizado"],
+            default="adequado",
+        )
+
+        def decimal(valor, casas="0.01"):
+            return Decimal(str(round(float(valor), 4))).quantize(Decimal(casas))
+
+        previsoes = []
+        for i, item in enumerate(itens):
+            esgotamento = None
+            if dias_esgotamento[i] <= PrevisaoConsumoService.HORIZONTE_DIAS:
+                esgotamento = hoje + timedelta(days=int(dias_esgotamento[i]))
+            previsoes.append({
+                "item_id": item[0],
+                "quantidade_consumida": decimal(consumido[i]),
+                "saldo_quantidade": decimal(saldo[i]),
+                "consumo_diario": decimal(ritmo[i], "0.0001"),
+                "data_esgotamento_prevista": esgotamento,
+                "data_fim_contrato": item[3],
+                "saldo_previsto_fim": decimal(saldo_fim[i]),
+                "percentual_ocioso": decimal(min(ocioso[i], 9999.99)),
+                "situacao": str(situacao[i]),
+                "calculado_em": hoje,
+            })
+        return previsoes
+
+    @staticmethod
+    def materializar(hoje: Optional[date] = None) -> int:
+        """
+        Regrava a tabela PrevisaoConsumoItem
+
+        Returns:
+            Quantidade de previsões gravadas
+        """
+        previsoes = [PrevisaoConsumoItem(**valores) for valores in PrevisaoConsumoService.calcular(hoje)]
+        with transaction.atomic():
+            PrevisaoConsumoItem.objects.all().delete()
+            PrevisaoConsumoItem.objects.bulk_create(previsoes, batch_size=1000)
+            CacheVersaoService.incrementar("painel", "geral")
+        return len(previsoes)
+
+    @staticmethod
+    def itens_criticos(limite: int = 5):
+        """
+        Itens que esgotam antes do fim do contrato ou com saldo abaixo de 10%
+
+        Lê a tabela materializada (uma consulta), ordenando pelo esgotamento mais próximo.
+        """
+        return (
+            PrevisaoConsumoItem.objects.filter(
+                Q(situacao="esgota_antes")
+                | Q(saldo_quantidade__gt=0, saldo_quantidade__lt=F("item__saldo_quantidade_inicial") * Decimal("0.1"))
+            )
+            .select_related("item__contrato")
+            .order_by(F("data_esgotamento_prevista").asc(nulls_last=True))[:limite]
+        )
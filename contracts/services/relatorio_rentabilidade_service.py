@@ -0,0 +1,388 @@
+"""
+Service Layer para o Relatório de Rentabilidade do Portfólio
+Consolida receita, custos e margem das OS por cliente, fornecedor e mês
+"""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Dict, List, Optional
+from io import BytesIO
+
+from django.db.models import FloatField
+from django.db.models.functions import Cast
+
+from ..models import OrdemServico
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+
+class RelatorioRentabilidadeService:
+    """
+    Calcula a rentabilidade do portfólio de OS de forma vetorizada.
+
+    Os dados são lidos com uma única consulta (values_list) e todas as
+    métricas são calculadas em colunas do DataFrame, aplicando as mesmas
+    regras das properties de margem da OrdemServico (impostos 15%,
+    royalties 12%, exequível com margem >= 20%).
+    """
+
+    PERCENTUAL_IMPOSTOS = 0.15
+    PERCENTUAL_ROYALTIES = 0.12
+    PERCENTUAL_MARGEM_MINIMA = 20.0
+
+    # Dimensões disponíveis e a ordem do drill-down (cliente -> fornecedor -> mês)
+    DIMENSOES = {
+        "cliente": "Cliente",
+        "fornecedor": "Fornecedor",
+        "mes": "Mês",
+    }
+    ORDEM_DRILL_DOWN = ["cliente", "fornecedor", "mes"]
+
+    CAMPOS_CONSULTA = [
+        "id",
+        "numero_os",
+        "status",
+        "cliente_id",
+        "cliente__nome_fantasia",
+        "cliente__nome_razao_social",
+        "item_fornecedor_consultor__fornecedor",
+        "item_fornecedor_gerente__fornecedor",
+        "data_faturamento",
+        "data_inicio",
+    ]
+
+    # Campos numéricos convertidos para float no próprio banco (evita Decimal por linha)
+    CAMPOS_NUMERICOS = {
+        "qtd": "quantidade",
+        "valor_item": "item_contrato__valor_unitario",
+        "h_consultor": "horas_consultor",
+        "h_gerente": "horas_gerente",
+        "valor_consultor": "item_fornecedor_consultor__valor_unitario",
+        "valor_gerente": "item_fornecedor_gerente__valor_unitario",
+    }
+
+    COLUNAS_VALORES = [
+        "receita",
+        "impostos",
+        "royalties",
+        "custo_consultor",
+        "custo_gerente",
+        "custo_total",
+        "margem",
+    ]
+
+    # ==================== CARGA ====================
+
+    @staticmethod
+    def carregar_dataframe(filtros: Optional[Dict[str, str]] = None) -> pd.DataFrame:
+        """
+        Carrega as OS em um DataFrame com uma única consulta e calcula as margens
+
+        Args:
+            filtros: Dicionário com filtros de drill-down (cliente, fornecedor, mes,
+                status, contrato)
+
+        Returns:
+            DataFrame com uma linha por OS e as colunas de receita, custos e margem
+        """
+        import pandas as pd
+        filtros = filtros or {}
+        queryset = OrdemServico.objects.all()
+
+        if filtros.get("contrato"):
+            queryset = queryset.filter(contrato_id=filtros["contrato"])
+        if filtros.get("status"):
+            queryset = queryset.filter(status=filtros["status"])
+        if filtros.get("cliente"):
+            queryset = queryset.filter(cliente_id=filtros["cliente"])
+
+        numericos = RelatorioRentabilidadeService.CAMPOS_NUMERICOS
+        colunas = RelatorioRentabilidadeService.CAMPOS_CONSULTA + list(numericos)
+        registros = list(
+            queryset.annotate(
+                **{alias: Cast(campo, FloatField()) for alias, campo in numericos.items()}
+            ).values_list(*colunas)
+        )
+        df = pd.DataFrame.from_records(registros, columns=colunas)
+        df = RelatorioRentabilidadeService.calcular_margens(df)
+
+        # Filtros derivados (fornecedor e mês) são aplicados sobre as colunas calculadas
+        if filtros.get("fornecedor"):
+            df = df[df["fornecedor"] == filtros["fornecedor"]]
+        if filtros.get("mes"):
+            df = df[df["mes"] == filtros["mes"]]
+
+        return df.reset_index(drop=True)
+
+    @staticmethod
+    def calcular_margens(df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Calcula receita, impostos, royalties, custos e margem de forma vetorizada
+
+        Args:
+            df: DataFrame com as colunas de CAMPOS_CONSULTA e CAMPOS_NUMERICOS
+
+        Returns:
+            DataFrame com as colunas derivadas (cliente, fornecedor, mes e valores)
+        """
+        import numpy as np
+        import pandas as pd
+        df = df.copy()
+
+        def numerico(coluna: str) -> np.ndarray:
+            return np.nan_to_num(df[coluna].to_numpy(dtype=float, na_value=np.nan))
+
+        quantidade = numerico("qtd")
+        valor_item = numerico("valor_item")
+        horas_consultor = numerico("h_consultor")
+        horas_gerente = numerico("h_gerente")
+        valor_consultor = numerico("valor_consultor")
+        valor_gerente = numerico("valor_gerente")
+
+        receita = valor_item * quantidade
+        impostos = receita * RelatorioRentabilidadeService.PERCENTUAL_IMPOSTOS
+        royalties = receita * RelatorioRentabilidadeService.PERCENTUAL_ROYALTIES
+        custo_consultor = horas_consultor * valor_consultor
+        custo_gerente = horas_gerente * valor_gerente
+        custo_total = custo_consultor + custo_gerente
+        margem = receita - impostos - royalties - custo_total
+
+        df["receita"] = receita
+        df["impostos"] = impostos
+        df["royalties"] = royalties
+        df["custo_consultor"] = custo_consultor
+        df["custo_gerente"] = custo_gerente
+        df["custo_total"] = custo_total
+        df["margem"] = margem
+        df["percentual_margem"] = RelatorioRentabilidadeService._percentual(margem, receita)
+        df["exequivel"] = (
+            df["percentual_margem"].to_numpy()
+            >= RelatorioRentabilidadeService.PERCENTUAL_MARGEM_MINIMA
+        )
+
+        # Dimensões
+        df["cliente"] = RelatorioRentabilidadeService._coalesce(
+            df["cliente__nome_fantasia"], df["cliente__nome_razao_social"], "-"
+        )
+        df["fornecedor"] = RelatorioRentabilidadeService._coalesce(
+            df["item_fornecedor_consultor__fornecedor"],
+            df["item_fornecedor_gerente__fornecedor"],
+            "Sem fornecedor",
+        )
+        competencia = pd.to_datetime(
+            df["data_faturamento"].where(df["data_faturamento"].notna(), df["data_inicio"]),
+            errors="coerce",
+        )
+        # Formata apenas os meses distintos (AAAA-MM) e expande pelos códigos
+        codigos = (competencia.dt.year * 100 + competencia.dt.month).fillna(0).to_numpy(dtype=int)
+        unicos, inverso = np.unique(codigos, return_inverse=True)
+        rotulos = np.array(
+            [f"{c // 100:04d}-{c % 100:02d}" if c else "-" for c in unicos], dtype=object
+        )
+        df["mes"] = rotulos[inverso] if len(df) else pd.Series(dtype=object)
+
+        return df
+
+    @staticmethod
+    def _coalesce(principal: pd.Series, alternativa: pd.Series, padrao: str) -> pd.Series:
+        """Primeiro valor não vazio entre duas colunas de texto"""
+        preenchido = principal.notna() & (principal != "")
+        resultado = principal.where(preenchido, alternativa)
+        preenchido = resultado.notna() & (resultado != "")
+        return resultado.where(preenchido, padrao)
+
+    @staticmethod
+    def _percentual(margem: np.ndarray, receita: np.ndarray) -> np.ndarray:
+        """Percentual da margem sobre a receita, zero quando não há receita"""
+        import numpy as np
+        margem = np.asarray(margem, dtype=float)
+        receita = np.asarray(receita, dtype=float)
+        resultado = np.zeros_like(receita)
+        np.divide(margem, receita, out=resultado, where=receita > 0)
+        return resultado * 100
+
+    # ==================== AGREGAÇÕES ====================
+
+    @staticmethod
+    def agregar(df: pd.DataFrame, dimensao: str) -> pd.DataFrame:
+        """
+        Agrupa as OS por uma dimensão somando os valores
+
+        Args:
+            df: DataFrame retornado por carregar_dataframe
+            dimensao: 'cliente', 'fornecedor' ou 'mes'
+
+        Returns:
+            DataFrame com uma linha por valor da dimensão, ordenado pela margem
+        """
+        import pandas as pd
+        if dimensao not in RelatorioRentabilidadeService.DIMENSOES:
+            raise ValueError(f"Dimensão inválida: {dimensao}")
+
+        colunas = RelatorioRentabilidadeService.COLUNAS_VALORES
+        chaves = [dimensao, "cliente_id"] if dimensao == "cliente" else [dimensao]
+
+        if df.empty:
+            return pd.DataFrame(
+                columns=chaves + ["quantidade_os"] + colunas + ["percentual_margem"]
+            )
+
+        agrupado = df.groupby(chaves, sort=False).agg(
+            quantidade_os=("id", "size"),
+            **{coluna: (coluna, "sum") for coluna in colunas},
+        ).reset_index()
+        agrupado["percentual_margem"] = RelatorioRentabilidadeService._percentual(
+            agrupado["margem"].to_numpy(), agrupado["receita"].to_numpy()
+        )
+
+        if dimensao == "mes":
+            return agrupado.sort_values("mes").reset_index(drop=True)
+        return agrupado.sort_values("margem", ascending=False).reset_index(drop=True)
+
+    @staticmethod
+    def pivot(df: pd.DataFrame, linhas: str = "cliente", colunas: str = "mes",
+              valor: str = "margem") -> pd.DataFrame:
+        """
+        Gera uma tabela dinâmica (ex.: margem por cliente x mês)
+
+        Args:
+            df: DataFrame retornado por carregar_dataframe
+            linhas: Dimensão das linhas
+            colunas: Dimensão das colunas
+            valor: Coluna de valor a ser somada
+
+        Returns:
+            DataFrame pivotado com totais por linha
+        """
+        import pandas as pd
+        if df.empty:
+            return pd.DataFrame()
+
+        tabela = pd.pivot_table(
+            df, index=linhas, columns=colunas, values=valor,
+            aggfunc="sum", fill_value=0.0, sort=True,
+        )
+        tabela["Total"] = tabela.sum(axis=1)
+        return tabela
+
+    @staticmethod
+    def totais(df: pd.DataFrame) -> Dict[str, float]:
+        """
+        Totais gerais do recorte atual
+
+        Args:
+            df: DataFrame retornado por carregar_dataframe
+
+        Returns:
+            Dicionário com os totais de valores, percentual de margem e contagens
+        """
+        totais = {
+            coluna: float(df[coluna].sum()) if not df.empty else 0.0
+            for coluna in RelatorioRentabilidadeService.COLUNAS_VALORES
+        }
+        receita = totais["receita"]
+        totais["percentual_margem"] = (totais["margem"] / receita * 100) if receita > 0 else 0.0
+        totais["quantidade_os"] = int(len(df))
+        totais["os_nao_exequiveis"] = int((~df["exequivel"]).sum()) if not df.empty else 0
+        return totais
+
+    @staticmethod
+    def proxima_dimensao(dimensao: str, filtros: Dict[str, str]) -> Optional[str]:
+        """
+        Próxima dimensão do drill-down ainda não filtrada
+
+        Args:
+            dimensao: Dimensão exibida atualmente
+            filtros: Filtros já aplicados
+
+        Returns:
+            Nome da próxima dimensão ou None quando o drill-down chegou às OS
+        """
+        for candidata in RelatorioRentabilidadeService.ORDEM_DRILL_DOWN:
+            if candidata != dimensao and not filtros.get(candidata):
+                return candidata
+        return None
+
+    # ==================== EXPORTAÇÃO ====================
+
+    @staticmethod
+    def _tabela_exportacao(df: pd.DataFrame, dimensao: Optional[str]) -> pd.DataFrame:
+        """Monta a tabela exportada (agregada por dimensão ou detalhada por OS)"""
+        rotulos = {
+            "numero_os": "Nº OS",
+            "quantidade_os": "Qtd. OS",
+            "receita": "Receita",
+            "impostos": "Impostos",
+            "royalties": "Royalties",
+            "custo_consultor": "Custo Consultor",
+            "custo_gerente": "Custo Gerente",
+            "custo_total": "Custo Total",
+            "margem": "Margem",
+            "percentual_margem": "% Margem",
+            **RelatorioRentabilidadeService.DIMENSOES,
+        }
+        valores = RelatorioRentabilidadeService.COLUNAS_VALORES + ["percentual_margem"]
+
+        if dimensao:
+            tabela = RelatorioRentabilidadeService.agregar(df, dimensao)
+            colunas = [dimensao, "quantidade_os"] + valores
+        else:
+            tabela = df
+            colunas = ["numero_os", "cliente", "fornecedor", "mes"] + valores
+
+        return tabela.reindex(columns=colunas).round(2).rename(columns=rotulos)
+
+    @staticmethod
+    def exportar_csv(df: pd.DataFrame, dimensao: Optional[str] = None) -> str:
+        """
+        Exporta o relatório em CSV (separador ';' e vírgula decimal)
+
+        Args:
+            df: DataFrame retornado por carregar_dataframe
+            dimensao: Dimensão de agregação ou None para o detalhamento por OS
+
+        Returns:
+            Conteúdo CSV
+        """
+        tabela = RelatorioRentabilidadeService._tabela_exportacao(df, dimensao)
+        return tabela.to_csv(index=False, sep=";", decimal=",")
+
+    @staticmethod
+    def exportar_xlsx(df: pd.DataFrame, dimensao: Optional[str] = None) -> bytes:
+        """
+        Exporta o relatório em XLSX, com uma aba para o recorte e outra com as OS
+
+        Args:
+            df: DataFrame retornado por carregar_dataframe
+            dimensao: Dimensão de agregação ou None para o detalhamento por OS
+
+        Returns:
+            Conteúdo binário do arquivo XLSX
+        """
+        import pandas as pd
+        buffer = BytesIO()
+        with pd.ExcelWriter(buffer, engine="xlsxwriter") as writer:
+            if dimensao:
+                RelatorioRentabilidadeService._tabela_exportacao(df, dimensao).to_excel(
+                    writer, sheet_name=f"Por {RelatorioRentabilidadeService.DIMENSOES[dimensao]}",
+                    index=False,
+                )
+            RelatorioRentabilidadeService._tabela_exportacao(df, None).to_excel(
+                writer, sheet_name="OS", index=False
+            )
+        return buffer.getvalue()
+
+    @staticmethod
+    def linhas(df: pd.DataFrame) -> List[Dict]:
+        """
+        Converte um DataFrame em lista de dicionários para o template
+
+        Args:
+            df: DataFrame agregado ou detalhado
+
+        Returns:
+            Lista de registros
+        """
+        import numpy as np
+        return df.replace({np.nan: None}).to_dict("records")
@@ -0,0 +1,291 @@
+"""
+Service Layer para a identificação de clientes e contratos já cadastrados
+Índice TF-IDF em memória (NumPy) sobre nome/CNPJ dos clientes e número, objeto
+e itens dos contratos, consultado com o texto dos documentos de uma análise
+"""
+from __future__ import annotations
+
+import math
+import re
+import threading
+from collections import Counter
+from datetime import timedelta
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
+
+from django.core.cache import cache
+from django.utils import timezone
+
+from ..models import Cliente, Contrato, ItemContrato, normalizar_documento
+from .busca_documento_service import BuscaDocumentoService
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+class _Indice:
+    """Estado do índice de um processo (linhas por registro e matriz esparsa derivada)"""
+
+    def __init__(self, versao: int):
+        self.versao = versao
+        self.carregado_em = timezone.now()
+        self.vocabulario: Dict[str, int] = {}
+        self.linhas: Dict[Tuple[str, int], Tuple[np.ndarray, np.ndarray]] = {}
+        self.pendentes = set()
+        self.matriz = None
+
+    def termo_ids(self, termos: Iterable[str]) -> np.ndarray:
+        import numpy as np
+        return np.fromiter(
+            (self.vocabulario.setdefault(termo, len(self.vocabulario)) for termo in termos), dtype=np.int64
+        )
+
+    def gravar(self, chave: Tuple[str, int], contagem: Counter) -> None:
+        import numpy as np
+        termos = list(contagem)
+        pesos = np.array([1 + math.log(contagem[termo]) for termo in termos], dtype=np.float64)
+        self.linhas[chave] = (self.termo_ids(termos), pesos)
+        self.matriz = None
+
+
+class SimilaridadeService:
+    """
+    Candidatos a cliente/contrato existente para o texto de uma análise
+
+    Cada registro é uma linha TF-IDF (tf sublinear, idf suavizado) com os
+    radicais de BuscaDocumentoService.termos mais termos de identidade:
+    doc:<CNPJ/CPF> nos clientes, cli:<CNPJ/CPF do cliente> e num:<n>/<ano>
+    nos contratos. A matriz é mantida em CSR (arrays NumPy) por processo;
+    a consulta é um produto esparso por np.bincount (cosseno no vocabulário
+    do índice).
+
+    Salvar/excluir Cliente, Contrato ou ItemContrato marca a linha como
+    pendente (recarregada em lote na próxima consulta) e incrementa a versão
+    no cache: os outros processos recarregam o índice ao perceber a mudança
+    ou após IDADE_MAXIMA.
+    """
+
+    CHAVE_VERSAO = "similaridade:versao"
+    IDADE_MAXIMA = timedelta(minutes=10)
+    # Identificação das partes, número e objeto ficam no início dos documentos
+    TAMANHO_CONSULTA = 20000
+    LIMIAR_DUPLICADO = 0.3
+    QUANTIDADE_CANDIDATOS = 5
+
+    _CNPJ_CPF = re.compile(r"(?<![\d./-])(\d{2}\.?\d{3}\.?\d{3}/?\d{4}-?\d{2}|\d{3}\.?\d{3}\.?\d{3}-?\d{2})(?![\d/-])")
+    _NUMERO = re.compile(r"(?<![\d./])(\d{1,6})\s*/\s*((?:19|20)\d{2})(?!\d)")
+
+    _indice: Optional[_Indice] = None
+    _trava = threading.RLock()
+
+    # ------------------------------------------------------------------
+    # Termos
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _numeros(texto: str) -> List[str]:
+        return [f"num:{int(numero)}/{ano}" for numero, ano in SimilaridadeService._NUMERO.findall(texto or "")]
+
+    @staticmethod
+    def termos_consulta(texto: str) -> Counter:
+        """Termos do texto de uma análise (CNPJ/CPF e números de contrato no texto inteiro)"""
+        texto = texto or ""
+        contagem = Counter(BuscaDocumentoService.termos(texto[:SimilaridadeService.TAMANHO_CONSULTA]))
+        for documento in SimilaridadeService._CNPJ_CPF.findall(texto):
+            digitos = normalizar_documento(documento)
+            contagem[f"doc:{digitos}"] += 1
+            contagem[f"cli:{digitos}"] += 1
+        contagem.update(SimilaridadeService._numeros(texto))
+        return contagem
+
+    @staticmethod
+    def _registros(tipo: str, pks: Optional[Iterable[int]] = None) -> Dict[Tuple[str, int], Counter]:
+        """Termos dos clientes ou contratos (todos ou os pks informados)"""
+        resultado = {}
+        if tipo == "cliente":
+            clientes = Cliente.objects.all() if pks is None else Cliente.objects.filter(pk__in=list(pks))
+            for pk, nome, fantasia, documento in clientes.values_list(
+                "pk", "nome_razao_social", "nome_fantasia", "cnpj_normalizado"
+            ):
+                contagem = Counter(BuscaDocumentoService.termos(f"{nome} {fantasia or ''}"))
+                if documento:
+                    contagem[f"doc:{documento}"] += 1
+                resultado[("cliente", pk)] = contagem
+            return resultado
+
+        contratos = Contrato.objects.all() if pks is None else Contrato.objects.filter(pk__in=list(pks))
+        for pk, numero, objeto, cliente, documento in contratos.values_list(
+            "pk", "numero_contrato", "objeto", "cliente__nome_razao_social", "cliente__cnpj_normalizado"
+        ):
+            contagem = Counter(BuscaDocumentoService.termos(f"{numero} {objeto or ''} {cliente or ''}"))
+            contagem.update(SimilaridadeService._numeros(numero))
+            if documento:
+                contagem[f"cli:{documento}"] += 1
+            resultado[("contrato", pk)] = contagem
+        itens = ItemContrato.objects.filter(contrato_id__in=[pk for _, pk in resultado])
+        for contrato_id, descricao in itens.values_list("contrato_id", "descricao"):
+            resultado[("contrato", contrato_id)].update(BuscaDocumentoService.termos(descricao))
+        return resultado
+
+    # ------------------------------------------------------------------
+    # Manutenção do índice
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _versao() -> int:
+        return cache.get_or_set(SimilaridadeService.CHAVE_VERSAO, 0, None)
+
+    @staticmethod
+    def limpar() -> None:
+        """Descarta o índice do processo (recarregado na próxima consulta)"""
+        with SimilaridadeService._trava:
+            SimilaridadeService._indice = None
+
+    @staticmethod
+    def marcar(tipo: str, pk: int) -> None:
+        """Registro salvo ou excluído: recarrega a linha na próxima consulta"""
+        with SimilaridadeService._trava:
+            indice = SimilaridadeService._indice
+            if indice is not None:
+                indice.pendentes.add((tipo, pk))
+            try:
+                versao = cache.incr(SimilaridadeService.CHAVE_VERSAO)
+            except ValueError:
+                versao = None
+                cache.set(SimilaridadeService.CHAVE_VERSAO, 1, None)
+            # Sem alteração de outro processo no intervalo, o índice local continua válido
+            if indice is not None and versao == indice.versao + 1:
+                indice.versao = versao
+
+    @staticmethod
+    def _carregar() -> _Indice:
+        indice = _Indice(SimilaridadeService._versao())
+        for tipo in ("cliente", "contrato"):
+            for chave, contagem in SimilaridadeService._registros(tipo).items():
+                indice.gravar(chave, contagem)
+        return indice
+
+    @staticmethod
+    def _atual() -> _Indice:
+        """Índice do processo, recarregado se desatualizado, com as linhas pendentes aplicadas"""
+        with SimilaridadeService._trava:
+            indice = SimilaridadeService._indice
+            if (
+                indice is None
+                or indice.versao != SimilaridadeService._versao()
+                or timezone.now() - indice.carregado_em > SimilaridadeService.IDADE_MAXIMA
+            ):
+                indice = SimilaridadeService._indice = SimilaridadeService._carregar()
+            if indice.pendentes:
+                for tipo in ("cliente", "contrato"):
+                    pks = [pk for t, pk in indice.pendentes if t == tipo]
+                    if not pks:
+                        continue
+                    registros = SimilaridadeService._registros(tipo, pks)
+                    for pk in pks:
+                        if (tipo, pk) in registros:
+                            indice.gravar((tipo, pk), registros[(tipo, pk)])
+                        elif indice.linhas.pop((tipo, pk), None) is not None:
+                            indice.matriz = None
+                indice.pendentes.clear()
+            if indice.matriz is None:
+                indice.matriz = SimilaridadeService._matriz(indice)
+            return indice
+
+    @staticmethod
+    def _matriz(indice: _Indice) -> Dict:
+        """CSR (linha de cada valor, coluna, peso tf-idf), idf e norma das linhas"""
+        import numpy as np
+        chaves = list(indice.linhas)
+        if not chaves:
+            return {"chaves": [], "linha": np.array([], dtype=np.int64), "coluna": np.array([], dtype=np.int64),
+                    "peso": np.array([]), "idf": np.zeros(len(indice.vocabulario)), "normas": np.array([])}
+        colunas = [indice.linhas[chave][0] for chave in chaves]
+        coluna = np.concatenate(colunas)
+        linha = np.repeat(np.arange(len(chaves)), [len(c) for c in colunas])
+        frequencia = np.bincount(coluna, minlength=len(indice.vocabulario))
+        idf = np.log((len(chaves) + 1) / (frequencia + 1)) + 1
+        peso = np.concatenate([indice.linhas[chave][1] for chave in chaves]) * idf[coluna]
+        normas = np.sqrt(np.bincount(linha, peso ** 2, minlength=len(chaves)))
+        return {"chaves": chaves, "linha": linha, "coluna": coluna, "peso": peso, "idf": idf, "normas": normas}
+
+    # ------------------------------------------------------------------
+    # Consulta
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def candidatos(texto: str, quantidade: Optional[int] = None) -> Dict[str, List[Dict]]:
+        """
+        Registros mais parecidos com o texto
+
+        Args:
+            texto: Texto consolidado dos documentos da análise
+            quantidade: Candidatos por tipo (padrão: QUANTIDADE_CANDIDATOS)
+
+        Returns:
+            Dict com clientes e contratos: listas de {id, similaridade (0 a 1),
+            identico (CNPJ/CPF ou número do contrato presente no texto)}
+        """
+        import numpy as np
+        quantidade = quantidade or SimilaridadeService.QUANTIDADE_CANDIDATOS
+        resultado = {"clientes": [], "contratos": []}
+        contagem = SimilaridadeService.termos_consulta(texto)
+        # Consulta sob a trava: o vocabulário e a matriz não mudam durante o cálculo
+        with SimilaridadeService._trava:
+            indice = SimilaridadeService._atual()
+            matriz = indice.matriz
+            ids = [(indice.vocabulario[termo], termo) for termo in contagem if termo in indice.vocabulario]
+            if not ids or not matriz["chaves"]:
+                return resultado
+
+            consulta = np.zeros(len(matriz["idf"]))
+            for coluna, termo in ids:
+                consulta[coluna] = (1 + math.log(contagem[termo])) * matriz["idf"][coluna]
+            norma_consulta = np.linalg.norm(consulta)
+            produto = np.bincount(matriz["linha"], matriz["peso"] * consulta[matriz["coluna"]],
+                                  minlength=len(matriz["chaves"]))
+            similaridade = produto / np.maximum(matriz["normas"] * norma_consulta, 1e-12)
+
+            identidade = [coluna for coluna, termo in ids if termo.startswith(("doc:", "num:"))]
+            identicos = np.zeros(len(matriz["chaves"]), dtype=bool)
+            if identidade:
+                identicos[matriz["linha"][np.isin(matriz["coluna"], identidade)]] = True
+            chaves = matriz["chaves"]
+
+        tipos = np.array([tipo for tipo, _ in chaves])
+        for tipo, destino in (("cliente", "clientes"), ("contrato", "contratos")):
+            linhas = np.flatnonzero((tipos == tipo) & (produto > 0))
+            # Idênticos primeiro, depois pela similaridade
+            ordem = linhas[np.lexsort((-similaridade[linhas], ~identicos[linhas]))][:quantidade]
+            resultado[destino] = [
+                {
+                    "id": int(chaves[posicao][1]),
+                    "similaridade": round(float(similaridade[posicao]), 3),
+                    "identico": bool(identicos[posicao]),
+                }
+                for posicao in ordem
+            ]
+        return resultado
+
+    @staticmethod
+    def possiveis_duplicados(analise, quantidade: int = 3) -> Dict[str, List[Dict]]:
+        """
+        Clientes/contratos existentes que a análise pode duplicar
+
+        Candidatos idênticos ou acima de LIMIAR_DUPLICADO, exceto os já vinculados,
+        com o objeto (Cliente/Contrato) em "registro"
+        """
+        vinculados = {("clientes", analise.cliente_gerado_id), ("contratos", analise.contrato_gerado_id)}
+        encontrados = SimilaridadeService.candidatos(analise.texto_consolidado or "", quantidade)
+        modelos = {"clientes": Cliente, "contratos": Contrato}
+        resultado = {}
+        for destino, candidatos in encontrados.items():
+            candidatos = [
+                c for c in candidatos
+                if (destino, c["id"]) not in vinculados
+                and (c["identico"] or c["similaridade"] >= SimilaridadeService.LIMIAR_DUPLICADO)
+            ]
+            registros = modelos[destino].objects.in_bulk([c["id"] for c in candidatos])
+            resultado[destino] = [
+                {**c, "registro": registros[c["id"]]} for c in candidatos if c["id"] in registros
+            ]
+        return resultado
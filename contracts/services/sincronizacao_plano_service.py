@@ -0,0 +1,327 @@
+"""
+Service Layer para a sincronização do projeto com o Plano de Trabalho
+Compara o plano, o estado gravado na última sincronização (fingerprint) e o
+banco atual, e aplica em lote apenas as criações, alterações e remoções necessárias
+"""
+import logging
+from typing import Dict, List, Optional
+
+from django.db import transaction
+from django.utils import timezone
+
+from ..models import OrdemServico, Sprint, Tarefa
+from .cache_versao_service import CacheVersaoService
+from .materializacao_projeto_service import MaterializacaoProjetoService
+
+logger = logging.getLogger(__name__)
+
+
+class SincronizacaoPlanoService:
+    """
+    Sincronização incremental Plano de Trabalho > Sprints > Tarefas
+
+    Cada Sprint/Tarefa gerada a partir do plano guarda em plano_fingerprint o
+    hash dos campos gravados pela sincronização. Comparando três versões de
+    cada registro (plano, última sincronização e banco) o diff distingue:
+
+    - igual: o banco já reflete o plano (nada a gravar);
+    - atualizar: o plano mudou e o registro não foi editado localmente;
+    - local: o registro foi editado no projeto e o plano não mudou (preservado);
+    - conflito: plano e registro mudaram (só aplicado com sobrescrever_conflitos);
+    - criar/remover: registros novos no plano ou gerados pelo plano e retirados dele.
+
+    Registros sem fingerprint (anteriores a este controle) são atualizados
+    quando diferem do plano, mas nunca removidos.
+    """
+
+    STATUS_SPRINT_PRESERVADOS = ["finalizada", "faturada"]
+    STATUS_TAREFA_PRESERVADOS = ["concluida"]
+    STATUS_SPRINT_TAREFA_PRESERVADOS = ["finalizada"]
+    ACOES = ["criar", "atualizar", "conflito", "local", "remover"]
+
+    @staticmethod
+    def classificar(fp_plano: str, fp_banco: str, fp_sync: str) -> str:
+        """
+        Ação para um registro existente a partir dos três fingerprints
+
+        Args:
+            fp_plano: Hash dos valores definidos pelo plano
+            fp_banco: Hash dos valores atuais no banco
+            fp_sync: Hash gravado na última sincronização ('' se nunca sincronizado)
+
+        Returns:
+            'igual', 'atualizar', 'local' ou 'conflito'
+        """
+        if fp_plano == fp_banco:
+            return "igual"
+        if not fp_sync or fp_banco == fp_sync:
+            return "atualizar"
+        if fp_plano == fp_sync:
+            return "local"
+        return "conflito"
+
+    @staticmethod
+    def campos_alterados(atual, desejado, campos: List[str]) -> List[str]:
+        fingerprint = MaterializacaoProjetoService.fingerprint
+        return [campo for campo in campos if fingerprint(atual, [campo]) != fingerprint(desejado, [campo])]
+
+    @staticmethod
+    def _item(diff: Dict, entidade: str, acao: str, nome: str, sprint: str,
+              objeto=None, desejado=None, campos: Optional[List[str]] = None):
+        diff["itens"].append({
+            "entidade": entidade,
+            "acao": acao,
+            "nome": nome,
+            "sprint": sprint,
+            "objeto": objeto,
+            "desejado": desejado,
+            "campos": campos or [],
+        })
+        diff["resumo"][entidade][acao] += 1
+
+    @staticmethod
+    def _comparar(diff: Dict, entidade: str, nome: str, sprint: str, atual, desejado, campos: List[str]):
+        """Classifica um registro existente e o registra no diff"""
+        fingerprint = MaterializacaoProjetoService.fingerprint
+        fp_plano = fingerprint(desejado, campos)
+        acao = SincronizacaoPlanoService.classificar(fp_plano, fingerprint(atual, campos), atual.plano_fingerprint)
+        if acao == "igual":
+            if atual.plano_fingerprint != fp_plano:
+                diff["fingerprints"].append((atual, fp_plano))
+            return
+        SincronizacaoPlanoService._item(
+            diff, entidade, acao, nome, sprint, atual, desejado,
+            SincronizacaoPlanoService.campos_alterados(atual, desejado, campos),
+        )
+
+    @staticmethod
+    def calcular_diff(plano) -> Dict:
+        """
+        Diff entre o processo_execucao do plano e as sprints/tarefas do projeto
+
+        Não grava nada: o resultado pode ser exibido para revisão e depois
+        passado para `aplicar_diff`.
+
+        Args:
+            plano: Instância de PlanoTrabalho vinculada a um projeto
+
+        Returns:
+            Dicionário com os itens do diff (entidade, ação, nome, sprint,
+            objeto, desejado e campos alterados), o resumo por entidade/ação e
+            os dados internos usados na aplicação
+        """
+        from .contract_ai_service import ContractAIService
+
+        projeto = plano.projeto
+        contrato = projeto.contrato
+        campos_sprint = MaterializacaoProjetoService.CAMPOS_SPRINT_PLANO
+        campos_tarefa = MaterializacaoProjetoService.CAMPOS_TAREFA_PLANO
+
+        diff = {
+            "projeto": projeto,
+            "itens": [],
+            "resumo": {
+                entidade: {acao: 0 for acao in SincronizacaoPlanoService.ACOES}
+                for entidade in ("sprint", "tarefa")
+            },
+            "fingerprints": [],
+            "tarefas_novas": [],
+            "sprints_novas": [],
+            "data_inicio_padrao": plano.data_inicio_prevista,
+            "data_fim_sprint": contrato.data_fim_atual or plano.data_fim_prevista,
+        }
+
+        sprints_data = ContractAIService.sprints_do_processo_execucao(plano)
+        if not sprints_data:
+            logger.warning(f"Plano {plano.pk} não tem processo_execucao. Nada para sincronizar.")
+            return diff
+
+        sprints_existentes = {sprint.nome: sprint for sprint in projeto.sprints.all()}
+        tarefas_por_sprint = {}
+        for tarefa in Tarefa.objects.filter(sprint__projeto=projeto):
+            tarefas_por_sprint.setdefault(tarefa.sprint_id, []).append(tarefa)
+
+        colaboradores = MaterializacaoProjetoService.colaboradores_para(sprints_data)
+        responsavel_padrao = contrato.gerente_contrato
+        nomes_plano = set()
+
+        for sprint_data in sprints_data:
+            nome = sprint_data.get("nome", "Sprint")
+            if nome in nomes_plano:
+                logger.warning(f"Plano {plano.pk}: etapa duplicada '{nome}' ignorada na sincronização")
+                continue
+            nomes_plano.add(nome)
+
+            inicio, fim = MaterializacaoProjetoService.periodo_sprint(
+                sprint_data, diff["data_inicio_padrao"], diff["data_fim_sprint"]
+            )
+            desejada = MaterializacaoProjetoService.montar_sprint(projeto, sprint_data, inicio, fim)
+            tarefas_data = sprint_data.get("tarefas") or []
+
+            sprint = sprints_existentes.get(nome)
+            if sprint is None:
+                diff["sprints_novas"].append(sprint_data)
+                SincronizacaoPlanoService._item(diff, "sprint", "criar", nome, nome, desejado=desejada)
+                for tarefa_data in tarefas_data:
+                    SincronizacaoPlanoService._item(
+                        diff, "tarefa", "criar", tarefa_data.get("titulo", "Tarefa"), nome
+                    )
+                continue
+
+            SincronizacaoPlanoService._comparar(diff, "sprint", nome, nome, sprint, desejada, campos_sprint)
+
+            # As tarefas são agendadas no período atual da sprint
+            tarefas_desejadas = MaterializacaoProjetoService.montar_tarefas(
+                projeto, sprint, tarefas_data, colaboradores, responsavel_padrao
+            )
+            tarefas_existentes = {}
+            for tarefa in tarefas_por_sprint.get(sprint.pk, []):
+                tarefas_existentes.setdefault(tarefa.titulo, tarefa)
+
+            titulos_plano = set()
+            for desejada_tarefa in tarefas_desejadas:
+                titulo = desejada_tarefa.titulo
+                if titulo in titulos_plano:
+                    continue
+                titulos_plano.add(titulo)
+                tarefa = tarefas_existentes.get(titulo)
+                if tarefa is None:
+                    diff["tarefas_novas"].append(desejada_tarefa)
+                    SincronizacaoPlanoService._item(
+                        diff, "tarefa", "criar", titulo, nome, desejado=desejada_tarefa
+                    )
+                else:
+                    SincronizacaoPlanoService._comparar(
+                        diff, "tarefa", titulo, nome, tarefa, desejada_tarefa, campos_tarefa
+                    )
+
+            for tarefa in tarefas_por_sprint.get(sprint.pk, []):
+                if (
+                    tarefa.titulo not in titulos_plano
+                    and tarefa.plano_fingerprint
+                    and tarefa.status not in SincronizacaoPlanoService.STATUS_TAREFA_PRESERVADOS
+                    and tarefa.status_sprint not in SincronizacaoPlanoService.STATUS_SPRINT_TAREFA_PRESERVADOS
+                ):
+                    SincronizacaoPlanoService._item(diff, "tarefa", "remover", tarefa.titulo, nome, objeto=tarefa)
+
+        for nome, sprint in sprints_existentes.items():
+            if (
+                nome not in nomes_plano
+                and sprint.plano_fingerprint
+                and sprint.status not in SincronizacaoPlanoService.STATUS_SPRINT_PRESERVADOS
+            ):
+                SincronizacaoPlanoService._item(diff, "sprint", "remover", nome, nome, objeto=sprint)
+
+        return diff
+
+    @staticmethod
+    def tem_alteracoes(diff: Dict) -> bool:
+        """Se o diff tem algo a aplicar (edições locais não contam)"""
+        return any(
+            quantidade
+            for resumo in diff["resumo"].values()
+            for acao, quantidade in resumo.items()
+            if acao != "local"
+        )
+
+    @staticmethod
+    def aplicar_diff(diff: Dict, sobrescrever_conflitos: bool = False) -> Dict[str, int]:
+        """
+        Aplica o diff com gravações em lote
+
+        Sprints novas são materializadas com suas OS e tarefas; alterações viram
+        um bulk_update por modelo (propagando as datas para as OS vinculadas) e
+        remoções um DELETE por modelo. Edições locais nunca são sobrescritas;
+        conflitos só quando `sobrescrever_conflitos` for True.
+
+        Args:
+            diff: Resultado de `calcular_diff`
+            sobrescrever_conflitos: Aplica o plano também nos registros em conflito
+
+        Returns:
+            Quantidades gravadas por operação
+        """
+        campos_sprint = MaterializacaoProjetoService.CAMPOS_SPRINT_PLANO
+        campos_tarefa = MaterializacaoProjetoService.CAMPOS_TAREFA_PLANO
+        acoes_atualizacao = {"atualizar", "conflito"} if sobrescrever_conflitos else {"atualizar"}
+        agora = timezone.now()
+
+        sprints_atualizar, tarefas_atualizar = {}, {}
+        sprints_remover, tarefas_remover = [], []
+        for item in diff["itens"]:
+            objeto = item["objeto"]
+            if item["acao"] in acoes_atualizacao:
+                campos = campos_sprint if item["entidade"] == "sprint" else campos_tarefa
+                for campo in campos:
+                    setattr(objeto, campo, getattr(item["desejado"], campo))
+                objeto.plano_fingerprint = MaterializacaoProjetoService.fingerprint(objeto, campos)
+                objeto.atualizado_em = agora
+                destino = sprints_atualizar if item["entidade"] == "sprint" else tarefas_atualizar
+                destino[objeto.pk] = objeto
+            elif item["acao"] == "remover":
+                (sprints_remover if item["entidade"] == "sprint" else tarefas_remover).append(objeto.pk)
+
+        # Registros já iguais ao plano: apenas registra o fingerprint
+        sprints_fingerprint, tarefas_fingerprint = [], []
+        for objeto, fp_plano in diff["fingerprints"]:
+            objeto.plano_fingerprint = fp_plano
+            (sprints_fingerprint if isinstance(objeto, Sprint) else tarefas_fingerprint).append(objeto)
+
+        resultado = {"sprints_criadas": 0, "tarefas_criadas": 0, "sprints_atualizadas": len(sprints_atualizar),
+                     "tarefas_atualizadas": len(tarefas_atualizar), "sprints_removidas": 0,
+                     "tarefas_removidas": 0}
+        batch_size = MaterializacaoProjetoService.BATCH_SIZE
+
+        with transaction.atomic():
+            if diff["sprints_novas"]:
+                criadas = MaterializacaoProjetoService.materializar(
+                    diff["projeto"], diff["sprints_novas"], diff["data_inicio_padrao"], diff["data_fim_sprint"]
+                )
+                resultado["sprints_criadas"] = criadas["sprints"]
+                resultado["tarefas_criadas"] = criadas["tarefas"]
+            if diff["tarefas_novas"]:
+                Tarefa.objects.bulk_create(diff["tarefas_novas"], batch_size=batch_size)
+                resultado["tarefas_criadas"] += len(diff["tarefas_novas"])
+
+            if sprints_atualizar:
+                Sprint.objects.bulk_update(
+                    sprints_atualizar.values(), campos_sprint + ["plano_fingerprint", "atualizado_em"],
+                    batch_size=batch_size,
+                )
+                # Mesma sincronização de datas Sprint → OS feita por Sprint.save
+                ordens = [
+                    OrdemServico(pk=sprint.ordem_servico_id, data_inicio=sprint.data_inicio,
+                                 data_termino=sprint.data_fim)
+                    for sprint in sprints_atualizar.values() if sprint.ordem_servico_id
+                ]
+                OrdemServico.objects.bulk_update(ordens, ["data_inicio", "data_termino"], batch_size=batch_size)
+                CacheVersaoService.incrementar("contrato", diff["projeto"].contrato_id)
+                CacheVersaoService.incrementar("painel", "geral")
+            if tarefas_atualizar:
+                Tarefa.objects.bulk_update(
+                    tarefas_atualizar.values(), campos_tarefa + ["plano_fingerprint", "atualizado_em"],
+                    batch_size=batch_size,
+                )
+            if sprints_fingerprint:
+                Sprint.objects.bulk_update(sprints_fingerprint, ["plano_fingerprint"], batch_size=batch_size)
+            if tarefas_fingerprint:
+                Tarefa.objects.bulk_update(tarefas_fingerprint, ["plano_fingerprint"], batch_size=batch_size)
+
+            if tarefas_remover:
+                resultado["tarefas_removidas"] = Tarefa.objects.filter(pk__in=tarefas_remover).delete()[1].get(
+                    Tarefa._meta.label, 0
+                )
+            if sprints_remover:
+                resultado["sprints_removidas"] = Sprint.objects.filter(pk__in=sprints_remover).delete()[1].get(
+                    Sprint._meta.label, 0
+                )
+
+            # Totais de horas armazenados das sprints alteradas em lote
+            sprints_recalcular = {tarefa.sprint_id for tarefa in diff["tarefas_novas"]}
+            sprints_recalcular |= {tarefa.sprint_id for tarefa in tarefas_atualizar.values()}
+            if sprints_recalcular:
+                Sprint.objects.filter(pk__in=sprints_recalcular).recalcular_horas()
+            CacheVersaoService.incrementar("projeto", diff["projeto"].pk)
+
+        logger.info(f"Sincronização do projeto {diff['projeto'].pk} com o plano: {resultado}")
+        return resultado
@@ -0,0 +1,198 @@
+"""
+Service Layer para as transições automáticas de status
+Atualiza, por data, a situação dos contratos e o status das sprints (e das OS
+vinculadas) com UPDATEs em conjunto, registrando cada mudança em TransicaoStatus
+"""
+from typing import Dict, List, Optional
+from datetime import date
+
+from django.db import transaction
+from django.db.models import F, Q, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from ..models import Contrato, OrdemServico, Sprint, TransicaoStatus
+from .cache_versao_service import CacheVersaoService
+from .evento_service import EventoService
+
+
+class TransicaoStatusService:
+    """
+    Transições de status dependentes da data corrente
+
+    Substitui o recálculo feito na leitura (sprint_detail) e no save() do
+    Contrato: um job diário aplica as mesmas regras a todos os registros com
+    poucas consultas, independentemente do volume. Os UPDATEs não disparam
+    post_save: os eventos de sprints encerradas e OS são registrados aqui; a
+    situação do contrato (Ativo/Inativo) não gera evento, como no save().
+    """
+
+    ORIGEM = "transicionar_status"
+    STATUS_SPRINT_BLOQUEADO = "faturada"
+
+    @staticmethod
+    def regras_sprint(hoje: date) -> List[tuple]:
+        """
+        Status esperado da sprint conforme as datas (mesma regra do antigo sprint_detail)
+
+        Args:
+            hoje: Data de referência
+
+        Returns:
+            Lista de (status, condição)
+        """
+        return [
+            ("aberta", Q(data_inicio__gt=hoje)),
+            ("execucao", Q(data_inicio__lte=hoje, data_fim__gte=hoje)),
+            ("finalizada", Q(data_fim__lt=hoje)),
+        ]
+
+    @staticmethod
+    def regras_contrato(hoje: date) -> List[tuple]:
+        """
+        Situação esperada do contrato conforme data_fim (mesma regra de Contrato.save)
+
+        Args:
+            hoje: Data de referência
+
+        Returns:
+            Lista de (situação, condição)
+        """
+        return [
+            ("Ativo", Q(data_fim__gte=hoje)),
+            ("Inativo", Q(data_fim__lt=hoje)),
+        ]
+
+    @staticmethod
+    def _auditoria(entidade: str, linhas: List[tuple], status_novo: str, hoje: date) -> List[TransicaoStatus]:
+        return [
+            TransicaoStatus(
+                entidade=entidade,
+                objeto_id=pk,
+                status_anterior=status_anterior or "",
+                status_novo=status_novo,
+                origem=TransicaoStatusService.ORIGEM,
+                data_referencia=hoje,
+            )
+            for pk, status_anterior in linhas
+        ]
+
+    @staticmethod
+    def _registrar_eventos(status: str, sprints: List[tuple], ordens: List[tuple]) -> None:
+        """
+        Eventos do fluxo de atividades das transições (os UPDATEs não disparam post_save)
+
+        Mesmas regras dos signals: sprint apenas no encerramento, OS em toda mudança de status.
+        """
+        rotulo_sprint = dict(Sprint._meta.get_field("status").flatchoices).get(status, status)
+        rotulo_os = dict(OrdemServico._meta.get_field("status").flatchoices).get(status, status)
+        if status == "finalizada":
+            for pk, _, _, _, nome, contrato_id in sprints:
+                EventoService.registrar("sprint", pk, status, f"Sprint {nome}: {rotulo_sprint}", contrato_id)
+        for pk, _, contrato_id, numero_os in ordens:
+            EventoService.registrar("ordem_servico", pk, status, f"OS {numero_os}: {rotulo_os}", contrato_id)
+
+    @staticmethod
+    def transicionar_contratos(hoje: date, dry_run: bool = False) -> List[TransicaoStatus]:
+        """
+        Atualiza Contrato.situacao dos contratos vencidos (ou reativados por aditivo)
+
+        Args:
+            hoje: Data de referência
+            dry_run: Apenas calcula as transições, sem gravar
+
+        Returns:
+            Registros de auditoria das transições
+        """
+        transicoes = []
+        for situacao, condicao in TransicaoStatusService.regras_contrato(hoje):
+            candidatos = Contrato.objects.filter(condicao).exclude(situacao=situacao)
+            linhas = list(candidatos.values_list("pk", "situacao"))
+            if not linhas:
+                continue
+            if not dry_run:
+                Contrato.objects.filter(pk__in=[pk for pk, _ in linhas]).update(situacao=situacao)
+                CacheVersaoService.incrementar("contrato", *(pk for pk, _ in linhas))
+                CacheVersaoService.incrementar("painel", "geral")
+            transicoes += TransicaoStatusService._auditoria("contrato", linhas, situacao, hoje)
+        return transicoes
+
+    @staticmethod
+    def transicionar_sprints(hoje: date, dry_run: bool = False) -> List[TransicaoStatus]:
+        """
+        Atualiza o status das sprints pelas datas e sincroniza as OS vinculadas
+
+        Sprints faturadas não são alteradas. Na OS, a passagem para finalizada
+        preenche data_emissao_trd quando vazia (mesma regra de Sprint.save).
+
+        Args:
+            hoje: Data de referência
+            dry_run: Apenas calcula as transições, sem gravar
+
+        Returns:
+            Registros de auditoria das transições (sprints e OS)
+        """
+        transicoes = []
+        for status, condicao in TransicaoStatusService.regras_sprint(hoje):
+            candidatas = Sprint.objects.filter(condicao).exclude(
+                status__in=[status, TransicaoStatusService.STATUS_SPRINT_BLOQUEADO]
+            )
+            linhas = list(candidatas.values_list(
+                "pk", "status", "ordem_servico_id", "projeto_id", "nome", "projeto__contrato_id"
+            ).order_by())
+            if not linhas:
+                continue
+
+            os_ids = [linha[2] for linha in linhas if linha[2]]
+            ordens = list(
+                OrdemServico.objects.filter(pk__in=os_ids).exclude(status=status)
+                .values_list("pk", "status", "contrato_id", "numero_os")
+            )
+
+            if not dry_run:
+                Sprint.objects.filter(pk__in=[linha[0] for linha in linhas]).update(
+                    status=status, atualizado_em=timezone.now()
+                )
+                CacheVersaoService.incrementar("projeto", *(linha[3] for linha in linhas))
+                if ordens:
+                    campos = {"status": status}
+                    if status == "finalizada":
+                        campos["data_emissao_trd"] = Coalesce(F("data_emissao_trd"), Value(hoje))
+                    OrdemServico.objects.filter(pk__in=[linha[0] for linha in ordens]).update(**campos)
+                    CacheVersaoService.incrementar("contrato", *(linha[2] for linha in ordens))
+                    CacheVersaoService.incrementar("painel", "geral")
+                TransicaoStatusService._registrar_eventos(status, linhas, ordens)
+
+            transicoes += TransicaoStatusService._auditoria(
+                "sprint", [linha[:2] for linha in linhas], status, hoje
+            )
+            transicoes += TransicaoStatusService._auditoria(
+                "ordem_servico", [linha[:2] for linha in ordens], status, hoje
+            )
+        return transicoes
+
+    @staticmethod
+    def executar(hoje: Optional[date] = None, dry_run: bool = False) -> Dict[str, int]:
+        """
+        Executa todas as transições em uma transação e grava a trilha de auditoria
+
+        Args:
+            hoje: Data de referência (padrão: hoje)
+            dry_run: Apenas calcula as transições, sem gravar
+
+        Returns:
+            Quantidade de transições por entidade
+        """
+        hoje = hoje or timezone.now().date()
+        with transaction.atomic():
+            transicoes = (
+                TransicaoStatusService.transicionar_contratos(hoje, dry_run)
+                + TransicaoStatusService.transicionar_sprints(hoje, dry_run)
+            )
+            if not dry_run:
+                TransicaoStatus.objects.bulk_create(transicoes, batch_size=1000)
+
+        resumo = {entidade: 0 for entidade, _ in TransicaoStatus.ENTIDADE_CHOICES}
+        for transicao in transicoes:
+            resumo[transicao.entidade] += 1
+        return resumo
@@ -1,11 +1,24 @@
 """
-Signals para atualização automática de horas planejadas e realizadas nas OSs
-e criação automática de tickets de contato quando Sprint/OS é faturada
+Signals para atualização automática de horas planejadas e realizadas nas OSs,
+criação automática de tickets de contato quando Sprint/OS é faturada, registro
+do fluxo de atividades (Evento), contagem de referências dos ArquivoConteudo,
+indexação dos trechos para a busca textual, do índice de similaridade e
+invalidação do cache versionado (contrato, projeto e painel)
 """
-from django.db.models.signals import post_save, post_delete
+from django.db.models.signals import post_init, post_save, post_delete
+from django.db import transaction
+from django.db.models import Q
 from django.dispatch import receiver
 from django.utils import timezone
-from .models import Tarefa, LancamentoHora, OrdemServico, Sprint, FeedbackSprintOS
+from .models import (
+    Tarefa, LancamentoHora, OrdemServico, OrdemFornecimento, Sprint, FeedbackSprintOS,
+    Contrato, TermoAditivo, AnaliseContrato, DocumentoContrato, Cliente, ItemContrato,
+    ItemFornecedorOF, ItemFornecedorOS, SLA, SLAImportante, Backlog, Projeto, PlanoTrabalho,
+    StakeholderContrato, Colaborador, ContatoCliente, ItemFornecedor,
+)
+from .services import (
+    EventoService, ArquivoConteudoService, BuscaDocumentoService, SimilaridadeService, CacheVersaoService,
+)
 
 
 @receiver([post_save, post_delete], sender=Tarefa)
@@ -16,6 +29,13 @@ def atualizar_horas_os_tarefa(sender, instance, **kwargs):
         instance.projeto.ordem_servico.calcular_horas_tarefas()
 
 
+@receiver(post_delete, sender=Tarefa)
+def atualizar_totais_sprint_tarefa_removida(sender, instance, **kwargs):
+    """Retira dos totais armazenados da sprint as horas da tarefa removida"""
+    contribuicao = getattr(instance, "_contribuicao_gravada", None) or instance.contribuicao_sprint()
+    Tarefa.somar_horas_sprint(contribuicao, sinal=-1)
+
+
 @receiver([post_save, post_delete], sender=LancamentoHora)
 def atualizar_horas_os_lancamento(sender, instance, **kwargs):
     """Atualiza horas realizadas da OS quando um lançamento de hora é salvo ou deletado"""
@@ -24,6 +44,136 @@ def atualizar_horas_os_lancamento(sender, instance, **kwargs):
         instance.tarefa.projeto.ordem_servico.calcular_horas_tarefas()
 
 
+@receiver(post_delete, sender=DocumentoContrato)
+def liberar_conteudo_documento(sender, instance, **kwargs):
+    """O blob fica sem referências para a coleta de órfãos (coletar_blobs_orfaos)"""
+    if instance.conteudo_id:
+        ArquivoConteudoService.liberar(instance.conteudo_id)
+
+
+@receiver(post_init, sender=DocumentoContrato)
+def guardar_texto_original(sender, instance, **kwargs):
+    """Texto carregado, para reindexar apenas quando texto_extraido mudar"""
+    instance._texto_indexado = instance.__dict__.get("texto_extraido")
+
+
+@receiver(post_save, sender=DocumentoContrato)
+def indexar_trechos_documento(sender, instance, created, update_fields=None, **kwargs):
+    """Regrava os trechos da busca textual quando o texto extraído muda"""
+    if update_fields is not None and "texto_extraido" not in update_fields:
+        return
+    texto = instance.__dict__.get("texto_extraido")
+    alterado = bool(texto) if created else texto != getattr(instance, "_texto_indexado", None)
+    instance._texto_indexado = texto
+    if alterado:
+        BuscaDocumentoService.indexar(instance)
+
+
+@receiver([post_save, post_delete], sender=Cliente)
+@receiver([post_save, post_delete], sender=Contrato)
+@receiver([post_save, post_delete], sender=ItemContrato)
+def atualizar_indice_similaridade(sender, instance, **kwargs):
+    """Linha do cliente/contrato recarregada no índice de similaridade após o commit"""
+    if sender is ItemContrato:
+        tipo, pk = "contrato", instance.contrato_id
+    else:
+        tipo, pk = ("cliente" if sender is Cliente else "contrato"), instance.pk
+    transaction.on_commit(lambda: SimilaridadeService.marcar(tipo, pk))
+
+
+@receiver([post_save, post_delete], sender=Contrato)
+@receiver([post_save, post_delete], sender=TermoAditivo)
+@receiver([post_save, post_delete], sender=ItemContrato)
+@receiver([post_save, post_delete], sender=OrdemFornecimento)
+@receiver([post_save, post_delete], sender=OrdemServico)
+@receiver([post_save, post_delete], sender=ItemFornecedorOF)
+@receiver([post_save, post_delete], sender=ItemFornecedorOS)
+@receiver([post_save, post_delete], sender=SLA)
+@receiver([post_save, post_delete], sender=SLAImportante)
+@receiver([post_save, post_delete], sender=Backlog)
+@receiver([post_save, post_delete], sender=Projeto)
+@receiver([post_save, post_delete], sender=PlanoTrabalho)
+@receiver([post_save, post_delete], sender=StakeholderContrato)
+def invalidar_cache_contrato(sender, instance, **kwargs):
+    """Nova versão do contrato (abas do detalhe em cache) quando ele ou um filho é gravado"""
+    if sender is Contrato:
+        contrato_id = instance.pk
+    elif sender is ItemFornecedorOF:
+        contrato_id = OrdemFornecimento.objects.filter(pk=instance.ordem_fornecimento_id).values_list(
+            "contrato_id", flat=True
+        ).first()
+    elif sender is ItemFornecedorOS:
+        contrato_id = OrdemServico.objects.filter(pk=instance.ordem_servico_id).values_list(
+            "contrato_id", flat=True
+        ).first()
+    elif sender is PlanoTrabalho:
+        contrato_id = Projeto.objects.filter(pk=instance.projeto_id).values_list("contrato_id", flat=True).first()
+    else:
+        contrato_id = instance.contrato_id
+    CacheVersaoService.incrementar("contrato", contrato_id)
+
+
+@receiver([post_save, post_delete], sender=Contrato)
+@receiver([post_save, post_delete], sender=Projeto)
+@receiver([post_save, post_delete], sender=Sprint)
+@receiver([post_save, post_delete], sender=Tarefa)
+@receiver([post_save, post_delete], sender=OrdemServico)
+@receiver([post_save, post_delete], sender=PlanoTrabalho)
+@receiver([post_save, post_delete], sender=Backlog)
+def invalidar_cache_projeto(sender, instance, **kwargs):
+    """Nova versão do projeto (fragmentos do detalhe/canvas e da sprint) quando ele ou um filho é gravado"""
+    if sender is Projeto:
+        CacheVersaoService.incrementar("projeto", instance.pk)
+        return
+    if sender in (Sprint, Tarefa, OrdemServico, PlanoTrabalho):
+        # A sprint da tarefa é sempre do mesmo projeto (as views a recebem pela URL do projeto)
+        CacheVersaoService.incrementar("projeto", instance.projeto_id)
+        if sender is not Tarefa or not instance.backlog_id:
+            return
+    # Contrato, backlogs e tarefas de backlog aparecem em todos os projetos do contrato
+    if sender is Contrato:
+        condicao = Q(contrato=instance.pk)
+    elif sender is Backlog:
+        condicao = Q(contrato=instance.contrato_id)
+    else:
+        condicao = Q(contrato__backlogs=instance.backlog_id)
+    CacheVersaoService.incrementar("projeto", *Projeto.objects.filter(condicao).values_list("pk", flat=True))
+
+
+@receiver([post_save, post_delete], sender=Cliente)
+@receiver([post_save, post_delete], sender=Contrato)
+@receiver([post_save, post_delete], sender=ItemContrato)
+@receiver([post_save, post_delete], sender=OrdemServico)
+@receiver([post_save, post_delete], sender=OrdemFornecimento)
+@receiver([post_save, post_delete], sender=ItemFornecedor)
+@receiver([post_save, post_delete], sender=ItemFornecedorOF)
+@receiver([post_save, post_delete], sender=ItemFornecedorOS)
+def invalidar_cache_painel(sender, instance, **kwargs):
+    """Nova versão dos indicadores do dashboard"""
+    CacheVersaoService.incrementar("painel", "geral")
+
+
+@receiver([post_save, post_delete], sender=Colaborador)
+@receiver([post_save, post_delete], sender=ItemFornecedor)
+def invalidar_cache_cadastro(sender, instance, **kwargs):
+    """Cadastros exibidos nas abas de todos os contratos (gerentes de projeto, itens de fornecedor)"""
+    CacheVersaoService.incrementar("cadastro", "geral")
+
+
+@receiver(post_save, sender=Colaborador)
+@receiver(post_save, sender=ContatoCliente)
+def invalidar_cache_pessoa(sender, instance, **kwargs):
+    """Nome e contatos exibidos nos stakeholders do contrato e nas tarefas/gerência dos projetos"""
+    campo = "colaborador" if sender is Colaborador else "contato_cliente"
+    CacheVersaoService.incrementar(
+        "contrato", *StakeholderContrato.objects.filter(**{campo: instance.pk}).values_list("contrato_id", flat=True)
+    )
+    if sender is Colaborador:
+        CacheVersaoService.incrementar("projeto", *Projeto.objects.filter(
+            Q(gerente_projeto=instance.pk) | Q(tarefas__responsavel=instance.pk)
+        ).values_list("pk", flat=True).distinct())
+
+
 @receiver(post_save, sender=Sprint)
 def criar_ticket_contato_sprint_faturada(sender, instance, created, **kwargs):
     """Cria ticket de contato automaticamente quando uma Sprint é faturada"""
@@ -55,3 +205,75 @@ def criar_ticket_contato_os_faturada(sender, instance, created, **kwargs):
                 status='pendente',
             )
 
+
+
+# ========== FLUXO DE ATIVIDADES ==========
+
+@receiver(post_init, sender=OrdemServico)
+@receiver(post_init, sender=OrdemFornecimento)
+@receiver(post_init, sender=Sprint)
+@receiver(post_init, sender=AnaliseContrato)
+def guardar_status_original(sender, instance, **kwargs):
+    """Guarda o status carregado para detectar a transição no post_save (sem consulta extra)"""
+    instance._status_evento = instance.__dict__.get("status")
+
+
+def _registrar_transicao(instance, created, entidade, rotulo, contrato_id):
+    """Registra criação ou mudança de status da OS/OF; atualiza o status guardado"""
+    anterior, instance._status_evento = getattr(instance, "_status_evento", None), instance.status
+    if created:
+        EventoService.registrar(entidade, instance.pk, "criado", f"{rotulo} criada", contrato_id)
+    elif anterior != instance.status:
+        EventoService.registrar(
+            entidade, instance.pk, instance.status,
+            f"{rotulo}: {instance.get_status_display()}", contrato_id,
+        )
+
+
+@receiver(post_save, sender=OrdemServico)
+def evento_ordem_servico(sender, instance, created, **kwargs):
+    _registrar_transicao(instance, created, "ordem_servico", f"OS {instance.numero_os}", instance.contrato_id)
+
+
+@receiver(post_save, sender=OrdemFornecimento)
+def evento_ordem_fornecimento(sender, instance, created, **kwargs):
+    _registrar_transicao(instance, created, "ordem_fornecimento", f"OF {instance.numero_of}", instance.contrato_id)
+
+
+@receiver(post_save, sender=Sprint)
+def evento_sprint(sender, instance, created, **kwargs):
+    """Apenas o encerramento da sprint (finalizada/faturada)"""
+    anterior, instance._status_evento = getattr(instance, "_status_evento", None), instance.status
+    if not created and anterior != instance.status and instance.status in ("finalizada", "faturada"):
+        EventoService.registrar(
+            "sprint", instance.pk, instance.status,
+            f"Sprint {instance.nome}: {instance.get_status_display()}", instance.projeto.contrato_id,
+        )
+
+
+@receiver(post_save, sender=AnaliseContrato)
+def evento_analise_contrato(sender, instance, created, **kwargs):
+    """Apenas a conclusão da análise"""
+    anterior, instance._status_evento = getattr(instance, "_status_evento", None), instance.status
+    if not created and anterior != instance.status and instance.status == "analisado":
+        EventoService.registrar(
+            "analise_contrato", instance.pk, instance.status,
+            f"Análise {instance.nome} concluída", instance.contrato_gerado_id,
+        )
+
+
+@receiver(post_save, sender=TermoAditivo)
+def evento_termo_aditivo(sender, instance, created, **kwargs):
+    if created:
+        EventoService.registrar(
+            "termo_aditivo", instance.pk, "criado",
+            f"Termo aditivo {instance.numero_termo} ({instance.get_tipo_display()}) criado", instance.contrato_id,
+        )
+
+
+@receiver(post_save, sender=Contrato)
+def evento_contrato(sender, instance, created, **kwargs):
+    if created:
+        EventoService.registrar(
+            "contrato", instance.pk, "criado", f"Contrato {instance.numero_contrato} criado", instance.pk,
+        )
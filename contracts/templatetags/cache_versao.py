@@ -0,0 +1,50 @@
+from django import template
+from django.db import models
+from django.utils.safestring import mark_safe
+
+from ..services import CacheVersaoService
+
+register = template.Library()
+
+
+class CacheVersaoNode(template.Node):
+    def __init__(self, nodelist, nome, dependencias):
+        self.nodelist = nodelist
+        self.nome = nome
+        self.dependencias = dependencias
+
+    def render(self, context):
+        entidades, variacoes = [], []
+        for dependencia in self.dependencias:
+            valor = dependencia.resolve(context)
+            if isinstance(valor, models.Model):
+                entidades.append((valor._meta.model_name, valor.pk))
+            else:
+                variacoes.append(str(valor))
+
+        def renderizar():
+            # O token de quem gerou o fragmento não pode ir para o cache
+            with context.push(csrf_token=CacheVersaoService.MARCADOR_CSRF):
+                return str(self.nodelist.render(context))
+
+        html = CacheVersaoService.fragmento(self.nome.resolve(context), entidades, variacoes, renderizar)
+        if CacheVersaoService.MARCADOR_CSRF in html:
+            html = html.replace(CacheVersaoService.MARCADOR_CSRF, str(context.get("csrf_token", "")))
+        return mark_safe(html)
+
+
+@register.tag
+def cache_versao(parser, token):
+    """
+    Guarda o HTML do bloco até a próxima alteração das entidades informadas
+
+    Uso: {% cache_versao "nome" projeto pode_gerenciar %} ... {% endcache_versao %}
+    Instâncias de modelo (contrato, projeto) entram pela versão; os demais
+    valores variam a chave (ex.: permissão de edição, data de referência).
+    """
+    bits = token.split_contents()
+    if len(bits) < 2:
+        raise template.TemplateSyntaxError(f"'{bits[0]}' requer o nome do fragmento")
+    nodelist = parser.parse(("endcache_versao",))
+    parser.delete_first_token()
+    return CacheVersaoNode(nodelist, parser.compile_filter(bits[1]), [parser.compile_filter(bit) for bit in bits[2:]])
@@ -0,0 +1,206 @@
+"""
+Testes para a geração incremental dos alertas de contratos, o fluxo de atividades
+e as abas do detalhe do contrato em cache
+"""
+from decimal import Decimal
+from datetime import date
+
+from django.contrib.auth.models import User
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from .middleware import EventoMiddleware
+from .models import (
+    AlertaContrato, Cliente, Colaborador, Contrato, Evento, ItemContrato, RegimeLegal, TermoAditivo, TipoTermoAditivo,
+)
+from .services import AlertaContratoService, CacheVersaoService, EventoService
+from .views.gestao_contratos import ABAS_CONTRATO
+
+
+class ContratosAlertaTestMixin:
+    """Cria um contrato público (com item e aditivo de valor) e um de estatal"""
+
+    def criar_estrutura(self):
+        self.cliente = Cliente.objects.create(
+            nome_razao_social="Órgão Teste",
+            tipo_cliente="publico",
+            tipo_pessoa="juridica",
+            cnpj_cpf="22.222.222/0001-22",
+            endereco="Rua B",
+            numero="2",
+            bairro="Centro",
+            cidade="Brasília",
+            estado="DF",
+            cep="70000-000",
+        )
+        self.publico = Contrato.objects.create(
+            cliente=self.cliente, numero_contrato="CT-ALE-001", vigencia=12,
+            data_assinatura=date(2024, 1, 1), regime_legal=RegimeLegal.LEI_14133,
+        )
+        ItemContrato.objects.create(
+            contrato=self.publico, lote=1, numero_item="1", descricao="Consultoria", tipo="servico",
+            unidade="Horas", quantidade=Decimal("1000"), valor_unitario=Decimal("100.00"),
+        )
+        self.publico.save()
+        TermoAditivo.objects.create(
+            contrato=self.publico, numero_termo="TA-01", tipo=TipoTermoAditivo.VALOR,
+            valor_acrescimo=Decimal("21000.00"), data_assinatura=date(2024, 6, 1),
+        )
+        self.estatal = Contrato.objects.create(
+            cliente=self.cliente, numero_contrato="CT-ALE-002", vigencia=60,
+            data_assinatura=date(2024, 1, 1), regime_legal=RegimeLegal.LEI_13303,
+        )
+        # Situação na data de referência dos testes (o save a calcula pela data real)
+        Contrato.objects.update(situacao="Ativo")
+
+
+class AlertaContratoTestCase(ContratosAlertaTestMixin, TestCase):
+    """Alertas de renovação, limite de vigência e limite de aditivos"""
+
+    def setUp(self):
+        self.criar_estrutura()
+
+    def tipos_ativos(self, contrato):
+        return set(AlertaContrato.objects.filter(contrato=contrato, ativo=True).values_list("tipo", flat=True))
+
+    def test_processamento_incremental(self):
+        resultado = AlertaContratoService.processar(date(2024, 11, 15))
+        self.assertEqual((resultado["avaliados"], resultado["criados"]), (2, 3))
+        self.assertEqual(self.tipos_ativos(self.publico), {"renovacao_60", "limite_aditivo"})
+        self.assertEqual(self.tipos_ativos(self.estatal), {"limite_vigencia"})
+
+        # Nada mudou: apenas a leitura agregada dos contratos
+        with self.assertNumQueries(1):
+            self.assertEqual(AlertaContratoService.processar(date(2024, 11, 20))["avaliados"], 0)
+
+        usuario = User.objects.create_superuser("admin", "admin@teste.com", "senha")
+        self.client.force_login(usuario)
+        alerta = AlertaContrato.objects.get(contrato=self.publico, tipo="renovacao_60")
+        self.client.post(reverse("gestao_contratos_alerta_reconhecer", args=[alerta.pk]))
+        self.assertEqual(AlertaContrato.objects.get(pk=alerta.pk).reconhecido_por, usuario)
+
+        # Mudança de faixa: só o contrato que vence é reavaliado
+        resultado = AlertaContratoService.processar(date(2024, 12, 10))
+        self.assertEqual((resultado["avaliados"], resultado["criados"], resultado["resolvidos"]), (1, 1, 1))
+        self.assertEqual(self.tipos_ativos(self.publico), {"renovacao_30", "limite_aditivo"})
+
+        response = self.client.get(reverse("gestao_contratos_list"), {"renovacao_pendente": "true"})
+        self.assertContains(response, "CT-ALE-001")
+        self.assertNotContains(response, "CT-ALE-002")
+
+        # Prorrogação resolve o alerta de renovação
+        TermoAditivo.objects.create(
+            contrato=self.publico, numero_termo="TA-02", tipo=TipoTermoAditivo.PRORROGACAO,
+            meses_acrescimo=12, data_assinatura=date(2024, 12, 1),
+        )
+        AlertaContratoService.processar(date(2024, 12, 10), contrato_ids=[self.publico.pk])
+        self.assertEqual(self.tipos_ativos(self.publico), {"limite_aditivo"})
+
+        response = self.client.get(reverse("gestao_contratos_alertas"))
+        self.assertContains(response, "CT-ALE-002")
+
+
+class EventoTestCase(ContratosAlertaTestMixin, TestCase):
+    """Eventos gravados em lote ao fim da requisição e linha do tempo por chave"""
+
+    def setUp(self):
+        self.criar_estrutura()
+
+    def test_buffer_por_requisicao(self):
+        usuario = User.objects.create_user("gerente", "gerente@teste.com", "senha")
+        request = RequestFactory().get("/")
+        request.user = usuario
+
+        def view(request):
+            with self.captureOnCommitCallbacks(execute=True):
+                for numero in ("TA-10", "TA-11"):
+                    TermoAditivo.objects.create(
+                        contrato=self.estatal, numero_termo=numero, tipo=TipoTermoAditivo.PRORROGACAO,
+                        meses_acrescimo=1, data_assinatura=date(2024, 6, 1),
+                    )
+            # Confirmados, mas ainda no buffer da requisição
+            self.assertFalse(Evento.objects.filter(entidade="termo_aditivo").exists())
+            return HttpResponse()
+
+        EventoMiddleware(view)(request)
+        eventos = Evento.objects.filter(entidade="termo_aditivo")
+        self.assertEqual(eventos.count(), 2)
+        self.assertEqual({e.usuario for e in eventos}, {usuario})
+        self.assertEqual({e.contrato_id for e in eventos}, {self.estatal.pk})
+
+    def test_linha_do_tempo_por_chave(self):
+        agora = timezone.now()
+        Evento.objects.bulk_create([
+            Evento(entidade="contrato", objeto_id=self.publico.pk, acao="criado", descricao=f"Evento {i}",
+                   contrato=self.publico, criado_em=agora)
+            for i in range(25)
+        ])
+        primeira = EventoService.linha_do_tempo(self.publico.pk)
+        self.assertEqual(len(primeira["eventos"]), 20)
+
+        url = reverse("api_contrato_eventos", args=[self.publico.pk])
+        self.client.force_login(User.objects.create_user("sem_grupo", "sem_grupo@teste.com", "senha"))
+        self.assertEqual(self.client.get(url).status_code, 302)
+
+        self.client.force_login(User.objects.create_superuser("admin", "admin@teste.com", "senha"))
+        with self.assertNumQueries(4):  # sessão, usuário, grupos e a página
+            response = self.client.get(url, {"cursor": primeira["proximo"]})
+        segunda = response.json()
+        self.assertEqual(len(segunda["eventos"]), 5)
+        self.assertIsNone(segunda["proximo"])
+        descricoes = [e.descricao for e in primeira["eventos"]] + [e["descricao"] for e in segunda["eventos"]]
+        self.assertEqual(len(set(descricoes)), 25)
+
+
+class AbasContratoTestCase(ContratosAlertaTestMixin, TestCase):
+    """Abas do detalhe carregadas sob demanda e invalidadas pela versão do contrato"""
+
+    def setUp(self):
+        self.criar_estrutura()
+
+    def test_aba_em_cache_ate_alteracao(self):
+        self.client.force_login(User.objects.create_superuser("admin", "admin@teste.com", "senha"))
+        url_aba = reverse("gestao_contratos_aba", args=[self.publico.pk, "itens"])
+        resposta = self.client.get(reverse("gestao_contratos_detail", args=[self.publico.pk]))
+        self.assertContains(resposta, f'data-url="{url_aba}"')
+        self.assertNotContains(resposta, "Consultoria")
+
+        resposta = self.client.get(url_aba)
+        self.assertContains(resposta, "Consultoria")
+        self.assertNotContains(resposta, CacheVersaoService.MARCADOR_CSRF)
+        # Sessão, usuário e grupos; versão e HTML da aba vêm do cache (tabela do DatabaseCache)
+        CacheVersaoService.gravar_estatisticas()
+        with self.assertNumQueries(5):
+            self.client.get(url_aba)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ItemContrato.objects.create(
+                contrato=self.publico, lote=1, numero_item="2", descricao="Sustentação", tipo="servico",
+                unidade="Horas", quantidade=Decimal("10"), valor_unitario=Decimal("100.00"),
+            )
+        self.assertContains(self.client.get(url_aba), "Sustentação")
+        for aba in ABAS_CONTRATO:
+            resposta = self.client.get(reverse("gestao_contratos_aba", args=[self.publico.pk, aba]))
+            self.assertEqual(resposta.status_code, 200)
+        self.assertEqual(
+            self.client.get(reverse("gestao_contratos_aba", args=[self.publico.pk, "info"])).status_code, 404
+        )
+
+    def test_aba_projetos_acompanha_cadastro(self):
+        """Renomear um gerente (cadastro geral) invalida a aba de projetos de todos os contratos"""
+        usuario = User.objects.create_superuser("admin", "admin@teste.com", "senha")
+        self.client.force_login(usuario)
+        gerente = Colaborador.objects.create(
+            user=usuario, nome_completo="Gerente Antigo", email="gerente@teste.com", cargo="Gerente de Projetos",
+        )
+        url_aba = reverse("gestao_contratos_aba", args=[self.estatal.pk, "projetos"])
+        self.assertContains(self.client.get(url_aba), "Gerente Antigo")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            gerente.nome_completo = "Gerente Novo"
+            gerente.save()
+        resposta = self.client.get(url_aba)
+        self.assertContains(resposta, "Gerente Novo")
+        self.assertNotContains(resposta, "Gerente Antigo")
@@ -0,0 +1,58 @@
+"""
+Testes para a chave normalizada do CNPJ/CPF dos clientes e o relatório de duplicados
+"""
+from importlib import import_module
+
+from django.apps import apps
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+
+from .forms import ClienteForm
+from .models import Cliente
+from .services import ClienteService
+from .services.contract_ai_service import ContractAIService
+
+
+class CnpjNormalizadoTestCase(TestCase):
+    """Buscas pelo CNPJ/CPF em qualquer formatação e deduplicação dos cadastros antigos"""
+
+    def cliente(self, nome, cnpj_cpf):
+        return Cliente.objects.create(
+            nome_razao_social=nome, tipo_cliente="publico", tipo_pessoa="juridica", cnpj_cpf=cnpj_cpf,
+            endereco="Rua A", numero="1", bairro="Centro", cidade="Brasília", estado="DF", cep="70000-000",
+        )
+
+    def test_chave_normalizada(self):
+        orgao = self.cliente("Órgão Teste", "11.111.111/0001-11")
+        self.assertEqual(orgao.cnpj_normalizado, "11111111000111")
+        self.assertEqual(Cliente.objects.por_documento("11111111000111").get(), orgao)
+        self.assertEqual(ContractAIService.verificar_contrato_existente(cnpj_cliente="11111111000111"), (None, orgao))
+        self.assertIsNone(self.cliente("A definir", "A_DEFINIR").cnpj_normalizado)
+
+        form = ClienteForm(data={"cnpj_cpf": "11111111000111"})
+        form.is_valid()
+        self.assertIn("cnpj_cpf", form.errors)
+
+        # Cadastro anterior à chave com outra formatação: o preenchimento da migração
+        # mantém a chave no mais antigo e o relatório lista o outro
+        legado = self.cliente("Órgão Teste (legado)", "22.222.222/0001-22")
+        Cliente.objects.filter(pk=legado.pk).update(cnpj_cpf="11 111 111 0001 11", cnpj_normalizado=None)
+        Cliente.objects.filter(pk=orgao.pk).update(cnpj_normalizado=None)
+        migracao = import_module("contracts.migrations.0087_cliente_cnpj_normalizado")
+        migracao.preencher_cnpj_normalizado(apps, None)
+        orgao.refresh_from_db()
+        legado.refresh_from_db()
+        self.assertEqual((orgao.cnpj_normalizado, legado.cnpj_normalizado), ("11111111000111", None))
+
+        legado.nome_fantasia = "Legado"
+        legado.save()  # não herda a chave do principal
+        grupos = ClienteService.duplicados()
+        self.assertEqual(len(grupos), 1)
+        self.assertEqual(grupos[0]["principal"], orgao)
+        self.assertEqual(grupos[0]["duplicados"], [legado])
+
+        self.client.force_login(User.objects.create_superuser("admin", "admin@teste.com", "x"))
+        response = self.client.get(reverse("cliente_list"), {"nome": "11.111.111"})
+        self.assertEqual(list(response.context["clientes"]), [orgao])
+        self.assertContains(self.client.get(reverse("cliente_duplicados")), "Órgão Teste (legado)")
@@ -0,0 +1,247 @@
+"""
+Testes para a entrega dos arquivos de documentos de contrato (Range/ETag e X-Accel-Redirect)
+e para o armazenamento deduplicado por conteúdo, a busca textual e a similaridade
+com registros existentes
+"""
+import hashlib
+import io
+import shutil
+import tempfile
+from decimal import Decimal
+from datetime import date
+
+from django.contrib.auth.models import User
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from .models import (
+    AnaliseContrato, ArquivoConteudo, Cliente, Contrato, DocumentoContrato, ItemContrato, TrechoDocumento,
+)
+from .services import ArquivoConteudoService, BuscaDocumentoService, EntregaArquivoService, SimilaridadeService
+
+
+class EntregaArquivoTestCase(TestCase):
+    """Download de DocumentoContrato com respostas parciais e delegação ao servidor web"""
+
+    def setUp(self):
+        self.media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media, ignore_errors=True)
+        configuracao = override_settings(MEDIA_ROOT=self.media, ARQUIVOS_ENTREGA="")
+        configuracao.enable()
+        self.addCleanup(configuracao.disable)
+
+        self.conteudo = bytes(range(256)) * 1024  # 256 KiB: mais de um bloco de leitura
+        self.documento = DocumentoContrato(nome="Edital", tipo_documento="edital")
+        self.documento.arquivo.save("edital.pdf", ContentFile(self.conteudo))
+        self.url = reverse("documento_contrato_download", args=[self.documento.pk])
+        self.client.force_login(User.objects.create_superuser("admin", "admin@teste.com", "x"))
+
+    def corpo(self, response):
+        return b"".join(response.streaming_content)
+
+    def test_intervalos(self):
+        completo = self.client.get(self.url)
+        self.assertEqual(completo.status_code, 200)
+        self.assertEqual(self.corpo(completo), self.conteudo)
+        self.assertEqual(completo["Accept-Ranges"], "bytes")
+        self.assertEqual(completo["Content-Length"], str(len(self.conteudo)))
+        etag = completo["ETag"]
+
+        tamanho = len(self.conteudo)
+        casos = {
+            "bytes=10-19": (10, 19),
+            "bytes=65530-65545": (65530, 65545),  # atravessa a borda entre blocos
+            "bytes=-5": (tamanho - 5, tamanho - 1),
+            f"bytes={tamanho - 3}-": (tamanho - 3, tamanho - 1),
+            f"bytes=100-{tamanho * 2}": (100, tamanho - 1),
+        }
+        for cabecalho, (inicio, fim) in casos.items():
+            with self.subTest(cabecalho):
+                parcial = self.client.get(self.url, HTTP_RANGE=cabecalho)
+                self.assertEqual(parcial.status_code, 206)
+                self.assertEqual(parcial["Content-Range"], f"bytes {inicio}-{fim}/{tamanho}")
+                self.assertEqual(parcial["Content-Length"], str(fim - inicio + 1))
+                self.assertEqual(self.corpo(parcial), self.conteudo[inicio:fim + 1])
+
+        # Fora do arquivo: 416 com o tamanho total
+        invalido = self.client.get(self.url, HTTP_RANGE=f"bytes={tamanho}-")
+        self.assertEqual(invalido.status_code, 416)
+        self.assertEqual(invalido["Content-Range"], f"bytes */{tamanho}")
+        # ...exceto com If-Range de outra versão: o Range é ignorado
+        antigo = self.client.get(self.url, HTTP_RANGE=f"bytes={tamanho}-", HTTP_IF_RANGE='"antigo"')
+        self.assertEqual(antigo.status_code, 200)
+        # Vários intervalos não são suportados: arquivo inteiro
+        self.assertEqual(self.client.get(self.url, HTTP_RANGE="bytes=0-1,5-6").status_code, 200)
+        # If-Range com versão diferente ignora o Range; com a mesma, responde a parte
+        self.assertEqual(self.client.get(self.url, HTTP_RANGE="bytes=0-1", HTTP_IF_RANGE='"antigo"').status_code, 200)
+        self.assertEqual(self.client.get(self.url, HTTP_RANGE="bytes=0-1", HTTP_IF_RANGE=etag).status_code, 206)
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        # Arquivo vazio: nenhum intervalo, nem sufixo, é satisfazível
+        for cabecalho in ("bytes=-5", "bytes=0-"):
+            with self.subTest(cabecalho), self.assertRaises(ValueError):
+                EntregaArquivoService.intervalo(cabecalho, 0)
+
+    def test_delegacao_ao_servidor_web(self):
+        with self.settings(ARQUIVOS_ENTREGA="nginx", ARQUIVOS_ACCEL_PREFIXO="/protegido/"):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["X-Accel-Redirect"], f"/protegido/{self.documento.arquivo.name}")
+        self.assertEqual(response.content, b"")
+        self.assertIn("attachment", response["Content-Disposition"])
+
+        with self.settings(ARQUIVOS_ENTREGA="apache"):
+            response = self.client.get(self.url + "?inline=1")
+        self.assertEqual(response["X-Sendfile"], self.documento.arquivo.path)
+        self.assertTrue(response["Content-Disposition"].startswith("inline"))
+
+
+class ArquivoConteudoTestCase(TestCase):
+    """Uploads idênticos compartilham o blob, o texto extraído e são coletados sem referências"""
+
+    def setUp(self):
+        self.media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media, ignore_errors=True)
+        configuracao = override_settings(MEDIA_ROOT=self.media)
+        configuracao.enable()
+        self.addCleanup(configuracao.disable)
+        self.client.force_login(User.objects.create_superuser("admin", "admin@teste.com", "x"))
+
+    def test_deduplicacao_e_coleta(self):
+        conteudo = b"%PDF-1.4 edital " * 10000
+        for nome in ("Análise 1", "Análise 2"):
+            response = self.client.post(reverse("documento_contrato_upload"), {
+                "nome_analise": nome,
+                "arquivos": [SimpleUploadedFile("edital.pdf", conteudo, "application/pdf")],
+            })
+            self.assertEqual(response.status_code, 302)
+            if nome == "Análise 1":
+                # Texto extraído da primeira análise é aproveitado pela segunda
+                primeiro = DocumentoContrato.objects.get()
+                ArquivoConteudoService.guardar_texto(primeiro.conteudo_id, "texto do edital")
+
+        blob = ArquivoConteudo.objects.get()
+        self.assertEqual(blob.sha256, hashlib.sha256(conteudo).hexdigest())
+        self.assertEqual(blob.referencias, 2)
+        self.assertEqual(len(list(ArquivoConteudoService._arquivos(ArquivoConteudoService.PASTA))), 1)
+        segundo = DocumentoContrato.objects.get(analise__nome="Análise 2")
+        self.assertEqual(segundo.arquivo.name, blob.arquivo.name)
+        self.assertEqual(segundo.texto_extraido, "texto do edital")
+
+        # Download com o nome original, não o hash
+        response = self.client.get(reverse("documento_contrato_download", args=[segundo.pk]))
+        self.assertIn('filename="edital.pdf"', response["Content-Disposition"])
+
+        AnaliseContrato.objects.filter(nome="Análise 1").delete()
+        call_command("coletar_blobs_orfaos", carencia=0, stdout=io.StringIO())
+        self.assertTrue(default_storage.exists(blob.arquivo.name))
+
+        AnaliseContrato.objects.all().delete()
+        self.assertEqual(ArquivoConteudo.objects.get().referencias, 0)
+        call_command("coletar_blobs_orfaos", carencia=0, stdout=io.StringIO())
+        self.assertFalse(ArquivoConteudo.objects.exists())
+        self.assertFalse(default_storage.exists(blob.arquivo.name))
+
+
+class BuscaDocumentoTestCase(TestCase):
+    """Trechos por cláusula, ranking e destaque (índice invertido fora do PostgreSQL)"""
+
+    TEXTO = (
+        "CLÁUSULA PRIMEIRA - DO OBJETO\n"
+        "1.1. Prestação de serviços de suporte técnico.\n\n"
+        "CLÁUSULA DÉCIMA - DAS PENALIDADES\n"
+        "10.1. Pelo atraso injustificado será aplicada multa de 10% sobre o valor da parcela.\n"
+        "10.2. As multas serão descontadas dos pagamentos devidos à <Contratada>.\n"
+    )
+
+    def test_busca_por_clausula(self):
+        analise = AnaliseContrato.objects.create(nome="Contrato 009/2025")
+        contrato = DocumentoContrato.objects.create(
+            analise=analise, nome="contrato.pdf", tipo_documento="contrato", texto_extraido=self.TEXTO
+        )
+        DocumentoContrato.objects.create(
+            analise=analise, nome="edital.pdf", tipo_documento="edital",
+            texto_extraido="CLÁUSULA QUINTA - DA GARANTIA\nGarantia de 5% sem multa.",
+        )
+        self.assertEqual(
+            list(contrato.trechos.values_list("titulo", flat=True)),
+            ["CLÁUSULA PRIMEIRA - DO OBJETO", "CLÁUSULA DÉCIMA - DAS PENALIDADES"],
+        )
+
+        resultados = BuscaDocumentoService.buscar("multas atraso")
+        self.assertEqual(len(resultados), 1)
+        self.assertEqual(resultados[0]["documento"], contrato)
+        self.assertIn("<mark>atraso</mark>", resultados[0]["destaque"])
+        self.assertIn("&lt;Contratada&gt;", resultados[0]["destaque"])  # texto escapado
+
+        self.assertEqual([r["documento"].nome for r in BuscaDocumentoService.buscar("multa")],
+                         ["edital.pdf", "contrato.pdf"])  # trecho mais curto primeiro (BM25)
+        self.assertEqual(len(BuscaDocumentoService.buscar("multa -garantia")), 1)
+        self.assertEqual(len(BuscaDocumentoService.buscar("multa", tipo_documento="edital")), 1)
+
+        # Novo texto extraído regrava os trechos
+        contrato.texto_extraido = "Sem penalidades."
+        contrato.save(update_fields=["texto_extraido"])
+        self.assertEqual(TrechoDocumento.objects.filter(documento=contrato).count(), 1)
+        self.assertEqual(len(BuscaDocumentoService.buscar("atraso")), 0)
+
+        self.client.force_login(User.objects.create_superuser("admin", "admin@teste.com", "x"))
+        response = self.client.get(reverse("documento_contrato_busca"), {"q": "garantia"})
+        self.assertContains(response, "<mark>Garantia</mark>", html=False)
+
+
+class SimilaridadeTestCase(TestCase):
+    """Candidatos a cliente/contrato existente por TF-IDF, com atualização incremental"""
+
+    def cliente(self, nome, cnpj):
+        return Cliente.objects.create(
+            nome_razao_social=nome, tipo_cliente="publico", tipo_pessoa="juridica", cnpj_cpf=cnpj,
+            endereco="Rua A", numero="1", bairro="Centro", cidade="Brasília", estado="DF", cep="70000-000",
+        )
+
+    def contrato(self, cliente, numero, objeto, item):
+        contrato = Contrato.objects.create(
+            cliente=cliente, numero_contrato=numero, objeto=objeto, vigencia=12, data_assinatura=date(2025, 1, 1),
+        )
+        ItemContrato.objects.create(
+            contrato=contrato, lote=1, numero_item="1", descricao=item, tipo="servico",
+            unidade="Horas", quantidade=Decimal("100"), valor_unitario=Decimal("10.00"),
+        )
+        return contrato
+
+    def test_candidatos(self):
+        SimilaridadeService.limpar()
+        self.addCleanup(SimilaridadeService.limpar)
+        tribunal = self.cliente("Tribunal Regional do Trabalho", "11.111.111/0001-11")
+        ministerio = self.cliente("Ministério da Saúde", "33.333.333/0001-33")
+        suporte = self.contrato(tribunal, "009/2025", "Suporte técnico a banco de dados Oracle", "Sustentação de banco de dados")
+        self.contrato(ministerio, "015/2024", "Licenciamento de antivírus", "Licença de antivírus")
+
+        texto = (
+            "CONTRATO Nº 9/2025 celebrado com o TRIBUNAL REGIONAL DO TRABALHO, CNPJ 11111111000111, "
+            "para a prestação de serviços de suporte técnico e sustentação de bancos de dados Oracle."
+        )
+        candidatos = SimilaridadeService.candidatos(texto)
+        self.assertEqual(candidatos["clientes"][0]["id"], tribunal.pk)
+        self.assertTrue(candidatos["clientes"][0]["identico"])
+        self.assertEqual(candidatos["contratos"][0]["id"], suporte.pk)
+        self.assertTrue(candidatos["contratos"][0]["identico"])
+        self.assertEqual(len(candidatos["contratos"]), 1)  # sem termo em comum com o outro contrato
+
+        # Novo contrato entra no índice do processo sem recarga completa
+        indice = SimilaridadeService._indice
+        with self.captureOnCommitCallbacks(execute=True):
+            novo = self.contrato(ministerio, "020/2025", "Sustentação de bancos de dados", "Suporte a banco de dados")
+        texto_novo = "Sustentação de banco de dados do Ministério da Saúde"
+        self.assertEqual(SimilaridadeService.candidatos(texto_novo)["contratos"][0]["id"], novo.pk)
+        self.assertIs(SimilaridadeService._indice, indice)
+
+        analise = AnaliseContrato.objects.create(nome="Novo contrato", texto_consolidado=texto)
+        self.client.force_login(User.objects.create_superuser("admin", "admin@teste.com", "x"))
+        response = self.client.get(reverse("documento_contrato_detail", args=[analise.pk]))
+        self.assertContains(response, "Possível duplicidade")
+        self.assertContains(response, "CNPJ/CPF encontrado nos documentos")
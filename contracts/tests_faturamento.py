@@ -0,0 +1,134 @@
+"""
+Testes para o faturamento em lote da Fila de Faturamento
+"""
+from decimal import Decimal
+from datetime import date
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from .models import Evento, FeedbackSprintOS, ItemContrato, OrdemFornecimento, OrdemServico, Sprint
+from .services import FaturamentoService
+from .tests_projetos import ProjetoTestMixin
+
+
+class FaturamentoEmLoteTestCase(ProjetoTestMixin, TestCase):
+    """Testes da transição em lote finalizada -> faturada"""
+
+    def setUp(self):
+        self.criar_estrutura()
+        self.sprint = self.criar_sprint("Sprint 1", status="finalizada")
+        self.os_sprint = self.sprint.ordem_servico
+        self.os_avulsas = [self.criar_os() for _ in range(2)]
+        self.os_aberta = self.criar_os(status="aberta")
+        OrdemServico.objects.filter(pk=self.os_sprint.pk).update(status="finalizada")
+
+        item_licenca = ItemContrato.objects.create(
+            contrato=self.contrato,
+            lote=1,
+            numero_item="2",
+            descricao="Licença",
+            tipo="licenca_software",
+            unidade="Licença",
+            quantidade=Decimal("10"),
+            valor_unitario=Decimal("1000.00"),
+        )
+        self.of = OrdemFornecimento.objects.create(
+            cliente=self.cliente,
+            contrato=self.contrato,
+            item_contrato=item_licenca,
+            quantidade=2,
+            status=OrdemFornecimento.STATUS_FINALIZADA,
+        )
+
+    def criar_os(self, status="finalizada"):
+        ordem_servico = OrdemServico.objects.create(
+            cliente=self.cliente,
+            contrato=self.contrato,
+            item_contrato=self.item,
+            quantidade=Decimal("10"),
+            data_inicio=date(2024, 2, 1),
+        )
+        OrdemServico.objects.filter(pk=ordem_servico.pk).update(status=status)
+        return ordem_servico
+
+    def test_faturar_em_lote(self):
+        """Fatura as finalizadas, recusa as demais e cria os tickets uma única vez"""
+        os_ids = [self.os_sprint.pk, self.os_aberta.pk, 999999] + [o.pk for o in self.os_avulsas]
+        resultado = FaturamentoService.faturar_em_lote(os_ids, [self.of.pk], data=date(2024, 3, 31))
+
+        self.assertEqual(resultado["faturadas_os"], 3)
+        self.assertEqual(resultado["faturadas_of"], 1)
+        self.assertEqual(resultado["erros"], 2)
+        self.assertEqual(resultado["valor_os"], Decimal("18000.00"))
+        self.assertEqual(resultado["valor_of"], Decimal("2000.00"))
+        self.assertEqual(resultado["valor_por_contrato"], {self.contrato.pk: Decimal("20000.00")})
+        recusados = {r["id"]: r["mensagem"] for r in resultado["resultados"] if not r["ok"]}
+        self.assertEqual(recusados[999999], "não encontrada")
+        self.assertIn("Aberta", recusados[self.os_aberta.pk])
+
+        self.assertEqual(
+            OrdemServico.objects.filter(status="faturada", data_faturamento=date(2024, 3, 31)).count(), 3
+        )
+        self.assertEqual(OrdemServico.objects.get(pk=self.os_aberta.pk).status, "aberta")
+        self.assertEqual(OrdemFornecimento.objects.get(pk=self.of.pk).status, "faturada")
+        self.assertEqual(Sprint.objects.get(pk=self.sprint.pk).status, "faturada")
+
+        # Um ticket por OS faturada e um pela Sprint sincronizada
+        self.assertEqual(resultado["tickets_criados"], 4)
+        numero = FaturamentoService.numero_ticket_os(self.os_sprint.numero_os)
+        ticket = FeedbackSprintOS.objects.get(numero_ticket=numero)
+        self.assertEqual(ticket.ordem_servico, self.os_sprint)
+        self.assertEqual(ticket.motivador_contato, "feedback_servico")
+
+        # Reprocessar o lote não fatura novamente nem duplica tickets
+        repetido = FaturamentoService.faturar_em_lote(os_ids, [self.of.pk])
+        self.assertEqual(repetido["faturadas_os"] + repetido["faturadas_of"], 0)
+        self.assertEqual(FeedbackSprintOS.objects.count(), 4)
+
+    def test_eventos_do_lote(self):
+        """O lote registra no fluxo de atividades as OS, OF e Sprints faturadas"""
+        with self.captureOnCommitCallbacks(execute=True):
+            FaturamentoService.faturar_em_lote([self.os_sprint.pk, self.os_aberta.pk], [self.of.pk])
+        self.assertEqual(
+            set(Evento.objects.filter(acao="faturada").values_list("entidade", "objeto_id", "contrato_id")),
+            {
+                ("ordem_servico", self.os_sprint.pk, self.contrato.pk),
+                ("ordem_fornecimento", self.of.pk, self.contrato.pk),
+                ("sprint", self.sprint.pk, self.contrato.pk),
+            },
+        )
+        self.assertEqual(
+            Evento.objects.get(entidade="sprint").descricao, f"Sprint {self.sprint.nome}: Faturada"
+        )
+
+    def test_view_consultas_nao_escalam(self):
+        """O POST em lote mantém o número de consultas ao aumentar a seleção"""
+        user = User.objects.create_superuser("admin", "admin@teste.com", "senha")
+        self.client.force_login(user)
+        url = reverse("faturar_selecionados")
+
+        def consultas(ordens):
+            with CaptureQueriesContext(connection) as contexto:
+                response = self.client.post(url, {"os_ids": [o.pk for o in ordens]})
+            self.assertRedirects(response, reverse("fila_faturamento"), fetch_redirect_response=False)
+            return len(contexto.captured_queries)
+
+        poucas = consultas(self.os_avulsas)
+        muitas = consultas([self.criar_os() for _ in range(20)])
+        self.assertEqual(muitas, poucas)
+        self.assertEqual(OrdemServico.objects.filter(status="faturada").count(), 22)
+
+    def test_marcar_os_faturada_individual(self):
+        """O fluxo individual continua criando um único ticket para a OS"""
+        user = User.objects.create_superuser("admin", "admin@teste.com", "senha")
+        self.client.force_login(user)
+        os_item = self.os_avulsas[0]
+
+        self.client.get(reverse("marcar_os_faturada", args=[os_item.pk]))
+
+        self.assertEqual(OrdemServico.objects.get(pk=os_item.pk).status, "faturada")
+        self.assertEqual(FeedbackSprintOS.objects.filter(ordem_servico=os_item).count(), 1)
@@ -0,0 +1,29 @@
+"""
+Testes para os imports da inicialização (django.setup() e URLs)
+"""
+import os
+import unittest
+
+from django.test import SimpleTestCase
+
+from .management.commands.tempo_importacao import Command as TempoImportacao
+
+
+class TempoImportacaoTestCase(SimpleTestCase):
+    """Bibliotecas pesadas fora do boot e orçamento de importação com folga"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.registros = TempoImportacao().medir()
+
+    def test_bibliotecas_pesadas_fora_da_inicializacao(self):
+        modulos = {nome for nome, _, _ in self.registros}
+        self.assertIn("contracts.views", modulos)
+        self.assertEqual({nome.split(".")[0] for nome in modulos} & set(TempoImportacao.PESADOS), set())
+
+    @unittest.skipIf(os.environ.get("SEM_ORCAMENTO_IMPORTACAO"), "orçamento de importação desativado")
+    def test_orcamento_com_folga(self):
+        # Tempo de parede: só regressões grandes (o orçamento exato fica com o comando)
+        limite = TempoImportacao.ORCAMENTO_MS * TempoImportacao.FOLGA_TESTES
+        self.assertLess(TempoImportacao.total_ms(self.registros), limite)
@@ -0,0 +1,761 @@
+"""
+Testes para a Gestão Ágil de Projetos (snapshots de horas e burn-down)
+"""
+import io
+from decimal import Decimal
+from datetime import date, datetime, time, timedelta
+
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from .forms import TarefaForm
+from .models import (
+    Backlog,
+    Cliente,
+    Colaborador,
+    Contrato,
+    ItemContrato,
+    ItemFornecedor,
+    LancamentoHora,
+    OrdemServico,
+    PlanoTrabalho,
+    Projeto,
+    SnapshotHorasProjeto,
+    Sprint,
+    Tarefa,
+)
+from .services import (
+    AuditoriaTimesheetService,
+    BurndownService,
+    CapacidadeService,
+    ContractAIService,
+    CacheVersaoService,
+    OrcamentoHorasService,
+    SincronizacaoPlanoService,
+)
+
+
+class ProjetoTestMixin:
+    """Cria a estrutura mínima Cliente > Contrato > Projeto > Sprint"""
+
+    def criar_estrutura(self):
+        self.cliente = Cliente.objects.create(
+            nome_razao_social="Cliente Projetos",
+            tipo_cliente="publico",
+            tipo_pessoa="juridica",
+            cnpj_cpf="22.222.222/0001-22",
+            endereco="Rua B",
+            numero="2",
+            bairro="Centro",
+            cidade="Brasília",
+            estado="DF",
+            cep="70000-000",
+        )
+        self.contrato = Contrato.objects.create(
+            cliente=self.cliente,
+            numero_contrato="CT-PRJ-001",
+            vigencia=12,
+            data_assinatura=date(2024, 1, 1),
+        )
+        self.item = ItemContrato.objects.create(
+            contrato=self.contrato,
+            lote=1,
+            numero_item="1",
+            descricao="Serviço",
+            tipo="servico",
+            unidade="Horas",
+            quantidade=Decimal("1000"),
+            valor_unitario=Decimal("150.00"),
+        )
+        user = User.objects.create_user("consultor", "consultor@teste.com", "senha")
+        self.colaborador = Colaborador.objects.create(
+            user=user, nome_completo="Consultor Teste", email="consultor@teste.com", cargo="Consultor"
+        )
+        self.projeto = Projeto.objects.create(contrato=self.contrato, nome="Projeto Teste")
+
+    def criar_sprint(self, nome, status="execucao"):
+        ordem_servico = OrdemServico.objects.create(
+            cliente=self.cliente,
+            contrato=self.contrato,
+            projeto=self.projeto,
+            item_contrato=self.item,
+            quantidade=Decimal("100"),
+            data_inicio=date(2024, 2, 1),
+        )
+        sprint = Sprint.objects.create(
+            projeto=self.projeto,
+            nome=nome,
+            data_inicio=date(2024, 2, 1),
+            data_fim=date(2024, 2, 15),
+            ordem_servico=ordem_servico,
+        )
+        # A sincronização Sprint <-> OS sobrescreve o status no save
+        Sprint.objects.filter(pk=sprint.pk).update(status=status)
+        sprint.status = status
+        return sprint
+
+    def criar_tarefa(self, sprint, titulo, horas_planejadas, status_sprint="nao_iniciada", **kwargs):
+        inicio = timezone.make_aware(datetime(2024, 2, 1, 9, 0))
+        tarefa = Tarefa.objects.create(
+            projeto=self.projeto,
+            sprint=sprint,
+            titulo=titulo,
+            descricao=titulo,
+            responsavel=self.colaborador,
+            status_sprint=status_sprint,
+            data_inicio_prevista=inicio,
+            data_termino_prevista=inicio + timedelta(hours=8),
+            **kwargs,
+        )
+        # O save recalcula as horas pelas datas; fixar o valor esperado pelo teste
+        Tarefa.objects.filter(pk=tarefa.pk).update(horas_planejadas=Decimal(horas_planejadas))
+        Sprint.objects.filter(pk=getattr(sprint, "pk", None)).recalcular_horas()
+        tarefa.refresh_from_db()
+        return tarefa
+
+    def lancar(self, tarefa, dia, horas, faturavel=True):
+        return LancamentoHora.objects.create(
+            tarefa=tarefa,
+            colaborador=self.colaborador,
+            data=dia,
+            hora_inicio=time(9, 0),
+            hora_termino=time(9 + horas, 0),
+            faturavel=faturavel,
+        )
+
+
+class BurndownServiceTestCase(ProjetoTestMixin, TestCase):
+    """Testes dos snapshots diários de horas"""
+
+    def setUp(self):
+        self.criar_estrutura()
+        self.sprint = self.criar_sprint("Sprint 1", status="finalizada")
+        self.concluida = self.criar_tarefa(self.sprint, "Instalação", "10", "finalizada", bilhetar_na_os=True)
+        self.andamento = self.criar_tarefa(self.sprint, "Configuração", "6", "em_execucao")
+        self.hoje = date.today()
+        self.lancar(self.concluida, self.hoje - timedelta(days=1), 4)
+        self.lancar(self.concluida, self.hoje, 2, faturavel=False)
+        self.lancar(self.andamento, self.hoje, 3)
+
+    def test_horas_executadas_projeto(self):
+        """Soma apenas lançamentos faturáveis de tarefas concluídas e bilhetáveis"""
+        self.assertEqual(self.projeto.horas_executadas_projeto, Decimal("4.00"))
+
+    def test_gerar_snapshots(self):
+        """Gera o consolidado do projeto e a linha da sprint com os totais do dia"""
+        total = BurndownService.gerar_snapshots(self.hoje)
+        self.assertEqual(total, 2)
+
+        consolidado = SnapshotHorasProjeto.objects.get(projeto=self.projeto, sprint__isnull=True)
+        self.assertEqual(consolidado.horas_planejadas, Decimal("16.00"))
+        self.assertEqual(consolidado.horas_consumidas, Decimal("9.00"))
+        self.assertEqual(consolidado.horas_restantes, Decimal("7.00"))
+        self.assertEqual(consolidado.horas_faturaveis, Decimal("4.00"))
+        self.assertEqual(consolidado.total_tarefas, 2)
+        self.assertEqual(consolidado.tarefas_concluidas, 1)
+
+        # Regerar o mesmo dia substitui os snapshots
+        BurndownService.gerar_snapshots(self.hoje)
+        self.assertEqual(SnapshotHorasProjeto.objects.filter(data=self.hoje).count(), 2)
+
+    def test_backfill_serie_e_velocidade(self):
+        """O comando gera o período e alimenta as séries e a velocidade"""
+        ontem = self.hoje - timedelta(days=1)
+        call_command(
+            "gerar_snapshots_projetos",
+            desde=ontem.isoformat(),
+            data=self.hoje.isoformat(),
+            stdout=open("/dev/null", "w"),
+        )
+
+        serie = BurndownService.serie_burndown(self.projeto)
+        self.assertEqual(serie["consumidas"], [4.0, 9.0])
+        self.assertEqual(len(serie["ideal"]), 2)
+
+        velocidade = BurndownService.velocidade(self.projeto)
+        self.assertEqual(len(velocidade["sprints"]), 1)
+        self.assertEqual(velocidade["media_horas"], Decimal("9.00"))
+
+        resumo = BurndownService.resumo_projeto(self.projeto)
+        self.assertEqual(resumo["data"], self.hoje)
+        self.assertEqual(resumo["horas_faturaveis"], Decimal("4.00"))
+
+
+class SprintProgressoQueryTestCase(ProjetoTestMixin, TestCase):
+    """Progresso das sprints anotado em uma única consulta"""
+
+    def setUp(self):
+        self.criar_estrutura()
+        self.criar_sprints(50)
+        self.user = User.objects.create_superuser("admin", "admin@teste.com", "senha")
+
+    def criar_sprints(self, quantidade):
+        inicio = timezone.make_aware(datetime(2024, 2, 1, 9, 0))
+        existentes = self.projeto.sprints.count()
+        sprints = Sprint.objects.bulk_create([
+            Sprint(
+                projeto=self.projeto,
+                nome=f"Sprint {existentes + i + 1}",
+                status="finalizada",
+                data_inicio=date(2024, 2, 1),
+                data_fim=date(2024, 2, 15),
+            )
+            for i in range(quantidade)
+        ])
+        tarefas = []
+        for sprint in sprints:
+            for titulo, papel, status, horas in (
+                ("Desenvolvimento", "consultor", "finalizada", "8"),
+                ("Testes", "consultor", "em_execucao", "4"),
+                ("Gestão do projeto", "gestao", "nao_iniciada", "3"),
+            ):
+                tarefas.append(Tarefa(
+                    projeto=self.projeto,
+                    sprint=sprint,
+                    titulo=titulo,
+                    papel=papel,
+                    descricao=titulo,
+                    status_sprint=status,
+                    horas_planejadas=Decimal(horas),
+                    horas_consumidas=Decimal("1"),
+                    data_inicio_prevista=inicio,
+                    data_termino_prevista=inicio,
+                ))
+        Tarefa.objects.bulk_create(tarefas)
+
+    def test_com_progresso_uma_consulta(self):
+        """Contagens, percentual e horas de 50 sprints em uma consulta"""
+        with self.assertNumQueries(1):
+            sprints = list(self.projeto.sprints.com_progresso())
+            for sprint in sprints:
+                self.assertEqual(sprint.total_tarefas, 3)
+                self.assertEqual(sprint.tarefas_concluidas, 1)
+                self.assertAlmostEqual(sprint.percentual_conclusao, 100 / 3, places=2)
+                self.assertEqual(sprint.soma_horas_planejadas, Decimal("15"))
+                self.assertEqual(sprint.soma_horas_consumidas, Decimal("3"))
+                self.assertEqual(sprint.soma_horas_gestao, Decimal("3"))
+                self.assertEqual(sprint.soma_horas_consultor, Decimal("12"))
+        self.assertEqual(len(sprints), 50)
+
+    def _consultas(self, url):
+
+        with CaptureQueriesContext(connection) as contexto:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(contexto.captured_queries)
+
+    # Mede a renderização completa: sem o cache de fragmentos (as sprints extras vêm de bulk_create, sem signals)
+    @override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}})
+    def test_views_nao_escalam_com_numero_de_sprints(self):
+        """projeto_detail e projeto_list mantêm o número de consultas ao adicionar sprints"""
+
+        self.client.force_login(self.user)
+        detalhe = reverse("projeto_detail", args=[self.projeto.pk])
+        listagem = reverse("projeto_list")
+
+        consultas_detalhe = self._consultas(detalhe)
+        consultas_listagem = self._consultas(listagem)
+        self.assertLessEqual(consultas_detalhe, 25)
+        self.assertLessEqual(consultas_listagem, 10)
+
+        self.criar_sprints(10)
+        self.assertEqual(self._consultas(detalhe), consultas_detalhe)
+        self.assertEqual(self._consultas(listagem), consultas_listagem)
+
+
+class MaterializacaoProjetoTestCase(ProjetoTestMixin, TestCase):
+    """Criação em lote de OS, sprints e tarefas a partir do plano aprovado"""
+
+    def setUp(self):
+        self.criar_estrutura()
+        ItemFornecedor.objects.create(
+            fornecedor="Red Hat", tipo="servico", sku="RH-CONS", descricao="Consultor",
+            unidade="Horas", valor_unitario=Decimal("50.00"),
+        )
+        # Numeração deve continuar a partir da maior OS do ano
+        OrdemServico.objects.create(
+            cliente=self.cliente, contrato=self.contrato, item_contrato=self.item,
+            quantidade=Decimal("1"), data_inicio=date(2025, 1, 6),
+        )
+        OrdemServico.objects.filter(numero_os="0001/2025").update(numero_os="0007/2025")
+        self.plano = PlanoTrabalho.objects.create(
+            projeto=self.projeto,
+            resumo_contrato="Plano",
+            data_inicio_prevista=date(2025, 1, 6),
+            data_fim_prevista=date(2025, 12, 31),
+        )
+
+    def test_materializar_plano_por_itens(self):
+        """4 fases x 10 itens gravados com número fixo de consultas"""
+
+        ItemContrato.objects.bulk_create([
+            ItemContrato(
+                contrato=self.contrato, lote=2, numero_item=str(i), descricao=f"Solução {i}",
+                tipo="solucao", unidade="Unidade", quantidade=Decimal("1"), valor_unitario=Decimal("100"),
+            )
+            for i in range(10)
+        ])
+
+        with CaptureQueriesContext(connection) as contexto:
+            ContractAIService.criar_projeto_sprints_tarefas(self.plano, None)
+        self.assertLessEqual(len(contexto.captured_queries), 20)
+
+        sprints = self.projeto.sprints.select_related("ordem_servico")
+        self.assertEqual(sprints.count(), 40)
+        self.assertEqual(Tarefa.objects.filter(projeto=self.projeto).count(), 140)
+        numeros = [sprint.ordem_servico.numero_os for sprint in sprints]
+        self.assertEqual(len(set(numeros)), 40)
+        self.assertEqual(min(n for n in numeros if n.endswith("/2025")), "0008/2025")
+        self.assertTrue(all(sprint.ordem_servico.projeto_id == self.projeto.pk for sprint in sprints))
+
+        primeira = sprints.order_by("data_inicio", "pk").first()
+        tarefa = primeira.tarefas.get(titulo="Planejamento Técnico")
+        self.assertEqual(tarefa.horas_planejadas, Decimal("24.00"))
+        self.assertEqual(tarefa.status_sprint, "nao_iniciada")
+        # Agendada após "Análise de Requisitos" (16h = 2 dias úteis) e com 24h úteis
+        inicio = timezone.localtime(tarefa.data_inicio_prevista)
+        termino = timezone.localtime(tarefa.data_termino_prevista)
+        self.assertEqual((inicio.date(), inicio.hour), (date(2025, 1, 7), 19))
+        self.assertEqual((termino.date(), termino.hour), (date(2025, 1, 10), 19))
+
+        # Reaprovar não duplica as sprints
+        ContractAIService.criar_projeto_sprints_tarefas(self.plano, None)
+        self.assertEqual(self.projeto.sprints.count(), 40)
+
+    def test_materializar_processo_execucao_com_gestao(self):
+        """Etapas do processo_execucao; a tarefa de gestão recebe 25% das horas do consultor"""
+        self.plano.processo_execucao = [
+            {"nome": "Etapa 1", "data_inicio": "2025-01-06", "tarefas": [
+                {"titulo": "Configuração", "horas_planejadas": 16, "responsavel": "consultor"},
+                {"titulo": "Testes", "horas_planejadas": 4},
+                {"titulo": "Gestão do projeto"},
+            ]},
+            {"nome": "Etapa 2", "duracao_semanas": 1, "tarefas": []},
+        ]
+        self.plano.save()
+
+        ContractAIService.criar_projeto_sprints_tarefas(self.plano, None)
+
+        self.assertEqual(list(self.projeto.sprints.order_by("data_inicio").values_list("nome", flat=True)),
+                         ["Etapa 1", "Etapa 2"])
+        tarefas = {t.titulo: t for t in Tarefa.objects.filter(sprint__nome="Etapa 1")}
+        self.assertEqual(tarefas["Configuração"].responsavel, self.colaborador)
+        self.assertEqual(tarefas["Testes"].horas_planejadas, Decimal("8.00"))
+        self.assertEqual(tarefas["Gestão do projeto"].horas_planejadas, Decimal("6.00"))
+
+
+class SincronizacaoPlanoTestCase(ProjetoTestMixin, TestCase):
+    """Sincronização incremental do projeto com o processo_execucao do plano"""
+
+    def setUp(self):
+        self.criar_estrutura()
+        ItemFornecedor.objects.create(
+            fornecedor="Red Hat", tipo="servico", sku="RH-CONS", descricao="Consultor",
+            unidade="Horas", valor_unitario=Decimal("50.00"),
+        )
+        self.plano = PlanoTrabalho.objects.create(
+            projeto=self.projeto,
+            resumo_contrato="Plano",
+            data_inicio_prevista=date(2025, 1, 6),
+            data_fim_prevista=date(2025, 12, 31),
+            processo_execucao=[
+                {"nome": "Etapa 1", "data_inicio": "2025-01-06", "tarefas": [
+                    {"titulo": "Configuração", "horas_planejadas": 16},
+                    {"titulo": "Testes", "horas_planejadas": 8},
+                    {"titulo": "Gestão do projeto"},
+                ]},
+                {"nome": "Etapa 2", "duracao_semanas": 1, "tarefas": [{"titulo": "Homologação"}]},
+            ],
+        )
+        ContractAIService.criar_projeto_sprints_tarefas(self.plano, None)
+
+    def alterar_plano(self):
+        etapa = self.plano.processo_execucao[0]
+        etapa["tarefas"] = [
+            {"titulo": "Configuração", "horas_planejadas": 24},
+            {"titulo": "Documentação", "horas_planejadas": 8},
+            {"titulo": "Gestão do projeto"},
+        ]
+        self.plano.processo_execucao.append({"nome": "Etapa 3", "tarefas": [{"titulo": "Suporte"}]})
+        self.plano.save()
+
+        # Edições feitas no projeto: descrição da Etapa 2 e prioridade da tarefa de gestão
+        Sprint.objects.filter(projeto=self.projeto, nome="Etapa 2").update(descricao="Ajustada pelo gerente")
+        Tarefa.objects.filter(titulo="Gestão do projeto").update(prioridade="alta")
+
+    def test_diff_e_aplicacao_minima(self):
+        """Aplica só o necessário, preserva edições locais e só sobrescreve conflitos quando pedido"""
+        self.assertFalse(SincronizacaoPlanoService.tem_alteracoes(SincronizacaoPlanoService.calcular_diff(self.plano)))
+        self.alterar_plano()
+
+        diff = SincronizacaoPlanoService.calcular_diff(self.plano)
+        self.assertEqual(
+            {entidade: {acao: n for acao, n in resumo.items() if n} for entidade, resumo in diff["resumo"].items()},
+            {
+                "sprint": {"criar": 1, "local": 1},
+                # Documentação e Suporte; a gestão passa a 8h (25% de 32h) mas foi editada no projeto
+                "tarefa": {"criar": 2, "atualizar": 1, "conflito": 1, "remover": 1},
+            },
+        )
+        configuracao = next(item for item in diff["itens"] if item["nome"] == "Configuração")
+        self.assertEqual(configuracao["campos"], ["horas_planejadas"])
+
+        ids_intocados = set(Tarefa.objects.filter(titulo="Homologação").values_list("pk", "atualizado_em"))
+        with self.assertNumQueries(18):
+            resultado = SincronizacaoPlanoService.aplicar_diff(diff)
+        self.assertEqual(
+            resultado,
+            {"sprints_criadas": 1, "tarefas_criadas": 2, "sprints_atualizadas": 0, "tarefas_atualizadas": 1,
+             "sprints_removidas": 0, "tarefas_removidas": 1},
+        )
+
+        tarefas = {t.titulo: t for t in Tarefa.objects.filter(projeto=self.projeto)}
+        self.assertNotIn("Testes", tarefas)
+        self.assertEqual(tarefas["Configuração"].horas_planejadas, Decimal("24.00"))
+        self.assertEqual(tarefas["Documentação"].sprint.nome, "Etapa 1")
+        self.assertEqual(tarefas["Suporte"].sprint.nome, "Etapa 3")
+        self.assertEqual((tarefas["Gestão do projeto"].prioridade, tarefas["Gestão do projeto"].horas_planejadas),
+                         ("alta", Decimal("6.00")))
+        self.assertEqual(self.projeto.sprints.get(nome="Etapa 2").descricao, "Ajustada pelo gerente")
+        self.assertEqual(set(Tarefa.objects.filter(titulo="Homologação").values_list("pk", "atualizado_em")),
+                         ids_intocados)
+
+        # Resta apenas o conflito, aplicado quando solicitado
+        diff = SincronizacaoPlanoService.calcular_diff(self.plano)
+        self.assertEqual(sorted(item["acao"] for item in diff["itens"]), ["conflito", "local"])
+        SincronizacaoPlanoService.aplicar_diff(diff, sobrescrever_conflitos=True)
+        gestao = Tarefa.objects.get(titulo="Gestão do projeto")
+        self.assertEqual((gestao.prioridade, gestao.horas_planejadas), ("media", Decimal("8.00")))
+        self.assertFalse(SincronizacaoPlanoService.tem_alteracoes(SincronizacaoPlanoService.calcular_diff(self.plano)))
+
+    def test_view_revisao_antes_de_aplicar(self):
+        """O GET apenas exibe o diff; o POST aplica"""
+        user = User.objects.create_superuser("admin", "admin@teste.com", "senha")
+        self.client.force_login(user)
+        self.alterar_plano()
+        url = reverse("plano_trabalho_sincronizar", args=[self.plano.pk])
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Documentação")
+        self.assertTrue(Tarefa.objects.filter(titulo="Testes").exists())
+
+        response = self.client.post(url)
+        self.assertRedirects(response, reverse("plano_trabalho_detail", args=[self.plano.pk]),
+                             fetch_redirect_response=False)
+        self.assertFalse(Tarefa.objects.filter(titulo="Testes").exists())
+        self.assertTrue(self.projeto.sprints.filter(nome="Etapa 3").exists())
+
+
+class FragmentosProjetoTestCase(ProjetoTestMixin, TestCase):
+    """Canvas, tarefas e sprints do projeto em cache pela versão do projeto"""
+
+    def setUp(self):
+        self.criar_estrutura()
+        self.sprint = self.criar_sprint("Sprint 1")
+        self.criar_tarefa(self.sprint, "Modelagem", "8")
+        self.client.force_login(User.objects.create_superuser("admin", "admin@teste.com", "senha"))
+
+    def _get(self, url):
+        with CaptureQueriesContext(connection) as contexto:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response, len(contexto.captured_queries)
+
+    def test_fragmentos_ate_alteracao(self):
+        CacheVersaoService.zerar_estatisticas()
+        for url in (
+            reverse("projeto_detail", args=[self.projeto.pk]),
+            reverse("sprint_detail", args=[self.projeto.pk, self.sprint.pk]),
+        ):
+            response, consultas_falha = self._get(url)
+            self.assertContains(response, "Modelagem")
+            response, consultas_acerto = self._get(url)
+            self.assertContains(response, "Modelagem")
+            self.assertLess(consultas_acerto, consultas_falha)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.criar_tarefa(self.sprint, "Homologação", "4")
+        response, _ = self._get(reverse("projeto_detail", args=[self.projeto.pk]))
+        self.assertContains(response, "Homologação")
+
+        estatisticas = {linha["grupo"]: linha for linha in CacheVersaoService.estatisticas()}
+        self.assertEqual(estatisticas["fragmento:projeto_canvas"]["acertos"], 1)
+        self.assertEqual(estatisticas["fragmento:projeto_canvas"]["falhas"], 2)
+        self.assertEqual(estatisticas["fragmento:sprint_kanban"]["taxa"], 50.0)
+
+
+class TotaisHorasSprintTestCase(ProjetoTestMixin, TestCase):
+    """Papel da tarefa e totais de horas da sprint mantidos de forma incremental"""
+
+    def setUp(self):
+        self.criar_estrutura()
+        self.user = User.objects.create_superuser("admin", "admin@teste.com", "senha")
+        self.client.force_login(self.user)
+        self.backlog = Backlog.objects.create(contrato=self.contrato, titulo="Backlog", status="pendente")
+        Projeto.objects.filter(pk=self.projeto.pk).update(backlog_origem=self.backlog)
+        self.sprint = self.criar_sprint("Sprint 1")
+
+    def totais(self):
+        return Sprint.objects.values_list("horas_consultor_planejadas", "horas_gestao_planejadas").get(
+            pk=self.sprint.pk
+        )
+
+    def do_backlog(self, titulo):
+        return self.criar_tarefa(None, titulo, "8", status_sprint=None, backlog=self.backlog)
+
+    def mover(self, tarefa):
+        url = reverse("tarefa_mover_sprint", args=[self.projeto.pk, self.sprint.pk, tarefa.pk])
+        with CaptureQueriesContext(connection) as contexto:
+            self.client.post(url)
+        return len(contexto.captured_queries)
+
+    def test_mover_tarefa_consultas_fixas(self):
+        """Mover para a sprint não soma as tarefas: mesmo número de consultas com 2 ou 30 tarefas"""
+        self.mover(self.do_backlog("Tarefa 1"))  # cria a tarefa de gestão
+        gestao = Tarefa.objects.get(sprint=self.sprint, papel="gestao")
+        self.assertEqual(gestao.horas_planejadas, Decimal("2.00"))
+        self.assertEqual(self.totais(), (Decimal("8.00"), Decimal("2.00")))
+
+        poucas = self.mover(self.do_backlog("Tarefa 2"))
+        for i in range(28):
+            self.criar_tarefa(self.sprint, f"Extra {i}", "1")
+        muitas = self.mover(self.do_backlog("Tarefa 3"))
+        self.assertEqual(poucas, muitas)
+
+        # 3 x 8h + 28 x 1h de consultor; gestão com 25%
+        self.assertEqual(self.totais(), (Decimal("52.00"), Decimal("13.00")))
+        self.assertEqual(Tarefa.objects.get(pk=gestao.pk).horas_planejadas, Decimal("13.00"))
+
+    def test_totais_em_edicao_e_remocao(self):
+        """save e delete aplicam só a diferença; o resultado confere com o recálculo completo"""
+        tarefa = self.criar_tarefa(self.sprint, "Configuração", "10")
+        tarefa.horas_planejadas = Decimal("12.00")
+        tarefa.save()
+        self.assertEqual(self.totais(), (Decimal("12.00"), Decimal("0.00")))
+
+        tarefa.papel = "gestao"
+        tarefa.save()
+        self.assertEqual(self.totais(), (Decimal("0.00"), Decimal("0.00")))
+
+        outra = self.criar_tarefa(self.sprint, "Testes", "6")
+        outra.delete()
+        Sprint.objects.filter(pk=self.sprint.pk).update(horas_consultor_planejadas=Decimal("99"))
+        Sprint.objects.filter(pk=self.sprint.pk).recalcular_horas()
+        self.assertEqual(self.totais(), (Decimal("0.00"), Decimal("0.00")))
+
+
+    def test_editar_tarefa_para_outra_sprint(self):
+        """A edição que troca a sprint recalcula a gestão da sprint de origem e da de destino"""
+        self.mover(self.do_backlog("Gestão 1"))
+        destino = self.criar_sprint("Sprint 2")
+        self.criar_tarefa(destino, "Gestão 2", "0", papel="gestao")
+        tarefa = self.criar_tarefa(self.sprint, "Migração", "4")
+        self.sprint.atualizar_horas_gestao()
+        self.assertEqual(self.totais(), (Decimal("12.00"), Decimal("3.00")))
+
+        formulario = TarefaForm(instance=tarefa, projeto_id=self.projeto.pk)
+        dados = {nome: formulario[nome].value() for nome in formulario.fields}
+        dados = {nome: valor for nome, valor in dados.items() if valor is not None}
+        dados["sprint"] = destino.pk
+        url = reverse("tarefa_projeto_update", args=[self.projeto.pk, tarefa.pk])
+        response = self.client.post(url, dados)
+        self.assertRedirects(
+            response, reverse("sprint_detail", args=[self.projeto.pk, destino.pk]), fetch_redirect_response=False
+        )
+
+        horas = Tarefa.objects.get(pk=tarefa.pk).horas_planejadas
+        gestao = (horas * Tarefa.PERCENTUAL_GESTAO).quantize(Decimal("0.01"))
+        self.assertEqual(self.totais(), (Decimal("8.00"), Decimal("2.00")))
+        self.assertEqual(
+            Sprint.objects.values_list("horas_consultor_planejadas", "horas_gestao_planejadas").get(pk=destino.pk),
+            (horas, gestao),
+        )
+        self.assertEqual(Tarefa.objects.get(sprint=destino, papel="gestao").horas_planejadas, gestao)
+
+
+class OrcamentoHorasTestCase(ProjetoTestMixin, TestCase):
+    """Orçamento de horas de consultor da OS validado com uma consulta agregada"""
+
+    def setUp(self):
+        self.criar_estrutura()
+        self.sprint = self.criar_sprint("Sprint 1")
+        OrdemServico.objects.filter(pk=self.sprint.ordem_servico_id).update(horas_consultor=Decimal("40"))
+
+    def test_validar_com_consulta_unica(self):
+        """A validação não depende do número de tarefas da sprint"""
+        for i in range(20):
+            self.criar_tarefa(self.sprint, f"Tarefa {i}", "1.5")
+        tarefa = self.criar_tarefa(self.sprint, "Ajuste", "5")
+        tarefa.sprint = self.sprint  # sprint em memória: sem consulta para achar a OS
+
+        with self.assertNumQueries(1):
+            self.assertEqual(OrcamentoHorasService.validar([tarefa]), [])
+
+        tarefa.horas_planejadas = Decimal("12.00")
+        with self.assertNumQueries(1):
+            violacoes = OrcamentoHorasService.validar([tarefa])
+        self.assertEqual(len(violacoes), 1)
+        self.assertEqual(violacoes[0]["horas_outras"], Decimal("30.00"))
+        self.assertEqual(violacoes[0]["excedente"], Decimal("2.00"))
+        with self.assertRaises(ValidationError):
+            tarefa.full_clean()
+
+        # Tarefas de gestão e OS sem horas de consultor não entram no orçamento
+        tarefa.papel = "gestao"
+        self.assertEqual(OrcamentoHorasService.validar([tarefa]), [])
+        tarefa.papel = "consultor"
+        OrdemServico.objects.filter(pk=self.sprint.ordem_servico_id).update(horas_consultor=None)
+        self.assertEqual(OrcamentoHorasService.validar([tarefa]), [])
+
+
+class CapacidadeTestCase(ProjetoTestMixin, TestCase):
+    """Sobreposições e utilização semanal dos colaboradores"""
+
+    def setUp(self):
+        self.criar_estrutura()
+
+    def tarefa(self, titulo, inicio, termino, **kwargs):
+        return Tarefa.objects.create(
+            projeto=self.projeto,
+            titulo=titulo,
+            descricao=titulo,
+            responsavel=self.colaborador,
+            data_inicio_prevista=timezone.make_aware(inicio),
+            data_termino_prevista=timezone.make_aware(termino),
+            **kwargs,
+        )
+
+    def test_sobreposicoes_e_sobrecarga(self):
+        # Semana de 05/02/2024: 24h + 8h sobrepostas + 16h = 48h; a última tarefa avança 1 dia na semana seguinte
+        self.tarefa("Levantamento", datetime(2024, 2, 5, 9), datetime(2024, 2, 7, 19))
+        self.tarefa("Reunião", datetime(2024, 2, 6, 9), datetime(2024, 2, 6, 19))
+        self.tarefa("Implantação", datetime(2024, 2, 8, 9), datetime(2024, 2, 12, 19))
+        self.tarefa("Concluída", datetime(2024, 2, 5, 9), datetime(2024, 2, 9, 19), status="concluida")
+
+        with self.assertNumQueries(2):
+            mapa = CapacidadeService.mapa_calor(date(2024, 2, 7), 2)
+        self.assertEqual(mapa["semanas"], [date(2024, 2, 5), date(2024, 2, 12)])
+        self.assertEqual(mapa["total_sobreposicoes"], 1)
+        linha = mapa["linhas"][0]
+        self.assertEqual(
+            {(c["tarefa"]["titulo"], c["conflito"]["titulo"]) for c in linha["sobreposicoes"]},
+            {("Levantamento", "Reunião")},
+        )
+        self.assertEqual([c["horas"] for c in linha["celulas"]], [Decimal("48.00"), Decimal("8.00")])
+        self.assertEqual(linha["celulas"][0]["nivel"], "sobrecarga")
+
+        inicio = timezone.make_aware(datetime(2024, 2, 7, 9))
+        alocacao = CapacidadeService.verificar_alocacao(
+            self.colaborador.pk, inicio, inicio + timedelta(hours=10), horas=Decimal("8")
+        )
+        self.assertTrue(alocacao["alerta"])
+        self.assertEqual([t["titulo"] for t in alocacao["sobreposicoes"]], ["Levantamento"])
+        self.assertEqual(alocacao["semanas"][0]["excedente"], Decimal("16.00"))
+
+        livre = timezone.make_aware(datetime(2024, 2, 19, 9))
+        self.assertFalse(
+            CapacidadeService.verificar_alocacao(self.colaborador.pk, livre, livre + timedelta(hours=10))["alerta"]
+        )
+
+    def test_mapa_e_api(self):
+        self.tarefa("Levantamento", datetime(2024, 2, 5, 9), datetime(2024, 2, 7, 19))
+        self.client.force_login(User.objects.create_superuser("admin", "admin@teste.com", "senha"))
+
+        response = self.client.get(reverse("capacidade_equipe"), {"inicio": "2024-02-05", "semanas": 4})
+        self.assertContains(response, "Consultor Teste")
+
+        response = self.client.get(reverse("api_capacidade_colaborador"), {
+            "responsavel_id": self.colaborador.pk,
+            "data_inicio": "06/02/2024, 09:00",
+            "data_termino": "06/02/2024, 19:00",
+        })
+        self.assertTrue(response.json()["alerta"])
+        self.assertEqual(response.json()["sobreposicoes"][0]["titulo"], "Levantamento")
+
+
+class AuditoriaTimesheetTestCase(ProjetoTestMixin, TestCase):
+    """Verificações vetorizadas dos lançamentos de horas"""
+
+    def setUp(self):
+        self.criar_estrutura()
+        self.sprint = self.criar_sprint("Sprint 1")
+        self.tarefa = self.criar_tarefa(self.sprint, "Desenvolvimento", "40")
+
+    def lancamento(self, dia, inicio, termino, salvar=True, **kwargs):
+        lancamento = LancamentoHora(
+            tarefa=self.tarefa, colaborador=self.colaborador, data=dia,
+            hora_inicio=time(*inicio), hora_termino=time(*termino), **kwargs,
+        )
+        if salvar:
+            lancamento.save()
+        return lancamento
+
+    def tipos(self, ocorrencias):
+        return {(o["data"], o["hora_inicio"], o["tipo"]) for o in ocorrencias}
+
+    def test_relatorio(self):
+        segunda = date(2024, 2, 5)
+        self.lancamento(segunda, (9, 0), (12, 0))
+        self.lancamento(segunda, (11, 0), (13, 0))
+        self.lancamento(segunda, (14, 0), (20, 0))
+        self.lancamento(segunda + timedelta(days=1), (22, 0), (2, 0))
+        self.lancamento(segunda + timedelta(days=5), (9, 0), (10, 0))
+        self.lancamento(segunda + timedelta(days=5), (10, 0), (11, 0), faturavel=False)
+
+        with self.assertNumQueries(1):
+            auditoria = AuditoriaTimesheetService.relatorio(segunda, segunda + timedelta(days=6))
+        self.assertEqual(self.tipos(auditoria["ocorrencias"]), {
+            (segunda, time(9, 0), "sobreposicao"),
+            (segunda, time(11, 0), "sobreposicao"),
+            (segunda, time(9, 0), "limite_diario"),
+            (segunda, time(11, 0), "limite_diario"),
+            (segunda, time(14, 0), "limite_diario"),
+            (segunda, time(14, 0), "fora_expediente"),
+            (segunda + timedelta(days=1), time(22, 0), "virada_dia"),
+            (segunda + timedelta(days=1), time(22, 0), "fora_expediente"),
+            (segunda + timedelta(days=5), time(9, 0), "fim_semana"),
+        })
+        self.assertEqual(auditoria["total_lancamentos"], 6)
+
+    def test_verificar_lote(self):
+        """Novos lançamentos são checados contra os gravados; OS encerrada bloqueia"""
+        dia = date(2024, 2, 6)
+        self.lancamento(dia, (9, 0), (12, 0))
+        novos = [self.lancamento(dia, (10, 0), (11, 0), salvar=False), self.lancamento(dia, (14, 0), (15, 0), salvar=False)]
+        ocorrencias = AuditoriaTimesheetService.verificar_lote(novos)
+        self.assertEqual([(o["indice"], o["tipo"], o["bloqueante"]) for o in ocorrencias], [(0, "sobreposicao", True)])
+
+        OrdemServico.objects.filter(pk=self.sprint.ordem_servico_id).update(status="finalizada")
+        ocorrencias = AuditoriaTimesheetService.verificar_lote(novos[1:])
+        self.assertEqual([o["tipo"] for o in ocorrencias], ["os_encerrada"])
+
+    def test_importacao_nao_passa_da_meia_noite(self):
+        """Linhas empilhadas após o último lançamento do dia não ultrapassam 24:00"""
+        from openpyxl import Workbook
+
+        dia = date(2024, 2, 7)
+        self.lancamento(dia, (9, 0), (20, 0))
+        planilha = Workbook()
+        planilha.active.append(["Data", "Projeto", "Sprint", "Tarefa", "Descrição", "Tempo"])
+        for horas in (3, 2, 0.5):
+            planilha.active.append(["07/02/2024", "Projeto Teste", "", "Desenvolvimento", f"{horas}h", horas])
+        arquivo = io.BytesIO()
+        planilha.save(arquivo)
+
+        self.client.force_login(self.colaborador.user)
+        response = self.client.post(reverse("timesheet_importar"), {
+            "arquivo": SimpleUploadedFile("horas.xlsx", arquivo.getvalue()),
+        }, follow=True)
+        horarios = list(LancamentoHora.objects.filter(data=dia).order_by("hora_inicio").values_list(
+            "hora_inicio", "hora_termino"
+        ))
+        self.assertEqual(horarios, [(time(9, 0), time(20, 0)), (time(20, 0), time(23, 0)), (time(23, 0), time(23, 30))])
+        self.assertContains(response, "Linha 3: 2.00h a partir das 23:00 ultrapassam 24:00")
@@ -0,0 +1,222 @@
+"""
+Testes para o Relatório de Rentabilidade do Portfólio, a Previsão de Consumo e a
+Expiração de Licenças
+"""
+from decimal import Decimal
+from datetime import date
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+
+from .models import (
+    Cliente, Contrato, ItemContrato, ItemFornecedor, OrdemFornecimento, OrdemServico, PrevisaoConsumoItem,
+)
+from .services import ExpiracaoLicencaService, PrevisaoConsumoService, RelatorioRentabilidadeService
+
+
+class PortfolioTestMixin:
+    """Cliente, contrato, item de serviço e duas OS (fev/mar de 2024)"""
+
+    def setUp(self):
+        self.cliente = Cliente.objects.create(
+            nome_razao_social="Cliente Teste",
+            tipo_cliente="publico",
+            tipo_pessoa="juridica",
+            cnpj_cpf="11.111.111/0001-11",
+            endereco="Rua A",
+            numero="1",
+            bairro="Centro",
+            cidade="São Paulo",
+            estado="SP",
+            cep="01000-000",
+        )
+        self.contrato = Contrato.objects.create(
+            cliente=self.cliente,
+            numero_contrato="CT-REL-001",
+            vigencia=12,
+            data_assinatura=date(2024, 1, 1),
+        )
+        self.item = ItemContrato.objects.create(
+            contrato=self.contrato,
+            lote=1,
+            numero_item="1",
+            descricao="Serviço de consultoria",
+            tipo="servico",
+            unidade="Horas",
+            quantidade=Decimal("1000"),
+            valor_unitario=Decimal("200.00"),
+        )
+        self.consultor = ItemFornecedor.objects.create(
+            fornecedor="Red Hat",
+            tipo="servico",
+            sku="RH-CONS",
+            descricao="Consultor",
+            unidade="Horas",
+            valor_unitario=Decimal("50.00"),
+        )
+        self.gerente = ItemFornecedor.objects.create(
+            fornecedor="Red Hat",
+            tipo="servico",
+            sku="RH-GP",
+            descricao="Gerente",
+            unidade="Horas",
+            valor_unitario=Decimal("80.00"),
+        )
+        self.os_fev = self._criar_os(date(2024, 2, 5), Decimal("10"), Decimal("8"), Decimal("2"))
+        self.os_mar = self._criar_os(date(2024, 3, 5), Decimal("20"), Decimal("100"), Decimal("0"))
+
+    def _criar_os(self, data_inicio, quantidade, horas_consultor, horas_gerente):
+        return OrdemServico.objects.create(
+            cliente=self.cliente,
+            contrato=self.contrato,
+            item_contrato=self.item,
+            item_fornecedor_consultor=self.consultor,
+            item_fornecedor_gerente=self.gerente,
+            quantidade=quantidade,
+            data_inicio=data_inicio,
+            horas_consultor=horas_consultor,
+            horas_gerente=horas_gerente,
+        )
+
+
+class RelatorioRentabilidadeTestCase(PortfolioTestMixin, TestCase):
+    """Testes do cálculo vetorizado de rentabilidade"""
+
+    def test_margens_iguais_as_properties_da_os(self):
+        """Os valores vetorizados devem bater com as properties da OrdemServico"""
+        df = RelatorioRentabilidadeService.carregar_dataframe().set_index("id")
+
+        for os_item in OrdemServico.objects.all():
+            linha = df.loc[os_item.pk]
+            self.assertAlmostEqual(linha["receita"], float(os_item.receita_prevista), places=2)
+            self.assertAlmostEqual(linha["custo_total"], float(os_item.custo_total_os), places=2)
+            self.assertAlmostEqual(linha["margem"], float(os_item.margem_contribuicao), places=2)
+            self.assertAlmostEqual(linha["percentual_margem"], float(os_item.percentual_margem), places=2)
+            self.assertEqual(bool(linha["exequivel"]), os_item.is_exequivel)
+
+    def test_agregacao_por_mes_e_drill_down(self):
+        """Agregação por mês e filtro de drill-down por fornecedor/mês"""
+        df = RelatorioRentabilidadeService.carregar_dataframe()
+        por_mes = RelatorioRentabilidadeService.agregar(df, "mes")
+        self.assertEqual(list(por_mes["mes"]), ["2024-02", "2024-03"])
+        self.assertAlmostEqual(por_mes["receita"].sum(), 6000.0, places=2)
+
+        recorte = RelatorioRentabilidadeService.carregar_dataframe(
+            {"fornecedor": "RED HAT", "mes": "2024-03"}
+        )
+        self.assertEqual(list(recorte["numero_os"]), [self.os_mar.numero_os])
+
+    def test_view_e_exportacao(self):
+        """A view renderiza o relatório e exporta CSV/XLSX"""
+        user = User.objects.create_superuser("admin", "admin@teste.com", "senha")
+        self.client.force_login(user)
+        url = reverse("relatorio_rentabilidade")
+
+        response = self.client.get(url, {"dimensao": "cliente"})
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Cliente Teste")
+        self.assertContains(response, "dimensao=fornecedor")
+
+        response = self.client.get(url, {"detalhe": "os"})
+        self.assertContains(response, self.os_fev.numero_os)
+
+        # Id inválido é ignorado, sem erro
+        response = self.client.get(url, {"cliente": "abc", "contrato": "1x"})
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Cliente Teste")
+
+        response = self.client.get(url, {"dimensao": "fornecedor", "formato": "csv"})
+        self.assertEqual(response["Content-Type"], "text/csv; charset=utf-8")
+        self.assertIn("RED HAT", response.content.decode())
+
+        response = self.client.get(url, {"formato": "xlsx"})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.content.startswith(b"PK"))
+
+
+class PrevisaoConsumoTestCase(PortfolioTestMixin, TestCase):
+    """Ajuste vetorizado do ritmo de consumo e previsão de esgotamento"""
+
+    def test_previsao_por_item(self):
+        # Item de 1000h: 100h faturadas em fev e 100h em mar (~3,3h/dia) esgota antes de 01/01/2025
+        for os_item, faturamento in ((self.os_fev, date(2024, 2, 1)), (self.os_mar, date(2024, 3, 1))):
+            OrdemServico.objects.filter(pk=os_item.pk).update(
+                status="faturada", quantidade=Decimal("100"), data_faturamento=faturamento
+            )
+        pouco_uso = ItemContrato.objects.create(
+            contrato=self.contrato, lote=1, numero_item="2", descricao="Treinamento", tipo="treinamento",
+            unidade="Horas", quantidade=Decimal("500"), valor_unitario=Decimal("100.00"),
+        )
+        os_treinamento = self._criar_os(date(2024, 2, 1), Decimal("10"), Decimal("1"), Decimal("0"))
+        OrdemServico.objects.filter(pk=os_treinamento.pk).update(
+            item_contrato=pouco_uso, status="faturada", data_faturamento=date(2024, 2, 1)
+        )
+        sem_uso = ItemContrato.objects.create(
+            contrato=self.contrato, lote=1, numero_item="3", descricao="Suporte", tipo="servico",
+            unidade="Horas", quantidade=Decimal("10"), valor_unitario=Decimal("100.00"),
+        )
+
+        with self.assertNumQueries(3):
+            previsoes = {p["item_id"]: p for p in PrevisaoConsumoService.calcular(date(2024, 4, 1))}
+
+        principal = previsoes[self.item.pk]
+        self.assertEqual(principal["situacao"], "esgota_antes")
+        self.assertEqual(principal["saldo_quantidade"], Decimal("800.00"))
+        self.assertTrue(date(2024, 10, 1) < principal["data_esgotamento_prevista"] < date(2025, 1, 1))
+        self.assertEqual(previsoes[pouco_uso.pk]["situacao"], "subutilizado")
+        self.assertEqual(previsoes[sem_uso.pk]["situacao"], "sem_historico")
+
+        self.assertEqual(PrevisaoConsumoService.materializar(date(2024, 4, 1)), 3)
+        self.assertEqual(
+            [p.item_id for p in PrevisaoConsumoService.itens_criticos()], [self.item.pk]
+        )
+        self.assertEqual(PrevisaoConsumoItem.objects.get(item=sem_uso).data_esgotamento_prevista, None)
+
+        self.client.force_login(User.objects.create_superuser("admin", "admin@teste.com", "senha"))
+        response = self.client.get(reverse("relatorio_previsao_consumo"), {"situacao": "esgota_antes"})
+        self.assertContains(response, "Serviço de consultoria")
+
+
+class ExpiracaoLicencaTestCase(PortfolioTestMixin, TestCase):
+    """Data de expiração armazenada nas OFs, consultas por período e alertas"""
+
+    def test_expiracao_e_alertas(self):
+        licenca = ItemContrato.objects.create(
+            contrato=self.contrato, lote=1, numero_item="4", descricao="Subscrição", tipo="subscricao_software",
+            unidade="Licença", quantidade=Decimal("100"), valor_unitario=Decimal("1000.00"), vigencia_produto=12,
+        )
+
+        def criar_of(data_ativacao):
+            return OrdemFornecimento.objects.create(
+                cliente=self.cliente, contrato=self.contrato, item_contrato=licenca, quantidade=10,
+                valor_unitario=Decimal("0"), valor_total=Decimal("0"), status="faturada", data_ativacao=data_ativacao,
+            )
+
+        proxima = criar_of(date(2024, 1, 31))
+        distante = criar_of(date(2024, 6, 15))
+        self.assertEqual(proxima.data_expiracao, date(2025, 1, 31))
+        self.assertEqual(distante.data_expiracao, date(2025, 6, 15))
+
+        # A ativação que expira primeiro define a vigência restante do item
+        self.assertEqual(licenca.vigencia_restante(), max((2025 - date.today().year) * 12 + 1 - date.today().month, 0))
+
+        with self.assertNumQueries(1):
+            self.assertEqual(
+                [o.pk for o in ExpiracaoLicencaService.expirando(date(2025, 1, 1), date(2025, 12, 31))],
+                [proxima.pk, distante.pk],
+            )
+        alertas = ExpiracaoLicencaService.alertas(date(2025, 1, 10))
+        self.assertEqual([(a["ordem"].pk, a["dias_restantes"], a["faixa"]) for a in alertas], [(proxima.pk, 21, "30")])
+
+        # Backfill após mudança da vigência do item (update não passa pelo save)
+        ItemContrato.objects.filter(pk=licenca.pk).update(vigencia_produto=24)
+        self.assertEqual(ExpiracaoLicencaService.recalcular(), 2)
+        self.assertEqual(OrdemFornecimento.objects.get(pk=proxima.pk).data_expiracao, date(2026, 1, 31))
+        self.assertEqual(ExpiracaoLicencaService.recalcular(), 0)
+
+        self.client.force_login(User.objects.create_superuser("admin", "admin@teste.com", "senha"))
+        response = self.client.get(reverse("ordem_fornecimento_expiracoes"), {"ano": 2026, "mes": 1})
+        self.assertContains(response, proxima.numero_of)
+        response = self.client.get(reverse("api_expiracoes_licencas"), {"inicio": "2026-06-01", "fim": "2026-06-30"})
+        self.assertEqual([e["id"] for e in response.json()["expiracoes"]], [distante.pk])
@@ -0,0 +1,166 @@
+"""
+Testes para as medições de SLA (incidentes), a conformidade mensal e as glosas previstas
+"""
+import json
+from decimal import Decimal
+from datetime import date, datetime
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from .models import (
+    Cliente, ConformidadeSLA, Contrato, GlosaPrevista, IncidenteSLA, ItemContrato, OrdemFornecimento,
+    QuadroPenalizacao, SLAImportante,
+)
+from .services import ConformidadeSLAService, GlosaService
+
+
+def local(*args):
+    return timezone.make_aware(datetime(*args))
+
+
+class SLATestMixin:
+    """Cria cliente, contrato, SLA importante e usuário gestor"""
+
+    def criar_estrutura(self):
+        cliente = Cliente.objects.create(
+            nome_razao_social="Órgão SLA",
+            tipo_cliente="publico",
+            tipo_pessoa="juridica",
+            cnpj_cpf="33.333.333/0001-33",
+            endereco="Rua C",
+            numero="3",
+            bairro="Centro",
+            cidade="Brasília",
+            estado="DF",
+            cep="70000-000",
+        )
+        self.contrato = Contrato.objects.create(
+            cliente=cliente, numero_contrato="CT-SLA-001", vigencia=24, data_assinatura=date(2024, 1, 1),
+        )
+        self.sla = SLAImportante.objects.create(
+            contrato=self.contrato, nome="Suporte N2", descricao="Atendimento",
+            tempo_resposta_horas=4, tempo_solucao_horas=16,
+        )
+        self.usuario = User.objects.create_superuser("gestor", "gestor@teste.com", "x")
+
+
+class ConformidadeSLATestCase(SLATestMixin, TestCase):
+    """Horas úteis, violações, conformidade mensal e janelas móveis"""
+
+    def setUp(self):
+        self.criar_estrutura()
+
+    def test_importacao_e_conformidade(self):
+        self.client.force_login(self.usuario)
+        incidentes = [
+            # Sexta 17h -> segunda 10h: 2h + 1h; solução terça 11h: 2h + 8h + 2h
+            {"sla": "Suporte N2", "identificador": "INC-1", "aberto_em": "01/03/2024 17:00",
+             "respondido_em": "04/03/2024 10:00", "resolvido_em": "2024-03-05T11:00:00"},
+            # Resposta no limite (4h, com intervalo de almoço); solução em 24h úteis
+            {"sla": str(self.sla.pk), "identificador": "INC-2", "aberto_em": "04/03/2024 09:00",
+             "respondido_em": "04/03/2024 15:00", "resolvido_em": "07/03/2024 09:00"},
+            {"sla": "Suporte N2", "identificador": "INC-3", "aberto_em": "20/03/2024 09:00"},
+            {"sla": "Outro", "identificador": "INC-4", "aberto_em": "20/03/2024 09:00"},
+            "INC-5",
+        ]
+        resposta = self.client.post(
+            reverse("gestao_contratos_sla_incidentes_importar", args=[self.contrato.pk]),
+            data=json.dumps({"incidentes": incidentes}), content_type="application/json",
+        )
+        resultado = resposta.json()
+        self.assertEqual((resultado["criados"], resultado["atualizados"], len(resultado["erros"])), (3, 0, 2))
+
+        # Referência: INC-3 aberto há 3h úteis, ainda dentro das metas
+        ConformidadeSLAService.processar(agora=local(2024, 3, 20, 12, 0), completo=True)
+        horas = dict(IncidenteSLA.objects.values_list("identificador", "horas_resposta"))
+        self.assertEqual(horas, {"INC-1": Decimal("3.00"), "INC-2": Decimal("4.00"), "INC-3": None})
+        self.assertEqual(IncidenteSLA.objects.get(identificador="INC-1").horas_solucao, Decimal("12.00"))
+        mes = ConformidadeSLA.objects.get(sla=self.sla, mes=date(2024, 3, 1))
+        self.assertEqual((mes.total_incidentes, mes.incidentes_avaliados, mes.violacoes_solucao), (3, 2, 1))
+        self.assertEqual(mes.percentual_conformidade, Decimal("50.00"))
+
+        # Um dia útil depois o incidente em aberto estoura a resposta (11h > 4h)
+        resultado = ConformidadeSLAService.processar(agora=local(2024, 3, 21, 12, 0))
+        self.assertEqual((resultado["incidentes"], resultado["atualizados"]), (1, 1))
+        mes = ConformidadeSLA.objects.get(sla=self.sla, mes=date(2024, 3, 1))
+        self.assertEqual((mes.incidentes_avaliados, mes.violacoes_resposta), (3, 1))
+        self.assertEqual(mes.percentual_conformidade, Decimal("33.33"))
+
+        janelas = ConformidadeSLAService.conformidade_movel(date(2024, 3, 21))[self.contrato.pk]
+        self.assertEqual([(j["janela"], j["incidentes"], j["violacoes"]) for j in janelas], [(30, 3, 2), (90, 3, 2)])
+        self.assertEqual(janelas[0]["percentual"], 33.33)
+
+
+class GlosaTestCase(SLATestMixin, TestCase):
+    """Glosas da competência a partir do quadro de penalizações"""
+
+    def setUp(self):
+        self.criar_estrutura()
+
+    def criar_of(self, quantidade, **campos):
+        return OrdemFornecimento.objects.create(
+            cliente=self.contrato.cliente, contrato=self.contrato, item_contrato=self.item,
+            quantidade=quantidade, **campos,
+        )
+
+    def test_glosas_por_documento(self):
+        self.item = ItemContrato.objects.create(
+            contrato=self.contrato, lote=1, numero_item="1", descricao="Licença", tipo="licenca_software",
+            unidade="Licença", quantidade=Decimal("100"), valor_unitario=Decimal("1000.00"),
+        )
+        na_fila = self.criar_of(6, status=OrdemFornecimento.STATUS_FINALIZADA)
+        faturada_no_mes = self.criar_of(2, status="faturada", data_faturamento=date(2024, 3, 10))
+        self.criar_of(5, status="faturada", data_faturamento=date(2024, 2, 10))
+        QuadroPenalizacao.objects.create(
+            sla_importante=self.sla, descricao="Glosa por chamado", tipo="glosa",
+            percentual=Decimal("2.00"), condicao_aplicacao="Por chamado fora do prazo",
+        )
+        QuadroPenalizacao.objects.create(
+            sla_importante=self.sla, descricao="Multa fixa", tipo="multa",
+            valor_fixo=Decimal("400.00"), condicao_aplicacao="Por chamado fora do prazo",
+        )
+        for identificador, violou in (("A", True), ("B", True), ("C", False)):
+            IncidenteSLA.objects.create(
+                sla=self.sla, contrato=self.contrato, identificador=identificador,
+                aberto_em=local(2024, 3, 5, 10, 0), violou_solucao=violou,
+            )
+
+        resultado = GlosaService.processar(date(2024, 3, 15))
+        self.assertEqual((resultado["glosas"], resultado["documentos"]), (4, 2))
+        # 6000: 2% x 2 = 240 + fixo 800 x 75% = 600; 2000: 80 + 200
+        totais = GlosaService.por_documento(of_ids=[na_fila.pk, faturada_no_mes.pk])["of"]
+        self.assertEqual(totais, {na_fila.pk: Decimal("840.00"), faturada_no_mes.pk: Decimal("280.00")})
+        self.assertEqual(resultado["valor_total"], Decimal("1120.00"))
+
+        # Reprocessar regrava a competência; a glosa nunca passa do valor do documento
+        QuadroPenalizacao.objects.filter(tipo="multa").update(valor_fixo=Decimal("50000.00"))
+        GlosaService.processar(date(2024, 3, 1))
+        self.assertEqual(GlosaPrevista.objects.filter(competencia=date(2024, 3, 1)).count(), 4)
+        totais = GlosaService.por_documento(of_ids=[na_fila.pk, faturada_no_mes.pk])["of"]
+        self.assertEqual(totais, {na_fila.pk: Decimal("6000.00"), faturada_no_mes.pk: Decimal("2000.00")})
+
+    def test_documento_na_fila_em_duas_competencias(self):
+        self.item = ItemContrato.objects.create(
+            contrato=self.contrato, lote=1, numero_item="1", descricao="Licença", tipo="licenca_software",
+            unidade="Licença", quantidade=Decimal("100"), valor_unitario=Decimal("1000.00"),
+        )
+        na_fila = self.criar_of(1, status=OrdemFornecimento.STATUS_FINALIZADA)
+        QuadroPenalizacao.objects.create(
+            sla_importante=self.sla, descricao="Glosa por chamado", tipo="glosa",
+            percentual=Decimal("30.00"), condicao_aplicacao="Por chamado fora do prazo",
+        )
+        for identificador, mes in (("A", 3), ("B", 3), ("C", 4), ("D", 4)):
+            IncidenteSLA.objects.create(
+                sla=self.sla, contrato=self.contrato, identificador=identificador,
+                aberto_em=local(2024, mes, 5, 10, 0), violou_solucao=True,
+            )
+
+        # 600 em cada competência; a soma (1200) fica limitada ao valor da OF
+        GlosaService.processar(date(2024, 3, 1))
+        GlosaService.processar(date(2024, 4, 1))
+        self.assertEqual(GlosaPrevista.objects.filter(ordem_fornecimento=na_fila).count(), 2)
+        totais = GlosaService.por_documento(of_ids=[na_fila.pk])["of"]
+        self.assertEqual(totais, {na_fila.pk: Decimal("1000.00")})
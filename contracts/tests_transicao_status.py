@@ -0,0 +1,97 @@
+"""
+Testes para o job de transições de status por data (transicionar_status)
+"""
+from datetime import date
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from .models import Contrato, Evento, OrdemServico, Sprint, TransicaoStatus
+from .services import TransicaoStatusService
+from .tests_projetos import ProjetoTestMixin
+
+
+class TransicaoStatusTestCase(ProjetoTestMixin, TestCase):
+    """Transições em conjunto de contratos, sprints e OS"""
+
+    def setUp(self):
+        self.criar_estrutura()
+        self.hoje = date(2024, 6, 10)
+        self.passada = self.criar_sprint_periodo("Passada", date(2024, 5, 1), date(2024, 5, 15))
+        self.atual = self.criar_sprint_periodo("Atual", date(2024, 6, 1), date(2024, 6, 20))
+        self.futura = self.criar_sprint_periodo("Futura", date(2024, 7, 1), date(2024, 7, 15), status="execucao")
+        self.faturada = self.criar_sprint_periodo("Faturada", date(2024, 4, 1), date(2024, 4, 15), status="faturada")
+
+        # Contrato vencido que ainda consta como ativo (situacao só era recalculada no save)
+        Contrato.objects.filter(pk=self.contrato.pk).update(data_fim=date(2024, 6, 9), situacao="Ativo")
+
+    def criar_sprint_periodo(self, nome, inicio, fim, status="aberta"):
+        sprint = self.criar_sprint(nome, status=status)
+        Sprint.objects.filter(pk=sprint.pk).update(data_inicio=inicio, data_fim=fim)
+        OrdemServico.objects.filter(pk=sprint.ordem_servico_id).update(status=status, data_emissao_trd=None)
+        return sprint
+
+    def status(self, sprint):
+        return Sprint.objects.values_list("status", "ordem_servico__status").get(pk=sprint.pk)
+
+    def test_executar(self):
+        """Aplica as regras por data, sincroniza as OS e grava a auditoria"""
+        # Número fixo de consultas: por regra, a seleção dos candidatos e os UPDATEs em conjunto
+        with self.captureOnCommitCallbacks(execute=True), self.assertNumQueries(18):
+            resumo = TransicaoStatusService.executar(self.hoje)
+
+        self.assertEqual(resumo, {"contrato": 1, "sprint": 3, "ordem_servico": 3})
+        self.assertEqual(Contrato.objects.get(pk=self.contrato.pk).situacao, "Inativo")
+        self.assertEqual(self.status(self.passada), ("finalizada", "finalizada"))
+        self.assertEqual(self.status(self.atual), ("execucao", "execucao"))
+        self.assertEqual(self.status(self.futura), ("aberta", "aberta"))
+        self.assertEqual(self.status(self.faturada), ("faturada", "faturada"))
+        self.assertEqual(
+            OrdemServico.objects.get(pk=self.passada.ordem_servico_id).data_emissao_trd, self.hoje
+        )
+
+        auditoria = TransicaoStatus.objects.get(entidade="sprint", objeto_id=self.passada.pk)
+        self.assertEqual((auditoria.status_anterior, auditoria.status_novo), ("aberta", "finalizada"))
+        self.assertEqual(TransicaoStatus.objects.count(), 7)
+        # Fluxo de atividades: encerramento da sprint e toda mudança de status das OS
+        self.assertEqual(
+            set(Evento.objects.values_list("entidade", "objeto_id", "acao")),
+            {("sprint", self.passada.pk, "finalizada")} | {
+                ("ordem_servico", sprint.ordem_servico_id, sprint_status)
+                for sprint, sprint_status in ((self.passada, "finalizada"), (self.atual, "execucao"), (self.futura, "aberta"))
+            },
+        )
+
+        # Uma nova execução no mesmo dia não encontra transições pendentes
+        self.assertEqual(sum(TransicaoStatusService.executar(self.hoje).values()), 0)
+
+    def test_comando_dry_run(self):
+        """--dry-run calcula as transições sem gravar"""
+        call_command(
+            "transicionar_status", data=self.hoje.isoformat(), dry_run=True, stdout=open("/dev/null", "w")
+        )
+        self.assertEqual(self.status(self.passada), ("aberta", "aberta"))
+        self.assertFalse(TransicaoStatus.objects.exists())
+
+    def test_sprint_detail_somente_leitura(self):
+        """O GET de sprint_detail não grava mais o status"""
+        user = User.objects.create_superuser("admin", "admin@teste.com", "senha")
+        self.client.force_login(user)
+        url = reverse("sprint_detail", args=[self.projeto.pk, self.passada.pk])
+
+        with CaptureQueriesContext(connection) as contexto:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        # Sessão e tabela do DatabaseCache (fragmentos da página) não são dados do modelo
+        ignoradas = ("django_session", settings.CACHES["default"]["LOCATION"])
+        escritas = [
+            q["sql"] for q in contexto.captured_queries
+            if q["sql"].startswith(("UPDATE", "INSERT")) and not any(tabela in q["sql"] for tabela in ignoradas)
+        ]
+        self.assertEqual(escritas, [])
+        self.assertEqual(self.status(self.passada), ("aberta", "aberta"))
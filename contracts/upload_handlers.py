@@ -0,0 +1,29 @@
+"""
+Upload handlers do app contracts
+"""
+import hashlib
+
+from django.core.files.uploadhandler import TemporaryFileUploadHandler
+
+
+class SHA256UploadHandler(TemporaryFileUploadHandler):
+    """
+    Grava o upload em arquivo temporário calculando o SHA-256 de cada bloco recebido
+
+    Uma única passada, sem manter o arquivo em memória: o arquivo resultante
+    (TemporaryUploadedFile) traz o atributo sha256 e é movido para o
+    armazenamento por ArquivoConteudoService.armazenar.
+    """
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.sha256 = hashlib.sha256()
+
+    def receive_data_chunk(self, raw_data, start):
+        self.sha256.update(raw_data)
+        return super().receive_data_chunk(raw_data, start)
+
+    def file_complete(self, file_size):
+        arquivo = super().file_complete(file_size)
+        arquivo.sha256 = self.sha256.hexdigest()
+        return arquivo
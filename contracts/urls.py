@@ -10,6 +10,7 @@ urlpatterns = [
     # Cliente
     path("clientes/", views.cliente_list, name="cliente_list"),
     path("clientes/novo/", views.cliente_create, name="cliente_create"),
+    path("clientes/duplicados/", views.cliente_duplicados, name="cliente_duplicados"),
     path("clientes/<int:pk>/", views.cliente_detail, name="cliente_detail"),
     path("clientes/<int:pk>/editar/", views.cliente_update, name="cliente_update"),
     path("clientes/<int:pk>/excluir/", views.cliente_delete, name="cliente_delete"),
@@ -88,6 +89,11 @@ urlpatterns = [
         views.export_ordemfornecimento_csv,
         name="export_ordem_fornecimento_csv",
     ),
+    path(
+        "ordensfornecimento/expiracoes/",
+        views.ordemfornecimento_expiracoes,
+        name="ordem_fornecimento_expiracoes",
+    ),
     # Ordem de Serviço
     path("ordensservico/", views.ordemservico_list, name="ordem_servico_list"),
     path("ordensservico/novo/", views.ordemservico_create, name="ordem_servico_create"),
@@ -203,6 +209,7 @@ urlpatterns = [
     path("colaboradores/<int:pk>/", views.colaborador_detail, name="colaborador_detail"),
     path("colaboradores/<int:pk>/editar/", views.colaborador_update, name="colaborador_update"),
     path("colaboradores/<int:pk>/password/", views.colaborador_password_change, name="colaborador_password_change"),
+    path("colaboradores/capacidade/", views.capacidade_equipe, name="capacidade_equipe"),
     # Grupos
     path("grupos/", views.grupo_list, name="grupo_list"),
     path("grupos/novo/", views.grupo_create, name="grupo_create"),
@@ -216,8 +223,14 @@ urlpatterns = [
     path("slas/<int:pk>/editar/", views.sla_update, name="sla_update"),
     # Gestão de Contratos e OF - Fila de Faturamento
     path("fila-faturamento/", views.fila_faturamento, name="fila_faturamento"),
+    path("fila-faturamento/glosas/", views.fila_faturamento_glosas, name="fila_faturamento_glosas"),
+    path("fila-faturamento/glosas/recalcular/", views.fila_faturamento_glosas_recalcular, name="fila_faturamento_glosas_recalcular"),
     path("fila-faturamento/os/<int:pk>/marcar-faturada/", views.marcar_os_faturada, name="marcar_os_faturada"),
     path("fila-faturamento/of/<int:pk>/marcar-faturada/", views.marcar_of_faturada, name="marcar_of_faturada"),
+    path("fila-faturamento/faturar-selecionados/", views.faturar_selecionados, name="faturar_selecionados"),
+    # Relatórios
+    path("relatorios/rentabilidade/", views.relatorio_rentabilidade, name="relatorio_rentabilidade"),
+    path("relatorios/previsao-consumo/", views.relatorio_previsao_consumo, name="relatorio_previsao_consumo"),
     # Gestão de OS com Tarefas
     path("ordensservico/<int:os_id>/tarefas/novo/", views.tarefa_os_create, name="tarefa_os_create"),
     path("ordensservico/<int:os_id>/tarefas/<int:tarefa_id>/editar/", views.tarefa_os_update, name="tarefa_os_update"),
@@ -252,7 +265,12 @@ urlpatterns = [
     # Gestão de Contratos (unificado - todos os regimes: Lei 14.133, Lei 13.303 e Privado)
     path("gestao-contratos/", views.gestao_contratos_list, name="gestao_contratos_list"),
     path("gestao-contratos/novo/", views.gestao_contratos_create, name="gestao_contratos_create"),
+    path("gestao-contratos/alertas/", views.gestao_contratos_alertas, name="gestao_contratos_alertas"),
+    path("gestao-contratos/alertas/<int:pk>/reconhecer/", views.gestao_contratos_alerta_reconhecer, name="gestao_contratos_alerta_reconhecer"),
     path("gestao-contratos/<int:pk>/", views.gestao_contratos_detail, name="gestao_contratos_detail"),
+    path("gestao-contratos/<int:pk>/abas/<slug:aba>/", views.gestao_contratos_aba, name="gestao_contratos_aba"),
+    path("gestao-contratos/<int:pk>/eventos/", views.api_contrato_eventos, name="api_contrato_eventos"),
+    path("gestao-contratos/<int:pk>/sla/incidentes/importar/", views.gestao_contratos_sla_incidentes_importar, name="gestao_contratos_sla_incidentes_importar"),
     path("gestao-contratos/<int:pk>/editar/", views.gestao_contratos_update, name="gestao_contratos_update"),
     path("gestao-contratos/<int:pk>/excluir/", views.gestao_contratos_delete, name="gestao_contratos_delete"),
     
@@ -276,11 +294,15 @@ urlpatterns = [
     path("timesheet/planilha/excluir/<int:lancamento_id>/", views.timesheet_planilha_excluir, name="timesheet_planilha_excluir"),
     path("timesheet/exportar/", views.timesheet_exportar, name="timesheet_exportar"),
     path("timesheet/importar/", views.timesheet_importar, name="timesheet_importar"),
+    path("timesheet/auditoria/", views.timesheet_auditoria, name="timesheet_auditoria"),
     path("api/tarefas_por_sprint/", views.api_tarefas_por_sprint, name="api_tarefas_por_sprint"),
+    path("api/capacidade_colaborador/", views.api_capacidade_colaborador, name="api_capacidade_colaborador"),
+    path("api/expiracoes_licencas/", views.api_expiracoes_licencas, name="api_expiracoes_licencas"),
     
     # Análise de Contratos com IA
     path("ia-contratos/", views.documento_contrato_list, name="documento_contrato_list"),
     path("ia-contratos/upload/", views.documento_contrato_upload, name="documento_contrato_upload"),
+    path("ia-contratos/busca/", views.documento_contrato_busca, name="documento_contrato_busca"),
     path("ia-contratos/<int:pk>/", views.documento_contrato_detail, name="documento_contrato_detail"),
     path("ia-contratos/<int:pk>/analisar/", views.documento_contrato_analisar, name="documento_contrato_analisar"),
     path("ia-contratos/<int:pk>/criar-registros/", views.documento_contrato_criar_registros, name="documento_contrato_criar_registros"),
@@ -293,5 +315,6 @@ urlpatterns = [
     path("plano-trabalho/<int:pk>/editar/", views.plano_trabalho_update, name="plano_trabalho_update"),
     path("plano-trabalho/<int:pk>/aprovar/", views.plano_trabalho_aprovar, name="plano_trabalho_aprovar"),
     path("plano-trabalho/<int:pk>/rejeitar/", views.plano_trabalho_rejeitar, name="plano_trabalho_rejeitar"),
+    path("plano-trabalho/<int:pk>/sincronizar/", views.plano_trabalho_sincronizar, name="plano_trabalho_sincronizar"),
     path("plano-trabalho/<int:pk>/exportar-pdf/", views.plano_trabalho_exportar_pdf, name="plano_trabalho_exportar_pdf"),
 ]
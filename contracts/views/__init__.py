@@ -0,0 +1,75 @@
+"""
+Views do app contracts, separadas por domínio
+
+As bibliotecas pesadas (pandas, openpyxl, reportlab, OpenAI) são importadas
+dentro das views que as usam: o boot do Django e a resolução das URLs não as carregam.
+"""
+from .autenticacao import login_view, logout_view
+from .dashboard import dashboard
+from .apis import (
+    api_contratos_por_cliente, api_itens_contrato_por_contrato,
+    api_itens_fornecedor_por_item_contrato, api_itens_fornecedor_por_contrato,
+    api_item_contrato_saldo, api_item_contrato_valor, api_item_fornecedor_valor,
+    api_itens_fornecedor_servico_por_contrato,
+)
+from .clientes import (
+    cliente_list, cliente_duplicados, cliente_create, cliente_update, cliente_detail,
+    cliente_delete, export_clientes_csv,
+)
+from .itens import (
+    itemcontrato_update, itemcontrato_detail, itemcontrato_delete, itemfornecedor_list,
+    itemfornecedor_detail, itemfornecedor_create, itemfornecedor_update, itemfornecedor_delete,
+    export_item_fornecedor_csv,
+)
+from .ordens import (
+    ordemfornecimento_list, ordemfornecimento_detail, ordemfornecimento_create,
+    ordemfornecimento_update, ordemfornecimento_delete, ordemfornecimento_expiracoes, api_expiracoes_licencas,
+    export_ordemfornecimento_csv, ordemservico_list, ordemservico_detail, ordemservico_create,
+    ordemservico_update, ordemservico_delete, export_ordemservico_csv,
+)
+from .importacao import import_export_view, export_excel_view, clean_datetimes, logs_import_export
+from .colaboradores import (
+    colaborador_list, colaborador_create, colaborador_update, colaborador_detail,
+    colaborador_password_change, grupo_list, grupo_create, grupo_update, grupo_detail, grupo_delete,
+)
+from .faturamento import (
+    sla_list, sla_create, sla_update, sla_detail, fila_faturamento, fila_faturamento_glosas,
+    fila_faturamento_glosas_recalcular, marcar_os_faturada, marcar_of_faturada,
+    faturar_selecionados, relatorio_rentabilidade, relatorio_previsao_consumo,
+)
+from .projetos import (
+    tarefa_os_create, tarefa_os_update, lancamento_hora_create, lancamento_hora_update,
+    lancamento_hora_delete, projeto_list, projeto_detail, projeto_create, projeto_update,
+    projeto_delete, backlog_create_ajax, backlog_update_ajax, backlog_delete_ajax,
+    backlog_converter_projeto_ajax, backlog_converter_projeto, backlog_gerenciar, sprint_create,
+    sprint_detail, sprint_update, sprint_delete, sprint_fechar, tarefa_mover_sprint,
+    tarefa_remover_sprint, tarefa_projeto_create, tarefa_projeto_update, tarefa_projeto_detail,
+    tarefa_create_ajax, tarefa_projeto_delete,
+)
+from .gestao_contratos import (
+    gestao_contratos_list, api_contrato_eventos, gestao_contratos_sla_incidentes_importar,
+    gestao_contratos_alertas, gestao_contratos_alerta_reconhecer, gestao_contratos_detail,
+    gestao_contratos_aba,
+    stakeholder_contrato_create, stakeholder_contrato_update, stakeholder_contrato_delete,
+    gestao_contratos_create, gestao_contratos_update, gestao_contratos_delete, termo_aditivo_create,
+    termo_aditivo_update, termo_aditivo_delete,
+)
+from .timesheet import (
+    timesheet_list, timesheet_lancar_horas, timesheet_editar_lancamento,
+    timesheet_excluir_lancamento, timesheet_tarefa_detail, timesheet_planilha,
+    timesheet_planilha_salvar, timesheet_planilha_excluir, timesheet_exportar, timesheet_importar,
+    timesheet_auditoria, api_sprints_por_projeto, api_projetos_por_contrato,
+    api_ordens_servico_por_contrato, api_tarefas_por_sprint,
+)
+from .capacidade import capacidade_equipe, api_capacidade_colaborador
+from .ia_contratos import (
+    documento_contrato_list, documento_contrato_busca, documento_contrato_upload,
+    documento_contrato_detail, documento_contrato_analisar, documento_contrato_criar_registros,
+    documento_contrato_delete, documento_contrato_download, plano_trabalho_gerar,
+    plano_trabalho_detail, plano_trabalho_aprovar, plano_trabalho_rejeitar, plano_trabalho_update,
+    plano_trabalho_sincronizar, plano_trabalho_exportar_pdf,
+)
+from .customer_success import (
+    customer_success_list, customer_success_detail, customer_success_criar_ticket,
+    customer_success_delete,
+)
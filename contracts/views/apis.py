@@ -0,0 +1,162 @@
+"""
+APIs para o carregamento dinâmico dos formulários
+"""
+from django.http import JsonResponse
+from django.db.models import Q
+from django.views.decorators.http import require_GET
+
+from ..models import Contrato, ItemContrato, ItemFornecedor
+from ..utils import map_tipo_item_contrato_para_fornecedor
+
+
+# APIs para carregamento dinâmico
+@require_GET
+def api_contratos_por_cliente(request):
+    cliente_id = request.GET.get("cliente_id")
+    if not cliente_id:
+        return JsonResponse({"error": "Cliente não informado."}, status=400)
+
+    contratos = Contrato.objects.filter(cliente_id=cliente_id)
+    data = [{"id": c.id, "numero": c.numero_contrato} for c in contratos]
+    return JsonResponse({"contratos": data})
+
+
+@require_GET
+def api_itens_contrato_por_contrato(request):
+    contrato_id = request.GET.get("contrato_id")
+    tipos_param = request.GET.get("tipo", "")
+    
+    # Se tipos não foram especificados, usar apenas Serviço e Treinamento (padrão para OS)
+    from ..constants import TIPOS_OS_ITEM_CONTRATO
+    if tipos_param:
+        tipos = [t.strip() for t in tipos_param.split(",") if t.strip()]
+    else:
+        tipos = TIPOS_OS_ITEM_CONTRATO
+    
+    itens = []
+
+    if contrato_id:
+        queryset = ItemContrato.objects.filter(contrato_id=contrato_id, tipo__in=tipos)
+
+        for item in queryset:
+            itens.append(
+                {
+                    "id": item.id,
+                    "descricao": f"{item.numero_item} - {item.descricao}",
+                    "valor_unitario": float(item.valor_unitario),
+                }
+            )
+
+    return JsonResponse({"itens_contrato": itens})
+
+
+@require_GET
+def api_itens_fornecedor_por_item_contrato(request):
+    contrato_id = request.GET.get("contrato")
+    item_contrato_id = request.GET.get("item_contrato")
+
+    if not contrato_id or not item_contrato_id:
+        return JsonResponse([], safe=False)
+
+    try:
+        contrato = Contrato.objects.get(id=contrato_id)
+        item_contrato = ItemContrato.objects.get(id=item_contrato_id)
+    except (Contrato.DoesNotExist, ItemContrato.DoesNotExist):
+        return JsonResponse([], safe=False)
+
+    tipo_item = map_tipo_item_contrato_para_fornecedor(item_contrato.tipo)
+    if not tipo_item:
+        return JsonResponse([], safe=False)
+
+    fornecedores = [f.upper() for f in contrato.fornecedores]
+    itens = ItemFornecedor.objects.filter(
+        tipo=tipo_item, fornecedor__in=fornecedores
+    ).values("id", "descricao")
+    return JsonResponse(list(itens), safe=False)
+
+
+@require_GET
+def api_itens_fornecedor_por_contrato(request):
+    contrato_id = request.GET.get("contrato_id")
+
+    if not contrato_id:
+        return JsonResponse({"itens_contrato": []})
+
+    try:
+        contrato = Contrato.objects.get(id=contrato_id)
+    except Contrato.DoesNotExist:
+        return JsonResponse({"itens_contrato": []})
+
+    itens = contrato.itens.filter(tipo__in=["servico", "treinamento"]).values(
+        "id", "descricao"
+    )
+    return JsonResponse({"itens_contrato": list(itens)})
+
+
+@require_GET
+def api_item_contrato_saldo(request, item_id):
+    try:
+        item = ItemContrato.objects.get(id=item_id)
+    except ItemContrato.DoesNotExist:
+        return JsonResponse({"error": "Item não encontrado."}, status=404)
+
+    saldo = item.saldo_quantidade_atual or 0
+    return JsonResponse({
+        "saldo": float(saldo),
+        "unidade": item.unidade or ""
+    })
+
+
+@require_GET
+def api_item_contrato_valor(request, item_id):
+    """API para retornar o valor unitário de um item de contrato"""
+    try:
+        item = ItemContrato.objects.get(id=item_id)
+        return JsonResponse({"valor_unitario": float(item.valor_unitario or 0)})
+    except ItemContrato.DoesNotExist:
+        return JsonResponse({"error": "Item não encontrado."}, status=404)
+
+
+@require_GET
+def api_item_fornecedor_valor(request, item_id):
+    """API para retornar o valor unitário de um item de fornecedor"""
+    try:
+        item = ItemFornecedor.objects.get(id=item_id)
+        return JsonResponse({"valor_unitario": float(item.valor_unitario or 0)})
+    except ItemFornecedor.DoesNotExist:
+        return JsonResponse({"error": "Item não encontrado."}, status=404)
+
+
+@require_GET
+def api_itens_fornecedor_servico_por_contrato(request):
+    """API para retornar itens de fornecedor do tipo serviço vinculados a um contrato"""
+    contrato_id = request.GET.get("contrato_id")
+    
+    if not contrato_id:
+        return JsonResponse({"itens": []})
+    
+    try:
+        contrato = Contrato.objects.get(id=contrato_id)
+        fornecedores_contrato = [f.upper() for f in contrato.fornecedores] if contrato.fornecedores else []
+        
+        # Filtrar itens de serviço vinculados aos fornecedores do contrato
+        itens = ItemFornecedor.objects.filter(tipo="servico")
+        if fornecedores_contrato:
+            itens = itens.filter(
+                Q(fornecedor__in=fornecedores_contrato) |
+                Q(outro_fornecedor__in=fornecedores_contrato)
+            )
+        
+        itens_data = [
+            {
+                "id": item.id,
+                "descricao": item.descricao,
+                "valor_unitario": float(item.valor_unitario),
+                "fornecedor": item.nome_fornecedor
+            }
+            for item in itens
+        ]
+        
+        return JsonResponse({"itens": itens_data})
+    except Contrato.DoesNotExist:
+        return JsonResponse({"error": "Contrato não encontrado."}, status=404)
@@ -0,0 +1,27 @@
+"""
+Views de login e logout
+"""
+from django.shortcuts import render, redirect
+from django.contrib import messages
+from django.contrib.auth import login, logout
+from django.contrib.auth.forms import AuthenticationForm
+
+
+# Controle de Login
+def login_view(request):
+    if request.user.is_authenticated:
+        return redirect("dashboard")
+
+    form = AuthenticationForm(request, data=request.POST or None)
+    if request.method == "POST" and form.is_valid():
+        login(request, form.get_user())
+        return redirect("dashboard")
+    if request.method == "POST":
+        messages.error(request, "Usuário ou senha inválidos.")
+
+    return render(request, "contracts/login.html", {"form": form})
+
+
+def logout_view(request):
+    logout(request)
+    return redirect("login")
@@ -0,0 +1,97 @@
+"""
+Views da capacidade da equipe
+"""
+from django.shortcuts import render
+from django.http import JsonResponse
+from django.contrib.auth.decorators import login_required
+from django.views.decorators.http import require_GET
+from datetime import datetime, timedelta
+from django.utils import timezone
+from decimal import Decimal
+
+from ..services import CapacidadeService
+from .comum import group_required
+
+
+# ========== CAPACIDADE DA EQUIPE ==========
+
+@group_required("Admin", "Gerente", "Leitor")
+def capacidade_equipe(request):
+    """Mapa de calor da utilização semanal dos colaboradores e sobreposições de tarefas"""
+    try:
+        inicio = datetime.strptime(request.GET.get("inicio", ""), "%Y-%m-%d").date()
+    except ValueError:
+        inicio = timezone.localdate()
+    try:
+        quantidade_semanas = min(max(int(request.GET.get("semanas", 8)), 1), 26)
+    except ValueError:
+        quantidade_semanas = 8
+
+    mapa = CapacidadeService.mapa_calor(inicio, quantidade_semanas)
+    primeira = mapa["semanas"][0]
+    context = {
+        **mapa,
+        "inicio": primeira,
+        "quantidade_semanas": quantidade_semanas,
+        "semana_anterior": primeira - timedelta(weeks=quantidade_semanas),
+        "semana_seguinte": primeira + timedelta(weeks=quantidade_semanas),
+        "capacidade_semana": CapacidadeService.HORAS_SEMANA,
+    }
+    return render(request, "colaborador/capacidade.html", context)
+
+
+@login_required
+@require_GET
+def api_capacidade_colaborador(request):
+    """Sobreposições e semanas sobrecarregadas caso a tarefa seja atribuída ao colaborador"""
+    from decimal import InvalidOperation
+
+    responsavel_id = request.GET.get("responsavel_id")
+    if not responsavel_id or not responsavel_id.isdigit():
+        return JsonResponse({"error": "Responsável não informado."}, status=400)
+
+    datas = []
+    for campo in ("data_inicio", "data_termino"):
+        valor = request.GET.get(campo, "").strip()
+        for formato in ("%Y-%m-%dT%H:%M", "%Y-%m-%d %H:%M:%S", "%d/%m/%Y, %H:%M", "%d/%m/%Y %H:%M"):
+            try:
+                datas.append(timezone.make_aware(datetime.strptime(valor, formato)))
+                break
+            except ValueError:
+                continue
+    if len(datas) != 2 or datas[1] <= datas[0]:
+        return JsonResponse({"error": "Informe início e término válidos."}, status=400)
+
+    try:
+        horas = Decimal(request.GET["horas"]) if request.GET.get("horas") else None
+    except InvalidOperation:
+        horas = None
+    tarefa_id = request.GET.get("tarefa_id")
+
+    resultado = CapacidadeService.verificar_alocacao(
+        int(responsavel_id), datas[0], datas[1], horas=horas,
+        tarefa_id=int(tarefa_id) if tarefa_id and tarefa_id.isdigit() else None,
+    )
+    formato = "%d/%m/%Y %H:%M"
+    return JsonResponse({
+        "alerta": resultado["alerta"],
+        "sobreposicoes": [
+            {
+                "id": tarefa["id"],
+                "titulo": tarefa["titulo"],
+                "projeto": tarefa["projeto__nome"],
+                "inicio": timezone.localtime(tarefa["data_inicio_prevista"]).strftime(formato),
+                "termino": timezone.localtime(tarefa["data_termino_prevista"]).strftime(formato),
+            }
+            for tarefa in resultado["sobreposicoes"]
+        ],
+        "semanas": [
+            {
+                "semana": celula["semana"].strftime("%d/%m/%Y"),
+                "horas": str(celula["horas"]),
+                "capacidade": str(celula["capacidade"]),
+                "excedente": str(celula["excedente"]),
+            }
+            for celula in resultado["semanas"]
+        ],
+    })
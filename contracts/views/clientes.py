@@ -0,0 +1,255 @@
+"""
+Views de clientes
+"""
+from django.shortcuts import render, get_object_or_404, redirect
+from django.http import HttpResponse
+from django.contrib import messages
+from django.core.paginator import Paginator
+import csv, re
+
+from ..models import normalizar_documento, Cliente
+from ..services import ClienteService
+from .comum import group_required
+
+
+CLIENTE_LIST_COLUMNS = [
+    {"id": "id", "label": "ID"},
+    {"id": "razao", "label": "Razão Social"},
+    {"id": "fantasia", "label": "Nome Fantasia"},
+    {"id": "cidade", "label": "Cidade"},
+    {"id": "estado", "label": "Estado"},
+    {"id": "documento", "label": "CNPJ/CPF"},
+    {"id": "telefone", "label": "Telefone"},
+    {"id": "status", "label": "Status"},
+]
+
+
+# Cliente - Listagem com filtros e paginação
+@group_required("Admin", "Gerente", "Leitor")
+def cliente_list(request):
+    clientes = Cliente.objects.all()
+
+    nome = request.GET.get("nome")
+    cidade = request.GET.get("cidade")
+    estado = request.GET.get("estado")
+    ativo = request.GET.get("ativo")
+
+    if nome:
+        # Só números e pontuação: busca pela chave normalizada do CNPJ/CPF (índice)
+        documento = normalizar_documento(nome) if re.fullmatch(r"[\d./\-\s]+", nome) else None
+        if documento and len(documento) in (11, 14):
+            clientes = clientes.por_documento(documento)
+        elif documento:
+            clientes = clientes.filter(cnpj_normalizado__startswith=documento)
+        else:
+            clientes = clientes.filter(nome_razao_social__icontains=nome)
+    if cidade:
+        clientes = clientes.filter(cidade__icontains=cidade)
+    if estado:
+        clientes = clientes.filter(estado__icontains=estado)
+    if ativo == "ativo":
+        clientes = clientes.filter(ativo=True)
+    elif ativo == "inativo":
+        clientes = clientes.filter(ativo=False)
+
+    # Estatísticas
+    total_clientes = Cliente.objects.count()
+    clientes_ativos = Cliente.objects.filter(ativo=True).count()
+    clientes_inativos = Cliente.objects.filter(ativo=False).count()
+    clientes_com_contratos = Cliente.objects.filter(contratos__isnull=False).distinct().count()
+    clientes_sem_contratos = total_clientes - clientes_com_contratos
+
+    paginator = Paginator(clientes, 10)
+    page = request.GET.get("page")
+    clientes_page = paginator.get_page(page)
+
+    return render(
+        request,
+        "cliente/list.html",
+        {
+            "clientes": clientes_page,
+            "colunas": CLIENTE_LIST_COLUMNS,
+            "total_clientes": total_clientes,
+            "clientes_ativos": clientes_ativos,
+            "clientes_inativos": clientes_inativos,
+            "clientes_com_contratos": clientes_com_contratos,
+            "clientes_sem_contratos": clientes_sem_contratos,
+            "nome_filter": nome or "",
+            "cidade_filter": cidade or "",
+            "estado_filter": estado or "",
+            "ativo_filter": ativo or "",
+        },
+    )
+
+
+# Cliente - Duplicados pelo CNPJ/CPF normalizado
+@group_required("Admin", "Gerente")
+def cliente_duplicados(request):
+    grupos = ClienteService.duplicados()
+    return render(request, "cliente/duplicados.html", {"grupos": grupos})
+
+
+# Cliente - Criar
+@group_required("Admin", "Gerente")
+def cliente_create(request):
+    from ..forms import ClienteForm, ContatoClienteFormSet
+    
+    if request.method == "POST":
+        form = ClienteForm(request.POST)
+        formset = ContatoClienteFormSet(request.POST)
+        
+        if form.is_valid() and formset.is_valid():
+            cliente = form.save()
+            formset.instance = cliente
+            formset.save()
+            messages.success(request, "Cliente criado com sucesso!")
+            return redirect("cliente_list")
+    else:
+        form = ClienteForm()
+        formset = ContatoClienteFormSet()
+    
+    return render(request, "cliente/form.html", {
+        "form": form,
+        "formset": formset
+    })
+
+
+# Cliente - Editar
+@group_required("Admin", "Gerente")
+def cliente_update(request, pk):
+    from ..forms import ClienteForm, ContatoClienteFormSet
+    
+    cliente = get_object_or_404(Cliente, pk=pk)
+    
+    if request.method == "POST":
+        form = ClienteForm(request.POST, instance=cliente)
+        formset = ContatoClienteFormSet(request.POST, instance=cliente)
+        
+        if form.is_valid() and formset.is_valid():
+            cliente = form.save()
+            formset.save()
+            messages.success(request, "Cliente atualizado com sucesso!")
+            return redirect("cliente_detail", pk=cliente.pk)
+    else:
+        form = ClienteForm(instance=cliente)
+        formset = ContatoClienteFormSet(instance=cliente)
+    
+    return render(request, "cliente/form.html", {
+        "form": form,
+        "formset": formset,
+        "cliente": cliente
+    })
+
+
+# Cliente - Detalhar (com abas para contratos, leads, oportunidades e reclamações)
+@group_required("Admin", "Gerente", "Leitor")
+def cliente_detail(request, pk):
+    cliente = get_object_or_404(
+        Cliente.objects.select_related('gerente_comercial', 'gerente_sucessos').prefetch_related('contatos'),
+        pk=pk
+    )
+    
+    # Contratos do cliente
+    contratos = cliente.contratos.all().order_by('-data_assinatura')
+    
+    # Tickets de Customer Success do cliente
+    from ..models import FeedbackSprintOS
+    tickets_cs = FeedbackSprintOS.objects.filter(cliente=cliente).select_related(
+        'contrato', 'projeto', 'sprint', 'ordem_servico', 'gerente_sucessos'
+    ).order_by('-criado_em')
+    
+    # Estatísticas
+    total_contratos = contratos.count()
+    contratos_ativos = contratos.filter(situacao="Ativo").count()
+    total_tickets = tickets_cs.count()
+    
+    context = {
+        "cliente": cliente,
+        "contratos": contratos[:10],  # Últimos 10
+        "tickets_cs": tickets_cs[:20],  # Últimos 20 tickets
+        "total_contratos": total_contratos,
+        "contratos_ativos": contratos_ativos,
+        "total_tickets": total_tickets,
+        "leads_ativos": 0,
+        "oportunidades_ativas": 0,
+        "reclamacoes_abertas": 0,
+    }
+    
+    return render(request, "cliente/detail.html", context)
+
+
+# Cliente - Deletar
+@group_required("Admin", "Gerente")
+def cliente_delete(request, pk):
+    cliente = get_object_or_404(Cliente, pk=pk)
+    if request.method == "POST":
+        cliente.delete()
+        return redirect("cliente_list")
+    return render(request, "cliente/confirm_delete.html", {"cliente": cliente})
+
+
+# Cliente - Exportação CSV
+@group_required("Admin", "Gerente")
+def export_clientes_csv(request):
+    clientes = Cliente.objects.all()
+
+    response = HttpResponse(content_type="text/csv")
+    response["Content-Disposition"] = 'attachment; filename="clientes.csv"'
+
+    writer = csv.writer(response)
+    writer.writerow(
+        [
+            "ID",
+            "Razão Social",
+            "Nome Fantasia",
+            "Tipo Cliente",
+            "Tipo Pessoa",
+            "CNPJ/CPF",
+            "Natureza Jurídica",
+            "Inscrição Estadual",
+            "Inscrição Municipal",
+            "Endereço",
+            "Número",
+            "Complemento",
+            "Bairro",
+            "Cidade",
+            "Estado",
+            "CEP",
+            "País",
+            "Nome Responsável",
+            "Cargo Responsável",
+            "Telefone Contato",
+            "Email Contato",
+            "Ativo",
+        ]
+    )
+
+    for cliente in clientes:
+        writer.writerow(
+            [
+                cliente.id,
+                cliente.nome_razao_social,
+                cliente.nome_fantasia,
+                cliente.tipo_cliente,
+                cliente.tipo_pessoa,
+                cliente.cnpj_cpf,
+                cliente.natureza_juridica,
+                cliente.inscricao_estadual,
+                cliente.inscricao_municipal,
+                cliente.endereco,
+                cliente.numero,
+                cliente.complemento,
+                cliente.bairro,
+                cliente.cidade,
+                cliente.estado,
+                cliente.cep,
+                cliente.pais,
+                cliente.nome_responsavel,
+                cliente.cargo_responsavel,
+                cliente.telefone_contato,
+                cliente.email_contato,
+                "Ativo" if cliente.ativo else "Inativo",
+            ]
+        )
+
+    return response
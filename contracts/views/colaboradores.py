@@ -0,0 +1,306 @@
+"""
+Views de colaboradores e grupos
+"""
+from django.shortcuts import render, get_object_or_404, redirect
+from django.contrib import messages
+from django.db.models import Q
+from django.contrib.auth.models import Group, Permission, User
+from django.core.paginator import Paginator
+
+from ..models import Colaborador
+from .comum import group_required
+
+
+# ========== GESTÃO DE CLIENTES - NOVAS VIEWS ==========
+
+# Colaborador - Listagem (Unificada com usuários do Django)
+@group_required("Admin", "Gerente", "Leitor")
+def colaborador_list(request):
+    # Buscar todos os usuários do sistema (unificando visão)
+    usuarios = User.objects.all().select_related('colaborador').order_by('username')
+    
+    nome = request.GET.get("nome")
+    cargo = request.GET.get("cargo")
+    ativo = request.GET.get("ativo")
+    tem_colaborador = request.GET.get("tem_colaborador")
+    
+    # Filtrar por nome (no usuário ou no colaborador)
+    if nome:
+        usuarios = usuarios.filter(
+            Q(username__icontains=nome) |
+            Q(first_name__icontains=nome) |
+            Q(last_name__icontains=nome) |
+            Q(email__icontains=nome) |
+            Q(colaborador__nome_completo__icontains=nome)
+        )
+    
+    # Filtrar por cargo
+    if cargo:
+        usuarios = usuarios.filter(colaborador__cargo__icontains=cargo)
+    
+    # Filtrar por status ativo/inativo
+    if ativo == "ativo":
+        usuarios = usuarios.filter(colaborador__ativo=True)
+    elif ativo == "inativo":
+        usuarios = usuarios.filter(colaborador__ativo=False)
+    
+    # Filtrar por ter ou não colaborador
+    if tem_colaborador == "sim":
+        usuarios = usuarios.filter(colaborador__isnull=False)
+    elif tem_colaborador == "nao":
+        usuarios = usuarios.filter(colaborador__isnull=True)
+    
+    # Estatísticas
+    total_usuarios = User.objects.count()
+    total_colaboradores = Colaborador.objects.count()
+    usuarios_sem_colaborador = User.objects.filter(colaborador__isnull=True).count()
+    colaboradores_ativos = Colaborador.objects.filter(ativo=True).count()
+    colaboradores_inativos = Colaborador.objects.filter(ativo=False).count()
+    
+    paginator = Paginator(usuarios, 10)
+    page = request.GET.get("page")
+    usuarios_page = paginator.get_page(page)
+    
+    context = {
+        "usuarios": usuarios_page,
+        "total_usuarios": total_usuarios,
+        "total_colaboradores": total_colaboradores,
+        "usuarios_sem_colaborador": usuarios_sem_colaborador,
+        "colaboradores_ativos": colaboradores_ativos,
+        "colaboradores_inativos": colaboradores_inativos,
+    }
+    
+    return render(request, "colaborador/list.html", context)
+
+
+# Colaborador - Criar
+@group_required("Admin", "Gerente")
+def colaborador_create(request):
+    from ..forms import ColaboradorForm
+    user_id = request.GET.get('user_id')
+    
+    if request.method == "POST":
+        form = ColaboradorForm(request.POST)
+        if form.is_valid():
+            form.save()
+            messages.success(request, "Colaborador criado com sucesso!")
+            return redirect("colaborador_list")
+    else:
+        form = ColaboradorForm()
+        # Se foi passado user_id, pré-selecionar o usuário
+        if user_id:
+            try:
+                user = User.objects.get(pk=user_id)
+                form.fields['user'].initial = user
+                form.fields['user'].queryset = User.objects.filter(pk=user_id)
+                form.fields['email'].initial = user.email
+                form.fields['nome_completo'].initial = user.get_full_name() or user.username
+                form.fields['criar_usuario'].initial = False
+            except User.DoesNotExist:
+                pass
+    
+    return render(request, "colaborador/form.html", {"form": form})
+
+
+# Colaborador - Editar
+@group_required("Admin", "Gerente")
+def colaborador_update(request, pk):
+    from ..forms import ColaboradorForm
+    colaborador = get_object_or_404(Colaborador, pk=pk)
+    if request.method == "POST":
+        form = ColaboradorForm(request.POST, instance=colaborador)
+        if form.is_valid():
+            form.save()
+            messages.success(request, "Colaborador atualizado com sucesso!")
+            return redirect("colaborador_list")
+    else:
+        form = ColaboradorForm(instance=colaborador)
+    return render(request, "colaborador/form.html", {"form": form})
+
+
+# Colaborador - Detalhar
+@group_required("Admin", "Gerente", "Leitor")
+def colaborador_detail(request, pk):
+    colaborador = get_object_or_404(
+        Colaborador.objects.select_related('user').prefetch_related('user__groups'),
+        pk=pk
+    )
+    
+    # Estatísticas do colaborador
+    clientes_comercial = colaborador.clientes_comercial.count() if colaborador.cargo and "comercial" in colaborador.cargo.lower() else 0
+    clientes_sucessos = colaborador.clientes_sucessos.count() if colaborador.cargo and "sucessos" in colaborador.cargo.lower() else 0
+    contratos_gerenciados = colaborador.contratos_gerenciados.count() if colaborador.cargo and "gerente" in colaborador.cargo.lower() else 0
+    tarefas = colaborador.tarefas.count()
+    lancamentos_horas = colaborador.lancamentos_horas.count()
+    
+    context = {
+        "colaborador": colaborador,
+        "clientes_comercial": clientes_comercial,
+        "clientes_sucessos": clientes_sucessos,
+        "contratos_gerenciados": contratos_gerenciados,
+        "tarefas": tarefas,
+        "lancamentos_horas": lancamentos_horas,
+    }
+    
+    return render(request, "colaborador/detail.html", context)
+
+
+# Colaborador - Alterar Senha
+@group_required("Admin", "Gerente")
+def colaborador_password_change(request, pk):
+    """Altera a senha do colaborador"""
+    colaborador = get_object_or_404(
+        Colaborador.objects.select_related('user'),
+        pk=pk
+    )
+    
+    if not colaborador.user:
+        messages.error(request, "Este colaborador não possui um usuário associado.")
+        return redirect("colaborador_detail", pk=colaborador.pk)
+    
+    from ..forms import ColaboradorPasswordChangeForm
+    
+    if request.method == "POST":
+        form = ColaboradorPasswordChangeForm(colaborador.user, request.POST)
+        if form.is_valid():
+            form.save()
+            messages.success(request, f"Senha do colaborador {colaborador.nome_completo} alterada com sucesso!")
+            return redirect("colaborador_detail", pk=colaborador.pk)
+        else:
+            messages.error(request, "Erro ao alterar a senha. Verifique os campos.")
+    else:
+        form = ColaboradorPasswordChangeForm(colaborador.user)
+    
+    context = {
+        "form": form,
+        "colaborador": colaborador,
+    }
+    
+    return render(request, "colaborador/password_change.html", context)
+
+
+# ========== GESTÃO DE GRUPOS ==========
+
+# Grupo - Listar
+@group_required("Admin")
+def grupo_list(request):
+    """Lista todos os grupos"""
+    grupos = Group.objects.prefetch_related('permissions', 'user_set').all()
+    
+    search = request.GET.get("search")
+    if search:
+        grupos = grupos.filter(name__icontains=search)
+    
+    # Estatísticas
+    total_grupos = Group.objects.count()
+    total_permissoes = Permission.objects.count()
+    total_usuarios = User.objects.filter(groups__isnull=False).distinct().count()
+    
+    paginator = Paginator(grupos, 20)
+    page = request.GET.get("page")
+    grupos_page = paginator.get_page(page)
+    
+    context = {
+        "grupos": grupos_page,
+        "search": search,
+        "total_grupos": total_grupos,
+        "total_permissoes": total_permissoes,
+        "total_usuarios": total_usuarios,
+    }
+    return render(request, "grupo/list.html", context)
+
+
+# Grupo - Criar
+@group_required("Admin")
+def grupo_create(request):
+    """Cria um novo grupo"""
+    from ..forms import GrupoForm
+    
+    if request.method == "POST":
+        form = GrupoForm(request.POST)
+        if form.is_valid():
+            form.save()
+            messages.success(request, "Grupo criado com sucesso!")
+            return redirect("grupo_list")
+        else:
+            messages.error(request, "Erro ao criar o grupo. Verifique os campos.")
+    else:
+        form = GrupoForm()
+    
+    return render(request, "grupo/form.html", {"form": form})
+
+
+# Grupo - Editar
+@group_required("Admin")
+def grupo_update(request, pk):
+    """Edita um grupo"""
+    from ..forms import GrupoForm
+    
+    grupo = get_object_or_404(Group, pk=pk)
+    
+    if request.method == "POST":
+        form = GrupoForm(request.POST, instance=grupo)
+        if form.is_valid():
+            form.save()
+            messages.success(request, "Grupo atualizado com sucesso!")
+            return redirect("grupo_detail", pk=grupo.pk)
+        else:
+            messages.error(request, "Erro ao atualizar o grupo. Verifique os campos.")
+    else:
+        form = GrupoForm(instance=grupo)
+    
+    return render(request, "grupo/form.html", {"form": form, "grupo": grupo})
+
+
+# Grupo - Detalhar
+@group_required("Admin", "Gerente")
+def grupo_detail(request, pk):
+    """Detalhes do grupo com permissões e usuários"""
+    grupo = get_object_or_404(
+        Group.objects.prefetch_related('permissions', 'user_set'),
+        pk=pk
+    )
+    
+    # Organizar permissões por app
+    permissoes_por_app = {}
+    for perm in grupo.permissions.all().select_related('content_type'):
+        app_label = perm.content_type.app_label
+        if app_label not in permissoes_por_app:
+            permissoes_por_app[app_label] = []
+        permissoes_por_app[app_label].append(perm)
+    
+    # Usuários do grupo
+    usuarios = grupo.user_set.select_related('colaborador').all()
+    
+    context = {
+        "grupo": grupo,
+        "permissoes_por_app": permissoes_por_app,
+        "usuarios": usuarios,
+        "total_permissoes": grupo.permissions.count(),
+        "total_usuarios": usuarios.count(),
+    }
+    
+    return render(request, "grupo/detail.html", context)
+
+
+# Grupo - Deletar
+@group_required("Admin")
+def grupo_delete(request, pk):
+    """Exclui um grupo"""
+    grupo = get_object_or_404(Group, pk=pk)
+    
+    if request.method == "POST":
+        nome_grupo = grupo.name
+        total_usuarios = grupo.user_set.count()
+        grupo.delete()
+        messages.success(
+            request,
+            f"Grupo '{nome_grupo}' excluído com sucesso! ({total_usuarios} usuário(s) foram removidos do grupo.)"
+        )
+        return redirect("grupo_list")
+    
+    context = {
+        "grupo": grupo,
+        "total_usuarios": grupo.user_set.count(),
+    }
+    return render(request, "grupo/confirm_delete.html", context)
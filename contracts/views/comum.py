@@ -0,0 +1,14 @@
+"""
+Controle de permissões compartilhado pelas views
+"""
+from django.contrib.auth.decorators import user_passes_test
+
+
+# Controle de Permissões
+def group_required(*group_names):
+    def in_groups(user):
+        return user.is_authenticated and (
+            bool(user.groups.filter(name__in=group_names)) or user.is_superuser
+        )
+
+    return user_passes_test(in_groups)
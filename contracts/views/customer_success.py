@@ -0,0 +1,177 @@
+"""
+Views de customer success (feedback de sprints e OS)
+"""
+from django.shortcuts import render, get_object_or_404, redirect
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required
+
+from ..models import Cliente, FeedbackSprintOS
+from ..forms import FeedbackSprintOSForm, CriarTicketContatoForm
+from .comum import group_required
+
+
+# ==================== CUSTOMER SUCCESS - FEEDBACK SPRINT/OS ====================
+
+@login_required
+@group_required("Admin", "Gerente", "Customer Success")
+def customer_success_list(request):
+    """Lista feedbacks pendentes de Sprint/OS faturadas"""
+    from django.db.models import Q
+    from django.utils import timezone
+    
+    # Filtros
+    status_filter = request.GET.get('status', '')
+    
+    # Query base
+    feedbacks = FeedbackSprintOS.objects.select_related(
+        'sprint', 'ordem_servico', 'cliente', 'contrato', 'projeto', 'gerente_sucessos'
+    ).all()
+    
+    # Aplicar filtros
+    if status_filter:
+        feedbacks = feedbacks.filter(status=status_filter)
+    
+    # Ordenar por data de criação (mais recentes primeiro)
+    feedbacks = feedbacks.order_by('-criado_em')
+    
+    # Estatísticas
+    total_pendentes = FeedbackSprintOS.objects.filter(status='pendente').count()
+    total_em_contato = FeedbackSprintOS.objects.filter(status='em_contato').count()
+    total_respondidos = FeedbackSprintOS.objects.filter(status='respondido').count()
+    total_concluidos = FeedbackSprintOS.objects.filter(status='concluido').count()
+    
+    context = {
+        'feedbacks': feedbacks,
+        'status_filter': status_filter,
+        'total_pendentes': total_pendentes,
+        'total_em_contato': total_em_contato,
+        'total_respondidos': total_respondidos,
+        'total_concluidos': total_concluidos,
+    }
+    
+    return render(request, 'customer_success/list.html', context)
+
+
+@login_required
+@group_required("Admin", "Gerente", "Customer Success")
+def customer_success_detail(request, pk):
+    """Visualiza e edita um feedback específico"""
+    feedback = get_object_or_404(
+        FeedbackSprintOS.objects.select_related(
+            'sprint', 'ordem_servico', 'cliente', 'contrato', 'projeto', 'gerente_sucessos'
+        ),
+        pk=pk
+    )
+    
+    if request.method == 'POST':
+        form = FeedbackSprintOSForm(request.POST, instance=feedback)
+        if form.is_valid():
+            # Atualizar data de contato se status mudou para 'em_contato'
+            if form.cleaned_data['status'] == 'em_contato' and not feedback.data_contato:
+                from django.utils import timezone
+                feedback.data_contato = timezone.now()
+            
+            # Atualizar data de resposta se status mudou para 'respondido'
+            if form.cleaned_data['status'] == 'respondido' and not feedback.data_resposta:
+                from django.utils import timezone
+                feedback.data_resposta = timezone.now()
+            
+            # Atribuir gerente de sucessos se não tiver
+            if not feedback.gerente_sucessos and form.cleaned_data.get('gerente_sucessos'):
+                feedback.gerente_sucessos = form.cleaned_data['gerente_sucessos']
+            
+            form.save()
+            messages.success(request, 'Feedback atualizado com sucesso!')
+            return redirect('customer_success_detail', pk=feedback.pk)
+        else:
+            messages.error(request, 'Erro ao atualizar feedback. Verifique os campos.')
+    else:
+        form = FeedbackSprintOSForm(instance=feedback)
+    
+    context = {
+        'feedback': feedback,
+        'form': form,
+    }
+    
+    return render(request, 'customer_success/detail.html', context)
+
+
+@login_required
+@group_required("Admin", "Gerente", "Customer Success")
+def customer_success_criar_ticket(request):
+    """Cria um ticket de contato manualmente"""
+    if request.method == 'POST':
+        form = CriarTicketContatoForm(request.POST)
+        if form.is_valid():
+            ticket = form.save(commit=False)
+            # Se não tiver sprint ou OS, definir cliente e contrato como obrigatórios
+            if not ticket.sprint and not ticket.ordem_servico:
+                if not ticket.cliente or not ticket.contrato:
+                    messages.error(request, 'Cliente e Contrato são obrigatórios quando não há Sprint ou OS vinculada.')
+                    return render(request, 'customer_success/criar_ticket.html', {'form': form})
+            
+            # Se tiver sprint, preencher automaticamente cliente, contrato e projeto
+            if ticket.sprint:
+                ticket.cliente = ticket.sprint.projeto.contrato.cliente
+                ticket.contrato = ticket.sprint.projeto.contrato
+                ticket.projeto = ticket.sprint.projeto
+            
+            # Se tiver OS, preencher automaticamente cliente e contrato
+            if ticket.ordem_servico:
+                ticket.cliente = ticket.ordem_servico.cliente
+                ticket.contrato = ticket.ordem_servico.contrato
+                # OrdemServico tem relação OneToOne com Sprint (via related_name 'sprint')
+                try:
+                    if ticket.ordem_servico.sprint:
+                        ticket.projeto = ticket.ordem_servico.sprint.projeto
+                except AttributeError:
+                    pass
+                # Se não tiver sprint, buscar projeto via contrato
+                if not ticket.projeto and ticket.contrato and ticket.contrato.projetos.exists():
+                    ticket.projeto = ticket.contrato.projetos.first()
+            
+            ticket.status = 'pendente'
+            ticket.save()
+            messages.success(request, 'Ticket de contato criado com sucesso!')
+            return redirect('customer_success_detail', pk=ticket.pk)
+        else:
+            messages.error(request, 'Erro ao criar ticket. Verifique os campos.')
+    else:
+        # Pré-selecionar cliente se passado via GET
+        cliente_id = request.GET.get('cliente')
+        if cliente_id:
+            try:
+                cliente = Cliente.objects.get(pk=cliente_id)
+                form = CriarTicketContatoForm(initial={'cliente': cliente})
+            except Cliente.DoesNotExist:
+                form = CriarTicketContatoForm()
+        else:
+            form = CriarTicketContatoForm()
+    
+    context = {
+        'form': form,
+    }
+    
+    return render(request, 'customer_success/criar_ticket.html', context)
+
+
+@login_required
+@group_required("Admin", "Gerente", "Customer Success")
+def customer_success_delete(request, pk):
+    """Exclui um ticket de Customer Success"""
+    try:
+        ticket = FeedbackSprintOS.objects.get(pk=pk)
+    except FeedbackSprintOS.DoesNotExist:
+        messages.error(request, 'Ticket não encontrado.')
+        return redirect('customer_success_list')
+    
+    if request.method == 'POST':
+        numero_ticket = ticket.numero_ticket
+        ticket.delete()
+        messages.success(request, f'Ticket {numero_ticket} excluído com sucesso!')
+        return redirect('customer_success_list')
+    
+    context = {
+        'ticket': ticket,
+    }
+    return render(request, 'customer_success/confirm_delete.html', context)
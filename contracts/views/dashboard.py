@@ -0,0 +1,582 @@
+"""
+View do dashboard
+"""
+from django.shortcuts import render
+from django.db.models import Q, Sum, Value, F, ExpressionWrapper, DecimalField
+from django.db.models.functions import Coalesce
+from django.contrib.auth.decorators import login_required
+from datetime import timedelta
+from django.utils import timezone
+from decimal import Decimal
+
+from ..models import (
+    Cliente,
+    Contrato,
+    ItemContrato,
+    OrdemFornecimento,
+    OrdemServico,
+)
+from ..services import PrevisaoConsumoService, AlertaContratoService, EventoService, CacheVersaoService
+
+
+def _indicadores(hoje):
+    """Indicadores, listas e gráficos agregados do dashboard (guardados em cache pela versão do painel)"""
+    # ========== INDICADORES BÁSICOS ==========
+    total_clientes = Cliente.objects.count()
+    total_contratos = Contrato.objects.count()
+    contratos_ativos = Contrato.objects.filter(situacao="Ativo").count()
+    contratos_inativos = Contrato.objects.filter(situacao="Inativo").count()
+
+    # ========== INDICADORES FINANCEIROS ==========
+    # Valor total dos contratos (soma de todos os itens)
+    valor_total_contratos = (
+        ItemContrato.objects.aggregate(
+            total=Coalesce(
+                Sum(
+                    ExpressionWrapper(
+                        F("quantidade") * F("valor_unitario"),
+                        output_field=DecimalField(max_digits=20, decimal_places=2),
+                    )
+                ),
+                Value(0, output_field=DecimalField(max_digits=20, decimal_places=2)),
+            )
+        )["total"]
+        or 0
+    )
+
+    # Valor faturado (OS e OF com status "faturada")
+    valor_faturado_os = (
+        OrdemServico.objects.filter(status="faturada").aggregate(
+            total=Coalesce(
+                Sum("valor_total"),
+                Value(0, output_field=DecimalField(max_digits=20, decimal_places=2)),
+            )
+        )["total"]
+        or 0
+    )
+
+    valor_faturado_of = (
+        OrdemFornecimento.objects.filter(status="faturada").aggregate(
+            total=Coalesce(
+                Sum("valor_total"),
+                Value(0, output_field=DecimalField(max_digits=20, decimal_places=2)),
+            )
+        )["total"]
+        or 0
+    )
+
+    valor_total_faturado = valor_faturado_os + valor_faturado_of
+    valor_nao_faturado = valor_total_contratos - valor_total_faturado
+    
+    # Taxa de utilização (% do valor faturado vs total)
+    taxa_utilizacao = (
+        (valor_total_faturado / valor_total_contratos * 100)
+        if valor_total_contratos > 0
+        else 0
+    )
+    
+    # Valor médio por contrato
+    valor_medio_contrato = (
+        valor_total_contratos / total_contratos if total_contratos > 0 else 0
+    )
+
+    # ========== INDICADORES DE VENCIMENTO ==========
+    # Contratos que vencem nos próximos 30, 60 e 90 dias
+    data_30_dias = hoje + timedelta(days=30)
+    data_60_dias = hoje + timedelta(days=60)
+    data_90_dias = hoje + timedelta(days=90)
+    
+    contratos_vencendo_30 = Contrato.objects.filter(
+        situacao="Ativo",
+        data_fim__gte=hoje,
+        data_fim__lte=data_30_dias
+    ).count()
+    
+    contratos_vencendo_60 = Contrato.objects.filter(
+        situacao="Ativo",
+        data_fim__gte=hoje,
+        data_fim__lte=data_60_dias
+    ).count()
+    
+    contratos_vencendo_90 = Contrato.objects.filter(
+        situacao="Ativo",
+        data_fim__gte=hoje,
+        data_fim__lte=data_90_dias
+    ).count()
+    
+    contratos_vencidos = Contrato.objects.filter(
+        situacao="Ativo",
+        data_fim__lt=hoje
+    ).count()
+
+    # ========== INDICADORES DE EXECUÇÃO (OS/OF) ==========
+    # OS/OF por status
+    os_abertas = OrdemServico.objects.filter(status="aberta").count()
+    os_execucao = OrdemServico.objects.filter(status="execucao").count()
+    os_finalizadas = OrdemServico.objects.filter(status="finalizada").count()
+    os_faturadas = OrdemServico.objects.filter(status="faturada").count()
+    total_os = OrdemServico.objects.count()
+    
+    of_abertas = OrdemFornecimento.objects.filter(status="aberta").count()
+    of_execucao = OrdemFornecimento.objects.filter(status="execucao").count()
+    of_finalizadas = OrdemFornecimento.objects.filter(status="finalizada").count()
+    of_faturadas = OrdemFornecimento.objects.filter(status="faturada").count()
+    total_of = OrdemFornecimento.objects.count()
+    
+    # Taxa de execução (finalizadas + faturadas / total)
+    taxa_execucao_os = (
+        ((os_finalizadas + os_faturadas) / total_os * 100) if total_os > 0 else 0
+    )
+    taxa_execucao_of = (
+        ((of_finalizadas + of_faturadas) / total_of * 100) if total_of > 0 else 0
+    )
+
+    # ========== INDICADORES DE CONSUMO ==========
+    # Total de itens e consumo
+    total_itens = ItemContrato.objects.count()
+    itens_consumidos = ItemContrato.objects.filter(
+        Q(ordemservico__status="faturada") | Q(ordemfornecimento__status="faturada")
+    ).distinct().count()
+    
+    # Quantidade total vs consumida
+    quantidade_total = ItemContrato.objects.aggregate(
+        total=Coalesce(Sum("quantidade"), Value(0), output_field=DecimalField())
+    )["total"] or 0
+    
+    quantidade_consumida_os = OrdemServico.objects.filter(
+        status="faturada"
+    ).aggregate(
+        total=Coalesce(Sum("quantidade"), Value(0), output_field=DecimalField())
+    )["total"] or 0
+    
+    quantidade_consumida_of = OrdemFornecimento.objects.filter(
+        status="faturada"
+    ).aggregate(
+        total=Coalesce(Sum("quantidade"), Value(0), output_field=DecimalField())
+    )["total"] or 0
+    
+    quantidade_total_consumida = quantidade_consumida_os + quantidade_consumida_of
+    taxa_consumo = (
+        (quantidade_total_consumida / quantidade_total * 100)
+        if quantidade_total > 0
+        else 0
+    )
+
+    # ========== TOP CLIENTES POR VALOR ==========
+    top_clientes = (
+        Contrato.objects.values("cliente__nome_fantasia", "cliente__nome_razao_social")
+        .annotate(
+            valor_total=Coalesce(
+                Sum(
+                    ExpressionWrapper(
+                        F("itens__quantidade") * F("itens__valor_unitario"),
+                        output_field=DecimalField(max_digits=20, decimal_places=2),
+                    )
+                ),
+                Value(0, output_field=DecimalField(max_digits=20, decimal_places=2)),
+            )
+        )
+        .order_by("-valor_total")[:5]
+    )
+    
+    top_clientes_list = [
+        {
+            "nome": c["cliente__nome_fantasia"] or c["cliente__nome_razao_social"],
+            "valor": c["valor_total"] or 0,
+        }
+        for c in top_clientes
+    ]
+
+    # ========== DISTRIBUIÇÃO POR FORNECEDOR ==========
+    # Contagem de contratos por fornecedor (primeiro fornecedor de cada contrato)
+    contratos_por_fornecedor = {}
+    for contrato in Contrato.objects.filter(situacao="Ativo"):
+        fornecedores = contrato.fornecedores or []
+        if fornecedores:
+            fornecedor_principal = fornecedores[0]
+            contratos_por_fornecedor[fornecedor_principal] = (
+                contratos_por_fornecedor.get(fornecedor_principal, 0) + 1
+            )
+
+    # ========== NOVOS INDICADORES DE DESEMPENHO ==========
+    # Saldo Disponível Total (valor não faturado)
+    saldo_disponivel_total = valor_nao_faturado
+    
+    # Contratos com baixa utilização (< 50% faturado)
+    contratos_baixa_utilizacao = []
+    for contrato in Contrato.objects.filter(situacao="Ativo"):
+        valor_total_contrato = contrato.get_valor_total_itens()
+        valor_faturado_contrato = contrato.get_valor_total_faturado()
+        if valor_total_contrato > 0:
+            taxa_util_contrato = (valor_faturado_contrato / valor_total_contrato) * 100
+            if taxa_util_contrato < 50:
+                contratos_baixa_utilizacao.append({
+                    "numero": contrato.numero_contrato,
+                    "cliente": str(contrato.cliente),
+                    "valor_total": float(valor_total_contrato),
+                    "valor_faturado": float(valor_faturado_contrato),
+                    "taxa_utilizacao": round(taxa_util_contrato, 2),
+                })
+    
+    # Ordenar por taxa de utilização (menor primeiro)
+    contratos_baixa_utilizacao.sort(key=lambda x: x["taxa_utilizacao"])
+    contratos_baixa_utilizacao_count = len(contratos_baixa_utilizacao)
+    
+    # Itens com saldo crítico (< 10% do saldo inicial) ou que esgotam antes do fim do contrato,
+    # lidos da previsão materializada pelo comando atualizar_previsoes_consumo
+    itens_saldo_critico = []
+    for previsao in PrevisaoConsumoService.itens_criticos():
+        item = previsao.item
+        saldo_inicial = item.saldo_quantidade_inicial or Decimal("0.00")
+        itens_saldo_critico.append({
+            "numero": item.numero_item,
+            "descricao": item.descricao[:50],
+            "contrato": str(item.contrato.numero_contrato),
+            "saldo_atual": float(previsao.saldo_quantidade),
+            "saldo_inicial": float(saldo_inicial),
+            "percentual": round(float(previsao.saldo_quantidade / saldo_inicial * 100), 2) if saldo_inicial else 0,
+            "esgotamento_previsto": previsao.data_esgotamento_prevista,
+        })
+    
+    # Top 5 itens mais consumidos
+    top_itens_consumidos = (
+        ItemContrato.objects.annotate(
+            quantidade_consumida_total=ExpressionWrapper(
+                Coalesce(
+                    Sum("ordemservico__quantidade", filter=Q(ordemservico__status="faturada")),
+                    Value(0, output_field=DecimalField())
+                ) + Coalesce(
+                    Sum("ordemfornecimento__quantidade", filter=Q(ordemfornecimento__status="faturada")),
+                    Value(0, output_field=DecimalField())
+                ),
+                output_field=DecimalField()
+            )
+        )
+        .filter(quantidade_consumida_total__gt=0)
+        .order_by("-quantidade_consumida_total")[:5]
+    )
+    
+    top_itens_list = []
+    for item in top_itens_consumidos:
+        top_itens_list.append({
+            "descricao": item.descricao[:40] if len(item.descricao) > 40 else item.descricao,
+            "contrato": item.contrato.numero_contrato,
+            "quantidade_consumida": float(item.quantidade_consumida_total) if item.quantidade_consumida_total else 0.0,
+        })
+    
+    # Top 5 fornecedores por valor faturado
+    fornecedores_faturamento = {}
+    for contrato in Contrato.objects.filter(situacao="Ativo"):
+        fornecedores = contrato.fornecedores or []
+        valor_faturado_contrato = contrato.get_valor_total_faturado()
+        for fornecedor in fornecedores:
+            if fornecedor not in fornecedores_faturamento:
+                fornecedores_faturamento[fornecedor] = Decimal(0)
+            fornecedores_faturamento[fornecedor] += Decimal(str(valor_faturado_contrato)) / len(fornecedores) if fornecedores else Decimal(0)
+    
+    top_fornecedores = sorted(
+        fornecedores_faturamento.items(),
+        key=lambda x: x[1],
+        reverse=True
+    )[:5]
+    
+    top_fornecedores_list = [
+        {
+            "nome": fornecedor,
+            "valor_faturado": float(valor),
+        }
+        for fornecedor, valor in top_fornecedores
+    ]
+    
+    # Tempo médio de execução OS (em dias)
+    os_com_tempo = OrdemServico.objects.filter(
+        status__in=["finalizada", "faturada"],
+        data_inicio__isnull=False,
+        data_termino__isnull=False,
+    )
+    
+    tempos_execucao_os = []
+    for os_item in os_com_tempo:
+        if os_item.data_inicio and os_item.data_termino:
+            dias = (os_item.data_termino - os_item.data_inicio).days
+            if dias > 0:
+                tempos_execucao_os.append(dias)
+    
+    tempo_medio_execucao_os = sum(tempos_execucao_os) / len(tempos_execucao_os) if tempos_execucao_os else 0
+    
+    # Tempo médio de execução OF (em dias)
+    of_com_tempo = OrdemFornecimento.objects.filter(
+        status__in=["finalizada", "faturada"],
+        data_ativacao__isnull=False,
+    )
+    
+    tempos_execucao_of = []
+    for of_item in of_com_tempo:
+        if of_item.data_ativacao:
+            # Usar data de criação como início
+            # data_ativacao já é um DateField (date), criado_em é DateTimeField (datetime)
+            dias = (of_item.data_ativacao - of_item.criado_em.date()).days
+            if dias > 0:
+                tempos_execucao_of.append(dias)
+    
+    tempo_medio_execucao_of = sum(tempos_execucao_of) / len(tempos_execucao_of) if tempos_execucao_of else 0
+    
+    # ========== GRÁFICOS ==========
+    # Gráfico de faturamento mensal (últimos 6 meses)
+    meses_labels = []
+    meses_valores = []
+    for i in range(5, -1, -1):
+        data_mes = hoje - timedelta(days=30 * i)
+        mes_label = data_mes.strftime("%b/%Y")
+        meses_labels.append(mes_label)
+        
+        # Faturamento do mês (OS e OF faturadas no mês)
+        valor_mes_os = (
+            OrdemServico.objects.filter(
+                status="faturada",
+                data_faturamento__year=data_mes.year,
+                data_faturamento__month=data_mes.month,
+            ).aggregate(
+                total=Coalesce(
+                    Sum("valor_total"),
+                    Value(0, output_field=DecimalField()),
+                )
+            )["total"]
+            or 0
+        )
+        
+        valor_mes_of = (
+            OrdemFornecimento.objects.filter(
+                status="faturada",
+                data_faturamento__year=data_mes.year,
+                data_faturamento__month=data_mes.month,
+            ).aggregate(
+                total=Coalesce(
+                    Sum("valor_total"),
+                    Value(0, output_field=DecimalField()),
+                )
+            )["total"]
+            or 0
+        )
+        
+        meses_valores.append(float(valor_mes_os + valor_mes_of))
+
+    # Garantir que todos os valores sejam float
+    meses_valores_float = [float(v) if v else 0.0 for v in meses_valores]
+    
+    # Passar objetos Python diretamente (json_script fará a serialização)
+    grafico_faturamento = {
+        "labels": meses_labels,
+            "datasets": [
+                {
+                    "label": "Faturamento",
+                "data": meses_valores_float,
+                "backgroundColor": "rgba(59, 130, 246, 0.6)",
+            }
+        ],
+    }
+
+    # Gráfico de contratos por cliente (top 5)
+    if top_clientes_list:
+        grafico_contratos_por_cliente = {
+            "labels": [str(c.get("nome", ""))[:20] for c in top_clientes_list if c.get("nome")],
+            "datasets": [
+                {
+                    "label": "Valor (R$)",
+                    "data": [float(c.get("valor", 0) or 0) for c in top_clientes_list],
+                    "backgroundColor": [
+                        "rgba(59, 130, 246, 0.6)",
+                        "rgba(16, 185, 129, 0.6)",
+                        "rgba(245, 158, 11, 0.6)",
+                        "rgba(239, 68, 68, 0.6)",
+                        "rgba(139, 92, 246, 0.6)",
+            ],
+                }
+            ],
+        }
+    else:
+        grafico_contratos_por_cliente = {
+            "labels": ["Sem Dados"],
+            "datasets": [
+                {
+                    "label": "Contratos",
+                    "data": [1],
+                    "backgroundColor": ["rgba(255, 99, 132, 0.6)"],
+                }
+            ],
+        }
+
+    # Gráfico de status de contratos
+    grafico_status_contratos = {
+        "labels": ["Ativos", "Inativos"],
+        "datasets": [
+            {
+                "label": "Contratos",
+                "data": [contratos_ativos, contratos_inativos],
+                "backgroundColor": [
+                    "rgba(16, 185, 129, 0.6)",
+                    "rgba(239, 68, 68, 0.6)",
+                ],
+            }
+        ],
+    }
+    
+    # Gráfico de status de OS/OF
+    grafico_status_os_of = {
+        "labels": ["Abertas", "Em Execução", "Finalizadas", "Faturadas"],
+        "datasets": [
+            {
+                "label": "OS",
+                "data": [int(os_abertas or 0), int(os_execucao or 0), int(os_finalizadas or 0), int(os_faturadas or 0)],
+                "backgroundColor": "rgba(59, 130, 246, 0.6)",
+            },
+            {
+                "label": "OF",
+                "data": [int(of_abertas or 0), int(of_execucao or 0), int(of_finalizadas or 0), int(of_faturadas or 0)],
+                "backgroundColor": "rgba(16, 185, 129, 0.6)",
+            },
+        ],
+    }
+    
+    # Gráfico de distribuição por fornecedor (valor faturado)
+    if top_fornecedores_list:
+        grafico_fornecedores = {
+            "labels": [str(f.get("nome", ""))[:20] for f in top_fornecedores_list if f.get("nome")],
+            "datasets": [
+                {
+                    "label": "Valor Faturado (R$)",
+                    "data": [float(f.get("valor_faturado", 0) or 0) for f in top_fornecedores_list],
+                    "backgroundColor": [
+                        "rgba(59, 130, 246, 0.6)",
+                        "rgba(16, 185, 129, 0.6)",
+                        "rgba(245, 158, 11, 0.6)",
+                        "rgba(239, 68, 68, 0.6)",
+                        "rgba(139, 92, 246, 0.6)",
+                    ],
+                }
+            ],
+        }
+    else:
+        grafico_fornecedores = {
+            "labels": ["Sem Dados"],
+            "datasets": [
+                {
+                    "label": "Fornecedores",
+                    "data": [1],
+                    "backgroundColor": ["rgba(255, 99, 132, 0.6)"],
+                }
+            ],
+        }
+
+    # ========== DADOS ADICIONAIS PARA O TEMPLATE ==========
+    # Próximos vencimentos (próximos 30 dias)
+    proximos_vencimentos_list = []
+    for contrato in Contrato.objects.filter(
+        situacao="Ativo",
+        data_fim__gte=hoje,
+        data_fim__lte=hoje + timedelta(days=30)
+    ).select_related("cliente")[:5]:
+        dias_restantes = (contrato.data_fim - hoje).days
+        proximos_vencimentos_list.append({
+            "cliente": str(contrato.cliente),
+            "numero": contrato.numero_contrato,
+            "dias_restantes": dias_restantes,
+        })
+    
+    # Valores financeiros adicionais (placeholders - podem ser calculados se houver modelo de pagamentos)
+    a_receber = valor_nao_faturado  # Valor não faturado pode ser considerado "a receber"
+    em_atraso = Decimal(0)  # Placeholder - requer modelo de pagamentos
+    recebido = valor_total_faturado  # Valor faturado pode ser considerado "recebido"
+    
+    # Garantir que os gráficos não sejam None
+    if grafico_faturamento is None:
+        grafico_faturamento = {"labels": ["Jan", "Fev", "Mar", "Abr", "Mai", "Jun"], "datasets": [{"label": "Faturamento", "data": [0, 0, 0, 0, 0, 0]}]}
+    if grafico_contratos_por_cliente is None:
+        grafico_contratos_por_cliente = {"labels": ["Sem Dados"], "datasets": [{"label": "Valor (R$)", "data": [1]}]}
+    if grafico_status_os_of is None:
+        grafico_status_os_of = {"labels": ["Abertas", "Em Execução", "Finalizadas", "Faturadas"], "datasets": [{"label": "OS", "data": [0, 0, 0, 0]}, {"label": "OF", "data": [0, 0, 0, 0]}]}
+    if grafico_fornecedores is None:
+        grafico_fornecedores = {"labels": ["Sem Dados"], "datasets": [{"label": "Valor Faturado (R$)", "data": [1]}]}
+    
+    # ========== CONTEXT ==========
+    return {
+        # Básicos
+        "total_clientes": total_clientes,
+        "total_contratos": total_contratos,
+        "contratos_ativos": contratos_ativos,
+        "contratos_inativos": contratos_inativos,
+        # Financeiros
+        "valor_total_contratos": valor_total_contratos,
+        "valor_total_faturado": valor_total_faturado,
+        "valor_nao_faturado": valor_nao_faturado,
+        "taxa_utilizacao": round(taxa_utilizacao, 2),
+        "valor_medio_contrato": valor_medio_contrato,
+        "saldo_disponivel_total": saldo_disponivel_total,
+        "a_receber": a_receber,
+        "em_atraso": em_atraso,
+        "recebido": recebido,
+        # Vencimento
+        "contratos_vencendo_30": contratos_vencendo_30,
+        "contratos_vencendo_60": contratos_vencendo_60,
+        "contratos_vencendo_90": contratos_vencendo_90,
+        "contratos_vencidos": contratos_vencidos,
+        "proximos_vencimentos": proximos_vencimentos_list,
+        # Execução
+        "os_abertas": os_abertas,
+        "os_execucao": os_execucao,
+        "os_finalizadas": os_finalizadas,
+        "os_faturadas": os_faturadas,
+        "total_os": total_os,
+        "of_abertas": of_abertas,
+        "of_execucao": of_execucao,
+        "of_finalizadas": of_finalizadas,
+        "of_faturadas": of_faturadas,
+        "total_of": total_of,
+        "taxa_execucao_os": round(taxa_execucao_os, 2),
+        "taxa_execucao_of": round(taxa_execucao_of, 2),
+        "tempo_medio_execucao_os": round(tempo_medio_execucao_os, 1),
+        "tempo_medio_execucao_of": round(tempo_medio_execucao_of, 1),
+        # Consumo
+        "total_itens": total_itens,
+        "quantidade_total": quantidade_total,
+        "quantidade_total_consumida": quantidade_total_consumida,
+        "taxa_consumo": round(taxa_consumo, 2),
+        # Novos indicadores
+        "contratos_baixa_utilizacao": contratos_baixa_utilizacao[:5],  # Top 5
+        "contratos_baixa_utilizacao_count": contratos_baixa_utilizacao_count,
+        "itens_saldo_critico": itens_saldo_critico,  # Top 5
+        "top_itens_consumidos": top_itens_list,
+        "top_fornecedores": top_fornecedores_list,
+        # Top clientes
+        "top_clientes": top_clientes_list,
+        # Gráficos
+        "grafico_faturamento": grafico_faturamento,
+        "grafico_contratos_por_cliente": grafico_contratos_por_cliente,
+        "grafico_status_contratos": grafico_status_contratos,
+        "grafico_status_os_of": grafico_status_os_of,
+        "grafico_fornecedores": grafico_fornecedores,
+    }
+
+
+# Dashboard
+@login_required
+def dashboard(request):
+    hoje = timezone.now().date()
+
+    # Indicadores em cache pela versão do painel (e pela data, por causa das janelas de vencimento)
+    context = dict(
+        CacheVersaoService.obter("painel", "geral", f"indicadores:{hoje.isoformat()}", lambda: _indicadores(hoje))
+    )
+
+    # Alertas de contratos ainda não reconhecidos (gerados pelo comando gerar_alertas_contratos)
+    alertas_contratos = AlertaContratoService.ativos(pendentes=True)
+    context["total_alertas_contratos"] = alertas_contratos.count()
+    context["alertas_contratos"] = list(alertas_contratos[:5])
+
+    # Contratos recentes (últimos 5)
+    context["contratos_recentes"] = Contrato.objects.select_related("cliente").order_by("-data_assinatura")[:5]
+
+    # Atividades recentes (fluxo de eventos gravado pelos signals)
+    context["atividades_recentes"] = EventoService.recentes(8)
+
+    return render(request, "contracts/dashboard.html", context)
@@ -0,0 +1,408 @@
+"""
+Views de SLAs, fila de faturamento e relatórios financeiros
+"""
+from django.shortcuts import render, get_object_or_404, redirect
+from django.urls import reverse
+from django.http import HttpResponse
+from django.contrib import messages
+from django.db.models import Q, Sum, F, Count
+from django.db.models.functions import Coalesce
+from django.core.paginator import Paginator
+from django.views.decorators.http import require_http_methods
+from datetime import datetime
+from django.utils import timezone
+from decimal import Decimal
+import csv, os
+
+from ..models import (
+    Cliente,
+    Contrato,
+    OrdemFornecimento,
+    OrdemServico,
+    SLA,
+    PrevisaoConsumoItem,
+    GlosaPrevista,
+)
+from ..services import RelatorioRentabilidadeService, FaturamentoService, GlosaService
+from ..templatetags.math_extras import currency_br
+from .comum import group_required
+
+
+# ========== GESTÃO DE CONTRATOS E OF - NOVAS VIEWS ==========
+
+# SLA - Listagem
+@group_required("Admin", "Gerente", "Leitor")
+def sla_list(request):
+    slas = SLA.objects.select_related('contrato').all()
+    
+    contrato_id = request.GET.get("contrato")
+    tipo = request.GET.get("tipo")
+    ativo = request.GET.get("ativo")
+    
+    if contrato_id:
+        slas = slas.filter(contrato_id=contrato_id)
+    if tipo:
+        slas = slas.filter(tipo=tipo)
+    if ativo == "ativo":
+        slas = slas.filter(ativo=True)
+    elif ativo == "inativo":
+        slas = slas.filter(ativo=False)
+    
+    paginator = Paginator(slas, 10)
+    page = request.GET.get("page")
+    slas_page = paginator.get_page(page)
+    
+    return render(request, "sla/list.html", {"slas": slas_page})
+
+
+# SLA - Criar
+@group_required("Admin", "Gerente")
+def sla_create(request):
+    from ..forms import SLAForm
+    if request.method == "POST":
+        form = SLAForm(request.POST)
+        if form.is_valid():
+            form.save()
+            messages.success(request, "SLA criado com sucesso!")
+            return redirect("sla_list")
+    else:
+        form = SLAForm()
+        # Preencher contrato se vier na URL
+        contrato_id = request.GET.get("contrato")
+        if contrato_id:
+            form.fields['contrato'].initial = contrato_id
+    return render(request, "sla/form.html", {"form": form})
+
+
+# SLA - Editar
+@group_required("Admin", "Gerente")
+def sla_update(request, pk):
+    from ..forms import SLAForm
+    sla = get_object_or_404(SLA, pk=pk)
+    if request.method == "POST":
+        form = SLAForm(request.POST, instance=sla)
+        if form.is_valid():
+            form.save()
+            messages.success(request, "SLA atualizado com sucesso!")
+            return redirect("sla_list")
+    else:
+        form = SLAForm(instance=sla)
+    return render(request, "sla/form.html", {"form": form})
+
+
+# SLA - Detalhar
+@group_required("Admin", "Gerente", "Leitor")
+def sla_detail(request, pk):
+    sla = get_object_or_404(SLA.objects.select_related('contrato'), pk=pk)
+    return render(request, "sla/detail.html", {"sla": sla})
+
+
+# Fila de Faturamento - Listagem
+@group_required("Admin", "Gerente", "Leitor")
+def fila_faturamento(request):
+    """Fila de OS e OF pendentes de faturamento"""
+    # OS finalizadas mas não faturadas
+    os_pendentes = OrdemServico.objects.filter(
+        status="finalizada"
+    ).select_related('cliente', 'contrato', 'item_contrato').order_by('-data_emissao_trd')
+    
+    # OF finalizadas mas não faturadas
+    of_pendentes = OrdemFornecimento.objects.filter(
+        status="finalizada"
+    ).select_related('cliente', 'contrato', 'item_contrato').prefetch_related('itens_fornecedor').order_by('-data_ativacao')
+    
+    # Filtros
+    tipo = request.GET.get("tipo")
+    cliente_id = request.GET.get("cliente")
+    contrato_id = request.GET.get("contrato")
+    
+    if tipo == "os":
+        of_pendentes = OrdemFornecimento.objects.none()
+    elif tipo == "of":
+        os_pendentes = OrdemServico.objects.none()
+    
+    if cliente_id:
+        os_pendentes = os_pendentes.filter(cliente_id=cliente_id)
+        of_pendentes = of_pendentes.filter(cliente_id=cliente_id)
+    
+    if contrato_id:
+        os_pendentes = os_pendentes.filter(contrato_id=contrato_id)
+        of_pendentes = of_pendentes.filter(contrato_id=contrato_id)
+    
+    # Estatísticas
+    total_os_pendentes = os_pendentes.count()
+    total_of_pendentes = of_pendentes.count()
+    valor_total_os = sum(os.receita_prevista for os in os_pendentes if os.receita_prevista)
+    valor_total_of = sum(of.valor_total for of in of_pendentes if of.valor_total)
+    
+    # Glosas previstas por violação de SLA (deduções projetadas, calculadas por calcular_glosas)
+    os_lista = list(os_pendentes[:50])  # Limitar a 50 para performance
+    of_lista = list(of_pendentes[:50])
+    glosas = GlosaService.por_documento([o.pk for o in os_lista], [o.pk for o in of_lista])
+    for os_item in os_lista:
+        os_item.glosa_prevista = glosas["os"].get(os_item.pk, Decimal("0.00"))
+    for of_item in of_lista:
+        of_item.glosa_prevista = glosas["of"].get(of_item.pk, Decimal("0.00"))
+    total_glosas = GlosaPrevista.objects.filter(
+        Q(ordem_servico__in=os_pendentes.values("pk")) | Q(ordem_fornecimento__in=of_pendentes.values("pk"))
+    ).aggregate(total=Coalesce(Sum("valor"), Decimal("0.00")))["total"]
+    
+    context = {
+        "os_pendentes": os_lista,
+        "of_pendentes": of_lista,
+        "total_os_pendentes": total_os_pendentes,
+        "total_of_pendentes": total_of_pendentes,
+        "valor_total_os": valor_total_os,
+        "valor_total_of": valor_total_of,
+        "valor_total_geral": valor_total_os + valor_total_of,
+        "total_glosas": total_glosas,
+        "valor_liquido": valor_total_os + valor_total_of - total_glosas,
+    }
+    
+    return render(request, "fila_faturamento/list.html", context)
+
+
+# Fila de Faturamento - Glosas previstas (memória de cálculo)
+@group_required("Admin", "Gerente", "Leitor")
+def fila_faturamento_glosas(request):
+    """Glosas previstas da competência por documento e penalização; ?formato=csv exporta"""
+    try:
+        competencia = datetime.strptime(request.GET.get("competencia", ""), "%Y-%m").date()
+    except ValueError:
+        competencia = timezone.localdate().replace(day=1)
+    contrato_id = request.GET.get("contrato")
+
+    glosas = GlosaPrevista.objects.filter(competencia=competencia).select_related(
+        "contrato", "penalizacao__sla_importante", "ordem_servico", "ordem_fornecimento"
+    )
+    if contrato_id:
+        glosas = glosas.filter(contrato_id=contrato_id)
+
+    if request.GET.get("formato") == "csv":
+        response = HttpResponse(content_type="text/csv")
+        response["Content-Disposition"] = f'attachment; filename="glosas_{competencia:%Y_%m}.csv"'
+        writer = csv.writer(response)
+        writer.writerow([
+            "Competência", "Contrato", "Documento", "SLA", "Penalização", "Violações",
+            "Valor do Documento", "Percentual", "Valor Fixo Rateado", "Glosa",
+        ])
+        for glosa in glosas:
+            documento = glosa.ordem_servico.numero_os if glosa.ordem_servico else glosa.ordem_fornecimento.numero_of
+            writer.writerow([
+                f"{competencia:%m/%Y}", glosa.contrato.numero_contrato, documento,
+                glosa.penalizacao.sla_importante.nome, glosa.penalizacao.descricao, glosa.violacoes,
+                glosa.valor_base, glosa.percentual or "", glosa.valor_fixo_rateado, glosa.valor,
+            ])
+        return response
+
+    context = {
+        "glosas": glosas,
+        "competencia": competencia,
+        "contrato_id": contrato_id,
+        "total": glosas.aggregate(total=Coalesce(Sum("valor"), Decimal("0.00")))["total"],
+        "contratos": Contrato.objects.filter(
+            pk__in=GlosaPrevista.objects.filter(competencia=competencia).values("contrato_id")
+        ).order_by("numero_contrato"),
+    }
+    return render(request, "fila_faturamento/glosas.html", context)
+
+
+# Fila de Faturamento - Recalcular glosas da competência
+@group_required("Admin", "Gerente")
+@require_http_methods(["POST"])
+def fila_faturamento_glosas_recalcular(request):
+    """Recalcula as glosas previstas da competência informada (AAAA-MM)"""
+    try:
+        competencia = datetime.strptime(request.POST.get("competencia", ""), "%Y-%m").date()
+    except ValueError:
+        competencia = timezone.localdate().replace(day=1)
+    resultado = GlosaService.processar(competencia)
+    messages.success(
+        request,
+        f"{resultado['glosas']} glosa(s) prevista(s) em {resultado['documentos']} documento(s) "
+        f"({currency_br(resultado['valor_total'])}) para {competencia:%m/%Y}.",
+    )
+    return redirect(f"{reverse('fila_faturamento_glosas')}?competencia={competencia:%Y-%m}")
+
+
+# Fila de Faturamento - Marcar como Faturado (OS)
+@group_required("Admin", "Gerente")
+def marcar_os_faturada(request, pk):
+    """Marca uma OS como faturada"""
+    os_item = get_object_or_404(OrdemServico, pk=pk)
+    if os_item.status == "finalizada":
+        os_item.status = "faturada"
+        if not os_item.data_faturamento:
+            os_item.data_faturamento = timezone.now().date()
+        os_item.save()
+        messages.success(request, f"OS {os_item.numero_os} marcada como faturada!")
+    else:
+        messages.error(request, "Apenas OS finalizadas podem ser marcadas como faturadas.")
+    return redirect("fila_faturamento")
+
+
+# Fila de Faturamento - Marcar como Faturado (OF)
+@group_required("Admin", "Gerente")
+def marcar_of_faturada(request, pk):
+    """Marca uma OF como faturada"""
+    of_item = get_object_or_404(OrdemFornecimento, pk=pk)
+    if of_item.status == "finalizada":
+        of_item.status = "faturada"
+        if not of_item.data_faturamento:
+            of_item.data_faturamento = timezone.now().date()
+        of_item.save()
+        messages.success(request, f"OF {of_item.numero_of} marcada como faturada!")
+    else:
+        messages.error(request, "Apenas OF finalizadas podem ser marcadas como faturadas.")
+    return redirect("fila_faturamento")
+
+
+# Fila de Faturamento - Faturar selecionados (OS e OF em lote)
+@group_required("Admin", "Gerente")
+@require_http_methods(["POST"])
+def faturar_selecionados(request):
+    """Marca como faturadas, em uma única transação, as OS/OF selecionadas na fila"""
+    try:
+        os_ids = [int(pk) for pk in request.POST.getlist("os_ids")]
+        of_ids = [int(pk) for pk in request.POST.getlist("of_ids")]
+    except ValueError:
+        messages.error(request, "Seleção inválida.")
+        return redirect("fila_faturamento")
+
+    if not os_ids and not of_ids:
+        messages.warning(request, "Nenhuma OS ou OF selecionada.")
+        return redirect("fila_faturamento")
+
+    resultado = FaturamentoService.faturar_em_lote(os_ids, of_ids)
+
+    faturadas = resultado["faturadas_os"] + resultado["faturadas_of"]
+    if faturadas:
+        messages.success(
+            request,
+            f"{resultado['faturadas_os']} OS e {resultado['faturadas_of']} OF marcadas como faturadas "
+            f"({currency_br(resultado['valor_total'])}).",
+        )
+    for item in resultado["resultados"]:
+        if not item["ok"]:
+            messages.error(request, f"{item['tipo']} {item['numero'] or item['id']}: {item['mensagem']}.")
+    return redirect("fila_faturamento")
+
+
+# Relatório de Rentabilidade do Portfólio
+@group_required("Admin", "Gerente", "Leitor")
+def relatorio_rentabilidade(request):
+    """Rentabilidade das OS por cliente, fornecedor e mês, com drill-down e exportação"""
+    dimensao = request.GET.get("dimensao", "cliente")
+    if dimensao not in RelatorioRentabilidadeService.DIMENSOES:
+        dimensao = "cliente"
+
+    filtros = {
+        campo: request.GET.get(campo)
+        for campo in ("cliente", "fornecedor", "mes", "status", "contrato")
+        if request.GET.get(campo)
+    }
+    # Ids não numéricos são descartados (o filtro por chave estrangeira falharia)
+    for campo in ("cliente", "contrato"):
+        if campo in filtros and not filtros[campo].isdigit():
+            del filtros[campo]
+
+    df = RelatorioRentabilidadeService.carregar_dataframe(filtros)
+
+    # Drill-down esgotado: todas as dimensões filtradas, exibir as OS
+    detalhar_os = request.GET.get("detalhe") == "os" or all(
+        filtros.get(d) for d in RelatorioRentabilidadeService.ORDEM_DRILL_DOWN
+    )
+
+    formato = request.GET.get("formato")
+    dimensao_exportacao = None if detalhar_os else dimensao
+    nome_arquivo = f"rentabilidade_{timezone.now().strftime('%Y%m%d')}"
+    if formato == "csv":
+        response = HttpResponse(
+            RelatorioRentabilidadeService.exportar_csv(df, dimensao_exportacao),
+            content_type="text/csv; charset=utf-8",
+        )
+        response["Content-Disposition"] = f'attachment; filename="{nome_arquivo}.csv"'
+        return response
+    if formato == "xlsx":
+        response = HttpResponse(
+            RelatorioRentabilidadeService.exportar_xlsx(df, dimensao_exportacao),
+            content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        )
+        response["Content-Disposition"] = f'attachment; filename="{nome_arquivo}.xlsx"'
+        return response
+
+    if detalhar_os:
+        linhas = RelatorioRentabilidadeService.linhas(
+            df.sort_values("margem") if not df.empty else df
+        )
+    else:
+        from urllib.parse import urlencode
+
+        linhas = RelatorioRentabilidadeService.linhas(
+            RelatorioRentabilidadeService.agregar(df, dimensao)
+        )
+        proxima = RelatorioRentabilidadeService.proxima_dimensao(dimensao, filtros)
+        for linha in linhas:
+            # Cliente é filtrado pelo id; fornecedor e mês pelo próprio rótulo
+            valor = linha["cliente_id"] if dimensao == "cliente" else linha[dimensao]
+            parametros = {**filtros, dimensao: valor}
+            if proxima:
+                parametros["dimensao"] = proxima
+            else:
+                parametros["detalhe"] = "os"
+            linha["rotulo"] = linha[dimensao]
+            linha["url_drill"] = f"{reverse('relatorio_rentabilidade')}?{urlencode(parametros)}"
+
+    # Tabela dinâmica cliente x mês do recorte atual
+    tabela = RelatorioRentabilidadeService.pivot(df)
+    pivot_meses = [str(c) for c in tabela.columns] if not tabela.empty else []
+    pivot_linhas = [
+        {"rotulo": indice, "valores": [float(v) for v in valores]}
+        for indice, valores in zip(tabela.index, tabela.to_numpy())
+    ] if not tabela.empty else []
+
+    context = {
+        "dimensao": dimensao,
+        "dimensoes": RelatorioRentabilidadeService.DIMENSOES,
+        "proxima_dimensao": RelatorioRentabilidadeService.proxima_dimensao(dimensao, filtros),
+        "filtros": filtros,
+        "detalhar_os": detalhar_os,
+        "linhas": linhas,
+        "totais": RelatorioRentabilidadeService.totais(df),
+        "pivot_meses": pivot_meses,
+        "pivot_linhas": pivot_linhas,
+        "querystring": request.GET.urlencode(),
+        "clientes": Cliente.objects.order_by("nome_razao_social").only("id", "nome_razao_social", "nome_fantasia"),
+        "status_choices": OrdemServico.STATUS_CHOICES,
+    }
+    return render(request, "relatorios/rentabilidade.html", context)
+
+
+# Previsão de Consumo dos Itens de Contrato
+@group_required("Admin", "Gerente", "Leitor")
+def relatorio_previsao_consumo(request):
+    """Ritmo de consumo e esgotamento previsto do saldo dos itens (tabela materializada)"""
+    previsoes = PrevisaoConsumoItem.objects.select_related("item__contrato__cliente").order_by(
+        F("data_esgotamento_prevista").asc(nulls_last=True), "-percentual_ocioso"
+    )
+    situacao = request.GET.get("situacao")
+    if situacao:
+        previsoes = previsoes.filter(situacao=situacao)
+    contrato = request.GET.get("contrato")
+    if contrato:
+        previsoes = previsoes.filter(item__contrato__numero_contrato__icontains=contrato)
+
+    resumo = dict(
+        PrevisaoConsumoItem.objects.values("situacao").annotate(total=Count("id")).values_list("situacao", "total")
+    )
+    context = {
+        "previsoes": Paginator(previsoes, 50).get_page(request.GET.get("page")),
+        "situacao": situacao,
+        "contrato": contrato or "",
+        "situacoes": [
+            {"valor": valor, "rotulo": rotulo, "total": resumo.get(valor, 0)}
+            for valor, rotulo in PrevisaoConsumoItem.SITUACAO_CHOICES
+        ],
+        "calculado_em": PrevisaoConsumoItem.objects.values_list("calculado_em", flat=True).first(),
+    }
+    return render(request, "relatorios/previsao_consumo.html", context)
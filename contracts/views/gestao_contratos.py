@@ -0,0 +1,711 @@
+"""
+Views da gestão de contratos (todos os regimes), stakeholders e termos aditivos
+"""
+from django.shortcuts import render, get_object_or_404, redirect
+from django.urls import reverse
+from django.template.loader import render_to_string
+from django.middleware.csrf import get_token
+from django.http import Http404, HttpResponse, JsonResponse
+from django.contrib import messages
+from django.db.models import Q, Value, Case, When, IntegerField, Count
+from django.contrib.auth.decorators import login_required
+from django.core.paginator import Paginator
+from django.views.decorators.http import require_GET
+from django.views.decorators.http import require_http_methods
+from django.utils import timezone
+from django import forms
+from decimal import Decimal
+import csv, json
+
+from ..models import (
+    Contrato,
+    OrdemFornecimento,
+    OrdemServico,
+    StakeholderContrato,
+    TermoAditivo,
+    RegimeLegal,
+    TipoTermoAditivo,
+    AlertaContrato,
+)
+from ..services import (
+    ContratoService, AlertaContratoService, EventoService, ConformidadeSLAService, CacheVersaoService,
+)
+from ..forms import ItemContratoForm, ContratoPublicoForm, TermoAditivoForm
+from .comum import group_required
+
+
+CONTRATO_LIST_COLUMNS = [
+    {"id": "numero", "label": "Nº Contrato"},
+    {"id": "cliente", "label": "Cliente"},
+    {"id": "fornecedor", "label": "Fornecedores"},
+    {"id": "assinatura", "label": "Data Assinatura"},
+    {"id": "fim", "label": "Data Fim"},
+    {"id": "valor", "label": "Valor Total (R$)"},
+    {"id": "valor_faturado", "label": "Valor Total Faturado (R$)"},
+    {"id": "valor_nao_faturado", "label": "Valor Total Não Faturado (R$)"},
+    {"id": "situacao", "label": "Situação"},
+]
+
+
+# ========== VIEWS PARA GESTÃO DE CONTRATOS ==========
+# Modelo unificado para todos os regimes: Lei 14.133, Lei 13.303 e Privado
+
+# Gestão de Contratos - Listar (todos os regimes)
+@group_required("Admin", "Gerente", "Leitor")
+def gestao_contratos_list(request):
+    """Lista todos os contratos (todos os regimes)"""
+    contratos = Contrato.objects.select_related('cliente').order_by('-data_assinatura')
+    
+    # Filtros
+    search_query = request.GET.get('search')
+    regime_filter = request.GET.get('regime_legal')
+    renovacao_pendente = request.GET.get('renovacao_pendente')
+    
+    if search_query:
+        contratos = contratos.filter(
+            Q(numero_contrato__icontains=search_query) |
+            Q(cliente__nome_razao_social__icontains=search_query) |
+            Q(objeto__icontains=search_query)
+        )
+    if regime_filter:
+        contratos = contratos.filter(regime_legal=regime_filter)
+    if renovacao_pendente == 'true':
+        # Filtrar contratos com renovação pendente (alertas materializados)
+        contratos = contratos.filter(pk__in=AlertaContratoService.contratos_com_renovacao_pendente())
+    
+    # Contadores por regime
+    total_contratos = Contrato.objects.count()
+    total_lei_14133 = Contrato.objects.filter(regime_legal=RegimeLegal.LEI_14133).count()
+    total_lei_13303 = Contrato.objects.filter(regime_legal=RegimeLegal.LEI_13303).count()
+    total_privados = Contrato.objects.filter(regime_legal=RegimeLegal.PRIVADO).count()
+    total_renovacao_pendente = AlertaContratoService.contratos_com_renovacao_pendente().distinct().count()
+    
+    paginator = Paginator(contratos, 50)
+    page_number = request.GET.get('page')
+    page_obj = paginator.get_page(page_number)
+    
+    context = {
+        "page_obj": page_obj,
+        "search_query": search_query,
+        "regime_filter": regime_filter,
+        "renovacao_pendente": renovacao_pendente,
+        "regime_choices": RegimeLegal.choices,
+        "total_contratos": total_contratos,
+        "total_lei_14133": total_lei_14133,
+        "total_lei_13303": total_lei_13303,
+        "total_privados": total_privados,
+        "total_renovacao_pendente": total_renovacao_pendente,
+    }
+    return render(request, "gestao_contratos/list.html", context)
+
+
+# Gestão de Contratos - Linha do tempo de eventos
+@login_required
+@group_required("Admin", "Gerente", "Leitor")
+@require_GET
+def api_contrato_eventos(request, pk):
+    """Eventos do contrato, do mais recente, paginados por chave (?cursor=)"""
+    pagina = EventoService.linha_do_tempo(pk, request.GET.get("cursor"))
+    return JsonResponse({
+        "eventos": [
+            {
+                "entidade": evento.get_entidade_display(),
+                "acao": evento.acao,
+                "descricao": evento.descricao,
+                "usuario": evento.usuario.get_username() if evento.usuario else "",
+                "criado_em": timezone.localtime(evento.criado_em).strftime("%d/%m/%Y %H:%M"),
+            }
+            for evento in pagina["eventos"]
+        ],
+        "proximo": pagina["proximo"],
+    })
+
+
+# Gestão de Contratos - Importar incidentes de SLA
+@group_required("Admin", "Gerente")
+@require_http_methods(["POST"])
+def gestao_contratos_sla_incidentes_importar(request, pk):
+    """
+    Importa incidentes dos SLAs importantes do contrato e recalcula a conformidade
+
+    Aceita um arquivo CSV (campo "arquivo", formulário da aba SLAs) ou um corpo
+    JSON (lista ou {"incidentes": [...]}) com sla, identificador, aberto_em,
+    respondido_em, resolvido_em e descricao; no JSON a resposta também é JSON.
+    """
+    contrato = get_object_or_404(Contrato, pk=pk)
+    arquivo = request.FILES.get("arquivo")
+    if arquivo is None:
+        try:
+            dados = json.loads(request.body)
+        except ValueError:
+            return JsonResponse({"error": "JSON inválido"}, status=400)
+        registros = dados.get("incidentes") if isinstance(dados, dict) else dados
+        if not isinstance(registros, list):
+            return JsonResponse({"error": "Informe uma lista de incidentes"}, status=400)
+        return JsonResponse(ConformidadeSLAService.importar(contrato, registros))
+
+    try:
+        registros = ConformidadeSLAService.ler_csv(arquivo.read().decode("utf-8-sig"))
+    except (UnicodeDecodeError, csv.Error) as e:
+        messages.error(request, f"Arquivo inválido: {e}")
+        return redirect(f"{reverse('gestao_contratos_detail', kwargs={'pk': pk})}?tab=slas")
+    resultado = ConformidadeSLAService.importar(contrato, registros)
+    messages.success(
+        request, f"{resultado['criados']} incidente(s) importado(s) e {resultado['atualizados']} atualizado(s)."
+    )
+    for erro in resultado["erros"][:10]:
+        messages.warning(request, erro)
+    return redirect(f"{reverse('gestao_contratos_detail', kwargs={'pk': pk})}?tab=slas")
+
+
+# Gestão de Contratos - Alertas
+@group_required("Admin", "Gerente", "Leitor")
+def gestao_contratos_alertas(request):
+    """Alertas ativos dos contratos (renovação, limite de vigência e de aditivos)"""
+    tipo = request.GET.get("tipo")
+    pendentes = request.GET.get("pendentes") == "true"
+    alertas = AlertaContratoService.ativos(tipos=[tipo] if tipo else None, pendentes=pendentes)
+
+    resumo = dict(
+        AlertaContrato.objects.filter(ativo=True).values("tipo").annotate(total=Count("id")).values_list("tipo", "total")
+    )
+    context = {
+        "alertas": Paginator(alertas, 50).get_page(request.GET.get("page")),
+        "tipo": tipo,
+        "pendentes": pendentes,
+        "tipos": [
+            {"valor": valor, "rotulo": rotulo, "total": resumo.get(valor, 0)}
+            for valor, rotulo in AlertaContrato.TIPO_CHOICES
+        ],
+    }
+    return render(request, "gestao_contratos/alertas.html", context)
+
+
+# Gestão de Contratos - Reconhecer alerta
+@group_required("Admin", "Gerente")
+@require_http_methods(["POST"])
+def gestao_contratos_alerta_reconhecer(request, pk):
+    """Registra a ciência do usuário sobre o alerta"""
+    alerta = get_object_or_404(AlertaContrato, pk=pk, ativo=True)
+    AlertaContratoService.reconhecer(alerta, request.user)
+    messages.success(request, f"Alerta do contrato {alerta.contrato.numero_contrato} reconhecido.")
+    return redirect("gestao_contratos_alertas")
+
+
+# Gestão de Contratos - Detalhar
+# Abas carregadas sob demanda por gestao_contratos_aba (a aba "info" vem na página)
+ABAS_CONTRATO = ("slas", "itens", "projetos", "ofs", "oss", "aditivos", "timeline", "stakeholders")
+# Abas que também exibem cadastros gerais (gerentes de projeto, itens de fornecedor): a chave
+# inclui a versão "cadastro", incrementada ao gravar Colaborador ou ItemFornecedor
+ABAS_CADASTRO = ("projetos", "ofs", "oss")
+
+
+def _form_item_contrato(contrato, data=None):
+    """Formulário de novo item com o contrato fixo e sem data_ativacao"""
+    item_form = ItemContratoForm(data, initial={'contrato': contrato})
+    # Esconder campo de contrato pois já está definido
+    item_form.fields['contrato'].widget = forms.HiddenInput()
+    item_form.fields['contrato'].initial = contrato.pk
+    # Remover campo data_ativacao do formulário
+    if 'data_ativacao' in item_form.fields:
+        del item_form.fields['data_ativacao']
+    return item_form
+
+
+def _form_sla(contrato, data=None):
+    """Formulário de novo SLA com o contrato fixo"""
+    from ..forms import SLAForm
+    sla_form = SLAForm(data, initial={'contrato': contrato, 'data_inicio': contrato.data_assinatura})
+    sla_form.fields['contrato'].widget = forms.HiddenInput()
+    sla_form.fields['contrato'].initial = contrato.pk
+    return sla_form
+
+
+def _stakeholders_contrato(contrato):
+    """Stakeholders ativos do contrato, separados por tipo"""
+    # Verificar se a tabela existe antes de fazer a query (migração pode não ter sido aplicada)
+    try:
+        stakeholders = contrato.stakeholders.filter(ativo=True).select_related(
+            'colaborador', 'contato_cliente'
+        ).order_by('tipo', 'papel')
+        return {
+            "stakeholders": stakeholders,
+            "stakeholders_contratada": stakeholders.filter(tipo=StakeholderContrato.TipoStakeholder.CONTRATADA),
+            "stakeholders_contratante": stakeholders.filter(tipo=StakeholderContrato.TipoStakeholder.CONTRATANTE),
+            "stakeholders_equipe_tecnica": stakeholders.filter(tipo=StakeholderContrato.TipoStakeholder.EQUIPE_TECNICA),
+        }
+    except Exception:
+        # Se a tabela não existir ainda (migração não aplicada), usar querysets vazios
+        vazio = StakeholderContrato.objects.none()
+        return {
+            "stakeholders": vazio,
+            "stakeholders_contratada": vazio,
+            "stakeholders_contratante": vazio,
+            "stakeholders_equipe_tecnica": vazio,
+        }
+
+
+def _contagens_abas(contrato):
+    """Quantidades exibidas nos títulos das abas"""
+    return {
+        "slas": contrato.slas.count() + contrato.slas_importantes.count(),
+        "itens": contrato.itens.count(),
+        "projetos": contrato.projetos.count(),
+        "ofs": OrdemFornecimento.objects.filter(contrato=contrato).count(),
+        "oss": OrdemServico.objects.filter(contrato=contrato).count(),
+        "aditivos": contrato.termos_aditivos.count(),
+    }
+
+
+def _contexto_aba(contrato, aba):
+    """Dados de uma aba do detalhe do contrato"""
+    if aba == "slas":
+        return {
+            "sla_form": _form_sla(contrato),
+            "slas": contrato.slas.all().order_by('-criado_em'),
+            "slas_importantes": contrato.slas_importantes.all().order_by('-prioridade', '-criado_em'),
+            "conformidade_sla": ConformidadeSLAService.resumo_contrato(contrato),
+        }
+    if aba == "itens":
+        return {
+            "itens_contrato": contrato.itens.all().order_by('lote', 'numero_item'),
+            "item_form": _form_item_contrato(contrato),
+        }
+    if aba == "projetos":
+        from ..models import Colaborador
+        # Backlogs do contrato (demandas que ainda não viraram projetos)
+        # Ordenar por prioridade: Crítica (4) > Alta (3) > Média (2) > Baixa (1)
+        backlogs = contrato.backlogs.filter(status__in=['pendente', 'em_analise']).annotate(
+            prioridade_ordem=Case(
+                When(prioridade='critica', then=Value(4)),
+                When(prioridade='alta', then=Value(3)),
+                When(prioridade='media', then=Value(2)),
+                When(prioridade='baixa', then=Value(1)),
+                default=Value(0),
+                output_field=IntegerField()
+            )
+        ).order_by('-prioridade_ordem', '-criado_em')
+        return {
+            "backlogs": backlogs,
+            "projetos": contrato.projetos.all().select_related(
+                'gerente_projeto', 'backlog_origem'
+            ).prefetch_related('plano_trabalho').order_by('-criado_em'),
+            # Gerentes de projeto para o formulário
+            "gerentes": Colaborador.objects.filter(ativo=True, cargo__icontains='gerente').order_by('nome_completo'),
+        }
+    if aba == "ofs":
+        return {
+            "ordens_fornecimento": OrdemFornecimento.objects.filter(contrato=contrato).select_related(
+                'item_contrato'
+            ).prefetch_related('itens_fornecedor__item_fornecedor').order_by('-id'),
+        }
+    if aba == "oss":
+        return {
+            "ordens_servico": OrdemServico.objects.filter(contrato=contrato).select_related(
+                'item_contrato'
+            ).prefetch_related('itens_fornecedor__item_fornecedor').order_by('-id'),
+        }
+    if aba == "aditivos":
+        return {"termos_aditivos": contrato.termos_aditivos.all().order_by('-data_assinatura')}
+    if aba == "timeline":
+        return {
+            "termos_aditivos": contrato.termos_aditivos.all().order_by('-data_assinatura'),
+            "resumo": ContratoService.obter_resumo_contrato(contrato),
+        }
+    return _stakeholders_contrato(contrato)
+
+
+def _pode_editar(user):
+    """Mesmo critério dos botões de edição das abas (o HTML em cache é separado por ele)"""
+    return user.is_superuser or user.groups.filter(name__in=["Admin", "Gerente"]).exists()
+
+
+def _resumo_detalhe(contrato, hoje):
+    """Resumo do contrato com os dados das barras de progresso (sem a instância, para o cache)"""
+    # Usar service layer para obter resumo completo
+    resumo = ContratoService.obter_resumo_contrato(contrato)
+    
+    # Progresso da Vigência: dias que já se passaram / total de dias
+    dias_totais_vigencia = 0
+    dias_passados = 0
+    if contrato.data_assinatura and resumo.get('data_fim_atual'):
+        dias_totais_vigencia = (resumo['data_fim_atual'] - contrato.data_assinatura).days
+        dias_passados = (hoje - contrato.data_assinatura).days
+        if dias_passados < 0:
+            dias_passados = 0
+        if dias_passados > dias_totais_vigencia:
+            dias_passados = dias_totais_vigencia
+    
+    # Limite de Aditivo de Valor: valor consumido / 25% do valor inicial
+    limite_aditivo_valor = resumo['valor_inicial'] * Decimal('0.25')
+    valor_consumido_aditivos = resumo['valor_atual'] - resumo['valor_inicial']
+    if valor_consumido_aditivos < 0:
+        valor_consumido_aditivos = Decimal('0.00')
+    
+    # Consumo dos Itens: valor faturado / valor total dos itens
+    valor_total_itens = contrato.get_valor_total_itens()
+    valor_faturado_itens = contrato.get_valor_total_faturado()
+    if valor_total_itens == 0:
+        percentual_consumo_itens = 0
+    else:
+        percentual_consumo_itens = (valor_faturado_itens / valor_total_itens) * 100
+    
+    resumo['dias_totais_vigencia'] = dias_totais_vigencia
+    resumo['dias_passados'] = dias_passados
+    resumo['limite_aditivo_valor'] = limite_aditivo_valor
+    resumo['valor_consumido_aditivos'] = valor_consumido_aditivos
+    resumo['valor_total_itens'] = valor_total_itens
+    resumo['valor_faturado_itens'] = valor_faturado_itens
+    resumo['percentual_consumo_itens'] = percentual_consumo_itens
+    resumo.pop('contrato')
+    return resumo
+
+
+@group_required("Admin", "Gerente", "Leitor")
+def gestao_contratos_detail(request, pk):
+    """Detalhes de um contrato (resumo e aba de informações; as demais abas vêm sob demanda)"""
+    contrato = get_object_or_404(Contrato.objects.select_related('cliente'), pk=pk)
+
+    # Processar formulário de item
+    aba_inicial, contexto_aba = None, None
+    if request.method == "POST" and 'add_item' in request.POST:
+        item_form = _form_item_contrato(contrato, request.POST)
+        if item_form.is_valid():
+            item = item_form.save(commit=False)
+            item.contrato = contrato
+            item.save()
+            messages.success(request, f"Item {item.numero_item} adicionado com sucesso!")
+            return redirect(f"{reverse('gestao_contratos_detail', kwargs={'pk': pk})}?tab=itens")
+        messages.error(request, "Erro ao adicionar item. Verifique os campos.")
+        aba_inicial, contexto_aba = "itens", {**_contexto_aba(contrato, "itens"), "item_form": item_form}
+
+    # Processar formulário de SLA
+    if request.method == "POST" and 'add_sla' in request.POST:
+        sla_form = _form_sla(contrato, request.POST)
+        if sla_form.is_valid():
+            sla = sla_form.save(commit=False)
+            sla.contrato = contrato
+            sla.save()
+            messages.success(request, f"SLA '{sla.titulo}' adicionado com sucesso!")
+            return redirect("gestao_contratos_detail", pk=pk)
+        messages.error(request, "Erro ao adicionar SLA. Verifique os campos.")
+        aba_inicial, contexto_aba = "slas", {**_contexto_aba(contrato, "slas"), "sla_form": sla_form}
+
+    # Resumo e barras de progresso em cache pela versão do contrato (e pela data, por serem relativos a hoje)
+    from datetime import date
+    hoje = date.today()
+    resumo = {
+        **CacheVersaoService.obter(
+            "contrato", pk, f"resumo:{hoje.isoformat()}", lambda: _resumo_detalhe(contrato, hoje)
+        ),
+        "contrato": contrato,
+    }
+
+    context = {
+        "contrato": contrato,
+        "resumo": resumo,
+        "abas": ABAS_CONTRATO,
+        "contagens": CacheVersaoService.obter("contrato", pk, "contagens", lambda: _contagens_abas(contrato)),
+        **_stakeholders_contrato(contrato),
+    }
+    if aba_inicial:
+        # Formulário com erros: a aba vem renderizada na página, sem cache
+        context["aba_inicial"] = aba_inicial
+        context["conteudo_aba_inicial"] = render_to_string(
+            f"gestao_contratos/abas/{aba_inicial}.html", {"contrato": contrato, **contexto_aba}, request=request
+        )
+    return render(request, "gestao_contratos/detail.html", context)
+
+
+# Gestão de Contratos - Aba do detalhe (HTML parcial)
+@group_required("Admin", "Gerente", "Leitor")
+@require_GET
+def gestao_contratos_aba(request, pk, aba):
+    """HTML de uma aba do detalhe, em cache até a próxima alteração do contrato ou de seus filhos"""
+    if aba not in ABAS_CONTRATO:
+        raise Http404("Aba inexistente")
+    perfil = "gestor" if _pode_editar(request.user) else "leitor"
+
+    def renderizar():
+        # Contrato inexistente: o 404 sai daqui, antes de qualquer gravação no cache
+        contrato = get_object_or_404(Contrato.objects.select_related('cliente'), pk=pk)
+        contexto = {
+            "contrato": contrato, "csrf_token": CacheVersaoService.MARCADOR_CSRF, **_contexto_aba(contrato, aba),
+        }
+        return str(render_to_string(f"gestao_contratos/abas/{aba}.html", contexto, request=request))
+
+    parte = f"aba:{aba}:{perfil}"
+    if aba in ABAS_CADASTRO:
+        parte += f":c{CacheVersaoService.versao('cadastro', 'geral')}"
+    html = CacheVersaoService.obter("contrato", pk, parte, renderizar)
+    return HttpResponse(html.replace(CacheVersaoService.MARCADOR_CSRF, get_token(request)))
+
+
+# Stakeholder Contrato - Criar
+@group_required("Admin", "Gerente")
+def stakeholder_contrato_create(request, contrato_id):
+    """Cria um novo stakeholder para o contrato"""
+    from ..forms import StakeholderContratoForm
+    contrato = get_object_or_404(Contrato, pk=contrato_id)
+    
+    if request.method == "POST":
+        form = StakeholderContratoForm(request.POST, contrato=contrato)
+        if form.is_valid():
+            stakeholder = form.save(commit=False)
+            stakeholder.contrato = contrato
+            stakeholder.save()
+            messages.success(request, f"Stakeholder '{stakeholder.get_papel_display()}' adicionado com sucesso!")
+            return redirect(f"{reverse('gestao_contratos_detail', kwargs={'pk': contrato_id})}?tab=stakeholders")
+    else:
+        form = StakeholderContratoForm(contrato=contrato)
+    
+    return render(request, "stakeholder_contrato/form.html", {
+        "form": form,
+        "contrato": contrato,
+        "action": "Criar"
+    })
+
+
+# Stakeholder Contrato - Editar
+@group_required("Admin", "Gerente")
+def stakeholder_contrato_update(request, pk):
+    """Edita um stakeholder do contrato"""
+    from ..forms import StakeholderContratoForm
+    stakeholder = get_object_or_404(StakeholderContrato, pk=pk)
+    contrato = stakeholder.contrato
+    
+    if request.method == "POST":
+        form = StakeholderContratoForm(request.POST, instance=stakeholder, contrato=contrato)
+        if form.is_valid():
+            form.save()
+            messages.success(request, f"Stakeholder '{stakeholder.get_papel_display()}' atualizado com sucesso!")
+            return redirect(f"{reverse('gestao_contratos_detail', kwargs={'pk': contrato.pk})}?tab=stakeholders")
+        else:
+            messages.error(request, "Erro ao atualizar stakeholder. Verifique os campos.")
+    else:
+        form = StakeholderContratoForm(instance=stakeholder, contrato=contrato)
+    
+    return render(request, "stakeholder_contrato/form.html", {
+        "form": form,
+        "stakeholder": stakeholder,
+        "contrato": contrato,
+        "action": "Editar"
+    })
+
+
+# Stakeholder Contrato - Deletar
+@group_required("Admin", "Gerente")
+def stakeholder_contrato_delete(request, pk):
+    """Exclui um stakeholder do contrato"""
+    stakeholder = get_object_or_404(StakeholderContrato, pk=pk)
+    contrato = stakeholder.contrato
+    
+    if request.method == "POST":
+        stakeholder.delete()
+        messages.success(request, f"Stakeholder '{stakeholder.get_papel_display()}' excluído com sucesso!")
+        return redirect(f"{reverse('gestao_contratos_detail', kwargs={'pk': contrato.pk})}?tab=stakeholders")
+    
+    return render(request, "stakeholder_contrato/confirm_delete.html", {
+        "stakeholder": stakeholder,
+        "contrato": contrato
+    })
+
+
+# Gestão de Contratos - Criar
+@group_required("Admin", "Gerente")
+def gestao_contratos_create(request):
+    """Cria um novo contrato"""
+    if request.method == "POST":
+        form = ContratoPublicoForm(request.POST)
+        if form.is_valid():
+            contrato = form.save(commit=False)
+            
+            # Validação de coerência entre regime_legal e origem_contrato
+            if contrato.regime_legal and contrato.origem_contrato:
+                is_valid, error_msg = ContratoService.origem_aceitavel_para_regime(contrato)
+                if not is_valid:
+                    messages.warning(request, f"Atenção: {error_msg}")
+            
+            contrato.save()
+            messages.success(request, "Contrato criado com sucesso!")
+            return redirect("gestao_contratos_list")
+        else:
+            messages.error(request, "Erro ao criar o contrato. Verifique os campos.")
+    else:
+        form = ContratoPublicoForm()
+    
+    return render(request, "gestao_contratos/form.html", {"form": form})
+
+
+# Gestão de Contratos - Editar
+@group_required("Admin", "Gerente")
+def gestao_contratos_update(request, pk):
+    """Edita um contrato"""
+    contrato = get_object_or_404(Contrato, pk=pk)
+    
+    if request.method == "POST":
+        form = ContratoPublicoForm(request.POST, instance=contrato)
+        if form.is_valid():
+            contrato = form.save(commit=False)
+            
+            # Validação de coerência entre regime_legal e origem_contrato
+            if contrato.regime_legal and contrato.origem_contrato:
+                is_valid, error_msg = ContratoService.origem_aceitavel_para_regime(contrato)
+                if not is_valid:
+                    messages.warning(request, f"Atenção: {error_msg}")
+            
+            contrato.save()
+            messages.success(request, "Contrato atualizado com sucesso!")
+            return redirect("gestao_contratos_detail", pk=contrato.pk)
+    else:
+        form = ContratoPublicoForm(instance=contrato)
+    
+    return render(request, "gestao_contratos/form.html", {"form": form, "contrato": contrato})
+
+
+# Gestão de Contratos - Deletar
+@group_required("Admin", "Gerente")
+def gestao_contratos_delete(request, pk):
+    """Exclui um contrato"""
+    contrato = get_object_or_404(Contrato, pk=pk)
+    
+    if request.method == "POST":
+        total_termos = contrato.termos_aditivos.count()
+        contrato.delete()
+        messages.success(request, f"Contrato excluído com sucesso! ({total_termos} termo(s) aditivo(s) também foram excluídos.)")
+        return redirect("gestao_contratos_list")
+    
+    context = {
+        "contrato": contrato,
+        "total_termos": contrato.termos_aditivos.count(),
+    }
+    return render(request, "gestao_contratos/confirm_delete.html", context)
+
+
+# Termo Aditivo - Criar
+@group_required("Admin", "Gerente")
+def termo_aditivo_create(request, contrato_id):
+    """Cria um novo termo aditivo usando Service Layer"""
+    contrato = get_object_or_404(Contrato, pk=contrato_id)
+    
+    if request.method == "POST":
+        form = TermoAditivoForm(request.POST, contrato_id=contrato_id, contrato=contrato)
+        if form.is_valid():
+            try:
+                # Usar Service Layer para criar com validações legais
+                termo = ContratoService.criar_termo_aditivo(
+                    contrato=contrato,
+                    numero_termo=form.cleaned_data['numero_termo'],
+                    tipo=form.cleaned_data['tipo'],
+                    meses_acrescimo=form.cleaned_data.get('meses_acrescimo') or 0,
+                    valor_acrescimo=form.cleaned_data.get('valor_acrescimo') or Decimal('0.00'),
+                    data_assinatura=form.cleaned_data['data_assinatura'],
+                    justificativa=form.cleaned_data.get('justificativa') or ''
+                )
+                AlertaContratoService.processar(contrato_ids=[contrato.pk])
+                messages.success(request, "Termo aditivo criado com sucesso!")
+                return redirect("gestao_contratos_detail", pk=contrato.pk)
+            except Exception as e:
+                messages.error(request, f"Erro ao criar termo aditivo: {str(e)}")
+        else:
+            messages.error(request, "Erro ao criar o termo aditivo. Verifique os campos.")
+    else:
+        form = TermoAditivoForm(contrato_id=contrato_id, contrato=contrato)
+    
+    # Obter informações do contrato para validações
+    resumo = ContratoService.obter_resumo_contrato(contrato)
+    
+    context = {
+        "form": form,
+        "contrato": contrato,
+        "resumo": resumo,
+    }
+    return render(request, "termo_aditivo/form.html", context)
+
+
+# Termo Aditivo - Editar
+@group_required("Admin", "Gerente")
+def termo_aditivo_update(request, contrato_id, pk):
+    """Edita um termo aditivo"""
+    contrato = get_object_or_404(Contrato, pk=contrato_id)
+    termo = get_object_or_404(TermoAditivo, pk=pk, contrato=contrato)
+    
+    if request.method == "POST":
+        form = TermoAditivoForm(request.POST, instance=termo, contrato_id=contrato_id, contrato=contrato)
+        if form.is_valid():
+            # Validar antes de salvar
+            tipo = form.cleaned_data['tipo']
+            meses_acrescimo = form.cleaned_data.get('meses_acrescimo', 0)
+            valor_acrescimo = form.cleaned_data.get('valor_acrescimo', Decimal('0.00'))
+            
+            if tipo == TipoTermoAditivo.PRORROGACAO:
+                # Validar limite de vigência (considerando outros aditivos, exceto este)
+                meses_outros_aditivos = sum(
+                    ta.meses_acrescimo or 0
+                    for ta in contrato.termos_aditivos.exclude(pk=termo.pk).filter(tipo=TipoTermoAditivo.PRORROGACAO)
+                )
+                meses_totais = contrato.vigencia + meses_outros_aditivos + meses_acrescimo
+                
+                if contrato.regime_legal == RegimeLegal.LEI_14133:
+                    limite = 120
+                else:
+                    limite = 60
+                
+                if meses_totais > limite:
+                    messages.error(request, f"Vigência total ({meses_totais} meses) ultrapassa o limite legal de {limite} meses.")
+                    return render(request, "termo_aditivo/form.html", {"form": form, "contrato": contrato, "termo": termo})
+            
+            elif tipo in [TipoTermoAditivo.VALOR, TipoTermoAditivo.REEQUILIBRIO]:
+                if contrato.regime_legal == RegimeLegal.LEI_14133:
+                    # Calcular valor atual sem este aditivo
+                    valor_atual_sem_este = ContratoService.calcular_valor_atual(contrato)
+                    valor_outros_aditivos = sum(
+                        ta.valor_acrescimo or Decimal('0.00')
+                        for ta in contrato.termos_aditivos.exclude(pk=termo.pk).filter(
+                            tipo__in=[TipoTermoAditivo.VALOR, TipoTermoAditivo.REEQUILIBRIO]
+                        )
+                    )
+                    valor_base = contrato.valor_inicial + valor_outros_aditivos
+                    limite = valor_base * Decimal('0.25')
+                    
+                    if valor_acrescimo > limite:
+                        messages.error(request, f"Valor de acréscimo (R$ {valor_acrescimo:,.2f}) ultrapassa o limite legal de 25% (R$ {limite:,.2f}).")
+                        return render(request, "termo_aditivo/form.html", {"form": form, "contrato": contrato, "termo": termo})
+            
+            form.save()
+            AlertaContratoService.processar(contrato_ids=[contrato.pk])
+            messages.success(request, "Termo aditivo atualizado com sucesso!")
+            return redirect("gestao_contratos_detail", pk=contrato.pk)
+    else:
+        form = TermoAditivoForm(instance=termo, contrato_id=contrato_id, contrato=contrato)
+    
+    # Obter informações do contrato para validações
+    resumo = ContratoService.obter_resumo_contrato(contrato)
+    
+    context = {
+        "form": form,
+        "contrato": contrato,
+        "termo": termo,
+        "resumo": resumo,
+    }
+    return render(request, "termo_aditivo/form.html", context)
+
+
+# Termo Aditivo - Deletar
+@group_required("Admin", "Gerente")
+def termo_aditivo_delete(request, contrato_id, pk):
+    """Exclui um termo aditivo"""
+    contrato = get_object_or_404(Contrato, pk=contrato_id)
+    termo = get_object_or_404(TermoAditivo, pk=pk, contrato=contrato)
+    
+    if request.method == "POST":
+        termo.delete()
+        AlertaContratoService.processar(contrato_ids=[contrato.pk])
+        messages.success(request, "Termo aditivo excluído com sucesso!")
+        return redirect("gestao_contratos_detail", pk=contrato.pk)
+    
+    context = {
+        "contrato": contrato,
+        "termo": termo,
+    }
+    return render(request, "termo_aditivo/confirm_delete.html", context)
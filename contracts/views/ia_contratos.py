@@ -0,0 +1,1154 @@
+"""
+Views da análise de contratos com IA e dos planos de trabalho
+"""
+from django.shortcuts import render, get_object_or_404, redirect
+from django.contrib import messages
+from django.core.paginator import Paginator
+from django.views.decorators.csrf import csrf_exempt, csrf_protect
+
+from ..models import (
+    Contrato,
+    Projeto,
+    AnaliseContrato,
+    DocumentoContrato,
+    PlanoTrabalho,
+)
+from ..services import (
+    SincronizacaoPlanoService, EntregaArquivoService, ArquivoConteudoService, BuscaDocumentoService,
+    SimilaridadeService,
+)
+from ..forms import AnaliseContratoForm, PlanoTrabalhoForm
+from ..upload_handlers import SHA256UploadHandler
+from .comum import group_required
+
+
+# =============================================================================
+# MÓDULO DE ANÁLISE DE CONTRATOS COM IA
+# =============================================================================
+
+@group_required("Admin", "Gerente")
+def documento_contrato_list(request):
+    """Lista análises de contrato"""
+    analises = AnaliseContrato.objects.all().order_by('-criado_em')
+    
+    # Filtros
+    status = request.GET.get('status')
+    
+    if status:
+        analises = analises.filter(status=status)
+    
+    # Paginação
+    paginator = Paginator(analises, 20)
+    page = request.GET.get('page', 1)
+    analises = paginator.get_page(page)
+    
+    context = {
+        'analises': analises,
+        'status_choices': AnaliseContrato.STATUS_CHOICES,
+        'filtro_status': status,
+    }
+    return render(request, 'ia_contratos/list.html', context)
+
+
+@group_required("Admin", "Gerente")
+def documento_contrato_busca(request):
+    """Busca textual nos trechos (cláusulas/parágrafos) dos documentos analisados"""
+    consulta = request.GET.get('q', '').strip()
+    contrato_id = request.GET.get('contrato', '')
+    tipo_documento = request.GET.get('tipo', '')
+
+    resultados = BuscaDocumentoService.buscar(
+        consulta,
+        contrato_id=int(contrato_id) if contrato_id.isdigit() else None,
+        tipo_documento=tipo_documento or None,
+    ) if consulta else []
+
+    context = {
+        'consulta': consulta,
+        'resultados': resultados,
+        'contratos': Contrato.objects.filter(analises_origem__isnull=False).distinct().order_by('numero_contrato'),
+        'contrato_id': contrato_id,
+        'tipos_documento': DocumentoContrato.TIPO_DOCUMENTO_CHOICES,
+        'tipo_documento': tipo_documento,
+    }
+    return render(request, 'ia_contratos/busca.html', context)
+
+
+@csrf_exempt
+@group_required("Admin", "Gerente")
+def documento_contrato_upload(request):
+    """Upload múltiplo de documentos para análise"""
+    # O handler precisa ser trocado antes da leitura do corpo (inclusive pelo CSRF);
+    # calcula o SHA-256 enquanto grava cada arquivo em disco
+    request.upload_handlers = [SHA256UploadHandler(request)]
+    return _documento_contrato_upload(request)
+
+
+@csrf_protect
+def _documento_contrato_upload(request):
+    if request.method == 'POST':
+        # Validação manual de arquivos múltiplos ANTES de validar o formulário
+        arquivos = request.FILES.getlist('arquivos')
+        erro_arquivos = None
+        
+        if not arquivos:
+            erro_arquivos = 'Selecione pelo menos um arquivo.'
+        else:
+            # Valida cada arquivo
+            for arquivo in arquivos:
+                ext = arquivo.name.split('.')[-1].lower()
+                if ext not in ['pdf', 'doc', 'docx']:
+                    erro_arquivos = f'Formato não suportado: {arquivo.name}. Use PDF ou Word (.doc, .docx)'
+                    break
+                if arquivo.size > 50 * 1024 * 1024:
+                    erro_arquivos = f'Arquivo muito grande: {arquivo.name}. Limite: 50MB'
+                    break
+        
+        form = AnaliseContratoForm(request.POST, request.FILES)
+        
+        # Se houver erro nos arquivos, adiciona ao formulário
+        if erro_arquivos:
+            form.add_error('arquivos', erro_arquivos)
+        
+        # Valida o formulário (nome e número de contrato)
+        if form.is_valid() and not erro_arquivos:
+            nome_analise = form.cleaned_data['nome_analise']
+            numero_contrato_busca = form.cleaned_data.get('numero_contrato_busca', '').strip()
+            
+            # Verifica se o contrato já existe
+            contrato_existente = None
+            cliente_existente = None
+            if numero_contrato_busca:
+                from ..services.contract_ai_service import ContractAIService
+                contrato_existente, cliente_existente = ContractAIService.verificar_contrato_existente(
+                    numero_contrato=numero_contrato_busca
+                )
+            
+            # Cria a análise
+            analise = AnaliseContrato.objects.create(
+                nome=nome_analise,
+                criado_por=request.user,
+                contrato_gerado=contrato_existente,
+                cliente_gerado=cliente_existente,
+            )
+            
+            # Cria os documentos
+            tipos_por_nome = {
+                'contrato': 'contrato',
+                'edital': 'edital',
+                'etp': 'etp',
+                'tr': 'tr',
+                'arp': 'arp',
+                'proposta': 'proposta',
+                'termo': 'termo_aditivo',
+                'aditivo': 'termo_aditivo',
+            }
+            
+            for arquivo in arquivos:
+                nome_arquivo = arquivo.name.lower()
+                tipo_doc = 'outro'
+                
+                # Tenta identificar o tipo pelo nome do arquivo
+                for palavra_chave, tipo in tipos_por_nome.items():
+                    if palavra_chave in nome_arquivo:
+                        tipo_doc = tipo
+                        break
+                
+                # Conteúdo idêntico a um upload anterior reutiliza o blob e o texto extraído
+                ArquivoConteudoService.criar_documento(
+                    arquivo,
+                    analise=analise,
+                    nome=arquivo.name,
+                    tipo_documento=tipo_doc,
+                )
+            
+            messages.success(request, f'Análise "{nome_analise}" criada com {len(arquivos)} documento(s)!')
+            if contrato_existente:
+                messages.info(request, f'Vinculada ao contrato existente: {contrato_existente.numero_contrato}')
+            return redirect('documento_contrato_detail', pk=analise.pk)
+        else:
+            # Se o formulário não for válido, adiciona mensagem de erro
+            if not form.is_valid() or erro_arquivos:
+                # Adiciona mensagem de erro genérica
+                if erro_arquivos:
+                    messages.error(request, erro_arquivos)
+                elif form.errors:
+                    # Adiciona mensagem de erro específica para cada campo
+                    for field, errors in form.errors.items():
+                        for error in errors:
+                            if field in form.fields:
+                                messages.error(request, f'{form.fields[field].label}: {error}')
+                            else:
+                                messages.error(request, f'{error}')
+                else:
+                    messages.error(request, 'Erro ao criar análise. Verifique os campos.')
+    else:
+        form = AnaliseContratoForm()
+    
+    context = {'form': form}
+    return render(request, 'ia_contratos/upload.html', context)
+
+
+@group_required("Admin", "Gerente")
+def documento_contrato_detail(request, pk):
+    """Detalhes da análise e resultados"""
+    analise = get_object_or_404(AnaliseContrato, pk=pk)
+    
+    # Clientes/contratos já cadastrados que "Criar Registros" pode duplicar
+    possiveis_duplicados = {}
+    if analise.texto_consolidado and not analise.contrato_gerado_id:
+        possiveis_duplicados = SimilaridadeService.possiveis_duplicados(analise)
+    
+    context = {
+        'analise': analise,
+        'documentos': analise.documentos.all(),
+        'dados': analise.dados_extraidos or {},
+        'possiveis_duplicados': possiveis_duplicados,
+    }
+    return render(request, 'ia_contratos/detail.html', context)
+
+
+@group_required("Admin", "Gerente")
+def documento_contrato_analisar(request, pk):
+    """Executa análise de todos os documentos com IA"""
+    analise = get_object_or_404(AnaliseContrato, pk=pk)
+    
+    # Verifica provider configurado
+    provider = request.GET.get('provider', 'openai')
+    
+    try:
+        from ..services.contract_ai_service import ContractAIService
+        
+        service = ContractAIService(provider=provider)
+        dados = service.process_multiple_documents(analise)
+        
+        messages.success(request, f'Análise concluída! {len(analise.documentos.all())} documento(s) processado(s).')
+        
+    except Exception as e:
+        import traceback
+        print(f"Erro na análise: {traceback.format_exc()}")
+        messages.error(request, f'Erro na análise: {str(e)}')
+    
+    return redirect('documento_contrato_detail', pk=pk)
+
+
+@group_required("Admin", "Gerente")
+def documento_contrato_criar_registros(request, pk):
+    """Cria registros (Cliente, Contrato, Itens) a partir dos dados extraídos"""
+    analise = get_object_or_404(AnaliseContrato, pk=pk)
+    
+    if not analise.dados_extraidos:
+        messages.error(request, 'Análise ainda não foi concluída.')
+        return redirect('documento_contrato_detail', pk=pk)
+    
+    try:
+        from ..services.contract_ai_service import ContractAIService
+        
+        dados = analise.dados_extraidos
+        
+        # Usa cliente/contrato existente se já vinculados
+        cliente_existente = analise.cliente_gerado
+        contrato_existente = analise.contrato_gerado
+        
+        # Criar ou usar Cliente existente
+        cliente = ContractAIService.create_cliente_from_data(dados, request.user, cliente_existente)
+        if cliente:
+            analise.cliente_gerado = cliente
+            if cliente_existente:
+                messages.info(request, f'Usando cliente existente: "{cliente.nome_razao_social}"')
+            else:
+                messages.success(request, f'Cliente "{cliente.nome_razao_social}" criado.')
+        
+        # Criar ou usar Contrato existente
+        if cliente:
+            contrato = ContractAIService.create_contrato_from_data(dados, cliente, request.user, contrato_existente)
+            if contrato:
+                analise.contrato_gerado = contrato
+                if contrato_existente:
+                    messages.info(request, f'Usando contrato existente: "{contrato.numero_contrato}"')
+                else:
+                    messages.success(request, f'Contrato "{contrato.numero_contrato}" criado.')
+                
+                # Criar Itens (apenas se for contrato novo)
+                if not contrato_existente:
+                    itens = ContractAIService.create_itens_from_data(dados, contrato)
+                    if itens:
+                        messages.success(request, f'{len(itens)} item(ns) de contrato criado(s).')
+                    
+                    # Criar SLAs (apenas se for contrato novo)
+                    slas = ContractAIService.create_slas_from_data(dados, contrato)
+                    if slas:
+                        messages.success(request, f'{len(slas)} SLA(s) criado(s).')
+                else:
+                    messages.info(request, 'Itens e SLAs não foram criados pois o contrato já existe.')
+        
+        analise.status = 'revisado'
+        analise.save()
+        
+    except Exception as e:
+        import traceback
+        print(f"Erro ao criar registros: {traceback.format_exc()}")
+        messages.error(request, f'Erro ao criar registros: {str(e)}')
+    
+    return redirect('documento_contrato_detail', pk=pk)
+
+
+@group_required("Admin", "Gerente")
+def documento_contrato_delete(request, pk):
+    """Exclui análise e todos os documentos"""
+    analise = get_object_or_404(AnaliseContrato, pk=pk)
+    
+    if request.method == 'POST':
+        nome = analise.nome
+        analise.delete()  # Isso também deleta os documentos relacionados (CASCADE)
+        messages.success(request, f'Análise "{nome}" excluída.')
+        return redirect('documento_contrato_list')
+    
+    return render(request, 'ia_contratos/confirm_delete.html', {'analise': analise})
+
+
+@group_required("Admin", "Gerente", "Leitor")
+def documento_contrato_download(request, pk):
+    """Faz download do arquivo do documento"""
+    from django.http import Http404
+    from django.conf import settings
+    from django.utils.text import get_valid_filename
+    import os
+    
+    documento = get_object_or_404(DocumentoContrato, pk=pk)
+    
+    if not documento.arquivo:
+        messages.error(request, 'Arquivo não encontrado.')
+        if documento.analise:
+            return redirect('documento_contrato_detail', pk=documento.analise.pk)
+        return redirect('documento_contrato_list')
+    
+    try:
+        # Verifica se o arquivo existe
+        file_path = documento.arquivo.path
+        if not os.path.exists(file_path):
+            messages.error(request, 'Arquivo não encontrado no sistema de arquivos.')
+            if documento.analise:
+                return redirect('documento_contrato_detail', pk=documento.analise.pk)
+            return redirect('documento_contrato_list')
+        
+        # Obtém o nome do arquivo original (blobs deduplicados são nomeados pelo hash)
+        original_filename = documento.nome if documento.conteudo_id else os.path.basename(documento.arquivo.name)
+        # Se não tiver extensão, tenta usar o nome do documento
+        if not original_filename or '.' not in original_filename:
+            filename = documento.nome or 'documento'
+            # Adiciona a extensão do arquivo se não tiver
+            ext = os.path.splitext(file_path)[1]
+            if ext:
+                filename = f"{filename}{ext}"
+        else:
+            filename = original_filename
+        
+        # Sanitiza o nome do arquivo para evitar problemas
+        filename = get_valid_filename(filename)
+        
+        # Determina o content-type baseado na extensão
+        ext = os.path.splitext(filename)[1].lower()
+        content_types = {
+            '.pdf': 'application/pdf',
+            '.doc': 'application/msword',
+            '.docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+        }
+        content_type = content_types.get(ext, 'application/octet-stream')
+        
+        # Entrega pelo servidor web (X-Accel-Redirect/X-Sendfile) ou em blocos com Range/ETag;
+        # ?inline=1 exibe PDFs no navegador (leitura por páginas via Range)
+        inline = request.GET.get('inline') == '1' and content_type == 'application/pdf'
+        return EntregaArquivoService.responder(request, file_path, filename, content_type, inline=inline)
+        
+    except Http404:
+        raise
+    except Exception as e:
+        import traceback
+        print(f"Erro ao fazer download do arquivo: {traceback.format_exc()}")
+        messages.error(request, f'Erro ao fazer download: {str(e)}')
+        if documento.analise:
+            return redirect('documento_contrato_detail', pk=documento.analise.pk)
+        return redirect('documento_contrato_list')
+
+
+@group_required("Admin", "Gerente")
+def plano_trabalho_gerar(request, projeto_id):
+    """Gera plano de trabalho completo usando IA para um projeto"""
+    projeto = get_object_or_404(Projeto, pk=projeto_id)
+    
+    # Verifica se já existe plano
+    if hasattr(projeto, 'plano_trabalho'):
+        messages.info(request, 'Este projeto já possui um plano de trabalho.')
+        return redirect('plano_trabalho_detail', pk=projeto.plano_trabalho.pk)
+    
+    # Busca análise relacionada ao contrato
+    contrato = projeto.contrato
+    analise = contrato.analises_origem.first()
+    if not analise or not analise.texto_consolidado:
+        messages.error(request, 'Análise não encontrada ou não foi concluída. É necessário ter uma análise de contrato concluída.')
+        return redirect('projeto_detail', pk=projeto_id)
+    
+    try:
+        from ..services.contract_ai_service import ContractAIService
+        
+        provider = request.GET.get('provider', 'openai')
+        dados_plano = ContractAIService.gerar_plano_trabalho_completo(
+            contrato, 
+            analise.texto_consolidado,
+            projeto=projeto,  # Passa o projeto para usar nome, descrição e item_contrato
+            provider=provider
+        )
+        
+        plano = ContractAIService.criar_plano_trabalho(projeto, dados_plano, request.user)
+        
+        messages.success(request, 'Plano de trabalho gerado com sucesso! Revise e aprove para aplicar ao projeto.')
+        return redirect('plano_trabalho_detail', pk=plano.pk)
+        
+    except Exception as e:
+        import traceback
+        print(f"Erro ao gerar plano: {traceback.format_exc()}")
+        messages.error(request, f'Erro ao gerar plano de trabalho: {str(e)}')
+        return redirect('projeto_detail', pk=projeto_id)
+
+
+@group_required("Admin", "Gerente")
+def plano_trabalho_detail(request, pk):
+    """Detalhes do plano de trabalho"""
+    plano = get_object_or_404(PlanoTrabalho, pk=pk)
+    
+    # Buscar dados do contrato através do projeto
+    contrato = plano.projeto.contrato if plano.projeto else None
+    
+    context = {
+        'plano': plano,
+        'projeto': plano.projeto,
+        'contrato': contrato,
+        'slas_importantes': contrato.slas_importantes.all() if contrato else [],
+        'clausulas_criticas': contrato.clausulas_criticas.all() if contrato else [],
+        'matriz_raci': contrato.matriz_raci.all() if contrato else [],
+    }
+    return render(request, 'ia_contratos/plano_detail.html', context)
+
+
+@group_required("Admin", "Gerente")
+def plano_trabalho_aprovar(request, pk):
+    """Aprova o plano de trabalho - o projeto já deve existir"""
+    plano = get_object_or_404(PlanoTrabalho, pk=pk)
+    
+    if request.method == 'POST':
+        observacoes = request.POST.get('observacoes', '')
+        
+        try:
+            import logging
+            
+            logger = logging.getLogger(__name__)
+            
+            # Verifica se o projeto existe
+            if not plano.projeto:
+                messages.error(request, 'O plano de trabalho deve estar vinculado a um projeto antes de ser aprovado.')
+                return redirect('plano_trabalho_detail', pk=pk)
+            
+            # Aprova o plano
+            plano.aprovar(request.user, observacoes)
+            logger.info(f"Plano {plano.pk} aprovado por {request.user}")
+            
+            projeto = plano.projeto
+            
+            # Criar sprints e tarefas automaticamente após aprovação
+            try:
+                from ..services.contract_ai_service import ContractAIService
+                ContractAIService.criar_projeto_sprints_tarefas(plano, request.user)
+                logger.info(f"Sprints e tarefas criadas automaticamente para o projeto {projeto.pk}")
+                messages.success(
+                    request, 
+                    f'Plano aprovado! Sprints e tarefas foram criadas automaticamente para o projeto "{projeto.nome}".'
+                )
+            except Exception as e:
+                logger.error(f"Erro ao criar sprints e tarefas: {e}")
+                import traceback
+                logger.error(traceback.format_exc())
+                messages.warning(
+                    request,
+                    f'Plano aprovado, mas houve um erro ao criar sprints e tarefas automaticamente: {str(e)}. '
+                    f'Você pode criá-las manualmente.'
+                )
+            
+            return redirect('projeto_detail', pk=projeto.pk)
+            
+        except Exception as e:
+            import traceback
+            logger = logging.getLogger(__name__)
+            error_trace = traceback.format_exc()
+            logger.error(f"Erro ao aprovar plano {plano.pk}: {error_trace}")
+            print(f"Erro ao aprovar plano: {error_trace}")
+            messages.error(request, f'Erro ao aprovar plano: {str(e)}. Verifique os logs para mais detalhes.')
+    
+    return redirect('plano_trabalho_detail', pk=pk)
+
+
+@group_required("Admin", "Gerente")
+def plano_trabalho_rejeitar(request, pk):
+    """Rejeita o plano de trabalho"""
+    plano = get_object_or_404(PlanoTrabalho, pk=pk)
+    
+    if request.method == 'POST':
+        observacoes = request.POST.get('observacoes', '')
+        plano.status = 'rejeitado'
+        plano.observacoes_aprovacao = observacoes
+        plano.save()
+        
+        messages.info(request, 'Plano de trabalho rejeitado.')
+    
+    return redirect('plano_trabalho_detail', pk=pk)
+
+
+@group_required("Admin", "Gerente")
+def plano_trabalho_update(request, pk):
+    """Edita o plano de trabalho"""
+    import json
+    plano = get_object_or_404(PlanoTrabalho, pk=pk)
+    
+    if request.method == 'POST':
+        form = PlanoTrabalhoForm(request.POST, instance=plano)
+        
+        # Processar dados JSON dos campos dinâmicos
+        if 'pontos_atencao_json' in request.POST:
+            try:
+                pontos_atencao = json.loads(request.POST['pontos_atencao_json'])
+                plano.pontos_atencao = pontos_atencao
+            except json.JSONDecodeError:
+                pass
+        
+        if 'processo_execucao_json' in request.POST:
+            try:
+                processo_execucao = json.loads(request.POST['processo_execucao_json'])
+                plano.processo_execucao = processo_execucao
+            except json.JSONDecodeError:
+                pass
+        
+        if 'cronograma_detalhado_json' in request.POST:
+            try:
+                cronograma_detalhado = json.loads(request.POST['cronograma_detalhado_json'])
+                plano.cronograma_detalhado = cronograma_detalhado
+            except json.JSONDecodeError:
+                pass
+        
+        if 'plano_comunicacao_json' in request.POST:
+            try:
+                plano_comunicacao = json.loads(request.POST['plano_comunicacao_json'])
+                plano.plano_comunicacao = plano_comunicacao
+            except json.JSONDecodeError:
+                pass
+        
+        if form.is_valid():
+            # Salvar campos do formulário
+            plano.resumo_contrato = form.cleaned_data.get('resumo_contrato', plano.resumo_contrato)
+            plano.data_inicio_prevista = form.cleaned_data.get('data_inicio_prevista', plano.data_inicio_prevista)
+            plano.data_fim_prevista = form.cleaned_data.get('data_fim_prevista', plano.data_fim_prevista)
+            plano.template_status_report = form.cleaned_data.get('template_status_report', plano.template_status_report)
+            plano.frequencia_status_report = form.cleaned_data.get('frequencia_status_report', plano.frequencia_status_report)
+            
+            # Detecta se o processo_execucao foi alterado
+            processo_execucao_alterado = 'processo_execucao_json' in request.POST
+            
+            plano.save()
+            
+            # Se o processo de execução foi alterado e o plano tem projeto, as diferenças
+            # com sprints e tarefas são exibidas para revisão antes de serem aplicadas
+            # Funciona para planos aprovados ou não (se já tiver projeto criado)
+            if processo_execucao_alterado:
+                if plano.projeto:
+                    messages.success(
+                        request,
+                        'Plano de trabalho atualizado! Revise as alterações antes de sincronizar com o projeto.'
+                    )
+                    return redirect('plano_trabalho_sincronizar', pk=plano.pk)
+                else:
+                    messages.success(
+                        request, 
+                        'Plano de trabalho atualizado com sucesso! '
+                        'As alterações no processo de execução serão aplicadas quando o plano for aprovado.'
+                    )
+            else:
+                messages.success(request, 'Plano de trabalho atualizado com sucesso!')
+            
+            return redirect('plano_trabalho_detail', pk=plano.pk)
+        else:
+            messages.error(request, 'Erro ao atualizar plano. Verifique os campos.')
+    else:
+        # Ao editar, o ModelForm já carrega automaticamente as datas salvas via instance=plano
+        # Se não houver datas salvas, preenche com as do contrato como padrão
+        form = PlanoTrabalhoForm(instance=plano)
+        
+        # Se o plano não tiver datas salvas, preenche com as do contrato através do projeto
+        if not plano.data_inicio_prevista and plano.projeto:
+            form.fields['data_inicio_prevista'].initial = plano.projeto.contrato.data_assinatura
+        if not plano.data_fim_prevista and plano.projeto:
+            form.fields['data_fim_prevista'].initial = plano.projeto.contrato.data_fim_atual or plano.projeto.contrato.data_fim
+    
+    context = {
+        'form': form,
+        'plano': plano,
+    }
+    return render(request, 'ia_contratos/plano_form.html', context)
+
+
+@group_required("Admin", "Gerente")
+def plano_trabalho_sincronizar(request, pk):
+    """Exibe o diff entre o plano e o projeto (GET) e aplica as alterações (POST)"""
+    plano = get_object_or_404(PlanoTrabalho.objects.select_related('projeto__contrato'), pk=pk)
+    if not plano.projeto:
+        messages.warning(request, 'O plano não está vinculado a um projeto.')
+        return redirect('plano_trabalho_detail', pk=plano.pk)
+    
+    diff = SincronizacaoPlanoService.calcular_diff(plano)
+    
+    if request.method == 'POST':
+        sobrescrever = request.POST.get('sobrescrever_conflitos') == '1'
+        try:
+            resultado = SincronizacaoPlanoService.aplicar_diff(diff, sobrescrever_conflitos=sobrescrever)
+        except ValueError as e:
+            messages.error(request, f'Erro ao sincronizar com o projeto: {e}')
+            return redirect('plano_trabalho_sincronizar', pk=plano.pk)
+        messages.success(
+            request,
+            f"Projeto sincronizado: {resultado['sprints_criadas']} sprint(s) criada(s), "
+            f"{resultado['sprints_atualizadas']} atualizada(s) e {resultado['sprints_removidas']} removida(s); "
+            f"{resultado['tarefas_criadas']} tarefa(s) criada(s), {resultado['tarefas_atualizadas']} atualizada(s) "
+            f"e {resultado['tarefas_removidas']} removida(s)."
+        )
+        return redirect('plano_trabalho_detail', pk=plano.pk)
+    
+    context = {
+        'plano': plano,
+        'projeto': plano.projeto,
+        'diff': diff,
+        'tem_alteracoes': SincronizacaoPlanoService.tem_alteracoes(diff),
+    }
+    return render(request, 'ia_contratos/plano_sincronizar.html', context)
+
+
+@group_required("Admin", "Gerente", "Leitor")
+def plano_trabalho_exportar_pdf(request, pk):
+    """Exporta o plano de trabalho em PDF usando reportlab"""
+    from django.http import HttpResponse
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.units import cm
+    from reportlab.lib import colors
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
+    from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_JUSTIFY
+    from io import BytesIO
+    import json
+    
+    plano = get_object_or_404(PlanoTrabalho.objects.select_related('projeto__contrato__cliente'), pk=pk)
+    
+    # Obter contrato através do projeto
+    if not plano.projeto:
+        messages.error(request, 'O plano de trabalho deve estar vinculado a um projeto.')
+        return redirect('plano_trabalho_detail', pk=pk)
+    
+    contrato = plano.projeto.contrato
+    projeto = plano.projeto
+    
+    # Criar resposta PDF
+    response = HttpResponse(content_type='application/pdf')
+    filename = f"plano_trabalho_{projeto.nome.replace(' ', '_').replace('/', '_')}_{contrato.numero_contrato.replace('/', '_')}.pdf"
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    
+    try:
+        # Criar documento PDF
+        buffer = BytesIO()
+        doc = SimpleDocTemplate(buffer, pagesize=A4, 
+                                rightMargin=2*cm, leftMargin=2*cm,
+                                topMargin=2*cm, bottomMargin=2*cm)
+        
+        # Cores Alltech (valores hex para uso em strings HTML)
+        cor_laranja_hex = '#FF6B35'
+        cor_azul_escuro_hex = '#1e3a5f'
+        cor_cinza_hex = '#9ca3af'
+        cor_branco_hex = '#FFFFFF'
+        
+        # Cores Alltech (objetos Color para uso em estilos)
+        cor_laranja = colors.HexColor(cor_laranja_hex)
+        cor_azul_escuro = colors.HexColor(cor_azul_escuro_hex)
+        cor_cinza = colors.HexColor(cor_cinza_hex)
+        
+        # Estilos
+        styles = getSampleStyleSheet()
+        title_style = ParagraphStyle(
+            'CustomTitle',
+            parent=styles['Heading1'],
+            fontSize=20,
+            textColor=cor_azul_escuro,
+            spaceAfter=12,
+            borderWidth=0,
+            borderColor=cor_laranja,
+            borderPadding=(0, 0, 5, 0),
+        )
+        heading_style = ParagraphStyle(
+            'CustomHeading',
+            parent=styles['Heading2'],
+            fontSize=14,
+            textColor=cor_azul_escuro,
+            spaceAfter=10,
+        )
+        
+        # Estilo para células de tabela com quebra de linha
+        cell_style = ParagraphStyle(
+            'CellStyle',
+            parent=styles['Normal'],
+            fontSize=8,
+            leading=10,
+            alignment=TA_LEFT,
+            spaceBefore=0,
+            spaceAfter=0,
+        )
+        
+        # Estilo para cabeçalhos de tabela
+        header_cell_style = ParagraphStyle(
+            'HeaderCellStyle',
+            parent=styles['Normal'],
+            fontSize=9,
+            leading=11,
+            alignment=TA_LEFT,
+            textColor=colors.white,
+            spaceBefore=0,
+            spaceAfter=0,
+        )
+        normal_style = styles['Normal']
+        normal_style.fontSize = 10
+        normal_style.leading = 14
+        
+        # Conteúdo do PDF
+        story = []
+        
+        # Cabeçalho com logo Alltech
+        header_data = [
+            [Paragraph(f'<font color="{cor_laranja_hex}"><b>ALL</b></font><font color="{cor_azul_escuro_hex}"><b>TECH</b></font><br/><font size="9" color="{cor_cinza_hex}">Soluções em Tecnologia</font>', 
+                      ParagraphStyle('Header', parent=styles['Normal'], 
+                                   fontSize=28, textColor=colors.black,
+                                   alignment=TA_CENTER, spaceAfter=5))],
+            [Paragraph('<b>PLANO DE TRABALHO</b>', 
+                      ParagraphStyle('HeaderTitle', parent=styles['Normal'],
+                                   fontSize=18, textColor=colors.white,
+                                   alignment=TA_CENTER, backColor=cor_azul_escuro,
+                                   spaceBefore=10, spaceAfter=10))],
+            [Paragraph(f'<b>Projeto:</b> {projeto.nome}<br/>'
+                      f'<b>Contrato:</b> {contrato.numero_contrato}<br/>'
+                      f'<b>Cliente:</b> {contrato.cliente.nome_razao_social}',
+                      ParagraphStyle('HeaderInfo', parent=styles['Normal'],
+                                   fontSize=10, textColor=colors.white,
+                                   alignment=TA_CENTER, spaceAfter=5))],
+        ]
+        header_table = Table(header_data, colWidths=[16*cm])
+        header_table.setStyle(TableStyle([
+            ('BACKGROUND', (0, 1), (0, 1), cor_azul_escuro),
+            ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 10),
+            ('TOPPADDING', (0, 0), (-1, -1), 10),
+        ]))
+        story.append(header_table)
+        story.append(Spacer(1, 0.5*cm))
+        
+        # Informações do Contrato
+        info_data = [
+            [
+                Paragraph('<b>Projeto</b>', header_cell_style),
+                Paragraph(str(projeto.nome), cell_style),
+                Paragraph('<b>Data de Início</b>', header_cell_style),
+                Paragraph(plano.data_inicio_prevista.strftime('%d/%m/%Y'), cell_style)
+            ],
+            [
+                Paragraph('<b>Número do Contrato</b>', header_cell_style),
+                Paragraph(str(contrato.numero_contrato), cell_style),
+                Paragraph('<b>Data de Término</b>', header_cell_style),
+                Paragraph(plano.data_fim_prevista.strftime('%d/%m/%Y'), cell_style)
+            ],
+            [
+                Paragraph('<b>Cliente</b>', header_cell_style),
+                Paragraph(contrato.cliente.nome_razao_social, cell_style),
+                Paragraph('<b>Status</b>', header_cell_style),
+                Paragraph(plano.get_status_display(), cell_style)
+            ],
+            [
+                Paragraph('<b>CNPJ/CPF</b>', header_cell_style),
+                Paragraph(str(contrato.cliente.cnpj_cpf or ''), cell_style),
+                Paragraph('<b>Fornecedor</b>', header_cell_style),
+                Paragraph(str(plano.fornecedor or 'Não definido'), cell_style)
+            ],
+        ]
+        info_table = Table(info_data, colWidths=[4*cm, 4*cm, 4*cm, 4*cm])
+        info_table.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (0, 0), cor_azul_escuro),
+            ('BACKGROUND', (2, 0), (2, 0), cor_azul_escuro),
+            ('BACKGROUND', (0, 1), (0, 1), cor_azul_escuro),
+            ('BACKGROUND', (2, 1), (2, 1), cor_azul_escuro),
+            ('BACKGROUND', (0, 2), (0, 2), cor_azul_escuro),
+            ('BACKGROUND', (2, 2), (2, 2), cor_azul_escuro),
+            ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTSIZE', (0, 1), (-1, -1), 8),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+            ('TOPPADDING', (0, 0), (-1, -1), 8),
+            ('LEFTPADDING', (0, 0), (-1, -1), 6),
+            ('RIGHTPADDING', (0, 0), (-1, -1), 6),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+        ]))
+        story.append(Paragraph('<b>Informações do Contrato</b>', heading_style))
+        story.append(info_table)
+        story.append(Spacer(1, 0.5*cm))
+        
+        # Resumo do Contrato
+        story.append(Paragraph('<b>Resumo do Contrato</b>', title_style))
+        story.append(Paragraph(plano.resumo_contrato.replace('\n', '<br/>'), normal_style))
+        story.append(Spacer(1, 0.3*cm))
+        
+        # Pontos de Atenção
+        if plano.pontos_atencao:
+            story.append(PageBreak())
+            story.append(Paragraph('<b>Pontos de Atenção</b>', title_style))
+            
+            pontos_data = [[
+                Paragraph('<b>Título</b>', header_cell_style),
+                Paragraph('<b>Descrição</b>', header_cell_style),
+                Paragraph('<b>Prioridade</b>', header_cell_style),
+                Paragraph('<b>Ação Recomendada</b>', header_cell_style)
+            ]]
+            for ponto in plano.pontos_atencao:
+                pontos_data.append([
+                    Paragraph(str(ponto.get('titulo', '-')), cell_style),
+                    Paragraph(str(ponto.get('descricao', '-')), cell_style),
+                    Paragraph(str(ponto.get('prioridade', 'media').upper()), cell_style),
+                    Paragraph(str(ponto.get('acao_recomendada', '-')), cell_style),
+                ])
+            
+            pontos_table = Table(pontos_data, colWidths=[3.5*cm, 5*cm, 2.5*cm, 5*cm], repeatRows=1)
+            pontos_table.setStyle(TableStyle([
+                ('BACKGROUND', (0, 0), (-1, 0), cor_azul_escuro),
+                ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
+                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+                ('FONTSIZE', (0, 1), (-1, -1), 8),
+                ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+                ('TOPPADDING', (0, 0), (-1, -1), 8),
+                ('LEFTPADDING', (0, 0), (-1, -1), 6),
+                ('RIGHTPADDING', (0, 0), (-1, -1), 6),
+                ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+                ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+            ]))
+            story.append(pontos_table)
+            story.append(Spacer(1, 0.3*cm))
+        
+        # Cláusulas Críticas
+        clausulas_criticas = contrato.clausulas_criticas.all()
+        if clausulas_criticas:
+            story.append(PageBreak())
+            story.append(Paragraph('<b>Cláusulas Críticas</b>', title_style))
+            
+            clausulas_data = [[
+                Paragraph('<b>Título</b>', header_cell_style),
+                Paragraph('<b>Nº Cláusula</b>', header_cell_style),
+                Paragraph('<b>Descrição</b>', header_cell_style),
+                Paragraph('<b>Impacto</b>', header_cell_style),
+                Paragraph('<b>Ação Necessária</b>', header_cell_style)
+            ]]
+            for clausula in clausulas_criticas:
+                clausulas_data.append([
+                    Paragraph(str(clausula.titulo), cell_style),
+                    Paragraph(str(clausula.numero_clausula or '-'), cell_style),
+                    Paragraph(str(clausula.descricao), cell_style),
+                    Paragraph(str(clausula.get_impacto_display().upper()), cell_style),
+                    Paragraph(str(clausula.acao_necessaria), cell_style),
+                ])
+            
+            clausulas_table = Table(clausulas_data, colWidths=[3*cm, 2*cm, 4*cm, 2*cm, 5*cm], repeatRows=1)
+            clausulas_table.setStyle(TableStyle([
+                ('BACKGROUND', (0, 0), (-1, 0), cor_azul_escuro),
+                ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+                ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
+                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+                ('FONTSIZE', (0, 1), (-1, -1), 8),
+                ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+                ('TOPPADDING', (0, 0), (-1, -1), 8),
+                ('LEFTPADDING', (0, 0), (-1, -1), 6),
+                ('RIGHTPADDING', (0, 0), (-1, -1), 6),
+                ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+                ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+            ]))
+            story.append(clausulas_table)
+            story.append(Spacer(1, 0.3*cm))
+        
+        # Processo de Execução
+        if plano.processo_execucao:
+            story.append(PageBreak())
+            story.append(Paragraph('<b>Processo de Execução</b>', title_style))
+            
+            for etapa in plano.processo_execucao:
+                etapa_nome = etapa.get('nome') or etapa.get('etapa') or 'Etapa'
+                fase = etapa.get('fase', '')
+                story.append(Paragraph(f'<b>{etapa_nome}</b> - {fase}', heading_style))
+                story.append(Paragraph(f'<b>Descrição:</b> {etapa.get("descricao", "-")}', normal_style))
+                story.append(Paragraph(f'<b>Duração:</b> {etapa.get("duracao_dias", "-")} dias', normal_style))
+                
+                if etapa.get('entregaveis'):
+                    story.append(Paragraph('<b>Entregáveis:</b>', normal_style))
+                    for entregavel in etapa.get('entregaveis', []):
+                        story.append(Paragraph(f'• {entregavel}', normal_style))
+                
+                story.append(Spacer(1, 0.3*cm))
+        
+        # SLAs Importantes
+        slas_importantes = contrato.slas_importantes.all()
+        if slas_importantes:
+            story.append(PageBreak())
+            story.append(Paragraph('<b>SLAs Importantes</b>', title_style))
+            
+            slas_data = [[
+                Paragraph('<b>Nome</b>', header_cell_style),
+                Paragraph('<b>Descrição</b>', header_cell_style),
+                Paragraph('<b>Resposta</b>', header_cell_style),
+                Paragraph('<b>Solução</b>', header_cell_style),
+                Paragraph('<b>Prioridade</b>', header_cell_style)
+            ]]
+            for sla in slas_importantes:
+                slas_data.append([
+                    Paragraph(str(sla.nome), cell_style),
+                    Paragraph(str(sla.descricao), cell_style),
+                    Paragraph(f'{sla.tempo_resposta_horas}h', cell_style),
+                    Paragraph(f'{sla.tempo_solucao_horas}h', cell_style),
+                    Paragraph(str(sla.get_prioridade_display().upper()), cell_style),
+                ])
+            
+            slas_table = Table(slas_data, colWidths=[3.5*cm, 5*cm, 2*cm, 2*cm, 3.5*cm], repeatRows=1)
+            slas_table.setStyle(TableStyle([
+                ('BACKGROUND', (0, 0), (-1, 0), cor_azul_escuro),
+                ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+                ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
+                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+                ('FONTSIZE', (0, 1), (-1, -1), 8),
+                ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+                ('TOPPADDING', (0, 0), (-1, -1), 8),
+                ('LEFTPADDING', (0, 0), (-1, -1), 6),
+                ('RIGHTPADDING', (0, 0), (-1, -1), 6),
+                ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+                ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+            ]))
+            story.append(slas_table)
+            story.append(Spacer(1, 0.3*cm))
+        
+        # Matriz RACI
+        matriz_raci = contrato.matriz_raci.all()
+        if matriz_raci:
+            story.append(PageBreak())
+            story.append(Paragraph('<b>Matriz RACI</b>', title_style))
+            
+            raci_data = [[
+                Paragraph('<b>Atividade</b>', header_cell_style),
+                Paragraph('<b>Fase</b>', header_cell_style),
+                Paragraph('<b>R</b>', header_cell_style),
+                Paragraph('<b>A</b>', header_cell_style),
+                Paragraph('<b>C</b>', header_cell_style),
+                Paragraph('<b>I</b>', header_cell_style)
+            ]]
+            for raci in matriz_raci:
+                fase_display = {
+                    'planejamento': 'Planejamento',
+                    'implantacao': 'Implantação',
+                    'execucao': 'Execução',
+                    'suporte': 'Suporte'
+                }.get(raci.fase, raci.fase)
+                
+                raci_data.append([
+                    Paragraph(str(raci.atividade), cell_style),
+                    Paragraph(str(fase_display), cell_style),
+                    Paragraph(str(raci.responsavel or '-'), cell_style),
+                    Paragraph(str(raci.aprovador or '-'), cell_style),
+                    Paragraph(str(raci.consultado or '-'), cell_style),
+                    Paragraph(str(raci.informado or '-'), cell_style),
+                ])
+            
+            raci_table = Table(raci_data, colWidths=[4*cm, 2.5*cm, 2.5*cm, 2.5*cm, 2.5*cm, 2.5*cm], repeatRows=1)
+            raci_table.setStyle(TableStyle([
+                ('BACKGROUND', (0, 0), (-1, 0), cor_azul_escuro),
+                ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+                ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
+                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+                ('FONTSIZE', (0, 1), (-1, -1), 8),
+                ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+                ('TOPPADDING', (0, 0), (-1, -1), 8),
+                ('LEFTPADDING', (0, 0), (-1, -1), 6),
+                ('RIGHTPADDING', (0, 0), (-1, -1), 6),
+                ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+                ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+            ]))
+            story.append(raci_table)
+            story.append(Spacer(1, 0.3*cm))
+        
+        # Cronograma Detalhado
+        if plano.cronograma_detalhado:
+            story.append(PageBreak())
+            story.append(Paragraph('<b>Cronograma Detalhado</b>', title_style))
+            
+            crono_data = [[
+                Paragraph('<b>Nome do Marco</b>', header_cell_style),
+                Paragraph('<b>Data</b>', header_cell_style),
+                Paragraph('<b>Descrição</b>', header_cell_style)
+            ]]
+            for marco in plano.cronograma_detalhado:
+                from datetime import datetime
+                try:
+                    if isinstance(marco.get('data'), str):
+                        data_obj = datetime.strptime(marco['data'], '%Y-%m-%d')
+                        data_str = data_obj.strftime('%d/%m/%Y')
+                    else:
+                        data_str = marco.get('data', '-')
+                except:
+                    data_str = str(marco.get('data', '-'))
+                
+                crono_data.append([
+                    Paragraph(str(marco.get('nome', '-')), cell_style),
+                    Paragraph(str(data_str), cell_style),
+                    Paragraph(str(marco.get('descricao', '-')), cell_style),
+                ])
+            
+            crono_table = Table(crono_data, colWidths=[5*cm, 3*cm, 8*cm], repeatRows=1)
+            crono_table.setStyle(TableStyle([
+                ('BACKGROUND', (0, 0), (-1, 0), cor_azul_escuro),
+                ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+                ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
+                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+                ('FONTSIZE', (0, 1), (-1, -1), 8),
+                ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+                ('TOPPADDING', (0, 0), (-1, -1), 8),
+                ('LEFTPADDING', (0, 0), (-1, -1), 6),
+                ('RIGHTPADDING', (0, 0), (-1, -1), 6),
+                ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+                ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+            ]))
+            story.append(crono_table)
+            story.append(Spacer(1, 0.3*cm))
+        
+        # Plano de Comunicação
+        if plano.plano_comunicacao:
+            story.append(PageBreak())
+            story.append(Paragraph('<b>Plano de Comunicação</b>', title_style))
+            
+            if isinstance(plano.plano_comunicacao, str):
+                try:
+                    plano_com = json.loads(plano.plano_comunicacao)
+                except:
+                    plano_com = {}
+            else:
+                plano_com = plano.plano_comunicacao
+            
+            if plano_com.get('stakeholders'):
+                story.append(Paragraph('<b>Stakeholders</b>', heading_style))
+                stakeholders_data = [[
+                    Paragraph('<b>Nome</b>', header_cell_style),
+                    Paragraph('<b>Papel</b>', header_cell_style),
+                    Paragraph('<b>Frequência</b>', header_cell_style),
+                    Paragraph('<b>Canais</b>', header_cell_style)
+                ]]
+                for stakeholder in plano_com.get('stakeholders', []):
+                    canais = stakeholder.get('canais', [])
+                    canais_str = ', '.join(canais) if isinstance(canais, list) else str(canais)
+                    stakeholders_data.append([
+                        Paragraph(str(stakeholder.get('nome', '-')), cell_style),
+                        Paragraph(str(stakeholder.get('papel', '-')), cell_style),
+                        Paragraph(str(stakeholder.get('frequencia_comunicacao', '-')), cell_style),
+                        Paragraph(str(canais_str), cell_style),
+                    ])
+                
+                stakeholders_table = Table(stakeholders_data, colWidths=[4*cm, 4*cm, 3*cm, 5*cm], repeatRows=1)
+                stakeholders_table.setStyle(TableStyle([
+                    ('BACKGROUND', (0, 0), (-1, 0), cor_azul_escuro),
+                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+                    ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
+                    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+                    ('FONTSIZE', (0, 0), (-1, 0), 9),
+                    ('FONTSIZE', (0, 1), (-1, -1), 8),
+                    ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
+                    ('TOPPADDING', (0, 0), (-1, -1), 4),
+                    ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+                    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+                ]))
+                story.append(stakeholders_table)
+                story.append(Spacer(1, 0.3*cm))
+            
+            if plano_com.get('reunioes'):
+                story.append(Paragraph('<b>Reuniões</b>', heading_style))
+                reunioes_data = [[
+                    Paragraph('<b>Tipo</b>', header_cell_style),
+                    Paragraph('<b>Frequência</b>', header_cell_style),
+                    Paragraph('<b>Participantes</b>', header_cell_style),
+                    Paragraph('<b>Objetivo</b>', header_cell_style)
+                ]]
+                for reuniao in plano_com.get('reunioes', []):
+                    participantes = reuniao.get('participantes', [])
+                    participantes_str = ', '.join(participantes) if isinstance(participantes, list) else str(participantes)
+                    reunioes_data.append([
+                        Paragraph(str(reuniao.get('tipo', '-')), cell_style),
+                        Paragraph(str(reuniao.get('frequencia', '-')), cell_style),
+                        Paragraph(str(participantes_str), cell_style),
+                        Paragraph(str(reuniao.get('objetivo', '-')), cell_style),
+                    ])
+                
+                reunioes_table = Table(reunioes_data, colWidths=[3*cm, 3*cm, 4*cm, 6*cm], repeatRows=1)
+                reunioes_table.setStyle(TableStyle([
+                    ('BACKGROUND', (0, 0), (-1, 0), cor_azul_escuro),
+                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+                    ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
+                    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+                    ('FONTSIZE', (0, 0), (-1, 0), 9),
+                    ('FONTSIZE', (0, 1), (-1, -1), 8),
+                    ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
+                    ('TOPPADDING', (0, 0), (-1, -1), 4),
+                    ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+                    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+                ]))
+                story.append(reunioes_table)
+                story.append(Spacer(1, 0.3*cm))
+        
+        # Template de Status Report
+        if plano.template_status_report:
+            story.append(PageBreak())
+            story.append(Paragraph('<b>Template de Status Report</b>', title_style))
+            story.append(Paragraph(plano.template_status_report.replace('\n', '<br/>'), normal_style))
+            story.append(Spacer(1, 0.2*cm))
+            story.append(Paragraph(f'<b>Frequência:</b> {plano.frequencia_status_report.title()}', normal_style))
+        
+        # Rodapé
+        story.append(Spacer(1, 1*cm))
+        footer_style = ParagraphStyle(
+            'Footer',
+            parent=styles['Normal'],
+            fontSize=8,
+            textColor=colors.HexColor('#6b7280'),
+            alignment=TA_CENTER,
+        )
+        story.append(Paragraph('<b>ALLTECH - Soluções em Tecnologia</b>', footer_style))
+        story.append(Paragraph('www.alltechsolucoes.com.br', footer_style))
+        from django.utils import timezone
+        story.append(Paragraph(f'Documento gerado em {timezone.now().strftime("%d/%m/%Y %H:%M")}', footer_style))
+        story.append(Paragraph('Este documento foi gerado automaticamente pelo sistema de gestão de contratos.', footer_style))
+        
+        # Construir PDF
+        doc.build(story)
+        
+        # Retornar PDF
+        pdf = buffer.getvalue()
+        buffer.close()
+        response.write(pdf)
+        return response
+        
+    except Exception as e:
+        import traceback
+        print(f"Erro ao gerar PDF: {traceback.format_exc()}")
+        messages.error(request, f'Erro ao gerar PDF: {str(e)}')
+        return redirect('plano_trabalho_detail', pk=pk)
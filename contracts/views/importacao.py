@@ -0,0 +1,160 @@
+"""
+Views de importação e exportação da planilha geral
+"""
+from django.shortcuts import render, redirect
+from django.http import HttpResponse
+from django.contrib import messages
+from django.views.decorators.http import require_http_methods
+from django.utils.timezone import is_aware
+from datetime import datetime
+import io
+
+from ..models import (
+    Cliente,
+    Contrato,
+    ItemContrato,
+    ItemFornecedor,
+    OrdemFornecimento,
+    OrdemServico,
+    ImportExportLog,
+)
+from .comum import group_required
+
+
+@require_http_methods(["GET", "POST"])
+def import_export_view(request):
+    import pandas as pd
+    if request.method == "POST" and request.FILES.get("file"):
+        file = request.FILES["file"]
+        try:
+            excel_file = pd.ExcelFile(file)
+
+            # Clientes
+            Cliente.objects.all().delete()
+            df_clientes = pd.read_excel(excel_file, sheet_name="Clientes")
+            for _, row in df_clientes.iterrows():
+                Cliente.objects.create(**row.to_dict())
+
+            # Contratos
+            Contrato.objects.all().delete()
+            df_contratos = pd.read_excel(excel_file, sheet_name="Contratos")
+            for _, row in df_contratos.iterrows():
+                cliente = Cliente.objects.get(id=row["cliente_id"])
+                fornecedores = (
+                    eval(row["fornecedores"])
+                    if isinstance(row["fornecedores"], str)
+                    else []
+                )
+                Contrato.objects.create(
+                    cliente=cliente,
+                    numero=row["numero"],
+                    data_assinatura=row["data_assinatura"],
+                    data_fim=row["data_fim"],
+                    valor_total=row["valor_total"],
+                    situacao=row["situacao"],
+                    fornecedores=fornecedores,
+                )
+
+            # Itens de Contrato
+            ItemContrato.objects.all().delete()
+            df_itens_contrato = pd.read_excel(excel_file, sheet_name="ItensContrato")
+            for _, row in df_itens_contrato.iterrows():
+                contrato = Contrato.objects.get(id=row["contrato_id"])
+                ItemContrato.objects.create(
+                    contrato=contrato, **row.drop("contrato_id").to_dict()
+                )
+
+            # Itens de Fornecedor
+            ItemFornecedor.objects.all().delete()
+            df_itens_fornecedor = pd.read_excel(
+                excel_file, sheet_name="ItensFornecedor"
+            )
+            for _, row in df_itens_fornecedor.iterrows():
+                ItemFornecedor.objects.create(**row.to_dict())
+
+            # Ordens de Serviço
+            OrdemServico.objects.all().delete()
+            df_os = pd.read_excel(excel_file, sheet_name="OrdensServico")
+            for _, row in df_os.iterrows():
+                OrdemServico.objects.create(**row.to_dict())
+
+            # Ordens de Fornecimento
+            OrdemFornecimento.objects.all().delete()
+            df_of = pd.read_excel(excel_file, sheet_name="OrdensFornecimento")
+            for _, row in df_of.iterrows():
+                OrdemFornecimento.objects.create(**row.to_dict())
+
+            messages.success(request, "Dados importados com sucesso!")
+        except Exception as e:
+            messages.error(request, f"Erro na importação: {str(e)}")
+
+        return redirect("import_export_view")
+
+    return render(request, "import_export/import_export.html")
+
+
+def export_excel_view(request):
+    import pandas as pd
+    output = io.BytesIO()
+    writer = pd.ExcelWriter(output, engine="openpyxl")
+
+    models_and_sheets = [
+        (Cliente, "Clientes"),
+        (Contrato, "Contratos"),
+        (ItemContrato, "ItensContrato"),
+        (ItemFornecedor, "ItensFornecedor"),
+        (OrdemFornecimento, "OrdensFornecimento"),
+        (OrdemServico, "OrdensServico"),
+    ]
+
+    for model, sheet_name in models_and_sheets:
+        queryset = model.objects.all().values()
+        df = pd.DataFrame.from_records(queryset)
+        df = clean_datetimes(df)
+        df.to_excel(writer, sheet_name=sheet_name, index=False)
+
+    writer.close()
+    output.seek(0)
+
+    response = HttpResponse(
+        output.read(),
+        content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    )
+    response["Content-Disposition"] = (
+        "attachment; filename=ControleContratos_Exportado.xlsx"
+    )
+    return response
+
+
+def clean_datetimes(df):
+    import pandas as pd
+    for col in df.columns:
+        if pd.api.types.is_datetime64_any_dtype(df[col]):
+            df[col] = df[col].apply(
+                lambda x: (
+                    x.replace(tzinfo=None)
+                    if isinstance(x, datetime) and is_aware(x)
+                    else x
+                )
+            )
+        elif df[col].dtype == "object":
+            # Tenta converter strings para datetime e remover fuso se necessário
+            try:
+                df[col] = pd.to_datetime(df[col], errors="coerce")
+                df[col] = df[col].apply(
+                    lambda x: (
+                        x.replace(tzinfo=None)
+                        if isinstance(x, datetime) and is_aware(x)
+                        else x
+                    )
+                )
+            except Exception:
+                pass
+    return df
+
+
+# Visualizar Logs de Importação e Exportação
+@group_required("Admin", "Gerente")
+def logs_import_export(request):
+    logs = ImportExportLog.objects.order_by("-data")
+    return render(request, "import_export/import_export_logs.html", {"logs": logs})
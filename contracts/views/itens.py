@@ -0,0 +1,206 @@
+"""
+Views de itens de contrato e itens de fornecedor
+"""
+from django.shortcuts import render, get_object_or_404, redirect
+from django.http import HttpResponse
+from django.contrib import messages
+from django.core.paginator import Paginator
+import csv
+
+from ..models import ItemContrato, ItemFornecedor
+from ..forms import ItemContratoForm, ItemFornecedorForm
+from .comum import group_required
+
+
+ITEM_CONTRATO_LIST_COLUMNS = [
+    {"id": "lote", "label": "Lote"},
+    {"id": "numero", "label": "Nº Item"},
+    {"id": "contrato", "label": "Contrato"},
+    {"id": "descricao", "label": "Descrição"},
+    {"id": "unidade", "label": "Unidade"},
+    {"id": "quantidade", "label": "Qtd"},
+    {"id": "consumida", "label": "Qtd. Consumida"},
+    {"id": "saldo", "label": "Qtd. Saldo"},
+]
+
+
+ITEM_FORNECEDOR_LIST_COLUMNS = [
+    {"id": "fornecedor", "label": "Fornecedor"},
+    {"id": "tipo", "label": "Tipo"},
+    {"id": "sku", "label": "SKU"},
+    {"id": "descricao", "label": "Descrição"},
+    {"id": "unidade", "label": "Unidade"},
+    {"id": "valor_unitario", "label": "Valor Unitário"},
+]
+
+
+# Função get_contratos_queryset removida - usar gestao_contratos_list ao invés
+# Views legadas de contrato removidas - usar gestao_contratos_* ao invés
+
+
+# Função de exportação CSV legada removida - usar gestao_contratos ao invés
+
+
+# Item de Contrato - Editar
+@group_required("Admin", "Gerente")
+def itemcontrato_update(request, pk):
+    item = get_object_or_404(ItemContrato, pk=pk)
+    if request.method == "POST":
+        form = ItemContratoForm(request.POST, instance=item)
+        if form.is_valid():
+            form.save()
+            messages.success(request, "Item de contrato atualizado com sucesso!")
+            return redirect("gestao_contratos_detail", pk=item.contrato.pk)
+    else:
+        form = ItemContratoForm(instance=item)
+    return render(request, "item_contrato/form.html", {"form": form, "item": item})
+
+
+# Item de Contrato - Detalhar
+@group_required("Admin", "Gerente", "Leitor")
+def itemcontrato_detail(request, pk):
+    item = get_object_or_404(ItemContrato, pk=pk)
+    return render(request, "item_contrato/detail.html", {"item": item})
+
+
+# Item de Contrato - Deletar
+@group_required("Admin", "Gerente")
+def itemcontrato_delete(request, pk):
+    item = get_object_or_404(ItemContrato, pk=pk)
+    contrato_pk = item.contrato.pk
+    if request.method == "POST":
+        item.delete()
+        messages.success(request, "Item de contrato excluído com sucesso!")
+        return redirect("gestao_contratos_detail", pk=contrato_pk)
+    return render(request, "item_contrato/confirm_delete.html", {"object": item, "contrato": item.contrato})
+
+
+# Item de Fornecedor - Listar com filtros e paginação
+@group_required("Admin", "Gerente", "Leitor")
+def itemfornecedor_list(request):
+    itens = ItemFornecedor.objects.all()
+
+    fornecedor = request.GET.get("fornecedor")
+    tipo = request.GET.get("tipo")
+
+    if fornecedor:
+        itens = itens.filter(fornecedor=fornecedor)
+
+    if tipo:
+        itens = itens.filter(tipo=tipo)
+
+    # Estatísticas
+    total_itens = ItemFornecedor.objects.count()
+    itens_produto = ItemFornecedor.objects.filter(tipo="produto").count()
+    itens_servico = ItemFornecedor.objects.filter(tipo="servico").count()
+    itens_treinamento = ItemFornecedor.objects.filter(tipo="treinamento").count()
+    
+    # Contar fornecedores únicos
+    # Fornecedores padrão (excluindo "Outro Fornecedor")
+    fornecedores_padrao = ItemFornecedor.objects.exclude(fornecedor="Outro Fornecedor").values('fornecedor').distinct().count()
+    # Fornecedores customizados (outro_fornecedor)
+    fornecedores_custom = ItemFornecedor.objects.filter(fornecedor="Outro Fornecedor").exclude(outro_fornecedor__isnull=True).exclude(outro_fornecedor__exact='').values('outro_fornecedor').distinct().count()
+    fornecedores_unicos = fornecedores_padrao + fornecedores_custom
+
+    paginator = Paginator(itens, 10)
+    page = request.GET.get("page")
+    itens_page = paginator.get_page(page)
+
+    filtro_form = ItemFornecedorForm()
+    context = {
+        "itens": itens_page,
+        "fornecedor": fornecedor,
+        "tipo": tipo,
+        "form": filtro_form,
+        "colunas": ITEM_FORNECEDOR_LIST_COLUMNS,
+        "total_itens": total_itens,
+        "itens_produto": itens_produto,
+        "itens_servico": itens_servico,
+        "itens_treinamento": itens_treinamento,
+        "fornecedores_unicos": fornecedores_unicos,
+    }
+    return render(request, "item_fornecedor/list.html", context)
+
+
+# Item de Fornecedor - Detalhar
+@group_required("Admin", "Gerente", "Leitor")
+def itemfornecedor_detail(request, pk):
+    item = get_object_or_404(ItemFornecedor, pk=pk)
+    return render(request, "item_fornecedor/detail.html", {"item": item})
+
+
+# Item de Fornecedor - Criar
+@group_required("Admin", "Gerente")
+def itemfornecedor_create(request):
+    if request.method == "POST":
+        form = ItemFornecedorForm(request.POST)
+        if form.is_valid():
+            form.save()
+            return redirect("item_fornecedor_list")
+    else:
+        form = ItemFornecedorForm()
+    return render(request, "item_fornecedor/form.html", {"form": form})
+
+
+# Item de Fornecedor - Editar
+@group_required("Admin", "Gerente")
+def itemfornecedor_update(request, pk):
+    item = get_object_or_404(ItemFornecedor, pk=pk)
+    if request.method == "POST":
+        form = ItemFornecedorForm(request.POST, instance=item)
+        if form.is_valid():
+            form.save()
+            return redirect("item_fornecedor_list")
+    else:
+        form = ItemFornecedorForm(instance=item)
+    return render(request, "item_fornecedor/form.html", {"form": form})
+
+
+# Item de Fornecedor - Deletar
+@group_required("Admin", "Gerente")
+def itemfornecedor_delete(request, pk):
+    item = get_object_or_404(ItemFornecedor, pk=pk)
+    if request.method == "POST":
+        item.delete()
+        return redirect("item_fornecedor_list")
+    return render(request, "item_fornecedor/confirm_delete.html", {"object": item})
+
+
+# Item de Fornecedor - Exportação CSV
+@group_required("Admin", "Gerente")
+def export_item_fornecedor_csv(request):
+    response = HttpResponse(content_type="text/csv")
+    response["Content-Disposition"] = 'attachment; filename="itens_fornecedor.csv"'
+
+    writer = csv.writer(response)
+    writer.writerow(
+        [
+            "ID",
+            "Fornecedor",
+            "Outro Fornecedor",
+            "Tipo",
+            "SKU",
+            "Descrição",
+            "Unidade",
+            "Valor Unitário",
+            "Observações",
+        ]
+    )
+
+    itens = ItemFornecedor.objects.all()
+    for item in itens:
+        writer.writerow(
+            [
+                item.id,
+                item.fornecedor,
+                item.outro_fornecedor if item.fornecedor == "Outro Fornecedor" else "",
+                item.tipo,
+                item.sku,
+                item.descricao,
+                item.unidade,
+                f"{item.valor_unitario:.2f}".replace(".", ","),
+                item.observacoes or "",
+            ]
+        )
+
+    return response
@@ -0,0 +1,559 @@
+"""
+Views de ordens de fornecimento e ordens de serviço
+"""
+from django.shortcuts import render, get_object_or_404, redirect
+from django.urls import reverse
+from django.http import HttpResponse, JsonResponse
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required
+from django.views.decorators.http import require_GET
+from django.db.models import Sum
+from django.core.paginator import Paginator
+from django.utils.encoding import smart_str
+from datetime import datetime, timedelta
+from django.utils import timezone
+from decimal import Decimal
+import csv
+
+from ..models import (
+    Contrato,
+    OrdemFornecimento,
+    OrdemServico,
+    Projeto,
+)
+from ..services import ExpiracaoLicencaService
+from ..forms import OrdemFornecimentoForm, OrdemServicoForm
+from .comum import group_required
+
+
+# Todas as colunas disponíveis
+colunas = [
+    {"id": "numero", "label": "Número"},
+    {"id": "cliente", "label": "Cliente"},
+    {"id": "contrato", "label": "Contrato"},
+    {"id": "itemcontrato", "label": "Item Contrato"},
+    {"id": "itemfornecedor", "label": "Item Fornecedor"},
+    {"id": "unidade", "label": "Unidade"},
+    {"id": "quantidade", "label": "Quantidade"},
+    {"id": "vigencia_produto", "label": "Vigência do Produto (meses)"},
+    {"id": "valor_unitario", "label": "Valor Unitário"},
+    {"id": "valor_total", "label": "Valor Total"},
+    {"id": "data_ativacao", "label": "Data Ativação"},
+    {"id": "data_faturamento", "label": "Data Faturamento"},
+    {"id": "observacoes", "label": "Observações"},
+    {"id": "status", "label": "Status"},
+]
+
+
+# Ordem de Fornecimento - Listar
+@group_required("Admin", "Gerente", "Leitor")
+def ordemfornecimento_list(request):
+    ordens = OrdemFornecimento.objects.all()
+
+    # Filtros
+    numero = request.GET.get("numero")
+    cliente = request.GET.get("cliente")
+    status = request.GET.get("status")
+
+    if numero:
+        ordens = ordens.filter(numero_of__icontains=numero)
+    if cliente:
+        ordens = ordens.filter(cliente__nome_fantasia__icontains=cliente)
+    if status:
+        ordens = ordens.filter(status=status)
+
+    # Estatísticas
+    total_ordens = OrdemFornecimento.objects.count()
+    ordens_abertas = OrdemFornecimento.objects.filter(status="aberta").count()
+    ordens_execucao = OrdemFornecimento.objects.filter(status="execucao").count()
+    ordens_finalizadas = OrdemFornecimento.objects.filter(status="finalizada").count()
+    ordens_faturadas = OrdemFornecimento.objects.filter(status="faturada").count()
+    
+    # Valor total das ordens faturadas
+    valor_total_faturado = OrdemFornecimento.objects.filter(status="faturada").aggregate(
+        total=Sum('valor_total')
+    )['total'] or 0
+
+    # Paginação
+    paginator = Paginator(ordens, 10)
+    page = request.GET.get("page")
+    ordens_page = paginator.get_page(page)
+
+    context = {
+        "ordens": ordens_page,
+        "colunas": colunas,
+        "numero": numero,
+        "cliente": cliente,
+        "status": status,
+        "total_ordens": total_ordens,
+        "ordens_abertas": ordens_abertas,
+        "ordens_execucao": ordens_execucao,
+        "ordens_finalizadas": ordens_finalizadas,
+        "ordens_faturadas": ordens_faturadas,
+        "valor_total_faturado": valor_total_faturado,
+    }
+    return render(request, "ordem_fornecimento/list.html", context)
+
+
+# Ordem de Fornecimento - Detalhar
+@group_required("Admin", "Gerente", "Leitor")
+def ordemfornecimento_detail(request, pk):
+    ordem = get_object_or_404(OrdemFornecimento, pk=pk)
+    return render(request, "ordem_fornecimento/detail.html", {"ordem": ordem})
+
+
+# Ordem de Fornecimento - Criar
+@group_required("Admin", "Gerente")
+def ordemfornecimento_create(request):
+    if request.method == "POST":
+        form = OrdemFornecimentoForm(request.POST)
+        if form.is_valid():
+            form.save()
+            messages.success(request, "Ordem de Fornecimento criada com sucesso.")
+            return redirect("ordem_fornecimento_list")
+    else:
+        form = OrdemFornecimentoForm()
+    return render(request, "ordem_fornecimento/form.html", {"form": form})
+
+
+# Ordem de Fornecimento - Editar
+@group_required("Admin", "Gerente")
+def ordemfornecimento_update(request, pk):
+    ordem = get_object_or_404(OrdemFornecimento, pk=pk)
+    if request.method == "POST":
+        form = OrdemFornecimentoForm(request.POST, instance=ordem)
+        if form.is_valid():
+            form.save()
+            messages.success(request, "Ordem de Fornecimento atualizada com sucesso.")
+            return redirect("ordem_fornecimento_list")
+    else:
+        form = OrdemFornecimentoForm(instance=ordem)
+    return render(request, "ordem_fornecimento/form.html", {"form": form})
+
+
+# Ordem de Fornecimento - Deletar
+@group_required("Admin", "Gerente")
+def ordemfornecimento_delete(request, pk):
+    ordem = get_object_or_404(OrdemFornecimento, pk=pk)
+    if request.method == "POST":
+        ordem.delete()
+        messages.success(request, "Ordem de Fornecimento excluída com sucesso.")
+        return redirect("ordem_fornecimento_list")
+    return render(request, "ordem_fornecimento/confirm_delete.html", {"ordem": ordem})
+
+
+# Ordem de Fornecimento - Calendário de expiração das licenças
+@group_required("Admin", "Gerente", "Leitor")
+def ordemfornecimento_expiracoes(request):
+    """Calendário mensal das licenças que expiram e alertas de renovação"""
+    hoje = timezone.now().date()
+    try:
+        ano = int(request.GET.get("ano", hoje.year))
+        mes = int(request.GET.get("mes", hoje.month))
+        if not 1 <= mes <= 12:
+            raise ValueError
+    except ValueError:
+        ano, mes = hoje.year, hoje.month
+    contrato_id = request.GET.get("contrato")
+    contrato_id = int(contrato_id) if contrato_id and contrato_id.isdigit() else None
+
+    primeiro_dia = datetime(ano, mes, 1).date()
+    mes_anterior = primeiro_dia - timedelta(days=1)
+    mes_seguinte = primeiro_dia + timedelta(days=32)
+    context = {
+        "ano": ano,
+        "mes": mes,
+        "primeiro_dia": primeiro_dia,
+        "mes_anterior": mes_anterior,
+        "mes_seguinte": mes_seguinte,
+        "hoje": hoje,
+        "semanas": ExpiracaoLicencaService.calendario(ano, mes, contrato_id=contrato_id),
+        "alertas": ExpiracaoLicencaService.alertas(hoje),
+        "contrato_id": contrato_id,
+        "contratos": Contrato.objects.filter(ordemfornecimento__data_expiracao__isnull=False)
+        .distinct().order_by("numero_contrato").only("id", "numero_contrato"),
+    }
+    return render(request, "ordem_fornecimento/expiracoes.html", context)
+
+
+# Ordem de Fornecimento - API de expirações das licenças
+@login_required
+@require_GET
+def api_expiracoes_licencas(request):
+    """
+    Licenças que expiram no período (inicio/fim em AAAA-MM-DD) ou, sem período,
+    o feed de alertas de renovação (vencidas e próximas de 30/60/90 dias)
+    """
+    hoje = timezone.now().date()
+    inicio, fim = request.GET.get("inicio"), request.GET.get("fim")
+    if inicio or fim:
+        try:
+            inicio = datetime.strptime(inicio or "", "%Y-%m-%d").date()
+            fim = datetime.strptime(fim or "", "%Y-%m-%d").date()
+        except ValueError:
+            return JsonResponse({"error": "Informe inicio e fim no formato AAAA-MM-DD."}, status=400)
+        contrato_id = request.GET.get("contrato")
+        ordens = ExpiracaoLicencaService.expirando(
+            inicio, fim, contrato_id=int(contrato_id) if contrato_id and contrato_id.isdigit() else None
+        )
+        entradas = [
+            {
+                "ordem": ordem,
+                "dias_restantes": (ordem.data_expiracao - hoje).days,
+                "faixa": ExpiracaoLicencaService.faixa((ordem.data_expiracao - hoje).days),
+            }
+            for ordem in ordens
+        ]
+    else:
+        entradas = ExpiracaoLicencaService.alertas(hoje)
+
+    return JsonResponse({
+        "expiracoes": [
+            {
+                "id": entrada["ordem"].pk,
+                "numero_of": entrada["ordem"].numero_of,
+                "cliente": entrada["ordem"].cliente.nome_fantasia,
+                "contrato": entrada["ordem"].contrato.numero_contrato,
+                "item": entrada["ordem"].item_contrato.descricao,
+                "quantidade": entrada["ordem"].quantidade,
+                "data_ativacao": entrada["ordem"].data_ativacao.strftime("%d/%m/%Y"),
+                "data_expiracao": entrada["ordem"].data_expiracao.strftime("%d/%m/%Y"),
+                "dias_restantes": entrada["dias_restantes"],
+                "faixa": entrada["faixa"],
+                "url": reverse("ordem_fornecimento_detail", args=[entrada["ordem"].pk]),
+            }
+            for entrada in entradas
+        ],
+    })
+
+
+# Ordem de Fornecimento - Exportação CSV
+@group_required("Admin", "Gerente", "Leitor")
+def export_ordemfornecimento_csv(request):
+    response = HttpResponse(content_type="text/csv")
+    response["Content-Disposition"] = 'attachment; filename="ordens_fornecimento.csv"'
+
+    writer = csv.writer(response)
+    writer.writerow(
+        [
+            "ID",
+            "Número OF",
+            "Número OF Cliente",
+            "Cliente",
+            "Contrato",
+            "Item do Contrato",
+            "Item do Fornecedor",
+            "Unidade",
+            "Quantidade",
+            "Vigência Produto",
+            "Valor Unitário",
+            "Valor Total",
+            "Status",
+            "Data Ativação",
+            "Data Faturamento",
+            "Observações",
+            "Criado em",
+            "Atualizado em",
+        ]
+    )
+
+    ordens = OrdemFornecimento.objects.all()
+
+    for ordem in ordens:
+        writer.writerow(
+            [
+                ordem.id,
+                smart_str(ordem.numero_of),
+                smart_str(ordem.numero_of_cliente),
+                smart_str(ordem.cliente.nome_fantasia),
+                smart_str(ordem.contrato.numero),
+                smart_str(ordem.item_contrato.descricao),
+                smart_str(', '.join([item.item_fornecedor.descricao for item in ordem.itens_fornecedor.all()]) or 'N/A'),
+                smart_str(ordem.unidade),
+                ordem.quantidade,
+                ordem.vigencia_produto,
+                ordem.valor_unitario,
+                ordem.valor_total,
+                ordem.get_status_display(),
+                ordem.data_ativacao.strftime("%d/%m/%Y") if ordem.data_ativacao else "",
+                (
+                    ordem.data_faturamento.strftime("%d/%m/%Y")
+                    if ordem.data_faturamento
+                    else ""
+                ),
+                smart_str(ordem.observacoes),
+                (
+                    ordem.criado_em.strftime("%d/%m/%Y %H:%M:%S")
+                    if ordem.criado_em
+                    else ""
+                ),
+                (
+                    ordem.atualizado_em.strftime("%d/%m/%Y %H:%M:%S")
+                    if ordem.atualizado_em
+                    else ""
+                ),
+            ]
+        )
+
+    return response
+
+
+# Ordem de Serviço - Listar com filtros e paginação
+@group_required("Admin", "Gerente", "Técnico")
+def ordemservico_list(request):
+    ordens = OrdemServico.objects.all()
+
+    numero = request.GET.get("numero")
+    cliente = request.GET.get("cliente")
+    status = request.GET.get("status")
+
+    if numero:
+        ordens = ordens.filter(numero_os__icontains=numero)
+
+    if cliente:
+        ordens = ordens.filter(cliente__nome_fantasia__icontains=cliente)
+
+    if status:
+        ordens = ordens.filter(status=status)
+
+    paginator = Paginator(ordens.order_by("-data_inicio"), 10)
+    page = request.GET.get("page")
+    ordens_page = paginator.get_page(page)
+
+    colunas = [
+        {"id": "numero", "label": "Número OS"},
+        {"id": "numero_cliente", "label": "Número OS Cliente"},
+        {"id": "cliente", "label": "Cliente"},
+        {"id": "contrato", "label": "Contrato"},
+        {"id": "itemcontrato", "label": "Item do Contrato"},
+        {"id": "itemfornecedor", "label": "Item do Fornecedor"},
+        {"id": "unidade", "label": "Unidade"},
+        {"id": "quantidade", "label": "Quantidade"},
+        {"id": "valor_unitario", "label": "Valor Unitário"},
+        {"id": "valor_total", "label": "Valor Total"},
+        {"id": "gerente_projetos", "label": "Gerente de Projetos"},
+        {"id": "consultor_tecnico", "label": "Consultor Técnico"},
+        {"id": "data_inicio", "label": "Data Início"},
+        {"id": "hora_inicio", "label": "Hora Início"},
+        {"id": "data_termino", "label": "Data Término"},
+        {"id": "hora_termino", "label": "Hora Término"},
+        {"id": "status", "label": "Status"},
+        {"id": "data_emissao_trd", "label": "Data Emissão TRD"},
+        {"id": "data_faturamento", "label": "Data Faturamento"},
+        {"id": "horas_consultor", "label": "Horas Consultor"},
+        {"id": "horas_gerente", "label": "Horas Gerente"},
+        {"id": "horas_totais", "label": "Horas Totais"},
+    ]
+
+    context = {
+        "ordens": ordens_page,
+        "colunas": colunas,
+        "filtro_numero": numero or "",
+        "filtro_cliente": cliente or "",
+        "filtro_status": status or "",
+    }
+    return render(request, "ordem_servico/list.html", context)
+
+
+# Ordem de Serviço - Detalhar (com tarefas e planejado x realizado)
+@group_required("Admin", "Gerente", "Técnico")
+def ordemservico_detail(request, pk):
+    ordem = get_object_or_404(
+        OrdemServico.objects.select_related(
+            'cliente', 'contrato', 'item_contrato', 
+            'item_fornecedor_consultor', 'item_fornecedor_gerente', 'sprint__projeto'
+        ),
+        pk=pk
+    )
+    
+    # Tarefas vinculadas à OS com lançamentos de horas
+    tarefas = ordem.tarefas.all().select_related('responsavel').prefetch_related('lancamentos_horas__colaborador').order_by('-criado_em')
+    
+    # Estatísticas de tarefas
+    total_tarefas = tarefas.count()
+    tarefas_concluidas = tarefas.filter(status='concluida').count()
+    tarefas_em_andamento = tarefas.filter(status='em_andamento').count()
+    tarefas_pendentes = tarefas.filter(status='pendente').count()
+    
+    # Calcular horas planejadas e realizadas
+    ordem.calcular_horas_tarefas()
+    
+    # Estatísticas de horas
+    horas_planejadas_total = ordem.horas_planejadas or Decimal('0.00')
+    horas_realizadas_total = ordem.horas_realizadas or Decimal('0.00')
+    diferenca_horas = horas_realizadas_total - horas_planejadas_total
+    percentual_execucao = ordem.percentual_execucao if ordem.horas_planejadas > 0 else Decimal('0.00')
+    
+    context = {
+        "ordem": ordem,
+        "tarefas": tarefas,
+        "total_tarefas": total_tarefas,
+        "tarefas_concluidas": tarefas_concluidas,
+        "tarefas_em_andamento": tarefas_em_andamento,
+        "tarefas_pendentes": tarefas_pendentes,
+        "horas_planejadas_total": horas_planejadas_total,
+        "horas_realizadas_total": horas_realizadas_total,
+        "diferenca_horas": diferenca_horas,
+        "percentual_execucao": percentual_execucao,
+    }
+    
+    return render(request, "ordem_servico/detail.html", context)
+
+
+# Ordem de Serviço - Criar
+@group_required("Admin", "Gerente")
+def ordemservico_create(request):
+    contrato_id = request.GET.get("contrato")
+    projeto_id = request.GET.get("projeto")
+    
+    # Se projeto_id foi fornecido, preencher dados automaticamente
+    projeto = None
+    if projeto_id:
+        projeto = get_object_or_404(Projeto.objects.select_related('contrato', 'gerente_projeto'), pk=projeto_id)
+    
+    if request.method == "POST":
+        form = OrdemServicoForm(request.POST)
+        if form.is_valid():
+            ordem_servico = form.save(commit=False)
+            # Se veio de um projeto, vincular automaticamente
+            # Pode vir do GET (projeto_id) ou do POST (form.projeto)
+            if projeto:
+                ordem_servico.projeto = projeto
+            elif form.cleaned_data.get('projeto'):
+                ordem_servico.projeto = form.cleaned_data['projeto']
+            
+            ordem_servico.save()
+            messages.success(request, "Ordem de Serviço criada com sucesso!")
+            
+            # Redirecionar para o projeto se foi criado a partir de um projeto
+            projeto_redirect = projeto or ordem_servico.projeto
+            if projeto_redirect:
+                return redirect("projeto_detail", pk=projeto_redirect.pk)
+            return redirect("ordem_servico_list")
+    else:
+        initial_data = {}
+        if contrato_id:
+            initial_data["contrato"] = contrato_id
+        
+        # Se projeto foi fornecido, preencher dados automaticamente
+        if projeto:
+            initial_data["contrato"] = projeto.contrato.pk
+            initial_data["cliente"] = projeto.contrato.cliente.pk
+            initial_data["projeto"] = projeto.pk
+            if projeto.gerente_projeto:
+                # OrdemServico tem campo gerente_projetos (string), não ForeignKey
+                # Vamos preencher com o nome do gerente
+                initial_data["gerente_projetos"] = projeto.gerente_projeto.nome_completo
+            if projeto.item_contrato:
+                initial_data["item_contrato"] = projeto.item_contrato.pk
+        
+        form = OrdemServicoForm(initial=initial_data)
+    
+    context = {
+        "form": form,
+        "projeto": projeto,
+    }
+    return render(request, "ordem_servico/form.html", context)
+
+
+# Ordem de Serviço - Editar
+@group_required("Admin", "Gerente")
+def ordemservico_update(request, pk):
+    ordem = get_object_or_404(OrdemServico, pk=pk)
+
+    if request.method == "POST":
+        form = OrdemServicoForm(request.POST, instance=ordem)
+        if form.is_valid():
+            form.save()
+            messages.success(request, "OS atualizada com sucesso!")
+            return redirect("ordem_servico_detail", pk=pk)
+        else:
+            messages.error(request, "Erro ao atualizar a OS. Verifique os campos.")
+            # Exibir erros específicos
+            for field, errors in form.errors.items():
+                for error in errors:
+                    messages.error(request, f"{field}: {error}")
+    else:
+        form = OrdemServicoForm(instance=ordem)
+
+    return render(request, "ordem_servico/form.html", {"form": form, "ordem": ordem})
+
+
+# Ordem de Serviço - Deletar
+@group_required("Admin", "Gerente")
+def ordemservico_delete(request, pk):
+    ordem = get_object_or_404(OrdemServico, pk=pk)
+    if request.method == "POST":
+        ordem.delete()
+        return redirect("ordem_servico_list")
+    return render(request, "ordem_servico/confirm_delete.html", {"object": ordem})
+
+
+# Ordem de Serviço - Exportação CSV
+@group_required("Admin", "Gerente", "Técnico")
+def export_ordemservico_csv(request):
+    ordens = OrdemServico.objects.all()
+
+    contrato = request.GET.get("contrato")
+    cliente = request.GET.get("cliente")
+    status = request.GET.get("status")
+
+    if contrato:
+        ordens = ordens.filter(contrato__numero_contrato__icontains=contrato)
+
+    if cliente:
+        ordens = ordens.filter(cliente__nome_fantasia__icontains=cliente)
+
+    if status:
+        ordens = ordens.filter(status=status)
+
+    response = HttpResponse(content_type="text/csv")
+    response["Content-Disposition"] = 'attachment; filename="ordens_servico.csv"'
+
+    writer = csv.writer(response)
+    writer.writerow(
+        [
+            "ID",
+            "Número OS",
+            "Número OS Cliente",
+            "Cliente",
+            "Contrato",
+            "Item Contrato",
+            "Item Fornecedor",
+            "Quantidade",
+            "Valor Unitário (R$)",
+            "Valor Total (R$)",
+            "Status",
+            "Data Início",
+            "Hora Início",
+            "Data Término",
+            "Hora Término",
+            "Data Emissão TRD",
+            "Data Faturamento",
+        ]
+    )
+
+    for ordem in ordens:
+        writer.writerow(
+            [
+                ordem.id,
+                ordem.numero_os,
+                ordem.numero_os_cliente,
+                ordem.cliente.nome_fantasia,
+                ordem.contrato.numero_contrato,
+                ordem.item_contrato.descricao,
+                ', '.join([item.item_fornecedor.descricao for item in ordem.itens_fornecedor.all()]) or 'N/A',
+                ordem.quantidade,
+                float(ordem.valor_unitario),
+                float(ordem.valor_total),
+                ordem.get_status_display(),
+                ordem.data_inicio,
+                ordem.hora_inicio,
+                ordem.data_termino or "",
+                ordem.hora_termino or "",
+                ordem.data_emissao_trd or "",
+                ordem.data_faturamento or "",
+            ]
+        )
+
+    return response
@@ -0,0 +1,1472 @@
+"""
+Views da gestão ágil de projetos (projetos, backlog, sprints e tarefas)
+"""
+from django.shortcuts import render, get_object_or_404, redirect
+from django.urls import reverse
+from django.contrib import messages
+from django.db.models import Q, Max
+from django.core.paginator import Paginator
+from django.utils.functional import SimpleLazyObject
+from django import forms
+from decimal import Decimal
+import os
+
+from ..models import (
+    Contrato,
+    OrdemServico,
+    Colaborador,
+    Tarefa,
+    LancamentoHora,
+    Projeto,
+    Backlog,
+    Sprint,
+)
+from ..services import BurndownService, OrcamentoHorasService
+from .comum import group_required
+
+
+# ========== GESTÃO DE OS COM TAREFAS ==========
+
+# Tarefa - Criar vinculada a OS
+@group_required("Admin", "Gerente")
+def tarefa_os_create(request, os_id):
+    """Cria uma tarefa vinculada a uma OS"""
+    from ..forms import TarefaForm
+    ordem_servico = get_object_or_404(OrdemServico, pk=os_id)
+    
+    if request.method == "POST":
+        form = TarefaForm(request.POST)
+        if form.is_valid():
+            tarefa = form.save(commit=False)
+            tarefa.ordem_servico = ordem_servico
+            tarefa.save()
+            messages.success(request, "Tarefa criada com sucesso!")
+            return redirect("ordem_servico_detail", pk=os_id)
+    else:
+        form = TarefaForm()
+        # Preencher OS se vier na URL
+        form.fields['ordem_servico'].initial = ordem_servico
+        form.fields['ordem_servico'].widget = forms.HiddenInput()
+    
+    return render(request, "tarefa/form_os.html", {"form": form, "ordem_servico": ordem_servico})
+
+
+# Tarefa - Editar vinculada a OS
+@group_required("Admin", "Gerente")
+def tarefa_os_update(request, os_id, tarefa_id):
+    """Edita uma tarefa vinculada a uma OS"""
+    from ..forms import TarefaForm
+    ordem_servico = get_object_or_404(OrdemServico, pk=os_id)
+    tarefa = get_object_or_404(Tarefa, pk=tarefa_id, ordem_servico=ordem_servico)
+    
+    if request.method == "POST":
+        form = TarefaForm(request.POST, instance=tarefa)
+        if form.is_valid():
+            form.save()
+            messages.success(request, "Tarefa atualizada com sucesso!")
+            return redirect("ordem_servico_detail", pk=os_id)
+    else:
+        form = TarefaForm(instance=tarefa)
+        form.fields['ordem_servico'].widget = forms.HiddenInput()
+    
+    return render(request, "tarefa/form_os.html", {"form": form, "ordem_servico": ordem_servico, "tarefa": tarefa})
+
+
+# Lançamento de Hora - Criar para tarefa
+@group_required("Admin", "Gerente", "Tecnico")
+def lancamento_hora_create(request, tarefa_id):
+    """Cria um lançamento de hora para uma tarefa"""
+    from ..forms import LancamentoHoraForm
+    tarefa = get_object_or_404(Tarefa, pk=tarefa_id)
+    
+    if request.method == "POST":
+        form = LancamentoHoraForm(request.POST)
+        if form.is_valid():
+            lancamento = form.save(commit=False)
+            lancamento.tarefa = tarefa
+            lancamento.save()
+            messages.success(request, "Lançamento de hora criado com sucesso!")
+            if tarefa.ordem_servico:
+                return redirect("ordem_servico_detail", pk=tarefa.ordem_servico.pk)
+            return redirect("tarefa_list")
+    else:
+        form = LancamentoHoraForm()
+        form.fields['tarefa'].initial = tarefa
+        form.fields['tarefa'].widget = forms.HiddenInput()
+    
+    return render(request, "lancamento_hora/form.html", {"form": form, "tarefa": tarefa})
+
+
+# Lançamento de Hora - Editar
+@group_required("Admin", "Gerente", "Tecnico")
+def lancamento_hora_update(request, lancamento_id):
+    """Edita um lançamento de hora"""
+    from ..forms import LancamentoHoraForm
+    lancamento = get_object_or_404(LancamentoHora, pk=lancamento_id)
+    tarefa = lancamento.tarefa
+    
+    if request.method == "POST":
+        form = LancamentoHoraForm(request.POST, instance=lancamento)
+        if form.is_valid():
+            form.save()
+            messages.success(request, "Lançamento de hora atualizado com sucesso!")
+            if tarefa.ordem_servico:
+                return redirect("ordem_servico_detail", pk=tarefa.ordem_servico.pk)
+            return redirect("tarefa_list")
+    else:
+        form = LancamentoHoraForm(instance=lancamento)
+        form.fields['tarefa'].widget = forms.HiddenInput()
+    
+    return render(request, "lancamento_hora/form.html", {"form": form, "tarefa": tarefa})
+
+
+# Lançamento de Hora - Deletar
+@group_required("Admin", "Gerente")
+def lancamento_hora_delete(request, lancamento_id):
+    """Deleta um lançamento de hora"""
+    lancamento = get_object_or_404(LancamentoHora, pk=lancamento_id)
+    tarefa = lancamento.tarefa
+    
+    if request.method == "POST":
+        lancamento.delete()
+        messages.success(request, "Lançamento de hora excluído com sucesso!")
+        if tarefa.ordem_servico:
+            return redirect("ordem_servico_detail", pk=tarefa.ordem_servico.pk)
+        return redirect("tarefa_list")
+    
+    return render(request, "lancamento_hora/confirm_delete.html", {"lancamento": lancamento})
+
+
+# ========== GESTÃO ÁGIL DE PROJETOS ==========
+
+# Projeto - Listar
+@group_required("Admin", "Gerente", "Leitor")
+def projeto_list(request):
+    """Lista todos os projetos"""
+    projetos = Projeto.objects.com_resumo_sprints().select_related('contrato', 'contrato__cliente', 'gerente_projeto').order_by("-criado_em")
+    
+    # Filtros
+    contrato_id = request.GET.get("contrato")
+    status = request.GET.get("status")
+    search = request.GET.get("search")
+    
+    if contrato_id:
+        projetos = projetos.filter(contrato_id=contrato_id)
+    if status:
+        projetos = projetos.filter(status=status)
+    if search:
+        projetos = projetos.filter(
+            Q(nome__icontains=search) |
+            Q(descricao__icontains=search) |
+            Q(contrato__numero_contrato__icontains=search) |
+            Q(contrato__cliente__nome_razao_social__icontains=search)
+        )
+    
+    # Paginação
+    paginator = Paginator(projetos, 20)
+    page = request.GET.get("page")
+    projetos = paginator.get_page(page)
+    
+    # Contratos para filtro
+    contratos = Contrato.objects.all().order_by("numero_contrato")
+    
+    context = {
+        "projetos": projetos,
+        "contratos": contratos,
+        "status_choices": Projeto.STATUS_CHOICES,
+    }
+    
+    return render(request, "projeto/list.html", context)
+
+
+# Projeto - Detalhar
+@group_required("Admin", "Gerente", "Leitor")
+def projeto_detail(request, pk):
+    """Detalhes do projeto com sprints e plano de trabalho"""
+    projeto = get_object_or_404(
+        Projeto.objects.select_related('contrato', 'gerente_projeto', 'backlog_origem'),
+        pk=pk
+    )
+    
+    # Buscar backlogs do contrato (não mais do projeto)
+    backlogs_contrato = projeto.contrato.backlogs.all() if projeto.contrato else Backlog.objects.none()
+    
+    # Tarefas do projeto (vinculadas a sprints do projeto)
+    tarefas_projeto = Tarefa.objects.filter(
+        sprint__projeto=projeto
+    ).select_related('responsavel', 'sprint').order_by('-prioridade', '-criado_em')
+    
+    # Tarefas no backlog do projeto (sem sprint atribuída)
+    tarefas_backlog_projeto = projeto.tarefas_backlog_projeto.select_related('responsavel', 'backlog').order_by('-prioridade', '-criado_em')
+    
+    # Tarefas do backlog de origem (se houver)
+    tarefas_backlog_origem = []
+    if projeto.backlog_origem:
+        tarefas_backlog_origem = Tarefa.objects.filter(
+            backlog=projeto.backlog_origem,
+            sprint__isnull=True
+        ).select_related('responsavel').order_by('-prioridade', '-criado_em')
+    
+    # Todas as tarefas do projeto (para aba Tarefas)
+    todas_tarefas = Tarefa.objects.filter(
+        Q(backlog__contrato=projeto.contrato) | Q(sprint__projeto=projeto)
+    ).select_related('responsavel', 'backlog', 'sprint').order_by('-criado_em')
+    
+    # Ordem de Serviço vinculada ao projeto
+    ordem_servico = projeto.ordens_servico.filter(status__in=['aberta', 'execucao']).first()
+    
+    # Sprints com progresso e horas anotados (uma consulta)
+    sprints = list(projeto.sprints.com_progresso().order_by('-data_inicio'))
+
+    def colunas_canvas():
+        # Tarefas pré-carregadas só quando o canvas é renderizado (fora do cache de fragmento)
+        from django.db.models import Prefetch, prefetch_related_objects
+        prefetch_related_objects(sprints, Prefetch(
+            'tarefas',
+            queryset=Tarefa.objects.select_related('responsavel').order_by('ordem_sprint', '-prioridade', '-criado_em'),
+        ))
+        return [
+            {
+                "sprint": sprint,
+                "tarefas": sprint.tarefas.all(),
+                "total_tarefas": sprint.num_tarefas,
+                "tarefas_nao_iniciadas": sprint.num_tarefas_nao_iniciadas,
+                "tarefas_em_execucao": sprint.num_tarefas_em_execucao,
+                "tarefas_finalizadas": sprint.num_tarefas_concluidas,
+            }
+            for sprint in sorted(sprints, key=lambda s: s.data_inicio)
+        ]
+
+    sprints_com_tarefas = SimpleLazyObject(colunas_canvas)
+    
+    # Plano de trabalho do projeto
+    plano_trabalho = getattr(projeto, 'plano_trabalho', None)
+    
+    # Estatísticas
+    total_tarefas_projeto = tarefas_projeto.count()
+    total_sprints = len(sprints)
+    sprints_pendentes = sum(1 for s in sprints if s.status == "aberta")
+    sprints_execucao = sum(1 for s in sprints if s.status == "execucao")
+    sprints_finalizadas = sum(1 for s in sprints if s.status == "finalizada")
+    sprints_faturadas = sum(1 for s in sprints if s.status == "faturada")
+    
+    # Calcular dias restantes para o vencimento do contrato
+    from datetime import date
+    dias_restantes_contrato = None
+    meses_restantes = None
+    if projeto.data_fim_prevista:
+        hoje = date.today()
+        diferenca = projeto.data_fim_prevista - hoje
+        dias_restantes_contrato = diferenca.days
+        meses_restantes = dias_restantes_contrato / 30  # Aproximação
+    
+    # Indicadores de horas (lidos do snapshot diário; ver gerar_snapshots_projetos)
+    horas_previstas_os = projeto.horas_previstas_os
+    resumo_horas = BurndownService.resumo_projeto(projeto)
+    horas_executadas_projeto = resumo_horas["horas_faturaveis"]
+    burndown = BurndownService.serie_burndown(projeto)
+    velocidade = BurndownService.velocidade(projeto)
+    
+    # Colaboradores ativos para o select de responsável
+    colaboradores = Colaborador.objects.filter(ativo=True).order_by('nome_completo')
+    
+    # Permissão de edição no canvas (resolvida uma vez, não por tarefa no template)
+    grupo_usuario = request.user.groups.first()
+    pode_gerenciar = bool(grupo_usuario and grupo_usuario.name in ("Admin", "Gerente"))
+    
+    # Combinar tarefas do backlog (projeto + origem) para exibição no canvas
+    from itertools import chain
+    tarefas_backlog = SimpleLazyObject(lambda: list(chain(tarefas_backlog_projeto, tarefas_backlog_origem)))
+    
+    context = {
+        "projeto": projeto,
+        "backlog_origem": projeto.backlog_origem,
+        "backlogs_contrato": backlogs_contrato,
+        "tarefas_projeto": tarefas_projeto,
+        "tarefas_backlog_projeto": tarefas_backlog_projeto,
+        "tarefas_backlog_origem": tarefas_backlog_origem,
+        "tarefas_backlog": tarefas_backlog,
+        "todas_tarefas": todas_tarefas,
+        "sprints": sprints,
+        "sprints_com_tarefas": sprints_com_tarefas,
+        "plano_trabalho": plano_trabalho,
+        "ordem_servico": ordem_servico,
+        "colaboradores": colaboradores,
+        "pode_gerenciar": pode_gerenciar,
+        "total_tarefas_projeto": total_tarefas_projeto,
+        "total_sprints": total_sprints,
+        "sprints_pendentes": sprints_pendentes,
+        "sprints_execucao": sprints_execucao,
+        "sprints_finalizadas": sprints_finalizadas,
+        "sprints_faturadas": sprints_faturadas,
+        "dias_restantes_contrato": dias_restantes_contrato,
+        "meses_restantes": meses_restantes,
+        "horas_previstas_os": horas_previstas_os,
+        "horas_executadas_projeto": horas_executadas_projeto,
+        "resumo_horas": resumo_horas,
+        "burndown": burndown,
+        "velocidade": velocidade,
+        "total_tarefas_backlog": projeto.total_tarefas_backlog,
+    }
+    
+    return render(request, "projeto/detail.html", context)
+
+
+# Projeto - Criar
+@group_required("Admin", "Gerente")
+def projeto_create(request):
+    """Cria um novo projeto (1 projeto por contrato)"""
+    from ..forms import ProjetoForm
+    contrato_id = request.GET.get("contrato")
+    
+    if request.method == "POST":
+        form = ProjetoForm(request.POST)
+        if form.is_valid():
+            # Obter contrato do POST ou do GET
+            contrato_id_post = request.POST.get('contrato') or contrato_id
+            if not contrato_id_post:
+                messages.error(request, "Contrato é obrigatório!")
+                return render(request, "projeto/form.html", {"form": form, "contrato_id": contrato_id})
+            
+            contrato = get_object_or_404(Contrato, pk=contrato_id_post)
+            
+            # Verificar se já existe projeto para este contrato
+            if Projeto.objects.filter(contrato=contrato).exists():
+                messages.error(request, f"Já existe um projeto para o contrato {contrato.numero_contrato}!")
+                return render(request, "projeto/form.html", {"form": form, "contrato": contrato, "contrato_id": contrato_id})
+            
+            projeto = form.save(commit=False)
+            projeto.contrato = contrato
+            # Sincronizar datas com o contrato
+            if contrato.data_assinatura:
+                projeto.data_inicio = contrato.data_assinatura
+            if contrato.data_fim_atual:
+                projeto.data_fim_prevista = contrato.data_fim_atual
+            projeto.save()
+            
+            # Não criar OS automaticamente - será criada manualmente pelo usuário
+            
+            messages.success(request, "Projeto criado com sucesso!")
+            return redirect("projeto_detail", pk=projeto.pk)
+    else:
+        form = ProjetoForm()
+        contrato = None
+        if contrato_id:
+            contrato = get_object_or_404(Contrato, pk=contrato_id)
+        
+        return render(request, "projeto/form.html", {"form": form, "contrato": contrato, "contrato_id": contrato_id})
+    
+    return render(request, "projeto/form.html", {"form": form})
+
+
+# Projeto - Editar
+@group_required("Admin", "Gerente")
+def projeto_update(request, pk):
+    """Edita um projeto"""
+    from ..forms import ProjetoForm
+    projeto = get_object_or_404(Projeto, pk=pk)
+    
+    if request.method == "POST":
+        form = ProjetoForm(request.POST, instance=projeto)
+        if form.is_valid():
+            form.save()
+            messages.success(request, "Projeto atualizado com sucesso!")
+            return redirect("projeto_detail", pk=projeto.pk)
+    else:
+        form = ProjetoForm(instance=projeto)
+    
+    return render(request, "projeto/form.html", {"form": form, "projeto": projeto})
+
+
+# Projeto - Deletar
+@group_required("Admin", "Gerente")
+def projeto_delete(request, pk):
+    """Exclui um projeto e todas as sprints e tarefas vinculadas"""
+    projeto = get_object_or_404(Projeto, pk=pk)
+    
+    if request.method == "POST":
+        # Contar itens que serão excluídos
+        total_sprints = projeto.sprints.count()
+        total_tarefas = 0
+        if hasattr(projeto, 'backlog'):
+            total_tarefas = projeto.backlog.tarefas.count()
+        
+        # Excluir projeto (cascade excluirá sprints, backlog e tarefas)
+        projeto.delete()
+        
+        messages.success(request, f"Projeto excluído com sucesso! ({total_sprints} sprint(s) e {total_tarefas} tarefa(s) também foram excluídos.)")
+        return redirect("projeto_list")
+    
+    # Contar itens para exibição na confirmação
+    total_sprints = projeto.sprints.count()
+    total_tarefas = 0
+    if hasattr(projeto, 'backlog'):
+        total_tarefas = projeto.backlog.tarefas.count()
+    
+    context = {
+        "projeto": projeto,
+        "total_sprints": total_sprints,
+        "total_tarefas": total_tarefas,
+    }
+    
+    return render(request, "projeto/confirm_delete.html", context)
+
+
+# Backlog - Criar via AJAX
+@group_required("Admin", "Gerente")
+def backlog_create_ajax(request, contrato_id):
+    """Cria um novo backlog via AJAX"""
+    from django.http import JsonResponse
+    contrato = get_object_or_404(Contrato, pk=contrato_id)
+    
+    if request.method == 'POST':
+        titulo = request.POST.get('titulo')
+        descricao = request.POST.get('descricao', '')
+        prioridade = request.POST.get('prioridade', 'media')
+        
+        if not titulo:
+            return JsonResponse({'success': False, 'error': 'Título é obrigatório.'}, status=400)
+        
+        try:
+            backlog = Backlog.objects.create(
+                contrato=contrato,
+                titulo=titulo,
+                descricao=descricao,
+                prioridade=prioridade,
+                status='pendente'
+            )
+            # Retornar dados do backlog criado para atualizar a interface
+            return JsonResponse({
+                'success': True,
+                'message': 'Backlog criado com sucesso!',
+                'backlog': {
+                    'id': backlog.id,
+                    'titulo': backlog.titulo or 'Backlog sem título',
+                    'descricao': backlog.descricao or '',
+                    'prioridade': backlog.prioridade,
+                    'prioridade_display': backlog.get_prioridade_display(),
+                    'contrato_id': contrato.id,
+                }
+            })
+        except Exception as e:
+            return JsonResponse({'success': False, 'error': str(e)}, status=500)
+    
+    return JsonResponse({'success': False, 'error': 'Método não permitido.'}, status=405)
+
+
+# Backlog - Excluir via AJAX
+@group_required("Admin", "Gerente")
+def backlog_update_ajax(request, backlog_id):
+    """Atualiza um backlog via AJAX"""
+    from django.http import JsonResponse
+    backlog = get_object_or_404(Backlog, pk=backlog_id)
+    
+    if request.method == 'POST':
+        titulo = request.POST.get('titulo')
+        descricao = request.POST.get('descricao', '')
+        prioridade = request.POST.get('prioridade', 'media')
+        status = request.POST.get('status', 'pendente')
+        
+        if not titulo:
+            return JsonResponse({'success': False, 'error': 'Título é obrigatório.'}, status=400)
+        
+        try:
+            backlog.titulo = titulo
+            backlog.descricao = descricao
+            backlog.prioridade = prioridade
+            backlog.status = status
+            backlog.save()
+            
+            return JsonResponse({
+                'success': True,
+                'backlog': {
+                    'id': backlog.id,
+                    'titulo': backlog.titulo or 'Backlog sem título',
+                    'descricao': backlog.descricao or '',
+                    'prioridade': backlog.prioridade,
+                    'prioridade_display': backlog.get_prioridade_display(),
+                    'status': backlog.status,
+                    'status_display': backlog.get_status_display(),
+                }
+            })
+        except Exception as e:
+            return JsonResponse({'success': False, 'error': str(e)}, status=500)
+    
+    # GET: Retornar dados do backlog para preencher o formulário
+    return JsonResponse({
+        'success': True,
+        'backlog': {
+            'id': backlog.id,
+            'titulo': backlog.titulo or '',
+            'descricao': backlog.descricao or '',
+            'prioridade': backlog.prioridade,
+            'status': backlog.status,
+        }
+    })
+
+
+def backlog_delete_ajax(request, backlog_id):
+    """Exclui um backlog via AJAX"""
+    from django.http import JsonResponse
+    backlog = get_object_or_404(Backlog, pk=backlog_id)
+    
+    if request.method == 'POST':
+        try:
+            backlog_id = backlog.id
+            backlog.delete()
+            return JsonResponse({
+                'success': True,
+                'message': 'Backlog excluído com sucesso!',
+                'backlog_id': backlog_id
+            })
+        except Exception as e:
+            return JsonResponse({'success': False, 'error': str(e)}, status=500)
+    
+    return JsonResponse({'success': False, 'error': 'Método não permitido.'}, status=405)
+
+
+# Backlog - Converter em Projeto via AJAX
+@group_required("Admin", "Gerente")
+def backlog_converter_projeto_ajax(request, backlog_id):
+    """Converte um backlog em projeto via AJAX"""
+    from django.http import JsonResponse
+    backlog = get_object_or_404(Backlog, pk=backlog_id)
+    
+    if request.method == 'POST':
+        nome_projeto = request.POST.get('nome_projeto')
+        descricao_projeto = request.POST.get('descricao_projeto', '')
+        gerente_id = request.POST.get('gerente_projeto')
+        
+        if not nome_projeto:
+            return JsonResponse({'success': False, 'error': 'Nome do projeto é obrigatório.'}, status=400)
+        
+        try:
+            gerente = None
+            if gerente_id:
+                from ..models import Colaborador
+                gerente = get_object_or_404(Colaborador, pk=gerente_id)
+            
+            projeto = backlog.converter_para_projeto(
+                nome_projeto=nome_projeto,
+                descricao_projeto=descricao_projeto,
+                gerente_projeto=gerente  # Colaborador ou None
+            )
+            
+            return JsonResponse({
+                'success': True,
+                'message': f'Backlog convertido em projeto "{projeto.nome}" com sucesso!',
+                'projeto_id': projeto.id,
+                'redirect_url': reverse('projeto_detail', kwargs={'pk': projeto.pk})
+            })
+        except Exception as e:
+            import traceback
+            print(f"Erro ao converter backlog: {traceback.format_exc()}")
+            return JsonResponse({'success': False, 'error': str(e)}, status=500)
+    
+    return JsonResponse({'success': False, 'error': 'Método não permitido.'}, status=405)
+
+
+# Backlog - Converter em Projeto (view antiga mantida para compatibilidade)
+@group_required("Admin", "Gerente")
+def backlog_converter_projeto(request, backlog_id):
+    """Converte um backlog em projeto"""
+    backlog = get_object_or_404(Backlog, pk=backlog_id)
+    
+    if request.method == 'POST':
+        nome_projeto = request.POST.get('nome_projeto')
+        descricao_projeto = request.POST.get('descricao_projeto', '')
+        gerente_id = request.POST.get('gerente_projeto')
+        
+        if not nome_projeto:
+            messages.error(request, 'Nome do projeto é obrigatório.')
+            return redirect('gestao_contratos_detail', pk=backlog.contrato.pk)
+        
+        try:
+            gerente = None
+            if gerente_id:
+                from ..models import Colaborador
+                gerente = get_object_or_404(Colaborador, pk=gerente_id)
+            
+            projeto = backlog.converter_para_projeto(
+                nome_projeto=nome_projeto,
+                descricao_projeto=descricao_projeto,
+                gerente_projeto=gerente  # Colaborador ou None
+            )
+            
+            messages.success(request, f'Backlog convertido em projeto "{projeto.nome}" com sucesso!')
+            return redirect('projeto_detail', pk=projeto.pk)
+        except Exception as e:
+            import traceback
+            print(f"Erro ao converter backlog: {traceback.format_exc()}")
+            messages.error(request, f'Erro ao converter backlog: {str(e)}')
+            return redirect('gestao_contratos_detail', pk=backlog.contrato.pk)
+    
+    # GET - mostrar formulário
+    from ..models import Colaborador
+    gerentes = Colaborador.objects.filter(ativo=True, cargo__icontains='gerente')
+    
+    context = {
+        'backlog': backlog,
+        'gerentes': gerentes,
+    }
+    return render(request, 'backlog/convert_projeto.html', context)
+
+
+# Backlog - Gerenciar Tarefas (agora vinculado ao contrato)
+@group_required("Admin", "Gerente")
+def backlog_gerenciar(request, contrato_id):
+    """Gerencia tarefas do backlog do contrato"""
+    from ..forms import TarefaForm
+    contrato = get_object_or_404(Contrato, pk=contrato_id)
+    # Buscar o primeiro backlog pendente do contrato ou criar um novo se não existir
+    backlog = Backlog.objects.filter(contrato=contrato, status='pendente').first()
+    if not backlog:
+        backlog = Backlog.objects.create(
+            contrato=contrato,
+            titulo=f"Backlog - {contrato.numero_contrato}",
+            status='pendente'
+        )
+    
+    if request.method == "POST":
+        # Criar nova tarefa no backlog
+        form = TarefaForm(request.POST)
+        if form.is_valid():
+            tarefa = form.save(commit=False)
+            tarefa.backlog = backlog
+            tarefa.save()
+            messages.success(request, "Tarefa adicionada ao backlog!")
+            return redirect("backlog_gerenciar", contrato_id=contrato_id)
+    else:
+        form = TarefaForm()
+        form.fields['backlog'].initial = backlog
+        form.fields['backlog'].widget = forms.HiddenInput()
+        # Ocultar sprint e ordem_servico
+        if 'sprint' in form.fields:
+            form.fields['sprint'].widget = forms.HiddenInput()
+        if 'ordem_servico' in form.fields:
+            form.fields['ordem_servico'].widget = forms.HiddenInput()
+    
+    # Apenas tarefas que não estão em sprint (no backlog)
+    tarefas = backlog.tarefas.filter(sprint__isnull=True).select_related('responsavel').order_by('-prioridade', '-criado_em')
+    
+    # Projetos gerados a partir deste backlog
+    projetos_gerados = backlog.projetos_gerados.all()
+    
+    context = {
+        "contrato": contrato,
+        "backlog": backlog,
+        "form": form,
+        "tarefas": tarefas,
+        "projetos_gerados": projetos_gerados,
+    }
+    
+    return render(request, "backlog/gerenciar.html", context)
+
+
+# Sprint - Criar
+@group_required("Admin", "Gerente")
+def sprint_create(request, projeto_id):
+    """Cria uma nova sprint"""
+    from ..forms import SprintForm
+    projeto = get_object_or_404(Projeto, pk=projeto_id)
+    
+    if request.method == "POST":
+        form = SprintForm(request.POST, projeto_id=projeto_id)
+        if form.is_valid():
+            sprint = form.save(commit=False)
+            # Garantir que o projeto está vinculado (caso o campo oculto não tenha funcionado)
+            sprint.projeto = projeto
+            sprint.save()
+            messages.success(request, "Sprint criada com sucesso!")
+            return redirect("sprint_detail", projeto_id=projeto_id, sprint_id=sprint.pk)
+    else:
+        form = SprintForm(projeto_id=projeto_id)
+        # Filtrar OSs disponíveis (sem sprint vinculada) do contrato do projeto
+        if "ordem_servico" in form.fields:
+            form.fields["ordem_servico"].queryset = OrdemServico.objects.filter(
+                contrato=projeto.contrato,
+                sprint__isnull=True
+            )
+            form.fields["ordem_servico"].empty_label = "Criar OS automaticamente"
+    
+    return render(request, "sprint/form.html", {"form": form, "projeto": projeto})
+
+
+# Sprint - Detalhar
+@group_required("Admin", "Gerente", "Leitor")
+def sprint_detail(request, projeto_id, sprint_id):
+    """Detalhes da sprint com tarefas"""
+    from datetime import datetime
+    
+    projeto = get_object_or_404(Projeto, pk=projeto_id)
+    sprint = get_object_or_404(Sprint.objects.com_progresso(), pk=sprint_id, projeto=projeto)
+    
+    # O status da sprint/OS por datas é atualizado pelo comando transicionar_status
+    
+    # Calcular dias e horas restantes para o término
+    dias_restantes = None
+    horas_restantes = 0
+    if sprint.data_fim:
+        agora = datetime.now()
+        fim_sprint = datetime.combine(sprint.data_fim, datetime.max.time().replace(hour=19, minute=0, second=0))
+        diferenca = fim_sprint - agora
+        
+        if diferenca.total_seconds() > 0:
+            dias_restantes = diferenca.days
+            horas_restantes = int((diferenca.seconds // 3600))
+        else:
+            dias_restantes = -abs(diferenca.days)
+            horas_restantes = 0
+    
+    # Tarefas da sprint
+    tarefas_sprint = sprint.tarefas.all().select_related('responsavel').order_by('-prioridade', '-criado_em')
+    
+    # Separar tarefas de consultor e tarefa de gestão (consultadas só fora do cache de fragmento)
+    tarefas_consultor = tarefas_sprint.filter(papel="consultor")
+    tarefa_gestao = SimpleLazyObject(lambda: tarefas_sprint.filter(papel="gestao").first())
+    
+    # Total de horas do consultor (anotado em com_progresso)
+    total_horas_consultor = sprint.soma_horas_consultor
+    
+    # Tarefas disponíveis no backlog (ordenadas por prioridade)
+    # Usar o backlog de origem do projeto se existir, senão usar o primeiro backlog pendente do contrato
+    if projeto.backlog_origem:
+        backlog = projeto.backlog_origem
+    else:
+        backlog = Backlog.objects.filter(contrato=projeto.contrato, status='pendente').first()
+    tarefas_backlog = backlog.tarefas.filter(sprint__isnull=True).select_related('responsavel').order_by('-prioridade', '-criado_em') if backlog else Tarefa.objects.none()
+    
+    context = {
+        "projeto": projeto,
+        "sprint": sprint,
+        "tarefas_sprint": tarefas_sprint,
+        "tarefas_consultor": tarefas_consultor,
+        "tarefa_gestao": tarefa_gestao,
+        "total_horas_consultor": total_horas_consultor,
+        "tarefas_backlog": tarefas_backlog,
+        "backlog": backlog,
+        "dias_restantes": dias_restantes,
+        "horas_restantes": horas_restantes,
+    }
+    
+    return render(request, "sprint/detail.html", context)
+
+
+# Sprint - Editar
+@group_required("Admin", "Gerente")
+def sprint_update(request, projeto_id, sprint_id):
+    """Edita uma sprint"""
+    from ..forms import SprintForm
+    projeto = get_object_or_404(Projeto, pk=projeto_id)
+    sprint = get_object_or_404(Sprint, pk=sprint_id, projeto=projeto)
+    
+    if request.method == "POST":
+        form = SprintForm(request.POST, instance=sprint, projeto_id=projeto_id)
+        if form.is_valid():
+            form.save()
+            messages.success(request, "Sprint atualizada com sucesso!")
+            return redirect("sprint_detail", projeto_id=projeto_id, sprint_id=sprint.pk)
+        else:
+            messages.error(request, "Erro ao atualizar a sprint. Verifique os campos.")
+    else:
+        form = SprintForm(instance=sprint, projeto_id=projeto_id)
+        
+        # Se a sprint tem uma OS vinculada, atualizar os dados da Sprint com os dados da OS
+        if sprint.ordem_servico:
+            os = sprint.ordem_servico
+            # Sincronizar datas da OS com a Sprint (sempre usar os valores da OS)
+            if os.data_inicio:
+                sprint.data_inicio = os.data_inicio
+                form.initial['data_inicio'] = os.data_inicio.strftime('%Y-%m-%d')
+            if os.data_termino:
+                sprint.data_fim = os.data_termino
+                form.initial['data_fim'] = os.data_termino.strftime('%Y-%m-%d')
+            # Se a descrição da sprint estiver vazia, preencher com informações da OS
+            if not sprint.descricao and os.numero_os:
+                sprint.descricao = f"OS: {os.numero_os}"
+                form.initial['descricao'] = f"OS: {os.numero_os}"
+            
+            # Garantir que a OS vinculada esteja selecionada no campo
+            form.initial['ordem_servico'] = sprint.ordem_servico.pk
+        else:
+            # Se não tem OS, usar as datas da sprint
+            if sprint.data_inicio:
+                form.initial['data_inicio'] = sprint.data_inicio.strftime('%Y-%m-%d')
+            if sprint.data_fim:
+                form.initial['data_fim'] = sprint.data_fim.strftime('%Y-%m-%d')
+        
+        # Filtrar OSs disponíveis (sem sprint vinculada) do contrato do projeto
+        # ou a OS atual da sprint
+        if "ordem_servico" in form.fields:
+            os_disponiveis = OrdemServico.objects.filter(
+                contrato=projeto.contrato,
+                sprint__isnull=True
+            )
+            # Se a sprint já tem uma OS, incluir ela também
+            if sprint.ordem_servico:
+                os_disponiveis = os_disponiveis | OrdemServico.objects.filter(pk=sprint.ordem_servico.pk)
+            form.fields["ordem_servico"].queryset = os_disponiveis
+            form.fields["ordem_servico"].empty_label = "Criar OS automaticamente"
+    
+    return render(request, "sprint/form.html", {"form": form, "projeto": projeto, "sprint": sprint})
+
+
+# Sprint - Deletar
+@group_required("Admin", "Gerente")
+def sprint_delete(request, projeto_id, sprint_id):
+    """Exclui uma sprint e sua OS vinculada"""
+    projeto = get_object_or_404(Projeto, pk=projeto_id)
+    sprint = get_object_or_404(Sprint, pk=sprint_id, projeto=projeto)
+    
+    if request.method == "POST":
+        # Deletar a OS vinculada antes de deletar a Sprint
+        ordem_servico_numero = None
+        if sprint.ordem_servico:
+            ordem_servico_numero = sprint.ordem_servico.numero_os
+            # Deletar a OS primeiro
+            sprint.ordem_servico.delete()
+        # Agora deletar a Sprint
+        sprint.delete()
+        if ordem_servico_numero:
+            messages.success(request, f"Sprint excluída com sucesso! A OS {ordem_servico_numero} também foi excluída.")
+        else:
+            messages.success(request, "Sprint excluída com sucesso!")
+        return redirect("projeto_detail", pk=projeto_id)
+    
+    context = {
+        "projeto": projeto,
+        "sprint": sprint,
+    }
+    return render(request, "sprint/confirm_delete.html", context)
+
+
+# Sprint - Fechar (Criar OS)
+@group_required("Admin", "Gerente")
+def sprint_fechar(request, projeto_id, sprint_id):
+    """Fecha a sprint e cria uma OS automaticamente"""
+    from ..forms import OrdemServicoForm
+    projeto = get_object_or_404(Projeto, pk=projeto_id)
+    sprint = get_object_or_404(Sprint, pk=sprint_id, projeto=projeto)
+    
+    if sprint.status == "finalizada":
+        messages.error(request, "Esta sprint já foi finalizada!")
+        return redirect("sprint_detail", projeto_id=projeto_id, sprint_id=sprint_id)
+    
+    # Obter tarefas da sprint
+    tarefas_sprint = sprint.tarefas.all()
+    
+    if not tarefas_sprint.exists():
+        messages.error(request, "Não é possível fechar uma sprint sem tarefas!")
+        return redirect("sprint_detail", projeto_id=projeto_id, sprint_id=sprint_id)
+    
+    # Calcular totais das tarefas
+    total_horas_planejadas = sum(t.horas_planejadas for t in tarefas_sprint if t.horas_planejadas)
+    total_horas_consumidas = sum(t.horas_consumidas for t in tarefas_sprint if t.horas_consumidas)
+    
+    if request.method == "POST":
+        # Criar OS baseada na sprint
+        form = OrdemServicoForm(request.POST)
+        if form.is_valid():
+            os_item = form.save(commit=False)
+            os_item.cliente = projeto.contrato.cliente
+            os_item.contrato = projeto.contrato
+            
+            # Definir datas baseadas na sprint
+            os_item.data_inicio = sprint.data_inicio
+            os_item.data_termino = sprint.data_fim
+            
+            # Calcular quantidade total (horas)
+            os_item.quantidade = total_horas_planejadas or Decimal('0.00')
+            
+            # Salvar OS (gera número automaticamente)
+            os_item.save()
+            
+            # Vincular sprint à OS
+            sprint.ordem_servico = os_item
+            sprint.status = "finalizada"
+            sprint.save()
+            
+            # Mover tarefas da sprint para a OS e atualizar horas planejadas/realizadas
+            for tarefa in tarefas_sprint:
+                tarefa.ordem_servico = os_item
+                tarefa.save()
+            
+            # Atualizar horas planejadas e realizadas da OS
+            os_item.horas_planejadas = total_horas_planejadas
+            os_item.horas_realizadas = total_horas_consumidas
+            os_item.save()
+            
+            messages.success(request, f"Sprint finalizada e OS {os_item.numero_os} criada com sucesso!")
+            return redirect("ordem_servico_detail", pk=os_item.pk)
+    else:
+        # Preencher formulário com dados sugeridos
+        form = OrdemServicoForm()
+        form.fields['contrato'].initial = projeto.contrato
+        form.fields['cliente'].initial = projeto.contrato.cliente
+        
+        # Tentar sugerir item_contrato do tipo Serviço do contrato
+        itens_servico = projeto.contrato.itens.filter(tipo="Serviço").first()
+        if itens_servico:
+            form.fields['item_contrato'].initial = itens_servico
+        
+        # Preencher quantidade com total de horas
+        form.fields['quantidade'].initial = total_horas_planejadas
+        
+        # Preencher datas
+        form.fields['data_inicio'].initial = sprint.data_inicio
+        form.fields['data_termino'].initial = sprint.data_fim
+    
+    context = {
+        "projeto": projeto,
+        "sprint": sprint,
+        "form": form,
+        "tarefas_sprint": tarefas_sprint,
+        "total_horas_planejadas": total_horas_planejadas,
+        "total_horas_consumidas": total_horas_consumidas,
+    }
+    
+    return render(request, "sprint/fechar.html", context)
+
+
+# Tarefa - Mover para Sprint
+@group_required("Admin", "Gerente")
+def tarefa_mover_sprint(request, projeto_id, sprint_id, tarefa_id):
+    """Move uma tarefa do backlog para a sprint"""
+    projeto = get_object_or_404(Projeto, pk=projeto_id)
+    sprint = get_object_or_404(Sprint, pk=sprint_id, projeto=projeto)
+    tarefa = get_object_or_404(Tarefa, pk=tarefa_id)
+    
+    if tarefa.backlog and projeto.backlog_origem == tarefa.backlog:
+        from datetime import datetime, time
+        from django.utils import timezone as tz
+        from decimal import Decimal
+        
+        # Validar datas da tarefa em relação à sprint
+        if tarefa.data_inicio_prevista:
+            # Converter data_inicio da sprint para datetime se necessário
+            if isinstance(sprint.data_inicio, datetime):
+                data_inicio_sprint = sprint.data_inicio
+            else:
+                data_inicio_sprint = datetime.combine(sprint.data_inicio, time.min)
+                # Tornar timezone-aware se o data_inicio_prevista for aware
+                if tz.is_aware(tarefa.data_inicio_prevista):
+                    data_inicio_sprint = tz.make_aware(data_inicio_sprint)
+            
+            if tarefa.data_inicio_prevista < data_inicio_sprint:
+                messages.error(request, f"A data de início da tarefa ({tarefa.data_inicio_prevista.strftime('%d/%m/%Y %H:%M')}) não pode ser anterior à data de início da sprint ({sprint.data_inicio.strftime('%d/%m/%Y')})!")
+                return redirect("sprint_detail", projeto_id=projeto_id, sprint_id=sprint_id)
+        
+        if tarefa.data_termino_prevista:
+            # Converter data_fim da sprint para datetime se necessário
+            if isinstance(sprint.data_fim, datetime):
+                data_fim_sprint = sprint.data_fim
+            else:
+                data_fim_sprint = datetime.combine(sprint.data_fim, time(23, 59, 59))
+                # Tornar timezone-aware se o data_termino_prevista for aware
+                if tz.is_aware(tarefa.data_termino_prevista):
+                    data_fim_sprint = tz.make_aware(data_fim_sprint)
+            
+            if tarefa.data_termino_prevista > data_fim_sprint:
+                messages.error(request, f"A data de término da tarefa ({tarefa.data_termino_prevista.strftime('%d/%m/%Y %H:%M')}) não pode ser maior que a data de fim da sprint ({sprint.data_fim.strftime('%d/%m/%Y')})!")
+                return redirect("sprint_detail", projeto_id=projeto_id, sprint_id=sprint_id)
+        
+        tarefa.sprint = sprint
+        tarefa.status_sprint = "nao_iniciada"  # Status inicial ao mover para sprint
+        
+        # Orçamento de horas do consultor na OS da sprint
+        violacoes = OrcamentoHorasService.validar([tarefa])
+        if violacoes:
+            for violacao in violacoes:
+                messages.error(request, violacao["mensagem"])
+            return redirect("sprint_detail", projeto_id=projeto_id, sprint_id=sprint_id)
+        
+        tarefa.save()  # Atualiza os totais de horas armazenados na sprint
+        
+        # Tarefa de gestão: recalculada a partir dos totais da sprint (consultas em número fixo)
+        if tarefa.papel == "consultor":
+            if not sprint.tarefas.filter(papel="gestao").exists():
+                # Criar tarefa de gestão (25% das horas do consultor; calculadas no save)
+                
+                # Usar o backlog de origem do projeto se existir, senão usar o primeiro backlog pendente do contrato
+                if projeto.backlog_origem:
+                    backlog = projeto.backlog_origem
+                else:
+                    backlog = Backlog.objects.filter(contrato=projeto.contrato, status='pendente').first()
+                    if not backlog:
+                        backlog = Backlog.objects.create(
+                            contrato=projeto.contrato,
+                            titulo=f"Backlog - {projeto.nome}",
+                            status='pendente'
+                        )
+                
+                # Converter datas da sprint para datetime se necessário
+                if isinstance(sprint.data_inicio, datetime):
+                    data_inicio_gestao = sprint.data_inicio
+                else:
+                    data_inicio_gestao = datetime.combine(sprint.data_inicio, time.min)
+                    if tz.is_aware(tarefa.data_inicio_prevista) if tarefa.data_inicio_prevista else False:
+                        data_inicio_gestao = tz.make_aware(data_inicio_gestao)
+                
+                if isinstance(sprint.data_fim, datetime):
+                    data_termino_gestao = sprint.data_fim
+                else:
+                    data_termino_gestao = datetime.combine(sprint.data_fim, time(23, 59, 59))
+                    if tz.is_aware(tarefa.data_termino_prevista) if tarefa.data_termino_prevista else False:
+                        data_termino_gestao = tz.make_aware(data_termino_gestao)
+                
+                tarefa_gestao = Tarefa.objects.create(
+                    titulo=f"Gestão de Projetos - {sprint.nome}",
+                    descricao="Tarefa de gestão de projetos (25% das horas do consultor técnico)",
+                    projeto=projeto,
+                    backlog=backlog,
+                    sprint=sprint,
+                    papel="gestao",
+                    responsavel=projeto.gerente_projeto,
+                    prioridade="media",
+                    status_sprint="nao_iniciada",
+                    data_inicio_prevista=data_inicio_gestao,
+                    data_termino_prevista=data_termino_gestao,
+                )
+                messages.success(request, f"Tarefa movida para a sprint! Tarefa de gestão criada automaticamente ({tarefa_gestao.horas_planejadas}h).")
+            else:
+                sprint.atualizar_horas_gestao()
+                messages.success(request, "Tarefa movida para a sprint!")
+        else:
+            messages.success(request, "Tarefa movida para a sprint!")
+    else:
+        messages.error(request, "Tarefa não pertence ao backlog deste projeto!")
+    
+    return redirect("sprint_detail", projeto_id=projeto_id, sprint_id=sprint_id)
+
+
+# Tarefa - Remover da Sprint (voltar ao backlog)
+@group_required("Admin", "Gerente")
+def tarefa_remover_sprint(request, projeto_id, sprint_id, tarefa_id):
+    """Remove uma tarefa da sprint e retorna ao backlog"""
+    projeto = get_object_or_404(Projeto, pk=projeto_id)
+    sprint = get_object_or_404(Sprint, pk=sprint_id, projeto=projeto)
+    tarefa = get_object_or_404(Tarefa, pk=tarefa_id, sprint=sprint)
+    
+    # Não permitir remover tarefa de gestão
+    if tarefa.papel == "gestao":
+        messages.error(request, "A tarefa de gestão não pode ser removida da sprint!")
+        return redirect("sprint_detail", projeto_id=projeto_id, sprint_id=sprint_id)
+    
+    # Usar o backlog de origem do projeto se existir, senão usar o primeiro backlog pendente do contrato
+    if projeto.backlog_origem:
+        backlog = projeto.backlog_origem
+    else:
+        backlog = Backlog.objects.filter(contrato=projeto.contrato, status='pendente').first()
+        if not backlog:
+            backlog = Backlog.objects.create(
+                contrato=projeto.contrato,
+                titulo=f"Backlog - {projeto.nome}",
+                status='pendente'
+            )
+    tarefa.sprint = None
+    tarefa.status_sprint = None
+    tarefa.backlog = backlog
+    tarefa.save()  # Atualiza os totais de horas armazenados na sprint
+    
+    # Atualizar horas da tarefa de gestão se ainda houver tarefas de consultor
+    if sprint.tarefas.filter(papel="gestao").exists():
+        if sprint.tarefas.filter(papel="consultor").exists():
+            sprint.atualizar_horas_gestao()
+        else:
+            # Se não há mais tarefas de consultor, remover tarefa de gestão
+            sprint.tarefas.filter(papel="gestao").delete()
+            messages.success(request, "Tarefa removida da sprint e retornada ao backlog! Tarefa de gestão removida (não há mais tarefas de consultor).")
+            return redirect("sprint_detail", projeto_id=projeto_id, sprint_id=sprint_id)
+    
+    messages.success(request, "Tarefa removida da sprint e retornada ao backlog!")
+    return redirect("sprint_detail", projeto_id=projeto_id, sprint_id=sprint_id)
+
+
+# Tarefa - Criar (no projeto)
+@group_required("Admin", "Gerente")
+def tarefa_projeto_create(request, projeto_id):
+    """Cria uma nova tarefa no projeto"""
+    from ..forms import TarefaForm
+    projeto = get_object_or_404(Projeto, pk=projeto_id)
+    # Usar o backlog de origem do projeto se existir, senão usar o primeiro backlog pendente do contrato
+    if projeto.backlog_origem:
+        backlog = projeto.backlog_origem
+    else:
+        # Buscar o primeiro backlog pendente do contrato
+        backlog = Backlog.objects.filter(contrato=projeto.contrato, status='pendente').first()
+        if not backlog:
+            # Se não houver backlog pendente, criar um novo
+            backlog = Backlog.objects.create(
+                contrato=projeto.contrato,
+                titulo=f"Backlog - {projeto.nome}",
+                status='pendente'
+            )
+    
+    if request.method == "POST":
+        form = TarefaForm(request.POST, projeto_id=projeto_id)
+        if form.is_valid():
+            tarefa = form.save(commit=False)
+            # Se não foi selecionada sprint, alocar no backlog
+            if not tarefa.sprint:
+                tarefa.backlog = backlog
+            # Se foi selecionada sprint, definir status_sprint inicial
+            if tarefa.sprint and not tarefa.status_sprint:
+                tarefa.status_sprint = "nao_iniciada"
+            tarefa.save()
+            messages.success(request, "Tarefa criada com sucesso!")
+            return redirect("projeto_detail", pk=projeto_id)
+        else:
+            messages.error(request, "Erro ao criar a tarefa. Verifique os campos.")
+    else:
+        form = TarefaForm(projeto_id=projeto_id)
+    
+    context = {
+        "form": form,
+        "projeto": projeto,
+        "sprints": projeto.sprints.all().order_by('-data_inicio'),
+    }
+    return render(request, "tarefa/form_projeto_create.html", context)
+
+
+# Tarefa - Editar (do projeto/sprint)
+@group_required("Admin", "Gerente")
+def tarefa_projeto_update(request, projeto_id, tarefa_id):
+    """Edita uma tarefa do projeto (backlog ou sprint)"""
+    from ..forms import TarefaForm
+    projeto = get_object_or_404(Projeto, pk=projeto_id)
+    tarefa = get_object_or_404(Tarefa, pk=tarefa_id)
+    
+    # Verificar se a tarefa pertence ao projeto
+    if tarefa.backlog:
+        # Verificar se o backlog está relacionado ao projeto através de backlog_origem
+        if projeto.backlog_origem != tarefa.backlog:
+            # Se não estiver relacionado pelo backlog, verificar se está em sprint do projeto
+            if not (tarefa.sprint and tarefa.sprint.projeto == projeto):
+                messages.error(request, "Tarefa não pertence a este projeto!")
+                if tarefa.sprint:
+                    return redirect("sprint_detail", projeto_id=projeto_id, sprint_id=tarefa.sprint.pk)
+                return redirect("projeto_detail", pk=projeto_id)
+    elif tarefa.sprint:
+        # Se não tem backlog, verificar se está em sprint do projeto
+        if tarefa.sprint.projeto != projeto:
+            messages.error(request, "Tarefa não pertence a este projeto!")
+            return redirect("projeto_detail", pk=projeto_id)
+    
+    if request.method == "POST":
+        # O form altera a própria instância: guardar a sprint e o papel antes da validação
+        sprint_anterior_id, papel_anterior = tarefa.sprint_id, tarefa.papel
+        form = TarefaForm(request.POST, instance=tarefa, projeto_id=projeto_id)
+        if form.is_valid():
+            tarefa_editada = form.save(commit=False)
+            
+            # Validar data fim se estiver em sprint
+            if tarefa_editada.sprint and tarefa_editada.data_termino_prevista:
+                from datetime import datetime, time
+                from django.utils import timezone as tz
+                
+                # Converter data_fim da sprint para datetime se necessário
+                if isinstance(tarefa_editada.sprint.data_fim, datetime):
+                    data_fim_sprint = tarefa_editada.sprint.data_fim
+                else:
+                    data_fim_sprint = datetime.combine(tarefa_editada.sprint.data_fim, time(23, 59, 59))
+                    # Tornar timezone-aware se o data_termino_prevista for aware
+                    if tz.is_aware(tarefa_editada.data_termino_prevista):
+                        data_fim_sprint = tz.make_aware(data_fim_sprint)
+                
+                if tarefa_editada.data_termino_prevista > data_fim_sprint:
+                    messages.error(request, f"A data de término não pode ser maior que a data de fim da sprint ({tarefa_editada.sprint.data_fim.strftime('%d/%m/%Y')})!")
+                    return render(request, "tarefa/form_projeto.html", {"form": form, "projeto": projeto, "tarefa": tarefa})
+            
+            tarefa_editada.save()
+            
+            # Tarefa de consultor (antes ou depois da edição): atualizar a gestão da sprint
+            # de origem e da de destino (o save já aplicou a diferença de horas nos totais)
+            if "consultor" in (papel_anterior, tarefa_editada.papel):
+                sprint_ids = {sprint_anterior_id, tarefa_editada.sprint_id} - {None}
+                for sprint in Sprint.objects.filter(pk__in=sprint_ids):
+                    sprint.atualizar_horas_gestao()
+            
+            messages.success(request, "Tarefa atualizada com sucesso!")
+            if tarefa_editada.sprint:
+                return redirect("sprint_detail", projeto_id=projeto_id, sprint_id=tarefa_editada.sprint.pk)
+            return redirect("projeto_detail", pk=projeto_id)
+    else:
+        form = TarefaForm(instance=tarefa, projeto_id=projeto_id)
+        
+        # Garantir que os valores de data/hora sejam carregados no formato correto para datetime-local
+        from django.utils import timezone as tz
+        if tarefa.data_inicio_prevista:
+            # Converter para timezone local antes de formatar
+            data_inicio_local = tz.localtime(tarefa.data_inicio_prevista) if tz.is_aware(tarefa.data_inicio_prevista) else tarefa.data_inicio_prevista
+            form.initial['data_inicio_prevista'] = data_inicio_local.strftime('%Y-%m-%dT%H:%M')
+        if tarefa.data_termino_prevista:
+            # Converter para timezone local antes de formatar
+            data_termino_local = tz.localtime(tarefa.data_termino_prevista) if tz.is_aware(tarefa.data_termino_prevista) else tarefa.data_termino_prevista
+            form.initial['data_termino_prevista'] = data_termino_local.strftime('%Y-%m-%dT%H:%M')
+        
+        # Ocultar campos conforme contexto
+        if tarefa.sprint:
+            if "status_sprint" in form.fields:
+                form.fields["status_sprint"].required = False
+            if "status" in form.fields:
+                form.fields["status"].widget = forms.HiddenInput()
+        else:
+            if "status_sprint" in form.fields:
+                form.fields["status_sprint"].widget = forms.HiddenInput()
+    
+    return render(request, "tarefa/form_projeto.html", {"form": form, "projeto": projeto, "tarefa": tarefa})
+
+
+# Tarefa - Ver Detalhes (do projeto)
+@group_required("Admin", "Gerente", "Leitor")
+def tarefa_projeto_detail(request, projeto_id, tarefa_id):
+    """Visualiza detalhes de uma tarefa do projeto (read-only)"""
+    projeto = get_object_or_404(Projeto, pk=projeto_id)
+    tarefa = get_object_or_404(Tarefa, pk=tarefa_id)
+    
+    # Verificar se a tarefa pertence ao projeto
+    if tarefa.backlog:
+        # Verificar se o backlog está relacionado ao projeto através de backlog_origem
+        if projeto.backlog_origem != tarefa.backlog:
+            # Se não estiver relacionado pelo backlog, verificar se está em sprint do projeto
+            if not (tarefa.sprint and tarefa.sprint.projeto == projeto):
+                messages.error(request, "Tarefa não pertence a este projeto!")
+                return redirect("projeto_detail", pk=projeto_id)
+    elif tarefa.sprint:
+        # Se não tem backlog, verificar se está em sprint do projeto
+        if tarefa.sprint.projeto != projeto:
+            messages.error(request, "Tarefa não pertence a este projeto!")
+            return redirect("projeto_detail", pk=projeto_id)
+    
+    context = {
+        "projeto": projeto,
+        "tarefa": tarefa,
+    }
+    return render(request, "tarefa/detail_projeto.html", context)
+
+
+# Tarefa - Criar (no projeto)
+@group_required("Admin", "Gerente")
+def tarefa_projeto_create(request, projeto_id):
+    """Cria uma nova tarefa no projeto"""
+    from ..forms import TarefaForm
+    projeto = get_object_or_404(Projeto, pk=projeto_id)
+    # Usar o backlog de origem do projeto se existir, senão usar o primeiro backlog pendente do contrato
+    if projeto.backlog_origem:
+        backlog = projeto.backlog_origem
+    else:
+        # Buscar o primeiro backlog pendente do contrato
+        backlog = Backlog.objects.filter(contrato=projeto.contrato, status='pendente').first()
+        if not backlog:
+            # Se não houver backlog pendente, criar um novo
+            backlog = Backlog.objects.create(
+                contrato=projeto.contrato,
+                titulo=f"Backlog - {projeto.nome}",
+                status='pendente'
+            )
+    
+    if request.method == "POST":
+        form = TarefaForm(request.POST, projeto_id=projeto_id)
+        if form.is_valid():
+            tarefa = form.save(commit=False)
+            # Se não foi selecionada sprint, alocar no backlog
+            if not tarefa.sprint:
+                tarefa.backlog = backlog
+            # Se foi selecionada sprint, definir status_sprint inicial
+            if tarefa.sprint and not tarefa.status_sprint:
+                tarefa.status_sprint = "nao_iniciada"
+            tarefa.save()
+            messages.success(request, "Tarefa criada com sucesso!")
+            return redirect("projeto_detail", pk=projeto_id)
+        else:
+            messages.error(request, "Erro ao criar a tarefa. Verifique os campos.")
+    else:
+        form = TarefaForm(projeto_id=projeto_id)
+    
+    context = {
+        "form": form,
+        "projeto": projeto,
+        "sprints": projeto.sprints.all().order_by('-data_inicio'),
+    }
+    return render(request, "tarefa/form_projeto_create.html", context)
+
+
+# Tarefa - Criar via AJAX
+@group_required("Admin", "Gerente")
+def tarefa_create_ajax(request, projeto_id):
+    """Cria uma nova tarefa no projeto via AJAX"""
+    from django.http import JsonResponse
+    from django.utils import timezone
+    from datetime import datetime
+    from decimal import InvalidOperation
+    projeto = get_object_or_404(Projeto, pk=projeto_id)
+    
+    if request.method == 'POST':
+        titulo = request.POST.get('titulo')
+        descricao = request.POST.get('descricao', '')
+        bilhetar_na_os = request.POST.get('bilhetar_na_os') == 'on'
+        responsavel_id = request.POST.get('responsavel')
+        data_inicio_prevista = request.POST.get('data_inicio_prevista')
+        data_termino_prevista = request.POST.get('data_termino_prevista')
+        horas_planejadas = request.POST.get('horas_planejadas', '0')
+        observacoes = request.POST.get('observacoes', '')
+        sprint_id = request.POST.get('sprint', '')
+        
+        if not titulo:
+            return JsonResponse({'success': False, 'error': 'Nome da Tarefa é obrigatório.'}, status=400)
+        
+        if not data_inicio_prevista or not data_termino_prevista:
+            return JsonResponse({'success': False, 'error': 'Data/Hora de Início e Término são obrigatórias.'}, status=400)
+        
+        try:
+            # Converter datas
+            try:
+                data_inicio = datetime.strptime(data_inicio_prevista, '%Y-%m-%dT%H:%M')
+                data_termino = datetime.strptime(data_termino_prevista, '%Y-%m-%dT%H:%M')
+            except ValueError:
+                return JsonResponse({'success': False, 'error': 'Formato de data inválido. Use o formato: YYYY-MM-DDTHH:MM'}, status=400)
+            
+            # Tornar timezone-aware se necessário
+            if timezone.is_naive(data_inicio):
+                data_inicio = timezone.make_aware(data_inicio)
+            if timezone.is_naive(data_termino):
+                data_termino = timezone.make_aware(data_termino)
+            
+            # Validar que data de término é posterior à data de início
+            if data_termino <= data_inicio:
+                return JsonResponse({'success': False, 'error': 'Data/Hora de Término deve ser posterior à Data/Hora de Início.'}, status=400)
+            
+            # Converter horas planejadas
+            try:
+                horas_planejadas_decimal = Decimal(str(horas_planejadas))
+            except (ValueError, InvalidOperation):
+                horas_planejadas_decimal = Decimal('0.00')
+            
+            # Buscar ou criar backlog
+            if projeto.backlog_origem:
+                backlog = projeto.backlog_origem
+            else:
+                backlog = Backlog.objects.filter(contrato=projeto.contrato, status='pendente').first()
+                if not backlog:
+                    backlog = Backlog.objects.create(
+                        contrato=projeto.contrato,
+                        titulo=f"Backlog - {projeto.nome}",
+                        status='pendente'
+                    )
+            
+            # Buscar responsável se fornecido
+            responsavel = None
+            if responsavel_id:
+                try:
+                    responsavel = Colaborador.objects.get(pk=responsavel_id)
+                except Colaborador.DoesNotExist:
+                    pass
+            
+            # Buscar sprint se fornecido
+            sprint = None
+            if sprint_id:
+                try:
+                    sprint = Sprint.objects.get(pk=sprint_id, projeto=projeto)
+                except Sprint.DoesNotExist:
+                    pass
+            
+            # Calcular ordem_sprint se a tarefa está em uma sprint
+            ordem_sprint = 0
+            if sprint:
+                # Obter a última ordem na sprint e adicionar 1
+                ultima_ordem = Tarefa.objects.filter(sprint=sprint).aggregate(
+                    max_ordem=Max('ordem_sprint')
+                )['max_ordem']
+                ordem_sprint = (ultima_ordem or 0) + 1
+            
+            # Criar tarefa
+            # Se não há sprint, garantir que a tarefa tenha um backlog
+            tarefa_backlog = None
+            if not sprint:
+                tarefa_backlog = backlog
+            
+            tarefa = Tarefa(
+                titulo=titulo,
+                descricao=descricao,
+                bilhetar_na_os=bilhetar_na_os,
+                responsavel=responsavel,
+                data_inicio_prevista=data_inicio,
+                data_termino_prevista=data_termino,
+                horas_planejadas=horas_planejadas_decimal,
+                observacoes=observacoes,
+                sprint=sprint,
+                backlog=tarefa_backlog,
+                projeto=projeto,
+                status_sprint="nao_iniciada" if sprint else None,
+                status="pendente",
+                ordem_sprint=ordem_sprint,
+                prioridade="media"  # Definir prioridade padrão
+            )
+            
+            # Orçamento de horas do consultor na OS da sprint
+            violacoes = OrcamentoHorasService.validar([tarefa])
+            if violacoes:
+                return JsonResponse({
+                    'success': False,
+                    'error': ' '.join(v['mensagem'] for v in violacoes),
+                    'violacoes': [
+                        {chave: str(valor) if isinstance(valor, Decimal) else valor for chave, valor in v.items()}
+                        for v in violacoes
+                    ],
+                }, status=400)
+            tarefa.save()
+            
+            # Retornar dados da tarefa criada
+            return JsonResponse({
+                'success': True,
+                'message': 'Tarefa criada com sucesso!',
+                'tarefa': {
+                    'id': tarefa.id,
+                    'titulo': tarefa.titulo,
+                    'descricao': tarefa.descricao or '',
+                    'responsavel': tarefa.responsavel.nome_completo if tarefa.responsavel else 'Sem responsável',
+                    'sprint': tarefa.sprint.nome if tarefa.sprint else None,
+                    'prioridade': tarefa.prioridade,
+                    'horas_planejadas': str(tarefa.horas_planejadas),
+                    'data_inicio_prevista': tarefa.data_inicio_prevista.strftime('%d/%m/%Y, %H:%M') if tarefa.data_inicio_prevista else '',
+                    'data_termino_prevista': tarefa.data_termino_prevista.strftime('%d/%m/%Y, %H:%M') if tarefa.data_termino_prevista else '',
+                }
+            })
+        except Exception as e:
+            import traceback
+            return JsonResponse({'success': False, 'error': f'Erro ao criar tarefa: {str(e)}'}, status=500)
+    
+    return JsonResponse({'success': False, 'error': 'Método não permitido.'}, status=405)
+
+
+# Tarefa - Deletar (do projeto)
+@group_required("Admin", "Gerente")
+def tarefa_projeto_delete(request, projeto_id, tarefa_id):
+    """Exclui uma tarefa do projeto"""
+    projeto = get_object_or_404(Projeto, pk=projeto_id)
+    tarefa = get_object_or_404(Tarefa, pk=tarefa_id)
+    
+    # Verificar se a tarefa pertence ao projeto
+    if tarefa.backlog:
+        # Verificar se o backlog está relacionado ao projeto através de backlog_origem
+        if projeto.backlog_origem != tarefa.backlog:
+            # Se não estiver relacionado pelo backlog, verificar se está em sprint do projeto
+            if not (tarefa.sprint and tarefa.sprint.projeto == projeto):
+                messages.error(request, "Tarefa não pertence a este projeto!")
+                return redirect("projeto_detail", pk=projeto_id)
+    elif tarefa.sprint:
+        # Se não tem backlog, verificar se está em sprint do projeto
+        if tarefa.sprint.projeto != projeto:
+            messages.error(request, "Tarefa não pertence a este projeto!")
+            return redirect("projeto_detail", pk=projeto_id)
+    
+    if request.method == "POST":
+        tarefa.delete()
+        messages.success(request, "Tarefa excluída com sucesso!")
+        return redirect("projeto_detail", pk=projeto_id)
+    
+    context = {
+        "projeto": projeto,
+        "tarefa": tarefa,
+    }
+    return render(request, "tarefa/confirm_delete_projeto.html", context)
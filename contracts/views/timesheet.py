@@ -0,0 +1,721 @@
+"""
+Views do timesheet
+"""
+from django.shortcuts import render, get_object_or_404, redirect
+from django.http import JsonResponse
+from django.contrib import messages
+from django.db.models import Q, Sum, Value, DecimalField, Max
+from django.db import transaction
+from django.db.models.functions import Coalesce
+from django.contrib.auth.decorators import login_required
+from django.views.decorators.http import require_GET
+from datetime import datetime
+from django.utils import timezone
+from decimal import Decimal
+
+from ..models import (
+    OrdemServico,
+    Colaborador,
+    Tarefa,
+    LancamentoHora,
+    Projeto,
+    Sprint,
+)
+from ..services import AuditoriaTimesheetService
+from ..forms import LancamentoHoraForm
+from .comum import group_required
+
+
+# ==================== TIMESHEET ====================
+
+@login_required
+def timesheet_list(request):
+    """Lista de tarefas do colaborador logado para lançamento de horas"""
+    try:
+        colaborador = request.user.colaborador
+    except:
+        messages.error(request, "Você precisa ter um perfil de colaborador para acessar o Timesheet.")
+        return redirect("dashboard")
+    
+    # Filtros
+    data_inicio = request.GET.get("data_inicio")
+    data_fim = request.GET.get("data_fim")
+    projeto_id = request.GET.get("projeto")
+    sprint_id = request.GET.get("sprint")
+    
+    # Buscar tarefas onde o colaborador é responsável
+    tarefas = Tarefa.objects.filter(responsavel=colaborador).select_related(
+        "sprint", "sprint__projeto", "ordem_servico"
+    ).order_by("-data_inicio_prevista")
+    
+    # Aplicar filtros
+    if projeto_id:
+        tarefas = tarefas.filter(sprint__projeto_id=projeto_id)
+    if sprint_id:
+        tarefas = tarefas.filter(sprint_id=sprint_id)
+    
+    # Buscar lançamentos do colaborador
+    lancamentos = LancamentoHora.objects.filter(colaborador=colaborador).select_related("tarefa")
+    
+    if data_inicio:
+        lancamentos = lancamentos.filter(data__gte=data_inicio)
+    if data_fim:
+        lancamentos = lancamentos.filter(data__lte=data_fim)
+    
+    # Calcular totais - somente horas faturáveis
+    total_horas_lancadas = lancamentos.filter(faturavel=True).aggregate(
+        total=Coalesce(Sum("horas_trabalhadas"), Value(Decimal("0.00")), output_field=DecimalField())
+    )["total"]
+    
+    total_horas_planejadas = tarefas.aggregate(
+        total=Coalesce(Sum("horas_planejadas"), Value(Decimal("0.00")), output_field=DecimalField())
+    )["total"]
+    
+    # Horas restantes = Horas Planejadas - Horas Lançadas
+    horas_restantes = total_horas_planejadas - total_horas_lancadas
+    
+    # Projetos do colaborador (para filtro)
+    projetos = Projeto.objects.filter(
+        sprints__tarefas__responsavel=colaborador
+    ).distinct()
+    
+    # Sprints do colaborador (para filtro)
+    sprints = Sprint.objects.filter(
+        tarefas__responsavel=colaborador
+    ).distinct()
+    
+    # Agrupar lançamentos por data para a visão semanal
+    from collections import defaultdict
+    lancamentos_por_data = defaultdict(list)
+    for lancamento in lancamentos.order_by("-data"):
+        lancamentos_por_data[lancamento.data].append(lancamento)
+    
+    # Todos os projetos para o dropdown da planilha
+    todos_projetos = Projeto.objects.all().order_by("nome")
+    
+    context = {
+        "colaborador": colaborador,
+        "tarefas": tarefas,
+        "lancamentos": lancamentos.order_by("-data", "-hora_inicio")[:50],
+        "lancamentos_por_data": dict(lancamentos_por_data),
+        "total_horas_lancadas": total_horas_lancadas,
+        "total_horas_planejadas": total_horas_planejadas,
+        "horas_restantes": horas_restantes,
+        "projetos": projetos,
+        "sprints": sprints,
+        "todos_projetos": todos_projetos,
+        "filtro_data_inicio": data_inicio,
+        "filtro_data_fim": data_fim,
+        "filtro_projeto": projeto_id,
+        "filtro_sprint": sprint_id,
+        "today": timezone.now().date(),
+    }
+    return render(request, "timesheet/list.html", context)
+
+
+@login_required
+def timesheet_lancar_horas(request, tarefa_id):
+    """Lançar horas em uma tarefa específica"""
+    try:
+        colaborador = request.user.colaborador
+    except:
+        messages.error(request, "Você precisa ter um perfil de colaborador.")
+        return redirect("timesheet_list")
+    
+    tarefa = get_object_or_404(Tarefa, pk=tarefa_id, responsavel=colaborador)
+    
+    if request.method == "POST":
+        form = LancamentoHoraForm(request.POST)
+        if form.is_valid():
+            lancamento = form.save(commit=False)
+            lancamento.tarefa = tarefa
+            lancamento.colaborador = colaborador
+            lancamento.save()
+            messages.success(request, f"Horas lançadas com sucesso! ({lancamento.horas_trabalhadas}h)")
+            return redirect("timesheet_list")
+    else:
+        form = LancamentoHoraForm(initial={"data": timezone.now().date()})
+    
+    # Lançamentos anteriores desta tarefa
+    lancamentos_tarefa = tarefa.lancamentos_horas.filter(colaborador=colaborador).order_by("-data")
+    total_lancado = lancamentos_tarefa.aggregate(
+        total=Coalesce(Sum("horas_trabalhadas"), Value(Decimal("0.00")), output_field=DecimalField())
+    )["total"]
+    
+    context = {
+        "form": form,
+        "tarefa": tarefa,
+        "lancamentos_tarefa": lancamentos_tarefa,
+        "total_lancado": total_lancado,
+        "horas_restantes": (tarefa.horas_planejadas or Decimal("0.00")) - total_lancado,
+        "today": timezone.now().date(),
+    }
+    return render(request, "timesheet/lancar_horas.html", context)
+
+
+@login_required
+def timesheet_editar_lancamento(request, lancamento_id):
+    """Editar um lançamento de horas existente"""
+    try:
+        colaborador = request.user.colaborador
+    except:
+        messages.error(request, "Você precisa ter um perfil de colaborador.")
+        return redirect("timesheet_list")
+    
+    lancamento = get_object_or_404(LancamentoHora, pk=lancamento_id, colaborador=colaborador)
+    
+    if request.method == "POST":
+        form = LancamentoHoraForm(request.POST, instance=lancamento)
+        if form.is_valid():
+            form.save()
+            messages.success(request, "Lançamento atualizado com sucesso!")
+            return redirect("timesheet_list")
+    else:
+        form = LancamentoHoraForm(instance=lancamento)
+    
+    context = {
+        "form": form,
+        "lancamento": lancamento,
+        "tarefa": lancamento.tarefa,
+    }
+    return render(request, "timesheet/editar_lancamento.html", context)
+
+
+@login_required
+def timesheet_excluir_lancamento(request, lancamento_id):
+    """Excluir um lançamento de horas"""
+    try:
+        colaborador = request.user.colaborador
+    except:
+        messages.error(request, "Você precisa ter um perfil de colaborador.")
+        return redirect("timesheet_list")
+    
+    lancamento = get_object_or_404(LancamentoHora, pk=lancamento_id, colaborador=colaborador)
+    
+    if request.method == "POST":
+        lancamento.delete()
+        messages.success(request, "Lançamento excluído com sucesso!")
+        return redirect("timesheet_list")
+    
+    context = {
+        "lancamento": lancamento,
+    }
+    return render(request, "timesheet/confirm_delete.html", context)
+
+
+@login_required
+def timesheet_tarefa_detail(request, tarefa_id):
+    """Detalhes de uma tarefa no timesheet"""
+    try:
+        colaborador = request.user.colaborador
+    except:
+        messages.error(request, "Você precisa ter um perfil de colaborador.")
+        return redirect("timesheet_list")
+    
+    tarefa = get_object_or_404(Tarefa, pk=tarefa_id, responsavel=colaborador)
+    
+    # Lançamentos desta tarefa
+    lancamentos = tarefa.lancamentos_horas.filter(colaborador=colaborador).order_by("-data")
+    total_lancado = lancamentos.aggregate(
+        total=Coalesce(Sum("horas_trabalhadas"), Value(Decimal("0.00")), output_field=DecimalField())
+    )["total"]
+    
+    context = {
+        "tarefa": tarefa,
+        "lancamentos": lancamentos,
+        "total_lancado": total_lancado,
+        "horas_restantes": (tarefa.horas_planejadas or Decimal("0.00")) - total_lancado,
+        "percentual_concluido": (total_lancado / tarefa.horas_planejadas * 100) if tarefa.horas_planejadas else 0,
+    }
+    return render(request, "timesheet/tarefa_detail.html", context)
+
+
+@login_required
+def timesheet_planilha(request):
+    """Visão de planilha de horas do colaborador"""
+    try:
+        colaborador = request.user.colaborador
+    except:
+        messages.error(request, "Você precisa ter um perfil de colaborador para acessar o Timesheet.")
+        return redirect("dashboard")
+    
+    # Todos os projetos disponíveis
+    todos_projetos = Projeto.objects.all().order_by("nome")
+    
+    # Lançamentos do colaborador
+    lancamentos = LancamentoHora.objects.filter(
+        colaborador=colaborador
+    ).select_related(
+        "tarefa", "tarefa__sprint", "tarefa__sprint__projeto"
+    ).order_by("-data", "-criado_em")
+    
+    # Filtros
+    data_inicio = request.GET.get("data_inicio")
+    data_fim = request.GET.get("data_fim")
+    
+    if data_inicio:
+        lancamentos = lancamentos.filter(data__gte=data_inicio)
+    if data_fim:
+        lancamentos = lancamentos.filter(data__lte=data_fim)
+    
+    # Calcular totais
+    total_horas = lancamentos.aggregate(
+        total=Coalesce(Sum("horas_trabalhadas"), Value(Decimal("0.00")), output_field=DecimalField())
+    )["total"]
+    
+    context = {
+        "colaborador": colaborador,
+        "todos_projetos": todos_projetos,
+        "lancamentos": lancamentos[:100],
+        "total_horas": total_horas,
+        "filtro_data_inicio": data_inicio,
+        "filtro_data_fim": data_fim,
+    }
+    return render(request, "timesheet/planilha.html", context)
+
+
+@login_required
+def timesheet_planilha_salvar(request):
+    """Salvar lançamento via planilha (AJAX)"""
+    import json
+    
+    if request.method != "POST":
+        return JsonResponse({"error": "Método não permitido"}, status=405)
+    
+    try:
+        colaborador = request.user.colaborador
+    except:
+        return JsonResponse({"error": "Colaborador não encontrado"}, status=400)
+    
+    try:
+        data = json.loads(request.body)
+        
+        tarefa_id = data.get("tarefa_id")
+        data_lancamento = data.get("data")
+        tempo_gasto = data.get("tempo_gasto")  # em formato HH:MM ou decimal
+        descricao = data.get("descricao", "")
+        faturavel = data.get("faturavel", True)
+        lancamento_id = data.get("lancamento_id")  # Para edição
+        
+        # Validação: se faturável, tarefa é obrigatória
+        if faturavel and not tarefa_id:
+            return JsonResponse({"error": "Para lançamentos faturáveis, a tarefa é obrigatória"}, status=400)
+        
+        if not data_lancamento or not tempo_gasto:
+            return JsonResponse({"error": "Data e tempo são obrigatórios"}, status=400)
+        
+        tarefa = None
+        if tarefa_id:
+            tarefa = get_object_or_404(Tarefa, pk=tarefa_id)
+        
+        # Converter data_lancamento para date se for string
+        from datetime import datetime, time as dt_time, timedelta
+        if isinstance(data_lancamento, str):
+            data_lancamento = datetime.strptime(data_lancamento, "%Y-%m-%d").date()
+        
+        # Converter tempo_gasto para horas decimais
+        if ":" in str(tempo_gasto):
+            partes = tempo_gasto.split(":")
+            horas = int(partes[0])
+            minutos = int(partes[1]) if len(partes) > 1 else 0
+            horas_decimal = Decimal(str(horas)) + Decimal(str(minutos)) / Decimal("60")
+        else:
+            horas_decimal = Decimal(str(tempo_gasto))
+        
+        # Calcular hora_inicio e hora_termino baseado no tempo gasto
+        hora_inicio = dt_time(9, 0)  # Padrão: 09:00
+        
+        # Calcular hora de término
+        minutos_totais = int(horas_decimal * 60)
+        hora_termino_dt = datetime.combine(datetime.today(), hora_inicio) + timedelta(minutes=minutos_totais)
+        hora_termino = hora_termino_dt.time()
+        
+        if lancamento_id:
+            # Editar existente
+            lancamento = get_object_or_404(LancamentoHora, pk=lancamento_id, colaborador=colaborador)
+            lancamento.tarefa = tarefa
+            lancamento.data = data_lancamento
+            lancamento.hora_inicio = hora_inicio
+            lancamento.hora_termino = hora_termino
+            lancamento.descricao = descricao
+            lancamento.faturavel = faturavel
+            lancamento.save()
+        else:
+            # Criar novo
+            lancamento = LancamentoHora.objects.create(
+                tarefa=tarefa,
+                colaborador=colaborador,
+                data=data_lancamento,
+                hora_inicio=hora_inicio,
+                hora_termino=hora_termino,
+                descricao=descricao,
+                faturavel=faturavel
+            )
+        
+        return JsonResponse({
+            "success": True,
+            "lancamento_id": lancamento.id,
+            "horas_trabalhadas": str(lancamento.horas_trabalhadas)
+        })
+        
+    except Exception as e:
+        return JsonResponse({"error": str(e)}, status=400)
+
+
+@login_required
+def timesheet_planilha_excluir(request, lancamento_id):
+    """Excluir lançamento via planilha (AJAX)"""
+    if request.method != "POST":
+        return JsonResponse({"error": "Método não permitido"}, status=405)
+    
+    try:
+        colaborador = request.user.colaborador
+    except:
+        return JsonResponse({"error": "Colaborador não encontrado"}, status=400)
+    
+    lancamento = get_object_or_404(LancamentoHora, pk=lancamento_id, colaborador=colaborador)
+    lancamento.delete()
+    
+    return JsonResponse({"success": True})
+
+
+@login_required
+def timesheet_exportar(request):
+    """Exportar lançamentos do colaborador para XLSX"""
+    from openpyxl import Workbook
+    from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
+    from django.http import HttpResponse
+    from io import BytesIO
+    
+    try:
+        colaborador = request.user.colaborador
+    except:
+        messages.error(request, "Colaborador não encontrado")
+        return redirect("timesheet_planilha")
+    
+    lancamentos = LancamentoHora.objects.filter(
+        colaborador=colaborador
+    ).select_related(
+        "tarefa", "tarefa__sprint", "tarefa__sprint__projeto"
+    ).order_by("-data")
+    
+    # Filtros
+    data_inicio = request.GET.get("data_inicio")
+    data_fim = request.GET.get("data_fim")
+    
+    if data_inicio:
+        lancamentos = lancamentos.filter(data__gte=data_inicio)
+    if data_fim:
+        lancamentos = lancamentos.filter(data__lte=data_fim)
+    
+    # Criar workbook
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Timesheet"
+    
+    # Estilos
+    header_font = Font(bold=True, color="FFFFFF")
+    header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
+    header_alignment = Alignment(horizontal="center", vertical="center")
+    thin_border = Border(
+        left=Side(style='thin'),
+        right=Side(style='thin'),
+        top=Side(style='thin'),
+        bottom=Side(style='thin')
+    )
+    
+    # Cabeçalhos
+    headers = ["Data", "Projeto", "Sprint", "Tarefa", "Descrição", "Tempo Gasto (h)", "Faturável"]
+    for col, header in enumerate(headers, 1):
+        cell = ws.cell(row=1, column=col, value=header)
+        cell.font = header_font
+        cell.fill = header_fill
+        cell.alignment = header_alignment
+        cell.border = thin_border
+    
+    # Dados
+    for row, lancamento in enumerate(lancamentos, 2):
+        if lancamento.tarefa and lancamento.tarefa.sprint:
+            projeto = lancamento.tarefa.sprint.projeto.nome
+            sprint = lancamento.tarefa.sprint.nome
+        else:
+            projeto = "-"
+            sprint = "-"
+        
+        ws.cell(row=row, column=1, value=lancamento.data.strftime("%d/%m/%Y")).border = thin_border
+        ws.cell(row=row, column=2, value=projeto).border = thin_border
+        ws.cell(row=row, column=3, value=sprint).border = thin_border
+        ws.cell(row=row, column=4, value=lancamento.tarefa.titulo if lancamento.tarefa else "-").border = thin_border
+        ws.cell(row=row, column=5, value=lancamento.descricao or "").border = thin_border
+        ws.cell(row=row, column=6, value=float(lancamento.horas_trabalhadas)).border = thin_border
+        ws.cell(row=row, column=7, value="Sim" if lancamento.faturavel else "Não").border = thin_border
+    
+    # Ajustar largura das colunas
+    ws.column_dimensions['A'].width = 12
+    ws.column_dimensions['B'].width = 25
+    ws.column_dimensions['C'].width = 20
+    ws.column_dimensions['D'].width = 35
+    ws.column_dimensions['E'].width = 40
+    ws.column_dimensions['F'].width = 15
+    ws.column_dimensions['G'].width = 12
+    
+    # Salvar em buffer
+    buffer = BytesIO()
+    wb.save(buffer)
+    buffer.seek(0)
+    
+    response = HttpResponse(
+        buffer.getvalue(),
+        content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    )
+    response["Content-Disposition"] = f'attachment; filename="timesheet_{colaborador.nome_completo}_{timezone.now().strftime("%Y%m%d")}.xlsx"'
+    
+    return response
+
+
+@login_required
+def timesheet_importar(request):
+    """Importar lançamentos de XLSX"""
+    from openpyxl import load_workbook
+    from datetime import datetime, time as dt_time, timedelta
+    
+    if request.method != "POST":
+        return redirect("timesheet_planilha")
+    
+    try:
+        colaborador = request.user.colaborador
+    except:
+        messages.error(request, "Colaborador não encontrado")
+        return redirect("timesheet_planilha")
+    
+    arquivo = request.FILES.get("arquivo")
+    if not arquivo:
+        messages.error(request, "Nenhum arquivo selecionado")
+        return redirect("timesheet_planilha")
+    
+    try:
+        # Ler XLSX
+        wb = load_workbook(arquivo)
+        ws = wb.active
+        
+        importados = 0
+        erros = []
+        novos, duracoes, linhas = [], [], []
+        
+        # Pular cabeçalho (linha 1)
+        for i, row in enumerate(ws.iter_rows(min_row=2, values_only=True), start=2):
+            try:
+                if not row[0]:  # Linha vazia
+                    continue
+                
+                # Parsear data
+                data_valor = row[0]
+                if isinstance(data_valor, datetime):
+                    data = data_valor.date()
+                elif isinstance(data_valor, str):
+                    data_str = data_valor.strip()
+                    if "/" in data_str:
+                        data = datetime.strptime(data_str, "%d/%m/%Y").date()
+                    else:
+                        data = datetime.strptime(data_str, "%Y-%m-%d").date()
+                else:
+                    data = data_valor
+                
+                # Buscar tarefa pelo nome
+                tarefa_nome = str(row[3] or "").strip()  # Coluna D - Tarefa
+                projeto_nome = str(row[1] or "").strip()  # Coluna B - Projeto
+                
+                if tarefa_nome:
+                    tarefa = Tarefa.objects.filter(
+                        titulo__icontains=tarefa_nome,
+                        sprint__projeto__nome__icontains=projeto_nome
+                    ).first()
+                    
+                    if not tarefa:
+                        erros.append(f"Linha {i}: Tarefa '{tarefa_nome}' não encontrada")
+                        continue
+                else:
+                    erros.append(f"Linha {i}: Tarefa não informada")
+                    continue
+                
+                # Parsear tempo gasto
+                tempo_valor = row[5]  # Coluna F - Tempo Gasto
+                if isinstance(tempo_valor, (int, float)):
+                    horas_decimal = Decimal(str(tempo_valor))
+                else:
+                    tempo_str = str(tempo_valor or "0").strip().replace(",", ".")
+                    horas_decimal = Decimal(tempo_str)
+                
+                # Descrição
+                descricao = str(row[4] or "").strip()  # Coluna E - Descrição
+                
+                # hora_inicio/hora_termino são definidos após a leitura de todas as linhas
+                novos.append(LancamentoHora(
+                    tarefa=tarefa,
+                    colaborador=colaborador,
+                    data=data,
+                    descricao=descricao
+                ))
+                duracoes.append(int(horas_decimal * 60))
+                linhas.append(i)
+                
+            except Exception as e:
+                erros.append(f"Linha {i}: {str(e)}")
+        
+        # Lançamentos do mesmo dia em sequência a partir das 09:00, após o último já registrado
+        proximo_inicio = {
+            item["data"]: max(item["ultimo"], dt_time(9, 0))
+            for item in LancamentoHora.objects.filter(
+                colaborador=colaborador, data__in={lancamento.data for lancamento in novos}
+            ).values("data").annotate(ultimo=Max("hora_termino"))
+        }
+        # Lançamento que passaria de 24:00 é recusado (o término voltaria para a madrugada do mesmo dia)
+        aceitos, linhas_aceitas = [], []
+        for lancamento, minutos_totais, linha in zip(novos, duracoes, linhas):
+            lancamento.hora_inicio = proximo_inicio.get(lancamento.data, dt_time(9, 0))
+            hora_termino_dt = datetime.combine(lancamento.data, lancamento.hora_inicio) + timedelta(minutes=minutos_totais)
+            if hora_termino_dt.date() != lancamento.data:
+                erros.append(
+                    f"Linha {linha}: {minutos_totais / 60:.2f}h a partir das "
+                    f"{lancamento.hora_inicio:%H:%M} ultrapassam 24:00 em {lancamento.data:%d/%m/%Y}"
+                )
+                continue
+            lancamento.hora_termino = hora_termino_dt.time()
+            proximo_inicio[lancamento.data] = lancamento.hora_termino
+            aceitos.append(lancamento)
+            linhas_aceitas.append(linha)
+        novos, linhas = aceitos, linhas_aceitas
+        
+        # Checagem prévia: nada é gravado se o lote gerar ocorrências bloqueantes
+        ocorrencias = AuditoriaTimesheetService.verificar_lote(novos)
+        bloqueantes = [o for o in ocorrencias if o["bloqueante"]]
+        if bloqueantes:
+            messages.error(request, "Importação cancelada: " + "; ".join(
+                f"Linha {linhas[o['indice']]}: {o['descricao']}" for o in bloqueantes[:5]
+            ))
+            novos = []
+        elif ocorrencias:
+            messages.warning(request, "Verifique: " + "; ".join(
+                f"Linha {linhas[o['indice']]}: {o['descricao']}" for o in ocorrencias[:5]
+            ))
+        
+        with transaction.atomic():
+            for lancamento in novos:
+                lancamento.save()
+                importados += 1
+        
+        if importados > 0:
+            messages.success(request, f"{importados} lançamento(s) importado(s) com sucesso!")
+        if erros:
+            messages.warning(request, f"Erros: {'; '.join(erros[:5])}")
+            
+    except Exception as e:
+        messages.error(request, f"Erro ao processar arquivo: {str(e)}")
+    
+    return redirect("timesheet_planilha")
+
+
+@group_required("Admin", "Gerente")
+def timesheet_auditoria(request):
+    """Auditoria dos lançamentos de horas do período (sobreposições, limites, horários e OS encerradas)"""
+    hoje = timezone.localdate()
+    try:
+        inicio = datetime.strptime(request.GET.get("inicio", ""), "%Y-%m-%d").date()
+    except ValueError:
+        inicio = hoje.replace(day=1)
+    try:
+        fim = datetime.strptime(request.GET.get("fim", ""), "%Y-%m-%d").date()
+    except ValueError:
+        fim = hoje
+    colaborador_id = request.GET.get("colaborador")
+    colaboradores = [int(colaborador_id)] if colaborador_id and colaborador_id.isdigit() else None
+
+    auditoria = AuditoriaTimesheetService.relatorio(inicio, fim, colaboradores)
+    nomes = dict(Colaborador.objects.values_list("id", "nome_completo"))
+    for ocorrencia in auditoria["ocorrencias"]:
+        ocorrencia["colaborador"] = nomes.get(ocorrencia["colaborador_id"], "")
+
+    tipo = request.GET.get("tipo")
+    if tipo in AuditoriaTimesheetService.TIPOS:
+        auditoria["ocorrencias"] = [o for o in auditoria["ocorrencias"] if o["tipo"] == tipo]
+
+    context = {
+        **auditoria,
+        "resumo": [
+            {"tipo": chave, "descricao": descricao, "quantidade": auditoria["resumo"][chave]}
+            for chave, descricao in AuditoriaTimesheetService.TIPOS.items()
+        ],
+        "inicio": inicio,
+        "fim": fim,
+        "tipo": tipo,
+        "colaborador_id": colaborador_id,
+        "colaboradores": Colaborador.objects.filter(ativo=True).only("id", "nome_completo"),
+        "limite_diario": AuditoriaTimesheetService.LIMITE_DIARIO,
+        "limite_semanal": AuditoriaTimesheetService.LIMITE_SEMANAL,
+    }
+    return render(request, "timesheet/auditoria.html", context)
+
+
+# APIs para carregar dados dinâmicos na planilha
+@login_required
+@require_GET
+def api_sprints_por_projeto(request):
+    """Retorna sprints de um projeto"""
+    projeto_id = request.GET.get("projeto_id")
+    if not projeto_id:
+        return JsonResponse({"sprints": []}, safe=False)
+    
+    sprints = Sprint.objects.filter(projeto_id=projeto_id).values("id", "nome")
+    return JsonResponse({"sprints": list(sprints)}, safe=False)
+
+
+@require_GET
+def api_projetos_por_contrato(request):
+    """Retorna projetos de um contrato"""
+    contrato_id = request.GET.get("contrato_id")
+    if not contrato_id:
+        return JsonResponse({"projetos": []}, safe=False)
+    
+    projetos = Projeto.objects.filter(contrato_id=contrato_id).values("id", "nome")
+    return JsonResponse({"projetos": list(projetos)}, safe=False)
+
+
+@require_GET
+def api_ordens_servico_por_contrato(request):
+    """Retorna ordens de serviço de um contrato"""
+    contrato_id = request.GET.get("contrato_id")
+    projeto_id = request.GET.get("projeto_id")
+    
+    if not contrato_id:
+        return JsonResponse({"ordens": []}, safe=False)
+    
+    os_queryset = OrdemServico.objects.filter(contrato_id=contrato_id)
+    
+    # Se projeto_id for fornecido, filtrar também por projeto (via sprint)
+    if projeto_id:
+        os_queryset = os_queryset.filter(
+            Q(sprint__projeto_id=projeto_id) | Q(sprint__isnull=True)
+        )
+    
+    ordens = os_queryset.values("id", "numero_os")
+    return JsonResponse({"ordens": list(ordens)}, safe=False)
+
+
+@login_required
+def api_tarefas_por_sprint(request):
+    """Retorna tarefas de uma sprint"""
+    sprint_id = request.GET.get("sprint_id")
+    if not sprint_id:
+        return JsonResponse([], safe=False)
+    
+    try:
+        colaborador = request.user.colaborador
+        # Retorna apenas tarefas do colaborador
+        tarefas = Tarefa.objects.filter(
+            sprint_id=sprint_id,
+            responsavel=colaborador
+        ).values("id", "titulo")
+    except:
+        tarefas = Tarefa.objects.filter(sprint_id=sprint_id).values("id", "titulo")
+    
+    return JsonResponse(list(tarefas), safe=False)
@@ -36,6 +36,23 @@ DATABASES = {
     )
 }
 
+# Cache compartilhado entre os workers (abas e fragmentos {% cache_versao %}, indicadores
+# do dashboard e contadores de versão, ver CacheVersaoService). O padrão usa uma tabela
+# no próprio banco, criada pelo migrate (contracts 0088); para Redis, defina
+# CACHE_BACKEND=django.core.cache.backends.redis.RedisCache e CACHE_LOCATION=redis://...
+# MAX_ENTRIES comporta ~16 abas por contrato mais fragmentos e versões sem descarte
+# frequente; CULL_FREQUENCY=4 descarta 1/4 das entradas quando o limite é atingido
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.db.DatabaseCache'),
+        'LOCATION': config('CACHE_LOCATION', default='cache_controlcontratos'),
+        'OPTIONS': {
+            'MAX_ENTRIES': config('CACHE_MAX_ENTRIES', default=50000, cast=int),
+            'CULL_FREQUENCY': 4,
+        },
+    }
+}
+
 # Application definition
 INSTALLED_APPS = [
     "django.contrib.admin",
@@ -53,7 +70,6 @@ INSTALLED_APPS = [
     "tailwind",
     "compressor",
     "django_browser_reload",  # Opcional para live reload
-    "pandas",
 ]
 
 TAILWIND_APP_NAME = "contracts"
@@ -68,6 +84,7 @@ MIDDLEWARE = [
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
+    "contracts.middleware.EventoMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
@@ -143,6 +160,12 @@ STATIC_ROOT = BASE_DIR / "staticfiles"
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
+# Entrega dos arquivos protegidos (documentos de contrato) após a checagem de permissão:
+# "nginx" -> X-Accel-Redirect para ARQUIVOS_ACCEL_PREFIXO (location internal com alias para MEDIA_ROOT)
+# "apache" -> X-Sendfile (mod_xsendfile); vazio -> transmissão pelo Django com Range/ETag
+ARQUIVOS_ENTREGA = config('ARQUIVOS_ENTREGA', default='')
+ARQUIVOS_ACCEL_PREFIXO = config('ARQUIVOS_ACCEL_PREFIXO', default='/protegido/')
+
 # Compressor (opcional se usar tailwind)
 COMPRESS_ROOT = BASE_DIR / "static"
 COMPRESS_ENABLED = True